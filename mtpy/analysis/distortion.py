@@ -46,6 +46,213 @@ import mtpy.analysis.geometry as MTge
 import mtpy.core.z as MTz
 import mtpy.utils.calculator as MTcc
 import mtpy.utils.exceptions as MTex
+from mtpy.utils.mtpylog import MtPyLog
+
+logger = MtPyLog().get_mtpy_logger(__name__)
+# =================================================================
+
+
+def _distortion_1d(z, z_err=None):
+    """
+    distortion tensors and their errors of impedance tensors z (n, 2, 2)
+    of 1-D frequencies, g = det(Z)^0.5
+    """
+    rot_mat = np.array([[0, -1], [1, 0]])
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        gr = np.sqrt(z.real[:, 0, 0] * z.real[:, 1, 1] -
+                     z.real[:, 0, 1] * z.real[:, 1, 0])[:, np.newaxis,
+                                                        np.newaxis]
+        gi = np.sqrt(z.imag[:, 0, 0] * z.imag[:, 1, 1] -
+                     z.imag[:, 0, 1] * z.imag[:, 1, 0])[:, np.newaxis,
+                                                        np.newaxis]
+
+        dis = .5 * (np.matmul(z.real, rot_mat) / gr +
+                    np.matmul(z.imag, rot_mat) / gi)
+
+        if z_err is None:
+            return dis, np.ones_like(dis)
+
+        # find errors of entries for calculating weights
+        gr_err = np.abs(z_err) / gr
+        gr_err[gr_err == 0.0] = 1.0
+        gi_err = np.abs(z_err) / gi
+        gi_err[gi_err == 0.0] = 1.0
+
+    return dis, .5 * (gi_err + gr_err)
+
+
+def _distortion_2d(z, z_err, strike):
+    """
+    distortion tensors and their errors of impedance tensors z (n, 2, 2)
+    of 2-D frequencies, rotated by strike (n) into the principal axes,
+    with det(D) = P = 1
+    """
+    P = 1
+    tetm = MTcc.rotatematrices_incl_errors(z, strike)[0]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        values = []
+        for tetm_part in [tetm.real, tetm.imag]:
+            t00 = tetm_part[:, 0, 0]
+            t01 = tetm_part[:, 0, 1]
+            t10 = tetm_part[:, 1, 0]
+            t11 = tetm_part[:, 1, 1]
+            det = t00 * t11 - t01 * t10
+            values.append((t00, t01, t10, t11, det,
+                           -4 * P * t01 * t10 / det))
+
+        # the larger of the real and imaginary part sets T
+        t_arr_r = values[0][5]
+        t_arr_i = values[1][5]
+        T = np.sqrt(np.where(t_arr_i > t_arr_r, t_arr_i, t_arr_r)) + .001
+
+        dis = np.zeros(z.shape)
+        dis_err = np.zeros(z.shape)
+        sr = None
+        for t00, t01, t10, t11, det, t_arr in values:
+            ss = np.sqrt(T ** 2 - t_arr)
+            if sr is None:
+                sr = ss
+            par = 2 * t01 / (T - ss)
+            orth = 2 * t10 / (T + ss)
+
+            # tetm . [[0, 1 / orth], [1 / par, 0]]
+            dis[:, 0, 0] += .5 * t01 / par
+            dis[:, 0, 1] += .5 * t00 / orth
+            dis[:, 1, 0] += .5 * t11 / par
+            dis[:, 1, 1] += .5 * t10 / orth
+
+            if z_err is None:
+                continue
+
+            # find errors of entries for calculating weights, the errors
+            # of the imaginary part are scaled by sr as well
+            err_arr = np.real(z_err).copy()
+            err_arr[err_arr == 0.0] = 1.0
+            e00 = err_arr[:, 0, 0]
+            e01 = err_arr[:, 0, 1]
+            e10 = err_arr[:, 1, 0]
+            e11 = err_arr[:, 1, 1]
+
+            scale = 2 * P / (det ** 2 * sr)
+            sigma_s = np.sqrt((scale * t01 * t10 * t11 * e00) ** 2 +
+                              (scale * t00 * t10 * t11 * e01) ** 2 +
+                              (scale * t00 * t01 * t11 * e10) ** 2 +
+                              (scale * t01 * t10 * t00 * e11) ** 2)
+            sigma_12 = np.sqrt((1. / orth / t00 * e00) ** 2 +
+                               (1. / orth / t10 * e10) ** 2 +
+                               (0.5 * t00 / t10 * sigma_s) ** 2)
+            sigma_21 = np.sqrt((1. / par / t11 * e11) ** 2 +
+                               (1. / par / t01 * e01) ** 2 +
+                               (0.5 * t11 / t01 * sigma_s) ** 2)
+
+            # the mean over both error matrices
+            dis_err += ((sigma_s + sigma_12 + sigma_21) /
+                        8.)[:, np.newaxis, np.newaxis]
+
+    if z_err is None:
+        dis_err[:] = 1.0
+
+    return dis, dis_err
+
+
+def find_distortion_batch(z_array, z_err_array=None, mask=None,
+                          num_freq=None):
+    """
+    find optimal distortion tensors of many stations at once
+
+    The same estimate as find_distortion, for all frequencies of all
+    stations in one go: the dimensionality and strike of each frequency are
+    found from the phase tensors, a distortion tensor is estimated for
+    every 1-D and 2-D frequency and the weighted mean over the frequencies
+    of a station is its distortion tensor.
+
+    Arguments
+    -------------
+
+        **z_array** : np.ndarray(n_station, nf, 2, 2)
+                      impedance tensors, e.g. ZStack.z
+
+        **z_err_array** : np.ndarray(n_station, nf, 2, 2)
+                          impedance tensor errors
+                          *default* is None, all frequencies are weighted
+                          equally
+
+        **mask** : np.ndarray(n_station, nf, dtype=bool)
+                   True where there is data, e.g. ZStack.mask
+                   *default* is None, where z_array is finite
+
+        **num_freq** : int
+                       number of frequencies with data of each station to
+                       look for distortion from, counted from index 0
+                       *default* is None, meaning all frequencies are used
+
+    Returns
+    ---------
+
+        **distortion** : np.ndarray(n_station, 2, 2)
+                         distortion arrays all real values
+
+        **distortion_err** : np.ndarray(n_station, 2, 2)
+                             distortion error arrays
+
+    Example:
+    ---------
+        :Estimate Distortion of a survey: ::
+
+            >>> import mtpy.analysis.distortion as distortion
+            >>> dis, dis_err = distortion.find_distortion_batch(
+            >>>     z_stack.z, z_stack.z_err, mask=z_stack.mask, num_freq=12)
+
+    """
+    z_array = np.asarray(z_array)
+    if z_array.ndim != 4 or z_array.shape[2:] != (2, 2):
+        raise MTex.MTpyError_inputarguments(
+            'impedance array must be of shape (n_station, nf, 2, 2), not '
+            '{0}'.format(z_array.shape))
+
+    valid = np.all(np.isfinite(z_array), axis=(2, 3))
+    if mask is not None:
+        valid &= np.asarray(mask, dtype='bool')
+    if num_freq is not None:
+        valid &= np.cumsum(valid, axis=1) <= num_freq
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        dim_arr = MTge.dimensionality(z_array=z_array)
+        st_arr = -1 * MTge.strike_angle(z_array=z_array)[..., 0]
+
+    # no distortion where there is a zero in z or the data are 3-D
+    has_zero = np.any(z_array == 0.0 + 0.0j, axis=(2, 3))
+    is_1d = valid & ~has_zero & (dim_arr == 1)
+    is_2d = valid & ~has_zero & (dim_arr == 2)
+
+    dis = np.zeros(z_array.shape)
+    dis[:, :] = np.identity(2)
+    dis_err = np.ones(z_array.shape)
+
+    z_err_1d = z_err_2d = None
+    if z_err_array is not None:
+        z_err_array = np.asarray(z_err_array)
+        z_err_1d = z_err_array[is_1d]
+        z_err_2d = z_err_array[is_2d]
+
+    dis[is_1d], dis_err[is_1d] = _distortion_1d(z_array[is_1d], z_err_1d)
+    dis[is_2d], dis_err[is_2d] = _distortion_2d(
+        z_array[is_2d], z_err_2d, np.nan_to_num(st_arr[is_2d]))
+
+    # weighted mean of the frequencies with an estimate
+    use = valid & np.any(dis != 0, axis=(2, 3))
+    weights = np.where(use[:, :, np.newaxis, np.newaxis],
+                       (1. / dis_err) ** 2, 0.)
+    dis = np.where(use[:, :, np.newaxis, np.newaxis], dis, 0.)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weights_sum = weights.sum(axis=1)
+        dis_avg = (weights * dis).sum(axis=1) / weights_sum
+        dis_avg_err = np.sqrt(1. / weights_sum)
+
+    return dis_avg, dis_avg_err
 
 
 def find_distortion(z_object, g='det', num_freq=None, lo_dims=None):
@@ -91,197 +298,25 @@ def find_distortion(z_object, g='det', num_freq=None, lo_dims=None):
 
     """
 
-    z_obj = copy.deepcopy(z_object)
-
     if num_freq is not None:
-        if num_freq > z_obj.freq.size:
-            num_freq = z_obj.freq.size
+        if num_freq > z_object.freq.size:
+            num_freq = z_object.freq.size
             print 'Number of frequencies to sweep over is too high for z'
             print 'setting num_freq to {0}'.format(num_freq)
     else:
-        num_freq = z_obj.freq.size
-
-    z_obj.z = z_obj.z[0:num_freq]
-    z_obj.z_err = z_obj.z_err[0:num_freq]
-    z_obj.freq = z_obj.freq[0:num_freq]
-
-    g = 'det'
-
-    dim_arr = MTge.dimensionality(z_object=z_obj)
-    st_arr = -1 * MTge.strike_angle(z_object=z_obj)[:, 0]
-
-    dis = np.zeros_like(z_obj.z, dtype=np.float)
-    dis_err = np.ones_like(z_obj.z, dtype=np.float)
-
-    # dictionary of values that should be no distortion in case distortion
-    # cannot be calculated for that component
-
-    rot_mat = np.matrix([[0, -1], [1, 0]])
-    for idx, dim in enumerate(dim_arr):
-        if np.any(z_obj.z[idx] == 0.0 + 0.0j) == True:
-            dis[idx] = np.identity(2)
-            print 'Found a zero in z at {0}, skipping'.format(idx)
-            continue
-
-        if dim == 1:
-
-            if g in ['01', '10']:
-                gr = np.abs(z_obj.z.real[idx, int(g[0]), int(g[1])])
-                gi = np.abs(z_obj.z.imag[idx, int(g[0]), int(g[1])])
-            else:
-                gr = np.sqrt(np.linalg.det(z_obj.z.real[idx]))
-                gi = np.sqrt(np.linalg.det(z_obj.z.imag[idx]))
-
-            dis[idx] = np.mean(np.array([(1. / gr * np.dot(z_obj.z.real[idx],
-                                                           rot_mat)),
-                                         (1. / gi * np.dot(z_obj.z.imag[idx],
-                                                           rot_mat))]),
-                               axis=0)
-
-            if z_obj.z_err is not None:
-                # find errors of entries for calculating weights
-
-                gr_err = 1. / gr * np.abs(z_obj.z_err[idx])
-                gr_err[np.where(gr_err == 0.0)] = 1.0
-
-                gi_err = 1. / gi * np.abs(z_obj.z_err[idx])
-                gi_err[np.where(gi_err == 0.0)] = 1.0
-
-                dis_err[idx] = np.mean(np.array([gi_err, gr_err]),
-                                       axis=0)
-
-        elif dim == 2:
-            P = 1
-            strike_ang = st_arr[idx]
-            if np.isnan(strike_ang):
-                strike_ang = 0.0
-
-            if z_obj.z_err is not None:
-                err_arr = z_obj.z_err[idx]
-                err_arr[np.where(err_arr == 0.0)] = 1.0
-            else:
-                err_arr = None
-
-            tetm_arr, tetm_err = MTcc.rotatematrix_incl_errors(z_obj.z[idx],
-                                                               strike_ang,
-                                                               inmatrix_err=err_arr)
-
-            tetm_r = tetm_arr.real
-            tetm_i = tetm_arr.imag
-            t_arr_r = -4 * P * tetm_r[0, 1] * \
-                tetm_r[1, 0] / np.linalg.det(tetm_r)
-            t_arr_i = -4 * P * tetm_i[0, 1] * \
-                tetm_i[1, 0] / np.linalg.det(tetm_i)
-
-            try:
-                T = np.sqrt(max([t_arr_r, t_arr_i])) + .001
-            except ValueError:
-                T = 2
-
-            sr = np.sqrt(
-                T ** 2 +
-                4 *
-                P *
-                tetm_r[
-                    0,
-                    1] *
-                tetm_r[
-                    1,
-                    0] /
-                np.linalg.det(tetm_r))
-            si = np.sqrt(
-                T ** 2 +
-                4 *
-                P *
-                tetm_i[
-                    0,
-                    1] *
-                tetm_i[
-                    1,
-                    0] /
-                np.linalg.det(tetm_i))
-
-            par_r = 2 * tetm_r[0, 1] / (T - sr)
-            orth_r = 2 * tetm_r[1, 0] / (T + sr)
-            par_i = 2 * tetm_i[0, 1] / (T - si)
-            orth_i = 2 * tetm_i[1, 0] / (T + si)
-
-            mat2_r = np.matrix([[0, 1. / orth_r], [1. / par_r, 0]])
-            mat2_i = np.matrix([[0, 1. / orth_i], [1. / par_i, 0]])
-
-            avg_mat = np.mean(np.array([np.dot(tetm_r, mat2_r),
-                                        np.dot(tetm_i, mat2_i)]),
-                              axis=0)
-
-            dis[idx] = avg_mat
-
-            if err_arr is not None:
-                # find errors of entries for calculating weights
-                sigma_sr = np.sqrt((-(2 * P * tetm_r[0, 1] * tetm_r[1, 0] *
-                                      tetm_r[1, 1] * err_arr[0, 0]) /
-                                    (np.linalg.det(tetm_r) ** 2 * sr)) ** 2 +
-                                   ((2 * P * tetm_r[0, 0] * tetm_r[1, 0] *
-                                     tetm_r[1, 1] * err_arr[0, 1]) /
-                                    (np.linalg.det(tetm_r) ** 2 * sr)) ** 2 +
-                                   ((2 * P * tetm_r[0, 0] * tetm_r[0, 1] *
-                                     tetm_r[1, 1] * err_arr[1, 0]) /
-                                    (np.linalg.det(tetm_r) ** 2 * sr)) ** 2 +
-                                   (-(2 * P * tetm_r[0, 1] * tetm_r[1, 0] *
-                                      tetm_r[0, 0] * err_arr[1, 1]) /
-                                    (np.linalg.det(tetm_r) ** 2 * sr)) ** 2)
-
-                sigma_dr_11 = 0.5 * sigma_sr
-                sigma_dr_22 = 0.5 * sigma_sr
-
-                sigma_dr_12 = np.sqrt((mat2_r[0, 1] / tetm_r[0, 0] * err_arr[0, 0]) ** 2 +
-                                      (mat2_r[0, 1] / tetm_r[1, 0] * err_arr[1, 0]) ** 2 +
-                                      (0.5 * tetm_r[0, 0] / tetm_r[1, 0] * sigma_sr) ** 2)
-                sigma_dr_21 = np.sqrt((mat2_r[1, 0] / tetm_r[1, 1] * err_arr[1, 1]) ** 2 +
-                                      (mat2_r[1, 0] / tetm_r[0, 1] * err_arr[0, 1]) ** 2 +
-                                      (0.5 * tetm_r[1, 1] / tetm_r[0, 1] * sigma_sr) ** 2)
-
-                dis_err_r = np.array([[sigma_dr_11, sigma_dr_12],
-                                      [sigma_dr_21, sigma_dr_22]])
-
-                sigma_si = np.sqrt((-(2 * P * tetm_i[0, 1] * tetm_i[1, 0] *
-                                      tetm_i[1, 1] * err_arr[0, 0]) /
-                                    (np.linalg.det(tetm_i) ** 2 * sr)) ** 2 +
-                                   ((2 * P * tetm_i[0, 0] * tetm_i[1, 0] *
-                                     tetm_i[1, 1] * err_arr[0, 1]) /
-                                    (np.linalg.det(tetm_i) ** 2 * sr)) ** 2 +
-                                   ((2 * P * tetm_i[0, 0] * tetm_i[0, 1] *
-                                     tetm_i[1, 1] * err_arr[1, 0]) /
-                                    (np.linalg.det(tetm_i) ** 2 * sr)) ** 2 +
-                                   (-(2 * P * tetm_i[0, 1] * tetm_i[1, 0] *
-                                      tetm_i[0, 0] * err_arr[1, 1]) /
-                                    (np.linalg.det(tetm_i) ** 2 * sr)) ** 2)
-
-                sigma_di_11 = 0.5 * sigma_si
-                sigma_di_22 = 0.5 * sigma_si
-                sigma_di_12 = np.sqrt((mat2_i[0, 1] / tetm_i[0, 0] * err_arr[0, 0]) ** 2 +
-                                      (mat2_i[0, 1] / tetm_i[1, 0] * err_arr[1, 0]) ** 2 +
-                                      (0.5 * tetm_i[0, 0] / tetm_i[1, 0] * sigma_si) ** 2)
-                sigma_di_21 = np.sqrt((mat2_i[1, 0] / tetm_i[1, 1] * err_arr[1, 1]) ** 2 +
-                                      (mat2_i[1, 0] / tetm_i[0, 1] * err_arr[0, 1]) ** 2 +
-                                      (0.5 * tetm_i[1, 1] / tetm_i[0, 1] * sigma_si) ** 2)
-
-                dis_err_i = np.array([[sigma_di_11, sigma_di_12],
-                                      [sigma_di_21, sigma_di_22]])
-
-                dis_err[idx] = np.mean(np.array([dis_err_r, dis_err_i]))
-        else:
-            dis[idx] = np.identity(2)
-
-    nonzero_idx = np.array(list(set(np.nonzero(dis)[0])))
-
-    dis_avg, weights_sum = np.average(dis[nonzero_idx],
-                                      axis=0,
-                                      weights=(1. / dis_err[nonzero_idx]) ** 2,
-                                      returned=True)
-
-    dis_avg_err = np.sqrt(1. / weights_sum)
+        num_freq = z_object.freq.size
 
-    return dis_avg, dis_avg_err
+    z_array = z_object.z[np.newaxis, :num_freq]
+    for idx in np.nonzero(np.any(z_array[0] == 0.0 + 0.0j, axis=(1, 2)))[0]:
+        print 'Found a zero in z at {0}, skipping'.format(idx)
+
+    z_err_array = None
+    if z_object.z_err is not None:
+        z_err_array = z_object.z_err[np.newaxis, :num_freq]
+
+    dis_avg, dis_avg_err = find_distortion_batch(z_array, z_err_array)
+
+    return dis_avg[0], dis_avg_err[0]
 
 
 def find_1d_distortion(z_object, include_non1d=False):
@@ -395,24 +430,192 @@ def remove_distortion(z_array=None, z_object=None, num_freq=None, g='det'):
 
     # 0. generate a Z object
     # 1. find distortion via function above,
-    # 2. remove distortion via method of z object
+    # 2. remove distortion via method of z object, the input z object is
+    #    not changed
 
     dis, dis_err = find_distortion(z_obj, num_freq=num_freq, g=g)
 
     try:
-        # distortion_tensor, zd, zd_err = z_obj.no_distortion(dis, distortion_err_tensor=dis_err)
         distortion_tensor, zd, zd_err = z_obj.remove_distortion(
             dis, distortion_err_tensor=dis_err)
         zd_err = np.nan_to_num(zd_err)
         zd_err[np.where(zd_err == 0.0)] = 1.0
-        distortion_z_obj = z_obj
-        distortion_z_obj.z = zd
-        distortion_z_obj.z[zero_idx] = 0.0 + 0.0j
-        distortion_z_obj.z_err = zd_err
+        zd[zero_idx] = 0.0 + 0.0j
 
-        return distortion_tensor, distortion_z_obj
+        return distortion_tensor, _new_z(z_obj, zd, zd_err)
 
     except MTex.MTpyError_Z:
         print 'Could not compute distortion tensor'
 
-        return np.identity(2), z_obj
+        z_err = z_obj.z_err
+        if z_err is not None:
+            z_err = z_err.copy()
+        return np.identity(2), _new_z(z_obj, z_obj.z.copy(), z_err)
+
+
+def _new_z(z_obj, z_array, z_err_array):
+    """
+    Z object with the frequencies and rotation angles of z_obj
+    """
+    new_z_obj = MTz.Z(z_array=z_array, z_err_array=z_err_array,
+                      freq=z_obj.freq)
+    new_z_obj.rotation_angle = copy.copy(z_obj.rotation_angle)
+    return new_z_obj
+
+
+def remove_distortion_stack(z_stack, num_freq=None):
+    """
+    remove distortion from the impedance tensors of all stations of a
+    survey at once, the same as remove_distortion does for each station.
+
+    The distortion tensors of all stations are found with
+    find_distortion_batch and removed with ZStack.remove_distortion.
+    Stations with a singular distortion tensor are left as they are.
+
+    Arguments
+    -----------
+
+        **z_stack** : mtpy.core.z_stack.ZStack
+                      impedance tensors of the survey, not changed
+
+        **num_freq** : int
+                       number of frequecies of each station to look for
+                       distortion
+                       *default* is None, meaning look over all frequencies
+
+    Returns
+    ------------
+
+        **distortion** : np.ndarray (n_station, 2, 2)
+                         distortion arrays
+
+        **z_corrected** : np.ndarray(n_station, nf, 2, 2)
+                          impedance tensors with distortion removed
+
+        **z_corrected_err** : np.ndarray(n_station, nf, 2, 2)
+                              impedance tensor errors
+
+    Examples
+    -------------
+
+        :Remove Distortion of a survey: ::
+
+            >>> import mtpy.analysis.distortion as distortion
+            >>> from mtpy.core.mt_loader import MTLoader
+            >>> z_stack = MTLoader().load_z_stack(r"/home/mt/edi_files")
+            >>> d, z_cor, z_cor_err = distortion.remove_distortion_stack(
+            >>>     z_stack, num_freq=12)
+    """
+
+    z_array = z_stack.z
+    z_err_array = z_stack.z_err
+    mask = z_stack.mask
+
+    dis, dis_err = find_distortion_batch(z_array, z_err_array, mask=mask,
+                                         num_freq=num_freq)
+
+    # stations with a singular distortion tensor keep their data
+    singular = dis[:, 0, 0] * dis[:, 1, 1] - dis[:, 0, 1] * dis[:, 1, 0] == 0
+    for station in z_stack.station[singular]:
+        logger.warning('Could not compute distortion tensor of %s', station)
+    dis[singular] = np.identity(2)
+    dis_err[singular] = 0.0
+
+    dis, z_corrected, z_corrected_err = z_stack.remove_distortion(dis,
+                                                                  dis_err)
+    z_corrected_err = np.nan_to_num(z_corrected_err)
+    z_corrected_err[z_corrected_err == 0.0] = 1.0
+    z_corrected[z_array == 0 + 0j] = 0.0 + 0.0j
+
+    z_corrected[singular] = z_array[singular]
+    z_corrected_err[singular] = z_err_array[singular]
+    z_corrected[~mask] = 0.0
+    z_corrected_err[~mask] = 0.0
+
+    return dis, z_corrected, z_corrected_err
+
+
+def remove_distortion_edi_files(edi_source, save_path=None, num_freq=None,
+                                suffix='_dr', n_workers=None, pool='process'):
+    """
+    remove distortion from every .edi file of a survey and write the
+    corrected .edi files.
+
+    The files are read once with a pool of workers, the distortion of all
+    stations is removed at once with remove_distortion_stack and the new
+    files are written with a pool of workers.  Files that cannot be read
+    or written are logged and left out.
+
+    Arguments
+    -----------
+
+        **edi_source** : string or list
+                         directory containing .edi files or a list of .edi
+                         files
+
+        **save_path** : string
+                        directory to write the new files to
+                        *default* is None, next to the input files
+
+        **num_freq** : int
+                       number of frequecies of each station to look for
+                       distortion
+                       *default* is None, meaning look over all frequencies
+
+        **suffix** : string
+                     added to the station file names, e.g. mt01_dr.edi
+                     *default* is '_dr'
+
+        **n_workers** : int
+                        number of worker processes or threads, 1 works in
+                        this process.  *default* is None, the number of CPUs
+
+        **pool** : [ 'process' | 'thread' ]
+                   kind of worker pool, *default* is 'process'
+
+    Returns
+    ------------
+
+        **distortion** : np.ndarray (n_station, 2, 2)
+                         distortion arrays of the stations that were read
+
+        **new_fn_list** : list
+                          the new .edi files, None where a file could not
+                          be written
+
+    Examples
+    -------------
+
+        :Remove Distortion from a directory of .edi files: ::
+
+            >>> import mtpy.analysis.distortion as distortion
+            >>> d, fn_list = distortion.remove_distortion_edi_files(
+            >>>     r"/home/mt/edi_files", save_path=r"/home/mt/edi_dr",
+            >>>     num_freq=12, n_workers=8)
+    """
+    # imported here, mtpy.core.mt_loader imports mtpy.core.mt which
+    # imports this module
+    import mtpy.core.mt_loader as mt_loader
+
+    loader = mt_loader.MTLoader(n_workers=n_workers, pool=pool)
+    z_stack = loader.load_z_stack(edi_source)
+    not_read = set([edi_fn for edi_fn, error in loader.errors])
+    edi_list = [edi_fn for edi_fn in loader.edi_list
+                if edi_fn not in not_read]
+
+    dis, z_corrected, z_corrected_err = remove_distortion_stack(
+        z_stack, num_freq=num_freq)
+
+    z_list = []
+    for ii in range(z_stack.n_stations):
+        valid = z_stack.mask[ii]
+        z_list.append(MTz.Z(z_array=z_corrected[ii, valid],
+                            z_err_array=z_corrected_err[ii, valid],
+                            freq=z_stack.freq[valid]))
+
+    new_fn_list = mt_loader.write_edi_list(edi_list, z_list,
+                                           save_path=save_path,
+                                           suffix=suffix,
+                                           n_workers=n_workers, pool=pool)
+
+    return dis, new_fn_list
@@ -10,11 +10,6 @@ import numpy as np
 import math
 import cmath
 
-import matplotlib
-
-matplotlib.use('TkAgg')
-import matplotlib.pyplot as plt
-
 mu0 = 4*math.pi*math.pow(10,-7)
 
 def bostick_depth(f, rho):
@@ -72,6 +67,10 @@ def sensitivity(z, sigma_conduct=100.0, freq=10.0):
 
 # ===========================================
 if __name__ == "__main__":
+    import matplotlib
+
+    matplotlib.use('TkAgg')
+    import matplotlib.pyplot as plt
 
     for n in xrange(0,36):
         zn = 0.1*n
@@ -27,6 +27,51 @@ import mtpy.utils.exceptions as MTex
 
 # =================================================================
 
+def _get_pt_attributes(z_array=None, z_object=None, pt_array=None,
+                       pt_object=None):
+    """
+    Return the phase tensor attributes of whichever input is given as a
+    record array (see mtpy.analysis.pt.pt_attributes) and whether they
+    have errors.  Arrays may hold many stations, e.g. (n_station, nf, 2, 2).
+    """
+    if z_array is not None:
+        z_array = np.asarray(z_array)
+        # no errors given, the phase tensor errors are zero
+        pt, pterr = MTpt.z2pt_batch(z_array, np.zeros(z_array.shape))[:2]
+        return MTpt.pt_attributes(pt, pterr), True
+    elif z_object is not None:
+        if not isinstance(z_object, MTz.Z):
+            raise MTex.MTpyError_Z(
+                'Input argument is not an instance of the Z class')
+        pt_object = MTpt.PhaseTensor(z_object=z_object)
+    elif pt_array is not None:
+        return MTpt.pt_attributes(pt_array), False
+    elif pt_object is not None:
+        if not isinstance(pt_object, MTpt.PhaseTensor):
+            raise MTex.MTpyError_PT(
+                'Input argument is not an instance of the PhaseTensor class')
+
+    if pt_object is None or pt_object.pt is None:
+        raise MTex.MTpyError_PT('Need to input a z or phase tensor array or '
+                                'object')
+    return pt_object.attributes, pt_object.pterr is not None
+
+
+def _dimensions(attributes, skew_threshold, eccentricity_threshold):
+    """
+    Return the dimensions [ 1 | 2 | 3 ] of phase tensor attributes.
+    """
+    # use criteria from Bibby et al. 2005 for determining the dimensionality
+    # for each frequency of the pt/z array:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # 1. compare the skew value with the threshold for 3D
+        is_3d = attributes.beta > skew_threshold
+        # 2. check for eccentricity
+        is_2d = attributes.pi1 / attributes.pi2 > eccentricity_threshold
+
+    return np.where(is_3d, 3, np.where(is_2d, 2, 1))
+
+
 def dimensionality(z_array=None, z_object=None, pt_array=None,
                    pt_object=None, skew_threshold=5,
                    eccentricity_threshold=0.1):
@@ -40,7 +85,7 @@ def dimensionality(z_array=None, z_object=None, pt_array=None,
     Arguments
     ------------
 
-        **z_array** : np.ndarray(nf, 2, 2)
+        **z_array** : np.ndarray(nf, 2, 2) or (n_station, nf, 2, 2)
                       numpy array of impedance elements
                       *default* is None
 
@@ -48,7 +93,7 @@ def dimensionality(z_array=None, z_object=None, pt_array=None,
                        z_object
                        *default* is None
 
-        **pt_array** : np.ndarray(nf, 2, 2)
+        **pt_array** : np.ndarray(nf, 2, 2) or (n_station, nf, 2, 2)
                        numpy array of phase tensor elements
                        *default* is None
 
@@ -71,7 +116,8 @@ def dimensionality(z_array=None, z_object=None, pt_array=None,
 
         **dimensions** : np.ndarray(nf, dtype=int)
                          an array of dimesions for each frequency
-                         the values are [ 1 | 2 | 3 ]
+                         the values are [ 1 | 2 | 3 ],
+                         (n_station, nf) for stacked arrays
 
 
     Examples
@@ -85,40 +131,10 @@ def dimensionality(z_array=None, z_object=None, pt_array=None,
 
     """
 
-    lo_dimensionality = []
+    attributes = _get_pt_attributes(z_array=z_array, z_object=z_object,
+                                    pt_array=pt_array, pt_object=pt_object)[0]
 
-    if z_array is not None:
-        pt_obj = MTpt.PhaseTensor(z_array=z_array)
-    elif z_object is not None:
-        if not isinstance(z_object, MTz.Z):
-            raise MTex.MTpyError_Z(
-                'Input argument is not an instance of the Z class')
-        pt_obj = MTpt.PhaseTensor(z_object=z_object)
-    elif pt_array is not None:
-        pt_obj = MTpt.PhaseTensor(pt_array=pt_array)
-    elif pt_object is not None:
-        if not isinstance(pt_object, MTpt.PhaseTensor):
-            raise MTex.MTpyError_PT(
-                'Input argument is not an instance of the PhaseTensor class')
-        pt_obj = pt_object
-
-    # use criteria from Bibby et al. 2005 for determining the dimensionality
-    # for each frequency of the pt/z array:
-    for idx_f in range(len(pt_obj.pt)):
-        # 1. determine skew value...
-        skew = pt_obj.beta[0][idx_f]
-        # compare with threshold for 3D
-        if skew > skew_threshold:
-            lo_dimensionality.append(3)
-        else:
-            # 2.check for eccentricity:
-            ecc = pt_obj._pi1()[0][idx_f] / pt_obj._pi2()[0][idx_f]
-            if ecc > eccentricity_threshold:
-                lo_dimensionality.append(2)
-            else:
-                lo_dimensionality.append(1)
-
-    return np.array(lo_dimensionality)
+    return _dimensions(attributes, skew_threshold, eccentricity_threshold)
 
 
 def strike_angle(z_array=None, z_object=None, pt_array=None,
@@ -131,7 +147,7 @@ def strike_angle(z_array=None, z_object=None, pt_array=None,
         Arguments
     ------------
 
-        **z_array** : np.ndarray(nf, 2, 2)
+        **z_array** : np.ndarray(nf, 2, 2) or (n_station, nf, 2, 2)
                       numpy array of impedance elements
                       *default* is None
 
@@ -139,7 +155,7 @@ def strike_angle(z_array=None, z_object=None, pt_array=None,
                        z_object
                        *default* is None
 
-        **pt_array** : np.ndarray(nf, 2, 2)
+        **pt_array** : np.ndarray(nf, 2, 2) or (n_station, nf, 2, 2)
                        numpy array of phase tensor elements
                        *default* is None
 
@@ -160,10 +176,12 @@ def strike_angle(z_array=None, z_object=None, pt_array=None,
     Returns
     ----------
 
-        **strike** : np.ndarray(nf)
+        **strike** : np.ndarray(nf, 2)
                          an array of strike angles in degrees for each frequency
                          assuming 0 is north, and e is 90.  There is a 90
-                         degree ambiguity in the angle.
+                         degree ambiguity in the angle, both angles are
+                         given, NaN for 1-D.  (n_station, nf, 2) for stacked
+                         arrays
 
 
     Examples
@@ -176,48 +194,22 @@ def strike_angle(z_array=None, z_object=None, pt_array=None,
 
     """
 
-    if z_array is not None:
-        pt_obj = MTpt.PhaseTensor(z_array=z_array)
-    elif z_object is not None:
-        if not isinstance(z_object, MTz.Z):
-            raise MTex.MTpyError_Z(
-                'Input argument is not an instance of the Z class')
-        pt_obj = MTpt.PhaseTensor(z_object=z_object)
+    attributes = _get_pt_attributes(z_array=z_array, z_object=z_object,
+                                    pt_array=pt_array, pt_object=pt_object)[0]
+    dimensions = _dimensions(attributes, skew_threshold,
+                             eccentricity_threshold)
 
-    elif pt_array is not None:
-        pt_obj = MTpt.PhaseTensor(pt_array=pt_array)
-    elif pt_object is not None:
-        if not isinstance(pt_object, MTpt.PhaseTensor):
-            raise MTex.MTpyError_PT(
-                'Input argument is not an instance of the PhaseTensor class')
-        pt_obj = pt_object
-
-    lo_dims = dimensionality(pt_object=pt_obj,
-                             skew_threshold=skew_threshold,
-                             eccentricity_threshold=eccentricity_threshold)
-
-    lo_strikes = []
-
-    for idx, dim in enumerate(lo_dims):
-        if dim == 1:
-            lo_strikes.append((np.nan, np.nan))
-            continue
-
-        a = pt_obj.alpha[0][idx]
-        b = pt_obj.beta[0][idx]
-
-        strike1 = (a - b) % 90
-        if 0 < strike1 < 45:
-            strike2 = strike1 + 90
-        else:
-            strike2 = strike1 - 90
-
-        s1 = min(strike1, strike2)
-        s2 = max(strike1, strike2)
+    strike1 = (attributes.alpha - attributes.beta) % 90
+    strike2 = np.where((strike1 > 0) & (strike1 < 45), strike1 + 90,
+                       strike1 - 90)
 
-        lo_strikes.append((s1, s2))
+    strikes = np.empty(strike1.shape + (2,))
+    strikes[..., 0] = np.minimum(strike1, strike2)
+    strikes[..., 1] = np.maximum(strike1, strike2)
+    # no strike for 1-D
+    strikes[dimensions == 1] = np.nan
 
-    return np.array(lo_strikes)
+    return strikes
 
 
 def eccentricity(z_array=None, z_object=None, pt_array=None, pt_object=None):
@@ -228,7 +220,7 @@ def eccentricity(z_array=None, z_object=None, pt_array=None, pt_object=None):
     Arguments
     ------------
 
-        **z_array** : np.ndarray(nf, 2, 2)
+        **z_array** : np.ndarray(nf, 2, 2) or (n_station, nf, 2, 2)
                       numpy array of impedance elements
                       *default* is None
 
@@ -236,7 +228,7 @@ def eccentricity(z_array=None, z_object=None, pt_array=None, pt_object=None):
                        z_object
                        *default* is None
 
-        **pt_array** : np.ndarray(nf, 2, 2)
+        **pt_array** : np.ndarray(nf, 2, 2) or (n_station, nf, 2, 2)
                        numpy array of phase tensor elements
                        *default* is None
 
@@ -251,7 +243,8 @@ def eccentricity(z_array=None, z_object=None, pt_array=None, pt_object=None):
         **eccentricity** : np.ndarray(nf)
 
 
-        **eccentricity_err** : np.ndarray(nf)
+        **eccentricity_err** : np.ndarray(nf), None for phase tensor arrays
+                               without errors
 
 
 
@@ -263,36 +256,89 @@ def eccentricity(z_array=None, z_object=None, pt_array=None, pt_object=None):
             >>> ec, ec_err= geometry.eccentricity(z_object=z_obj)
     """
 
-    if z_array is not None:
-        pt_obj = MTpt.PhaseTensor(z_array=z_array)
-    elif z_object is not None:
-        if not isinstance(z_object, MTz.Z):
-            raise MTex.MTpyError_Z(
-                'Input argument is not an instance of the Z class')
-        pt_obj = MTpt.PhaseTensor(z_object=z_object)
-    elif pt_array is not None:
-        pt_obj = MTpt.PhaseTensor(pt_array=pt_array)
-    elif pt_object is not None:
-        if not isinstance(pt_object, MTpt.PhaseTensor):
-            raise MTex.MTpyError_PT(
-                'Input argument is not an instance of the PhaseTensor class')
-        pt_obj = pt_object
+    attributes, has_err = _get_pt_attributes(z_array=z_array,
+                                             z_object=z_object,
+                                             pt_array=pt_array,
+                                             pt_object=pt_object)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ecc = attributes.pi1 / attributes.pi2
+        if has_err:
+            ecc_err = np.sqrt((attributes.pi1_err / attributes.pi1) ** 2 +
+                              (attributes.pi2_err / attributes.pi2) ** 2)
+        else:
+            ecc_err = np.empty(ecc.shape, dtype=object)
+
+    return ecc, ecc_err
 
-    lo_ecc = []
-    lo_eccerr = []
 
-    if not isinstance(pt_obj, MTpt.PhaseTensor):
-        raise MTex.MTpyError_PT(
-            'Input argument is not an instance of the PhaseTensor class')
+def strike_histograms(strike_array, period, period_ranges, bin_width=5,
+                      fold=True):
+    """
+    Histogram the strike angles of a survey for several period ranges, e.g.
+    for each decade, with one np.histogram per range.
 
-    for idx_f in range(len(pt_obj.pt)):
-        lo_ecc.append(pt_obj._pi1()[0][idx_f] / pt_obj._pi2()[0][idx_f])
+    Arguments
+    ------------
 
-        ecc_err = None
-        if (pt_obj._pi1()[1] is not None) and (pt_obj._pi2()[1] is not None):
-            ecc_err = np.sqrt((pt_obj._pi1()[1][idx_f] / pt_obj._pi1()[0][idx_f]) ** 2 + (
-                pt_obj._pi2()[1][idx_f] / pt_obj._pi2()[0][idx_f]) ** 2)
+        **strike_array** : np.ndarray(n_period, n_station)
+                           strike angles in degrees, zeros and NaN are
+                           treated as no data
 
-        lo_eccerr.append(ecc_err)
+        **period** : np.ndarray(n_period)
+                     periods (s) of the rows of strike_array
 
-    return np.array(lo_ecc), np.array(lo_eccerr)
+        **period_ranges** : list of (min, max)
+                            log10 of the period limits of each histogram,
+                            e.g. [(-1, 0), (0, 1)] for two decades.  Only
+                            periods strictly inside the limits are counted.
+
+        **bin_width** : float
+                        width of the angle bins in degrees
+                        *default* is 5
+
+        **fold** : [ True | False ]
+                   True if the angles are folded into -180 to 180,
+                   False for 0 to 360
+                   *default* is True
+
+    Returns
+    ----------
+
+        **counts** : np.ndarray(n_ranges, 360 / bin_width, dtype=int)
+                     number of strike angles in each bin for each range
+
+        **bin_edges** : np.ndarray(360 / bin_width + 1)
+                        edges of the angle bins in degrees
+
+
+    Examples
+    ----------
+        :Strike histogram of each decade: ::
+
+            >>> import mtpy.analysis.geometry as geometry
+            >>> decades = [(bb, bb + 1) for bb in range(-3, 3)]
+            >>> counts, edges = geometry.strike_histograms(strike, period,
+            >>>                                            decades)
+
+    """
+    if fold == True:
+        histrange = (-180, 180)
+    else:
+        histrange = (0, 360)
+    n_bins = int(360 / bin_width)
+
+    strike_array = np.asarray(strike_array, dtype='float')
+    period = np.asarray(period)
+    # no data are zero
+    with np.errstate(invalid='ignore'):
+        has_data = (strike_array != 0) & np.isfinite(strike_array)
+
+    counts = np.zeros((len(period_ranges), n_bins), dtype='int')
+    bin_edges = np.linspace(histrange[0], histrange[1], n_bins + 1)
+    for ii, (range_min, range_max) in enumerate(period_ranges):
+        in_range = (period > 10 ** range_min) & (period < 10 ** range_max)
+        values = strike_array[in_range][has_data[in_range]]
+        counts[ii] = np.histogram(values, bins=bin_edges)[0]
+
+    return counts, bin_edges
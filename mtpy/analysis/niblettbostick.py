@@ -19,16 +19,15 @@ Niblett-Bostick transformations are possible in 1D and 2D.
 """
 
 # =================================================================
-import copy
-
 import numpy as np
-import scipy.interpolate as spi
 
 import mtpy.analysis.geometry as MTge
-import mtpy.core.z as MTz
 import mtpy.utils.calculator as MTcc
+import mtpy.utils.exceptions as MTex
 
-reload(MTz)
+# number of (station, period) entries times rotation angles evaluated at
+# once in calculate_rho_minmax, to bound the memory used
+_ROTATION_BLOCK = 2 ** 21
 
 
 def rhophi2rhodepth(rho, phase, period):
@@ -37,6 +36,7 @@ def rhophi2rhodepth(rho, phase, period):
     into rho/depth (Ohm meters/meters)
 
     The conversion uses the simplified transformation without derivatives.
+    All inputs may be arrays of the same (or broadcastable) shape.
 
     Input:
     - apparent resistivity (Ohm meters
@@ -52,24 +52,104 @@ def rhophi2rhodepth(rho, phase, period):
     depth = np.sqrt(rho * period / 2 / np.pi / MTcc.mu0)
     # phase angle needed in rad
     rho_nb = rho * (np.pi / 2 / np.deg2rad(phase % 90) - 1)
-    # print rho,period,depth,rho_nb
-    # print 'rho: {0:.1f} \t-\t rhoNB: {3:.1f}\t-\t period: {1:.1f} \t-\t depth: {2:.1f}'.format(
-    #												rho,period,depth,rho_nb)
 
     return rho_nb, depth
 
 
+def _get_z_periods(z_object=None, z_array=None, periods=None):
+    """
+    Return the impedance array (..., nf, 2, 2) and the periods broadcast to
+    its leading shape (..., nf) from a Z (or ZStack) object or an array.
+    """
+    if z_object is not None:
+        z = np.asarray(z_object.z)
+        periods = 1. / np.asarray(z_object.freq)
+    else:
+        if z_array is None:
+            raise MTex.MTpyError_inputarguments('Need to input a z array or '
+                                                'object')
+        if periods is None:
+            raise MTex.MTpyError_inputarguments('Need to input periods with '
+                                                'a z array')
+        z = np.asarray(z_array)
+
+    try:
+        periods = np.broadcast_to(np.asarray(periods, dtype='float'),
+                                  z.shape[:-2])
+    except ValueError:
+        raise MTex.MTpyError_inputarguments(
+            'Periods of shape {0} do not match z of shape {1}'.format(
+                np.shape(periods), z.shape))
+
+    return z, periods
+
+
+def _nb_from_z(z, periods):
+    """
+    Niblett-Bostick resistivity and depth of impedance elements z (any
+    shape) at periods broadcastable to z.
+    """
+    res = 0.2 * periods * np.abs(z) ** 2
+    phase = np.degrees(np.angle(z))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return rhophi2rhodepth(res, phase, periods)
+
+
+def _sort_rows(periods):
+    """
+    Return periods as (n, nf) rows, the row index and the order sorting each
+    row by period in ascending order.
+    """
+    periods = periods.reshape(-1, periods.shape[-1])
+    rows = np.arange(periods.shape[0])[:, np.newaxis]
+    order = np.argsort(periods, axis=-1, kind='mergesort')
+
+    return periods, rows, order
+
+
+def _interpolate_sorted(values, periods, valid, fill_value):
+    """
+    Interpolate rows (n, nf) sorted by period linearly in period between
+    the entries where valid is True.  Entries outside the period range of
+    the valid ones are set to fill_value.
+    """
+    n_per = values.shape[-1]
+    rows = np.arange(values.shape[0])[:, np.newaxis]
+    index = np.arange(n_per)
+    # last valid index at or below each index, first one at or above
+    below = np.maximum.accumulate(np.where(valid, index, -1), axis=-1)
+    above = np.minimum.accumulate(np.where(valid, index, n_per)[:, ::-1],
+                                  axis=-1)[:, ::-1]
+    inside = (below >= 0) & (above < n_per)
+    below = np.clip(below, 0, n_per - 1)
+    above = np.clip(above, 0, n_per - 1)
+
+    per_below = periods[rows, below]
+    per_above = periods[rows, above]
+    val_below = values[rows, below]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        weight = (periods - per_below) / (per_above - per_below)
+    weight[per_above == per_below] = 0.
+
+    return np.where(inside,
+                    val_below + weight * (values[rows, above] - val_below),
+                    fill_value)
+
+
 def calculate_znb(z_object=None, z_array=None, periods=None):
     """
     Determine an array of Z_nb (depth dependent Niblett-Bostick transformed Z)
     from the 1D and 2D parts of an impedance tensor array Z.
 
     input:
-    - Z (object or array)
-    - periods (mandatory, if Z is just array)
+    - Z (object or array), array of shape (nf, 2, 2) or
+      (n_station, nf, 2, 2)
+    - periods (mandatory, if Z is just array), shape (nf) or (n_station, nf)
 
     output:
-    - Z_nb
+    - nf x 2 array, depth/rho_nb for rho_nb max
+    - nf x 2 array, depth/rho_nb for rho_nb min
+      (n_station x nf x 2 for stacked arrays), NaN for 3D periods
 
     The calculation of the Z_nb needs 6 steps:
 
@@ -93,53 +173,32 @@ def calculate_znb(z_object=None, z_array=None, periods=None):
 
     """
 
-    # deal with inputs
-    # if zobject:
-    # z = z_object.z
-    # periods = 1./z_object.freq
-    # else:
-    z = z_array
-    periods = periods
+    z, periods = _get_z_periods(z_object, z_array, periods)
 
-    dimensions = MTge.dimensionality(z)
-    angles = MTge.strike_angle(z)
-
-    # reduce actual Z by the 3D layers:
-    z2 = z[np.where(dimensions != 3)[0]]
-    angles2 = angles[np.where(dimensions != 3)[0]]
-    periods2 = periods[np.where(dimensions != 3)[0]]
+    dimensions = MTge.dimensionality(z_array=z)
+    angles = MTge.strike_angle(z_array=z)[..., 0]
 
-    angles_incl1D = interpolate_strike_angles(angles2[:, 0], periods2)
+    # leave out the 3D layers:
+    is_2d = dimensions != 3
+    angles_incl1D = interpolate_strike_angles(angles, periods, mask=is_2d)
 
-    z3 = MTz.rotate_z(z2, -angles_incl1D)[0]
+    z_rot = MTcc.rotatematrices_incl_errors(
+        z, -np.nan_to_num(angles_incl1D))[0]
 
     # at this point we assume that the two modes are the off-diagonal elements!!
     # TE is element (1,2), TM at (2,1)
-    lo_nb_max = []
-    lo_nb_min = []
-
-    app_res = MTz.z2resphi(z3, periods2)[0]
-    phase = MTz.z2resphi(z3, periods2)[1]
-
-    for i, per in enumerate(periods):
-
-        te_rho, te_depth = rhophi2rhodepth(
-            app_res[i][
-                0, 1], phase[i][
-                0, 1], per)
-        tm_rho, tm_depth = rhophi2rhodepth(
-            app_res[i][
-                1, 0], phase[i][
-                1, 0], per)
+    te_rho, te_depth = _nb_from_z(z_rot[..., 0, 1], periods)
+    tm_rho, tm_depth = _nb_from_z(z_rot[..., 1, 0], periods)
 
-        if te_rho > tm_rho:
-            lo_nb_max.append([te_depth, te_rho])
-            lo_nb_min.append([tm_depth, tm_rho])
-        else:
-            lo_nb_min.append([te_depth, te_rho])
-            lo_nb_max.append([tm_depth, tm_rho])
+    te_is_max = te_rho > tm_rho
+    nb_max = np.stack((np.where(te_is_max, te_depth, tm_depth),
+                       np.where(te_is_max, te_rho, tm_rho)), axis=-1)
+    nb_min = np.stack((np.where(te_is_max, tm_depth, te_depth),
+                       np.where(te_is_max, tm_rho, te_rho)), axis=-1)
+    nb_max[~is_2d] = np.nan
+    nb_min[~is_2d] = np.nan
 
-    return np.array(lo_nb_max), np.array(lo_nb_min)
+    return nb_max, nb_min
 
 
 def calculate_depth_nb(z_object=None, z_array=None, periods=None):
@@ -169,11 +228,13 @@ def calculate_depth_nb(z_object=None, z_array=None, periods=None):
 
     Arguments
     -------------
-        *z_object* : mtpy.core.z object
+        *z_object* : mtpy.core.z object or mtpy.core.z_stack.ZStack
 
-        *z_array* : np.ndarray [num_periods, 2, 2]
+        *z_array* : np.ndarray [num_periods, 2, 2] or
+                    [num_stations, num_periods, 2, 2]
 
-        *periods* : np.ndarray(num_periods)
+        *periods* : np.ndarray(num_periods) or
+                    np.ndarray(num_stations, num_periods)
                    only input if input z_array, otherwise periods are extracted
                    from z_object.freq
 
@@ -182,7 +243,8 @@ def calculate_depth_nb(z_object=None, z_array=None, periods=None):
         *depth_array* : np.ndarray(num_periods,
                                    dtype=['period', 'depth_min', 'depth_max',
                                           'rho_min', 'rho_max'])
-                        numpy structured array with keywords.
+                        numpy structured array with keywords,
+                        (num_stations, num_periods) for stacked arrays.
                             - period    --> period in s
                             - depth_min --> minimum depth estimated (m)
                             - depth_max --> maximum depth estimated (m)
@@ -192,7 +254,7 @@ def calculate_depth_nb(z_object=None, z_array=None, periods=None):
     Example
     ------------
         >>> import mtpy.analysis.niblettbostick as nb
-        >>> depth_array = nb.calculate_znb(z_object=z1)
+        >>> depth_array = nb.calculate_depth_nb(z_object=z1)
         >>> # plot the results
         >>> import matplotlib.pyplot as plt
         >>> fig = plt.figure()
@@ -203,80 +265,44 @@ def calculate_depth_nb(z_object=None, z_array=None, periods=None):
 
     """
 
-    # deal with inputs
-    if z_object is not None:
-        z = z_object.z
-        periods = 1. / z_object.freq
-    else:
-        z = z_array
-        periods = periods
+    z, periods = _get_z_periods(z_object, z_array, periods)
 
     dimensions = MTge.dimensionality(z_array=z)
-    angles = MTge.strike_angle(z_array=z)
-
-    # reduce actual Z by the 3D layers:
-    #    z_2d = z[np.where(dimensions != 3)[0]]
-    angles_2d = np.nan_to_num(angles[np.where(dimensions != 3)][:, 0])
-    periods_2d = periods[np.where(dimensions != 3)]
+    angles = np.nan_to_num(MTge.strike_angle(z_array=z)[..., 0])
 
-    # interperpolate strike angle onto all periods
-    # make a function for strike using only 2d angles
-    strike_interp = spi.interp1d(periods_2d, angles_2d,
-                                 bounds_error=False,
-                                 fill_value=0)
-    strike_angles = strike_interp(periods)
+    # interpolate the strike angles of the 1D and 2D layers onto all
+    # periods, 0 outside their period range
+    per_rows, rows, order = _sort_rows(periods)
+    strike_angles = np.empty(per_rows.shape)
+    strike_angles[rows, order] = _interpolate_sorted(
+        angles.reshape(per_rows.shape)[rows, order], per_rows[rows, order],
+        (dimensions != 3).reshape(per_rows.shape)[rows, order], 0.)
 
     # rotate z to be along the interpolated strike angles
-    z_rot = MTz.rotate_z(z, strike_angles)[0]
-
-    #    angles_incl1D = interpolate_strike_angles(angles_2d, periods_2d)
-
-    #    z3 = MTz.rotate_z(z_2d, -angles_incl1D)[0]
+    z_rot = MTcc.rotatematrices_incl_errors(
+        z, strike_angles.reshape(periods.shape))[0]
 
     # at this point we assume that the two modes are the off-diagonal elements!!
     # TE is element (1,2), TM at (2,1)
-    #    lo_nb_max = []
-    #    lo_nb_min = []
-
-    depth_array = np.zeros(periods.shape[0],
-                           dtype=[('period', np.float),
-                                  ('depth_min', np.float),
-                                  ('depth_max', np.float),
-                                  ('rho_min', np.float),
-                                  ('rho_max', np.float)])
-
-    #    app_res, app_res_err, phase, phase_err = MTz.z2resphi(z3, periods_2d)
-    app_res, app_res_err, phase, phase_err = MTz.z2resphi(z_rot, periods)
-
-    for ii, per in enumerate(periods):
-        te_rho, te_depth = rhophi2rhodepth(app_res[ii, 0, 1],
-                                           phase[ii, 0, 1],
-                                           per)
-        tm_rho, tm_depth = rhophi2rhodepth(app_res[ii, 1, 0],
-                                           phase[ii, 1, 0],
-                                           per)
-        depth_array[ii]['period'] = per
-        depth_array[ii]['depth_min'] = min([te_depth, tm_depth])
-        depth_array[ii]['depth_max'] = max([te_depth, tm_depth])
-        depth_array[ii]['rho_min'] = min([te_rho, tm_rho])
-        depth_array[ii]['rho_max'] = max([te_rho, tm_rho])
+    te_rho, te_depth = _nb_from_z(z_rot[..., 0, 1], periods)
+    tm_rho, tm_depth = _nb_from_z(z_rot[..., 1, 0], periods)
+
+    depth_array = np.zeros(periods.shape,
+                           dtype=[('period', float),
+                                  ('depth_min', float),
+                                  ('depth_max', float),
+                                  ('rho_min', float),
+                                  ('rho_max', float)])
+
+    depth_array['period'] = periods
+    depth_array['depth_min'] = np.minimum(te_depth, tm_depth)
+    depth_array['depth_max'] = np.maximum(te_depth, tm_depth)
+    depth_array['rho_min'] = np.minimum(te_rho, tm_rho)
+    depth_array['rho_max'] = np.maximum(te_rho, tm_rho)
 
     return depth_array
 
 
-#        if te_rho > tm_rho:
-#            lo_nb_max.append([te_depth, te_rho])
-#            lo_nb_min.append([tm_depth, tm_rho])
-#
-#        else:
-#            lo_nb_min.append([te_depth, te_rho])
-#            lo_nb_max.append([tm_depth, tm_rho])
-
-# return arrays of the min and max depths
-
-#    return np.array(lo_nb_max), np.array(lo_nb_min)
-
-
 def calculate_rho_minmax(z_object=None, z_array=None, periods=None):
     """
     Determine 2 arrays of Niblett-Bostick transformed aparent resistivities:
@@ -285,19 +311,24 @@ def calculate_rho_minmax(z_object=None, z_array=None, periods=None):
     Values are calculated from the 1D and 2D parts of an impedance tensor array Z.
 
     input:
-    - Z (object or array)
-    - periods (mandatory, if Z is just array)
+    - Z (object or array), array of shape (nf, 2, 2) or
+      (n_station, nf, 2, 2)
+    - periods (mandatory, if Z is just array), shape (nf) or (n_station, nf)
 
     output:
-    - n x 3 array, depth/rho_nb/angle for rho_nb max
-    - n x 3 array, depth/rho_nb/angle for rho_nb min
+    - nf x 3 array, depth/rho_nb/angle for rho_nb max
+    - nf x 2 array, depth/rho_nb for rho_nb min
+      (n_station x nf x 3 and n_station x nf x 2 for stacked arrays),
+      NaN for 3D periods
 
     The calculation is carried out by :
 
     1) Determine the dimensionality of the Z(T), discard all 3D parts
-    2) loop over periods
-       * rotate Z and calculate app_res_NB for off-diagonal elements
-       * find maximum and minimum values
+    2) for all periods at once
+       * rotate Z by every angle and calculate app_res_NB for off-diagonal
+         elements
+       * find maximum and minimum values, the minimum is the other mode
+         at the angle of the maximum
        * write out respective depths and rho values
 
 
@@ -306,127 +337,104 @@ def calculate_rho_minmax(z_object=None, z_array=None, periods=None):
 
     """
 
-    # deal with inputs
-    # if zobject:
-    # z = z_object.z
-    # periods = 1./z_object.freq
-    # else:
-    z = z_array
-    periods = periods
-
-    dimensions = MTge.dimensionality(z)
-    angles = MTge.strike_angle(z)
-
-    # reduce actual Z by the 3D layers:
-    z2 = z[np.where(dimensions != 3)[0]]
-    angles2 = angles[np.where(dimensions != 3)[0]]
-    periods2 = periods[np.where(dimensions != 3)[0]]
+    z, periods = _get_z_periods(z_object, z_array, periods)
 
-    lo_nb_max = []
-    lo_nb_min = []
+    dimensions = MTge.dimensionality(z_array=z)
 
     rotsteps = 360
     rotangles = np.arange(rotsteps) * 180. / rotsteps
-
-    for i, per in enumerate(periods2):
-        z_curr = z2[i]
-        temp_vals = np.zeros((rotsteps, 4))
-
-        for jj, d in enumerate(rotangles):
-            new_z = MTcc.rotatematrix_incl_errors(z_curr, d)[0]
-            # print i,per,jj,d
-
-            res = MTz.z2resphi(new_z, per)[0]
-            phs = MTz.z2resphi(new_z, per)[1]
-
-            te_rho, te_depth = rhophi2rhodepth(res[0, 1], phs[0, 1], per)
-            tm_rho, tm_depth = rhophi2rhodepth(res[1, 0], phs[1, 0], per)
-
-            temp_vals[jj, 0] = te_depth
-            temp_vals[jj, 1] = te_rho
-            temp_vals[jj, 2] = tm_depth
-            temp_vals[jj, 3] = tm_rho
-
-        column = (np.argmax([np.max(temp_vals[:, 1]),
-                             np.max(temp_vals[:, 3])])) * 2 + 1
-
-        maxidx = np.argmax(temp_vals[:, column])
-        max_rho = temp_vals[maxidx, column]
-        max_depth = temp_vals[maxidx, column - 1]
+    cphi = np.cos(np.radians(rotangles))
+    sphi = np.sin(np.radians(rotangles))
+    c2 = cphi ** 2
+    s2 = sphi ** 2
+    cs = cphi * sphi
+
+    z_flat = z.reshape(-1, 2, 2)
+    per_flat = periods.reshape(-1, 1)
+    nb_max = np.full((z_flat.shape[0], 3), np.nan)
+    nb_min = np.full((z_flat.shape[0], 2), np.nan)
+
+    # leave out the 3D layers:
+    index_2d = np.nonzero(dimensions.reshape(-1) != 3)[0]
+    block = max(1, _ROTATION_BLOCK // rotsteps)
+    for start in range(0, len(index_2d), block):
+        idx = index_2d[start:start + block]
+        zz = z_flat[idx, :, :, np.newaxis]
+        per = per_flat[idx]
+        rows = np.arange(len(idx))
+
+        # off-diagonal elements of Z rotated by all angles at once
+        diag = (zz[:, 1, 1] - zz[:, 0, 0]) * cs
+        te_rho, te_depth = _nb_from_z(c2 * zz[:, 0, 1] - s2 * zz[:, 1, 0] +
+                                      diag, per)
+        tm_rho, tm_depth = _nb_from_z(c2 * zz[:, 1, 0] - s2 * zz[:, 0, 1] +
+                                      diag, per)
+
+        rho_peaks = np.array([np.max(te_rho, axis=-1),
+                              np.max(tm_rho, axis=-1)])
+        max_is_te = (np.argmax(rho_peaks, axis=0) == 0)[:, np.newaxis]
+
+        max_rho = np.where(max_is_te, te_rho, tm_rho)
+        maxidx = np.argmax(max_rho, axis=-1)
         max_ang = rotangles[maxidx]
+        nb_max[idx, 0] = np.where(max_is_te, te_depth, tm_depth)[rows, maxidx]
+        nb_max[idx, 1] = max_rho[rows, maxidx]
+        nb_max[idx, 2] = max_ang
 
-        # alternative 1
-        min_column = (np.argmin([np.max(temp_vals[:, 1]),
-                                 np.max(temp_vals[:, 3])])) * 2 + 1
-        if max_ang <= 90:
-            min_ang = max_ang + 90
-        else:
-            min_ang = max_ang - 90
-        minidx = np.argmin(np.abs(rotangles - min_ang))
-
-        min_rho = temp_vals[minidx, min_column]
-        min_depth = temp_vals[minidx, min_column - 1]
+        # the same mode rotated by 90 degrees is the other mode at the
+        # angle of the maximum
+        min_ang = np.where(max_ang <= 90, max_ang + 90, max_ang - 90)
+        minidx = np.argmin(np.abs(rotangles - min_ang[:, np.newaxis]),
+                           axis=-1)
+        nb_min[idx, 0] = np.where(max_is_te, te_depth,
+                                  tm_depth)[rows, minidx]
+        nb_min[idx, 1] = max_rho[rows, minidx]
 
-        lo_nb_max.append([max_depth, max_rho, max_ang])
-        lo_nb_min.append([min_depth, min_rho])
+    return (nb_max.reshape(periods.shape + (3,)),
+            nb_min.reshape(periods.shape + (2,)))
 
-    return np.array(lo_nb_max), np.array(lo_nb_min)
 
-
-def interpolate_strike_angles(angles, in_periods):
+def interpolate_strike_angles(angles, in_periods, mask=None):
     """
-    expect 2 arrays
+    expect 2 arrays of shape (nf) or (n_station, nf), NaN angles mark 1D
+    layers
 
     1. sort ascending by periods
-    2. loop over angles to find 'nan' values (i.e. 1D layers)
+    2. find 'nan' values (i.e. 1D layers)
     3. determine linear interpolation between bounding 2D strike angles
     4. if 1D on top or bottom, set to 0 degrees
+
+    Entries where the optional boolean mask is False (e.g. 3D layers) are
+    left out of the interpolation and returned as NaN.
     """
 
-    new_angles = copy.copy(angles)
+    angles = np.asarray(angles, dtype='float')
+    periods = np.broadcast_to(np.asarray(in_periods, dtype='float'),
+                              angles.shape)
+    if mask is None:
+        mask = np.ones(angles.shape, dtype=bool)
+    mask = np.broadcast_to(mask, angles.shape)
 
     # sort in ascending order:
-    orig_sorting = np.argsort(in_periods)
-    back_sorting = np.argsort(orig_sorting)
-    angles = angles[orig_sorting]
-    periods = in_periods[orig_sorting]
-
-    in_line = 0
-    while in_line < len(angles):
-        curr_per = periods[in_line]
-        curr_ang = angles[in_line]
-        if np.isnan(curr_ang):
-            if in_line in [0, len(angles) - 1]:
-                new_angles[in_line] = 0.
-                in_line += 1
-                continue
-
-            # otherwise:
-            # use value before current one:
-            ang1 = new_angles[in_line - 1]
-            per1 = periods[in_line - 1]
-            # check for next non-nan:
-            ang2 = None
-
-            jj = in_line
-            print in_line
-            while jj < len(angles):
-                jj += 1
-                if not np.isnan(angles[jj]):
-                    per2 = periods[jj]
-                    ang2 = angles[jj]
-                    break
-            # catch case of all nan:
-            if ang2 is None:
-                ang2 = 0.
-
-            delta_per = per2 - per1
-            delta_ang = ang2 - ang1
-            per_step = periods[in_line] - per1
-            new_angles[in_line] = ang1 + delta_ang / delta_per * per_step
-            print jj
-
-        in_line += 1
+    per_rows, rows, order = _sort_rows(periods)
+    periods = per_rows[rows, order]
+    sorted_angles = angles.reshape(per_rows.shape)[rows, order]
+    sorted_mask = mask.reshape(per_rows.shape)[rows, order]
+
+    # 1D on top or bottom is set to 0 degrees
+    n_per = periods.shape[-1]
+    has_any = sorted_mask.any(axis=-1)
+    top = np.argmax(sorted_mask, axis=-1)[has_any]
+    bottom = n_per - 1 - np.argmax(sorted_mask[:, ::-1], axis=-1)[has_any]
+    for end in (top, bottom):
+        ends = sorted_angles[rows[has_any, 0], end]
+        sorted_angles[rows[has_any, 0], end] = np.nan_to_num(ends)
+
+    new_angles = _interpolate_sorted(
+        sorted_angles, periods, sorted_mask & ~np.isnan(sorted_angles), 0.)
+    new_angles[~sorted_mask] = np.nan
 
     # asserting correct order (same as input) of the angles:
-    return new_angles[back_sorting]
+    out = np.empty(per_rows.shape)
+    out[rows, order] = new_angles
+    return out.reshape(angles.shape)
@@ -69,6 +69,8 @@ class PhaseTensor(object):
         self._z_err = z_err_array
         self._freq = freq
         self.rotation_angle = pt_rot
+        # attributes derived from pt and pterr, computed on first access
+        self._derived = {}
 
         # if a z object is input be sure to set the z and z_err so that the
         # pt will be calculated
@@ -117,6 +119,7 @@ class PhaseTensor(object):
 
         """
         self._pt = pt_array
+        self._clear_cache()
 
         # check for dimensions
         if pt_array is not None:
@@ -191,6 +194,7 @@ class PhaseTensor(object):
 
         """
         self._pterr = pterr_array
+        self._clear_cache()
 
         # check dimensions
         if pterr_array is not None:
@@ -213,10 +217,10 @@ class PhaseTensor(object):
                                             'array! Invalid dimensions')
 
             if len(pterr_array.shape) == 3:
-                self.pterr = pterr_array
+                self._pterr = pterr_array
             else:
-                self.pterr = np.zeros((1, self.pt.shape[0], self.pt.shape[1]))
-                self.pterr[0] = pterr_array
+                self._pterr = np.zeros((1, self.pt.shape[0], self.pt.shape[1]))
+                self._pterr[0] = pterr_array
 
         else:
             pass
@@ -266,36 +270,36 @@ class PhaseTensor(object):
         self._z = z_object.z
         self._z_err = z_object.z_err
         self._freq = z_object.freq
+        self._compute_pt()
+
+        self.rotation_angle = z_object.rotation_angle
+
+    def _compute_pt(self):
+        """
+            Compute pt and pterr of all frequencies from the Z array and, if
+            set, the Z-error array.  pt and pterr are zeros where the real
+            part of Z is singular.
+        """
+        self._clear_cache()
         self._pt = np.zeros_like(self._z, dtype=np.float)
         self._pterr = np.zeros_like(self._z, dtype=np.float)
+        if self._z is None:
+            return
 
-        if self._z_err is not None:
-            for idx_f in range(len(self._z)):
-                try:
-                    self._pt[idx_f], self._pterr[idx_f] = z2pt(self._z[idx_f],
-                                                               self._z_err[idx_f])
-                except MTex.MTpyError_PT:
-                    try:
-                        print 'Singular Matrix at {0:.5g} Hz'.format(
-                            self._freq[idx_f])
-                    except AttributeError:
-                        print 'Computed singular matrix'
-                        print '  --> pt[{0}]=np.zeros((2,2))'.format(idx_f)
-
-        # --> if there is not error to the impedance tensor
-        else:
-            for idx_f in range(len(self._z)):
-                try:
-                    self._pt[idx_f] = z2pt(self._z[idx_f])[0]
-                except MTex.MTpyError_PT:
-                    try:
-                        print 'Singular Matrix at {0:.5g}'.format(
-                            self._freq[idx_f])
-                    except AttributeError:
-                        print 'Computed singular matrix'
-                        print '  --> pt[{0}]=np.zeros((2,2))'.format(idx_f)
+        pt_array, pterr_array, singular = z2pt_batch(self._z, self._z_err)
+        self._pt[:] = pt_array
+        if pterr_array is not None:
+            self._pterr[:] = pterr_array
 
-        self.rotation_angle = z_object.rotation_angle
+        # all zero tensors are no data, not singular matrices
+        no_data = np.all(self._z == 0, axis=(-2, -1))
+        for idx_f in np.nonzero(singular & ~no_data)[0]:
+            try:
+                print 'Singular Matrix at {0:.5g} Hz'.format(
+                    self._freq[idx_f])
+            except (TypeError, IndexError):
+                print 'Computed singular matrix'
+                print '  --> pt[{0}]=np.zeros((2,2))'.format(idx_f)
 
     # def _get_z_object(self):
     #     z_object = MTz.Z(z_array=self._z, z_err_array=self._z_err)
@@ -314,34 +318,7 @@ class PhaseTensor(object):
         """
 
         self._z = z_array
-        self._pt = np.zeros_like(self._z, dtype=np.float)
-        self._pterr = np.zeros_like(self._z, dtype=np.float)
-
-        if self._z_err is not None and self._z is not None:
-            for idx_f in range(len(self._z)):
-                try:
-                    self._pt[idx_f], self._pterr[idx_f] = z2pt(self._z[idx_f],
-                                                               self._z_err[idx_f])
-                except MTex.MTpyError_PT:
-                    try:
-                        print 'Singular Matrix at {0:.5g} Hz'.format(
-                            self._freq[idx_f])
-                    except AttributeError:
-                        print 'Computed singular matrix'
-                        print '  --> pt[{0}]=np.zeros((2,2))'.format(idx_f)
-
-        # --> if there is not error to the impedance tensor
-        elif self._z is not None:
-            for idx_f in range(len(self._z)):
-                try:
-                    self._pt[idx_f] = z2pt(self._z[idx_f])[0]
-                except MTex.MTpyError_PT:
-                    try:
-                        print 'Singular Matrix at {0:.5g}'.format(
-                            self._freq[idx_f])
-                    except AttributeError:
-                        print 'Computed singular matrix'
-                        print '  --> pt[{0}]=np.zeros((2,2))'.format(idx_f)
+        self._compute_pt()
 
     # def _get_z(self):
     #     return self._z
@@ -356,38 +333,12 @@ class PhaseTensor(object):
         """
 
         self._z_err = z_err_array
-        if self._z.shape != self._z_err.shape:
+        if self._z_err is not None and self._z.shape != self._z_err.shape:
             print 'z and z_err are not the not the same shape, setting ' + \
                   'z_err to None'
+            self._z_err = None
 
-        self._pt = np.zeros_like(self._z, dtype=np.float)
-        self._pterr = np.zeros_like(self._z, dtype=np.float)
-
-        if self._z_err is not None:
-            for idx_f in range(len(self._z)):
-                try:
-                    self.pt[idx_f], self.pterr[idx_f] = z2pt(self._z[idx_f],
-                                                             self._z_err[idx_f])
-                except MTex.MTpyError_PT:
-                    try:
-                        print 'Singular Matrix at {0:.5g} Hz'.format(
-                            self._freq[idx_f])
-                    except AttributeError:
-                        print 'Computed singular matrix'
-                        print '  --> pt[{0}]=np.zeros((2,2))'.format(idx_f)
-
-            # --> if there is not error to the impedance tensor
-            else:
-                for idx_f in range(len(self.z)):
-                    try:
-                        self._pt[idx_f] = z2pt(self._z[idx_f])[0]
-                    except MTex.MTpyError_PT:
-                        try:
-                            print 'Singular Matrix at {0:.5g}'.format(
-                                self._freq[idx_f])
-                        except AttributeError:
-                            print 'Computed singular matrix'
-                            print '  --> pt[{0}]=np.zeros((2,2))'.format(idx_f)
+        self._compute_pt()
 
     # def _get_z_err(self):
     #     return self._z_err
@@ -398,6 +349,51 @@ class PhaseTensor(object):
     # ==========================================================================
     #  define get methods for read only properties
     # ==========================================================================
+    # -----derived quantities-------------------------------------------------
+    def _clear_cache(self):
+        """
+        Forget the attributes derived from pt and pterr (trace, alpha, beta,
+        skew, azimuth, ellipticity, det, phimin, phimax and the invariants).
+        They are recomputed when they are accessed next.
+
+        This is done automatically when pt or pterr are set, call it after
+        changing those arrays in place.
+        """
+        self._derived = {}
+
+    def _get_attributes(self):
+        """
+            Return all attributes of PT and their uncertainties as a record
+            array with one entry per frequency, see pt_attributes.  It is
+            computed in one go on first access.  The errors are NaN if
+            there is no pterr.
+        """
+        if self.pt is None:
+            return None
+
+        if 'attributes' not in self._derived:
+            self._derived['attributes'] = pt_attributes(self.pt, self.pterr)
+
+        return self._derived['attributes']
+
+    attributes = property(_get_attributes,
+                          doc="record array of all PT attributes and errors")
+
+    def _get_attribute(self, name):
+        """
+            Return [value, error] of an attribute, the error is None if
+            there is no pterr.
+        """
+        if self.pt is None:
+            return None, None
+
+        attributes = self._get_attributes()
+        err = None
+        if self.pterr is not None:
+            err = np.array(attributes[name + '_err'])
+
+        return [np.array(attributes[name]), err]
+
     # ---invariants-------------------------------------------------------------
     def _get_invariants(self):
         """
@@ -410,13 +406,8 @@ class PhaseTensor(object):
             return None
 
         inv_dict = {}
-        inv_dict['trace'] = self.trace[0]
-        inv_dict['skew'] = self.skew[0]
-        inv_dict['det'] = self.det[0]
-
-        inv_dict['phimax'] = self.phimax[0]
-        inv_dict['phimin'] = self.phimin[0]
-        inv_dict['beta'] = self.beta[0]
+        for key in ['trace', 'skew', 'det', 'phimax', 'phimin', 'beta']:
+            inv_dict[key] = self._get_attribute(key)[0]
 
         return inv_dict
 
@@ -432,17 +423,7 @@ class PhaseTensor(object):
             - Error of Trace(PT) - Numpy array
 
         """
-        if self.pt is None:
-            return None, None
-
-        tr = np.array([np.trace(i) for i in self.pt])
-
-        tr_err = None
-        if self.pterr is not None:
-            tr_err = np.zeros_like(tr)
-            tr_err[:] = self.pterr[:, 0, 0] + self.pterr[:, 1, 1]
-
-        return [tr, tr_err]
+        return self._get_attribute('trace')
 
     trace = property(_get_trace, doc="")
 
@@ -457,25 +438,7 @@ class PhaseTensor(object):
             - Error of Alpha - Numpy array
 
         """
-
-        if self.pt is None:
-            return None, None
-
-        alpha = np.degrees(0.5 * np.arctan2(self.pt[:, 0, 1] + self.pt[:, 1, 0],
-                                            self.pt[:, 0, 0] - self.pt[:, 1, 1]))
-
-        alphaerr = None
-        if self.pterr is not None:
-            alphaerr = np.zeros_like(alpha)
-            y = self.pt[:, 0, 1] + self.pt[:, 1, 0]
-            yerr = np.sqrt(self.pterr[:, 0, 1] ** 2 + self.pterr[:, 1, 0] ** 2)
-            x = self.pt[:, 0, 0] - self.pt[:, 1, 1]
-            xerr = np.sqrt(self.pterr[:, 0, 0] ** 2 + self.pterr[:, 1, 1] ** 2)
-
-            alphaerr[:] = 0.5 / (x ** 2 + y ** 2) * np.sqrt(y ** 2 * xerr ** 2 +
-                                                            x ** 2 * yerr ** 2)
-
-        return [alpha, alphaerr]
+        return self._get_attribute('alpha')
 
     alpha = property(_get_alpha, doc="")
 
@@ -490,27 +453,7 @@ class PhaseTensor(object):
             - Error of Beta - Numpy array
 
         """
-
-        if self.pt is None:
-            return None, None
-
-        beta = np.degrees(0.5 * np.arctan2(self.pt[:, 0, 1] - self.pt[:, 1, 0],
-                                           self.pt[:, 0, 0] + self.pt[:, 1, 1]))
-
-        betaerr = None
-
-        if self.pterr is not None:
-            betaerr = np.zeros_like(beta)
-
-            y = self.pt[:, 0, 1] - self.pt[:, 1, 0]
-            yerr = np.sqrt(self.pterr[:, 0, 1] ** 2 + self.pterr[:, 1, 0] ** 2)
-            x = self.pt[:, 0, 0] + self.pt[:, 1, 1]
-            xerr = np.sqrt(self.pterr[:, 0, 0] ** 2 + self.pterr[:, 1, 1] ** 2)
-
-            betaerr[:] = 0.5 / (x ** 2 + y ** 2) * np.sqrt(y ** 2 * xerr ** 2 +
-                                                           x ** 2 * yerr ** 2)
-
-        return [beta, betaerr]
+        return self._get_attribute('beta')
 
     beta = property(_get_beta, doc="")
 
@@ -524,17 +467,7 @@ class PhaseTensor(object):
             - Error of Skew(PT) - Numpy array
 
         """
-        if self.pt is None:
-            return None, None
-
-        skew = np.array([i[0, 1] - i[1, 0] for i in self.pt])
-
-        skewerr = None
-        if self.pterr is not None:
-            skewerr = np.zeros_like(skew)
-            skewerr[:] = self.pterr[:, 0, 1] + self.pterr[:, 1, 0]
-
-        return [skew, skewerr]
+        return self._get_attribute('skew')
 
     skew = property(_get_skew, doc="Skew angle in degrees")
 
@@ -554,18 +487,7 @@ class PhaseTensor(object):
                               azimuth angle errors in degrees
 
         """
-
-        if self.pt is None:
-            return None, None
-
-        az = self.alpha[0] - self.beta[0]
-
-        if self.pterr is not None:
-            az_err = np.sqrt(self.alpha[1] + self.beta[1])
-        else:
-            az_err = None
-
-        return [az, az_err]
+        return self._get_attribute('azimuth')
 
     azimuth = property(_get_azimuth,
                        doc="Azimuth angle (deg) related to geoelectric strike")
@@ -584,21 +506,7 @@ class PhaseTensor(object):
                                   ellipticity errors
 
         """
-
-        if self.pt is None:
-            return None, None
-
-        ellip = (self.phimax[0] - self.phimin[0]) / \
-            (self.phimax[0] + self.phimin[0])
-
-        if self.pterr is not None:
-            ellip_err = ellip * np.sqrt(self.phimax[1] + self.phimin[1]) * \
-                np.sqrt((1 / (self.phimax[0] - self.phimin[0])) ** 2 +
-                        (1 / (self.phimax[0] + self.phimin[0])) ** 2)
-        else:
-            ellip_err = None
-
-        return [ellip, ellip_err]
+        return self._get_attribute('ellipticity')
 
     ellipticity = property(_get_ellipticity,
                            doc="Ellipticity of phase tensor related to " +
@@ -614,20 +522,7 @@ class PhaseTensor(object):
             - Error of Det(PT) - Numpy array
 
         """
-        if self.pt is None:
-            return None, None
-
-        det_phi = np.array([np.linalg.det(i) for i in self.pt])
-
-        det_phi_err = None
-        if self.pterr is not None:
-            det_phi_err = np.zeros_like(det_phi)
-            det_phi_err[:] = np.abs(self.pt[:, 1, 1] * self.pterr[:, 0, 0]) + \
-                np.abs(self.pt[:, 0, 0] * self.pterr[:, 1, 1]) + \
-                np.abs(self.pt[:, 0, 1] * self.pterr[:, 1, 0]) + \
-                np.abs(self.pt[:, 1, 0] * self.pterr[:, 0, 1])
-
-        return [det_phi, det_phi_err]
+        return self._get_attribute('det')
 
     det = property(_get_det, doc="")
 
@@ -640,49 +535,26 @@ class PhaseTensor(object):
                         Pi1 = 0.5 * sqrt(PT[0,0]-PT[1,1])**2 + (PT[0,1]+PT[1,0])**2)
 
             Output:
-            - Phi_min - Numpy array
-            - Error of Phi_min - Numpy array
+            - Pi1 - Numpy array
+            - Error of Pi1 - Numpy array
 
         """
-        # after bibby et al. 2005
-
-        pi1 = 0.5 * np.sqrt((self.pt[:, 0, 0] - self.pt[:, 1, 1]) ** 2 +
-                            (self.pt[:, 0, 1] + self.pt[:, 1, 0]) ** 2)
-        pi1err = None
-
-        if self.pterr is not None:
-            pi1err = 1. / pi1 * np.sqrt((self.pt[:, 0, 0] - self.pt[:, 1, 1]) ** 2 *
-                                        (self.pterr[:, 0, 0] ** 2 + self.pterr[:, 1, 1] ** 2) +
-                                        (self.pt[:, 0, 1] + self.pt[:, 1, 0]) ** 2 *
-                                        (self.pterr[:, 0, 1] ** 2 + self.pterr[:, 1, 0] ** 2))
-        return pi1, pi1err
+        return tuple(self._get_attribute('pi1'))
 
     # ---principle component 2----------------------------------------------
     def _pi2(self):
         """
-            Return Pi1 (incl. uncertainties).
+            Return Pi2 (incl. uncertainties).
 
-            Pi1 is calculated according to Bibby et al. 2005:
-                        Pi1 = 0.5 * sqrt(PT[0,0]+PT[1,1])**2 + (PT[0,1]-PT[1,0])**2)
+            Pi2 is calculated according to Bibby et al. 2005:
+                        Pi2 = 0.5 * sqrt(PT[0,0]+PT[1,1])**2 + (PT[0,1]-PT[1,0])**2)
 
             Output:
-            - Phi_min - Numpy array
-            - Error of Phi_min - Numpy array
+            - Pi2 - Numpy array
+            - Error of Pi2 - Numpy array
 
         """
-        # after bibby et al. 2005
-
-        pi2 = 0.5 * np.sqrt((self.pt[:, 0, 0] + self.pt[:, 1, 1]) ** 2 +
-                            (self.pt[:, 0, 1] - self.pt[:, 1, 0]) ** 2)
-        pi2err = None
-
-        if self.pterr is not None:
-            pi2err = 1. / pi2 * np.sqrt((self.pt[:, 0, 0] + self.pt[:, 1, 1]) ** 2 *
-                                        (self.pterr[:, 0, 0] ** 2 + self.pterr[:, 1, 1] ** 2) +
-                                        (self.pt[:, 0, 1] - self.pt[:, 1, 0]) ** 2 *
-                                        (self.pterr[:, 0, 1] ** 2 + self.pterr[:, 1, 0] ** 2))
-
-        return pi2, pi2err
+        return tuple(self._get_attribute('pi2'))
 
     # ---phimin----------------------------------------------
     def _get_phimin(self):
@@ -697,20 +569,7 @@ class PhaseTensor(object):
             - Error of Phi_min - Numpy array
 
         """
-
-        if self.pt is None:
-            return None, None
-
-        phimin = self._pi2()[0] - self._pi1()[0]
-
-        phiminerr = None
-        if self.pterr is not None:
-            phiminerr = np.sqrt(self._pi2()[1] ** 2 + self._pi1()[1] ** 2)
-
-            return [np.degrees(np.arctan(phimin)),
-                    np.degrees(np.arctan(phiminerr))]
-        else:
-            return [np.degrees(np.arctan(phimin)), None]
+        return self._get_attribute('phimin')
 
     phimin = property(_get_phimin, doc=" Minimum phase in degrees")
 
@@ -726,20 +585,7 @@ class PhaseTensor(object):
             - Error of Phi_max - Numpy array
 
         """
-
-        if self.pt is None:
-            return None, None
-
-        phimax = self._pi2()[0] + self._pi1()[0]
-
-        phimaxerr = None
-        if self.pterr is not None:
-            phimaxerr = np.sqrt(self._pi2()[1] ** 2 + self._pi1()[1] ** 2)
-
-            return [np.degrees(np.arctan(phimax)),
-                    np.degrees(np.arctan(phimaxerr))]
-        else:
-            return [np.degrees(np.arctan(phimax)), None]
+        return self._get_attribute('phimax')
 
     phimax = property(_get_phimax, doc="Maximum phase in degrees")
 
@@ -799,25 +645,16 @@ class PhaseTensor(object):
             self.rotation_angle = 0.
             return
 
-        pt_rot = copy.copy(self._pt)
-        pterr_rot = copy.copy(self._pterr)
-
-        for idx_freq in range(len(self._pt)):
+        angles = np.array(lo_angles, dtype='float')
+        angles[np.isnan(angles)] = 0.
 
-            angle = lo_angles[idx_freq]
-            if np.isnan(angle):
-                angle = 0.
-
-            if self.pterr is not None:
-                pt_rot[idx_freq], pterr_rot[idx_freq] = MTcc.rotatematrix_incl_errors(self.pt[idx_freq, :, :], angle,
-                                                                                      self.pterr[idx_freq, :, :])
-            else:
-                pt_rot[idx_freq], pterr_rot = MTcc.rotatematrix_incl_errors(
-                    self.pt[idx_freq, :, :], angle)
+        pt_rot, pterr_rot = MTcc.rotatematrices_incl_errors(self.pt, angles,
+                                                            self.pterr)
 
         # --> set the rotated tensors as the current attributes
         self._pt = pt_rot
         self._pterr = pterr_rot
+        self._clear_cache()
 
     # ---only 1d----------------------------------------------
     def _get_only1d(self):
@@ -833,14 +670,11 @@ class PhaseTensor(object):
             return None
 
         pt1d = copy.copy(self._pt)
-
-        for i in range(len(pt1d)):
-            pt1d[i, 0, 1] = 0
-            pt1d[i, 1, 0] = 0
-
-            mean1d = 0.5 * (pt1d[i, 0, 0] + pt1d[i, 1, 1])
-            pt1d[i, 0, 0] = mean1d
-            pt1d[i, 1, 1] = mean1d
+        mean1d = 0.5 * (pt1d[:, 0, 0] + pt1d[:, 1, 1])
+        pt1d[:, 0, 1] = 0
+        pt1d[:, 1, 0] = 0
+        pt1d[:, 0, 0] = mean1d
+        pt1d[:, 1, 1] = mean1d
 
         return pt1d
 
@@ -857,13 +691,10 @@ class PhaseTensor(object):
             return None
 
         pt2d = copy.copy(self._pt)
-
-        for i in range(len(pt2d)):
-            pt2d[i, 0, 1] = 0
-            pt2d[i, 1, 0] = 0
-
-            pt2d[i, 0, 0] = self.phimax[0][i]
-            pt2d[i, 1, 1] = self.phimin[0][i]
+        pt2d[:, 0, 1] = 0
+        pt2d[:, 1, 0] = 0
+        pt2d[:, 0, 0] = self.phimax[0]
+        pt2d[:, 1, 1] = self.phimin[0]
 
         return pt2d
 
@@ -924,133 +755,60 @@ class ResidualPhaseTensor():
         pt2 = pt_o2.pt
         self.freq = pt_o1.freq
 
-        # --> compute residual phase tensor
-        if pt1 is not None and pt2 is not None:
-            if pt1.dtype not in [float, int]:
-                raise ValueError
-            if pt2.dtype not in [float, int]:
-                raise ValueError
-            if not pt1.shape == pt2.shape:
-                raise MTex.MTpyError_PT('PT arrays not the same shape')
-            if (not len(pt1.shape) in [2, 3]):
-                raise MTex.MTpyError_PT('PT array is not a valid shape')
-
-            if len(pt1.shape) == 3:
-                self.rpt = np.zeros_like(pt1)
-
-                for idx in range(len(pt1)):
-                    try:
-                        self.rpt[idx] = np.eye(2) - np.dot(np.matrix(pt1[idx]).I,
-                                                           np.matrix(pt2[idx]))
-                    except np.linalg.LinAlgError:
-                        print 'Singular matrix at index {0}, frequency {1:.5g}'.format(idx, self.freq[idx])
-                        print 'Setting residual PT to zeros. '
-                        self.rpt[idx] = np.zeros((2, 2))
-
-                self._pt1 = pt1
-                self._pt2 = pt2
-
-            else:
-                self.rpt = np.zeros((1, 2, 2))
-                try:  # FZ: what is idx below?
-                    self.rpt[idx] = np.eye(2) - np.dot(np.matrix(pt1).I,
-                                                       np.matrix(pt2))
-                except np.linalg.LinAlgError:
-                    print 'Singular matrix at frequency {0:.5g}'.format(self.freq)
-                    print 'Setting residual PT to zeros. '
-                self.rpt[0] = np.eye(2) - np.dot(np.matrix(pt1).I,
-                                                 np.matrix(pt2))
-
-                self._pt1 = np.zeros((1, 2, 2))
-                self._pt1[0] = pt1
-                self._pt2 = np.zeros((1, 2, 2))
-                self._pt2[0] = pt2
-
-        else:
+        if pt1 is None or pt2 is None:
             print ('Could not determine ResPT - both PhaseTensor objects must'
                    'contain PT arrays of the same shape')
+            self.residual_pt = PhaseTensor(pt_array=self.rpt,
+                                           pterr_array=self.rpterr,
+                                           freq=self.freq)
+            return
+
+        # --> compute residual phase tensor
+        if pt1.dtype not in [float, int]:
+            raise ValueError
+        if pt2.dtype not in [float, int]:
+            raise ValueError
+        if not pt1.shape == pt2.shape:
+            raise MTex.MTpyError_PT('PT arrays not the same shape')
+        if (not len(pt1.shape) in [2, 3]):
+            raise MTex.MTpyError_PT('PT array is not a valid shape')
 
-        # --> compute residual error
         pt1err = pt_o1.pterr
         pt2err = pt_o2.pterr
-
         if pt1err is not None and pt2err is not None:
-            self.rpterr = np.zeros(self.rpt.shape)
-            try:
-                if (pt1err.dtype not in [float, int]) or \
-                        (pt2err.dtype not in [float, int]):
-                    raise
-                if not pt1err.shape == pt2err.shape:
-                    raise
-                if (not len(pt1err.shape) in [2, 3]):
-                    raise
-                if self.rpterr is not None:
-                    if self.rpterr.shape != pt1err.shape:
-                        raise
-
-                if len(pt1err.shape) == 3:
-                    self.rpterr = np.zeros((len(pt1), 2, 2))
-
-                    for idx in range(len(pt1err)):
-                        matrix1 = pt1[idx]
-                        matrix1err = pt1err[idx]
-                        matrix2, matrix2err = MTcc.invertmatrix_incl_errors(
-                            pt2[idx], inmatrix_err=pt2err[idx])
-
-                        summand1, err1 = MTcc.multiplymatrices_incl_errors(
-                            matrix2, matrix1,
-                            inmatrix1_err=matrix2err,
-                            inmatrix2_err=matrix1err)
-                        summand2, err2 = MTcc.multiplymatrices_incl_errors(
-                            matrix1, matrix2,
-                            inmatrix1_err=matrix1err,
-                            inmatrix2_err=matrix2err)
-
-                        self.rpterr[idx] = np.sqrt(
-                            0.25 * err1 ** 2 + 0.25 * err2 ** 2)
-
-                    self._pterr1 = pt1err
-                    self._pterr2 = pt2err
-
-                else:
-                    self.rpterr = np.zeros((1, 2, 2))
-                    self.rpterr[0] = np.eye(2) - 0.5 * np.array(
-                        np.dot(np.matrix(pt2).I, np.matrix(pt1))
-                        + np.dot(np.matrix(pt1), np.matrix(pt2).I))
-                    matrix1 = pt1
-                    matrix1err = pt1err
-                    matrix2, matrix2err = MTcc.invertmatrix_incl_errors(
-                        pt2, inmatrix_err=pt2err)
-
-                    summand1, err1 = MTcc.multiplymatrices_incl_errors(
-                        matrix2, matrix1,
-                        inmatrix1_err=matrix2err,
-                        inmatrix2_err=matrix1err)
-                    summand2, err2 = MTcc.multiplymatrices_incl_errors(
-                        matrix1, matrix2,
-                        inmatrix1_err=matrix1err,
-                        inmatrix2_err=matrix2err)
-
-                    self.rpterr = np.sqrt(0.25 * err1 ** 2 + 0.25 * err2 ** 2)
-
-                    self._pt1err = np.zeros((1, 2, 2))
-                    self._pt1err[0] = pt1err
-                    self._pt2err = np.zeros((1, 2, 2))
-                    self._pt2err[0] = pt2err
-
-            except:
+            if (pt1err.dtype not in [float, int]) or \
+                    (pt2err.dtype not in [float, int]) or \
+                    pt1err.shape != pt1.shape or pt2err.shape != pt1.shape:
                 raise MTex.MTpyError_PT('ERROR - both PhaseTensor objects must'
                                         'contain PT-error arrays of the same shape')
-
         else:
             print ('Could not determine Residual PT uncertainties - both'
                    ' PhaseTensor objects must contain PT-error arrays of the'
                    'same shape')
+            pt1err = pt2err = None
+
+        # a single tensor is treated as one frequency
+        self._pt1 = pt1.reshape((-1, 2, 2))
+        self._pt2 = pt2.reshape((-1, 2, 2))
+        self._pt1err = None
+        self._pt2err = None
+        if pt1err is not None:
+            self._pt1err = pt1err.reshape((-1, 2, 2))
+            self._pt2err = pt2err.reshape((-1, 2, 2))
+
+        self.rpt, self.rpterr, attributes, singular = residual_pt_batch(
+            self._pt1, self._pt2, self._pt1err, self._pt2err)
+
+        for idx in np.nonzero(singular)[0]:
+            print 'Singular matrix at index {0}, frequency {1}'.format(
+                idx, self.freq[idx] if np.ndim(self.freq) else self.freq)
+            print 'Setting residual PT to zeros. '
 
         # --> make a pt object that is the residual phase tensor
         self.residual_pt = PhaseTensor(pt_array=self.rpt,
                                        pterr_array=self.rpterr,
                                        freq=self.freq)
+        self.residual_pt._derived['attributes'] = attributes
 
     def read_pts(self, pt1, pt2, pt1err=None, pt2err=None):
         """
@@ -1127,19 +885,132 @@ class ResidualPhaseTensor():
 
 # =======================================================================
 
+PT_ATTRIBUTES = ['trace', 'alpha', 'beta', 'skew', 'azimuth', 'ellipticity',
+                 'det', 'pi1', 'pi2', 'phimin', 'phimax']
+
+
+def pt_attributes(pt_array, pterr_array=None):
+    """
+        Calculate all attributes of Phase Tensors and their uncertainties in
+        one go.
+
+        Input:
+        - PT : (..., 2, 2) real valued Numpy array, e.g. (n_freq, 2, 2) or
+               (n_station, n_freq, 2, 2)
+
+        Optional:
+        - PT-error : (..., 2, 2) real valued Numpy array
+
+        Return:
+        - attributes : Numpy record array of shape PT.shape[:-2] with the
+                       fields of PT_ATTRIBUTES (trace, alpha, beta, skew,
+                       azimuth, ellipticity, det, pi1, pi2, phimin, phimax)
+                       and an error field for each, e.g. phimin_err.  The
+                       errors are NaN if no PT-error is given.
+
+        The angles are in degrees, the formulas are those of the
+        attributes of the PhaseTensor class (Caldwell et al. 2004, Bibby
+        et al. 2005).
+    """
+    pt_array = np.asarray(pt_array, dtype='float')
+    if pt_array.ndim < 2 or pt_array.shape[-2:] != (2, 2):
+        raise MTex.MTpyError_PT('Error - incorrect pt array: %s instead of '
+                                '(...,2,2)' % str(pt_array.shape))
+
+    p00, p01, p10, p11 = [pt_array[..., ii, jj]
+                          for ii, jj in [(0, 0), (0, 1), (1, 0), (1, 1)]]
+    # the differences and sums all attributes are built from
+    d_diag = p00 - p11
+    s_diag = p00 + p11
+    s_off = p01 + p10
+    d_off = p01 - p10
+
+    values = {}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values['trace'] = s_diag
+        values['skew'] = d_off
+        values['det'] = p00 * p11 - p01 * p10
+        alpha = np.degrees(0.5 * np.arctan2(s_off, d_diag))
+        beta = np.degrees(0.5 * np.arctan2(d_off, s_diag))
+        values['alpha'] = alpha
+        values['beta'] = beta
+        values['azimuth'] = alpha - beta
+
+        # after bibby et al. 2005
+        pi1 = 0.5 * np.sqrt(d_diag ** 2 + s_off ** 2)
+        pi2 = 0.5 * np.sqrt(s_diag ** 2 + d_off ** 2)
+        phimin = np.degrees(np.arctan(pi2 - pi1))
+        phimax = np.degrees(np.arctan(pi2 + pi1))
+        ellip = (phimax - phimin) / (phimax + phimin)
+        values.update(pi1=pi1, pi2=pi2, phimin=phimin, phimax=phimax,
+                      ellipticity=ellip)
+
+        if pterr_array is not None:
+            pterr_array = np.asarray(pterr_array, dtype='float')
+            if pterr_array.shape != pt_array.shape:
+                raise MTex.MTpyError_PT(
+                    'Error - pt-array and pt-err-array have different '
+                    'shape: %s;%s' % (str(pt_array.shape),
+                                      str(pterr_array.shape)))
+            e00, e01, e10, e11 = [pterr_array[..., ii, jj] for ii, jj in
+                                  [(0, 0), (0, 1), (1, 0), (1, 1)]]
+            err_diag = np.sqrt(e00 ** 2 + e11 ** 2)
+            err_off = np.sqrt(e01 ** 2 + e10 ** 2)
+
+            values['trace_err'] = e00 + e11
+            values['skew_err'] = e01 + e10
+            values['det_err'] = np.abs(p11 * e00) + np.abs(p00 * e11) + \
+                np.abs(p01 * e10) + np.abs(p10 * e01)
+            alpha_err = 0.5 / (d_diag ** 2 + s_off ** 2) * \
+                np.sqrt(s_off ** 2 * err_diag ** 2 +
+                        d_diag ** 2 * err_off ** 2)
+            beta_err = 0.5 / (s_diag ** 2 + d_off ** 2) * \
+                np.sqrt(d_off ** 2 * err_diag ** 2 +
+                        s_diag ** 2 * err_off ** 2)
+            values['alpha_err'] = alpha_err
+            values['beta_err'] = beta_err
+            values['azimuth_err'] = np.sqrt(alpha_err + beta_err)
+
+            pi1_err = 1. / pi1 * np.sqrt(d_diag ** 2 * err_diag ** 2 +
+                                         s_off ** 2 * err_off ** 2)
+            pi2_err = 1. / pi2 * np.sqrt(s_diag ** 2 * err_diag ** 2 +
+                                         d_off ** 2 * err_off ** 2)
+            # phimin and phimax have the same error
+            phi_err = np.degrees(np.arctan(np.sqrt(pi2_err ** 2 +
+                                                   pi1_err ** 2)))
+            values.update(pi1_err=pi1_err, pi2_err=pi2_err,
+                          phimin_err=phi_err, phimax_err=phi_err)
+            values['ellipticity_err'] = ellip * np.sqrt(2 * phi_err) * \
+                np.sqrt((1 / (phimax - phimin)) ** 2 +
+                        (1 / (phimax + phimin)) ** 2)
+
+    dtype = [(name + suffix, 'float') for name in PT_ATTRIBUTES
+             for suffix in ['', '_err']]
+    attributes = np.empty(pt_array.shape[:-2], dtype=dtype)
+    for name, _ in dtype:
+        # the errors are NaN without pterr
+        attributes[name] = values.get(name, np.nan)
+
+    return attributes.view(np.recarray)
+
+
 def z2pt(z_array, z_err_array=None):
     """
         Calculate Phase Tensor from Z array (incl. uncertainties)
 
         Input:
-        - Z : 2x2 complex valued Numpy array
+        - Z : 2x2 or nx2x2 complex valued Numpy array
 
         Optional:
-        - Z-error : 2x2 real valued Numpy array
+        - Z-error : 2x2 or nx2x2 real valued Numpy array
 
         Return:
-        - PT : 2x2 real valued Numpy array
-        - PT-error : 2x2 real valued Numpy array
+        - PT : 2x2 or nx2x2 real valued Numpy array
+        - PT-error : 2x2 or nx2x2 real valued Numpy array
+
+        A single singular matrix raises an MTpyError_PT, unless it is all
+        zeros.  Singular matrices of an nx2x2 array give zeros, see
+        z2pt_batch.
 
     """
     if z_array is not None:
@@ -1170,165 +1041,277 @@ def z2pt(z_array, z_err_array=None):
             raise MTex.MTpyError_PT('Error - z-array and z-err-array have different shape: %s;%s' % (
                 str(z_array.shape), str(z_err_array.shape)))
 
-    # for a single matrix as input:
-    if len(z_array.shape) == 2:
+    pt_array, pterr_array, singular = z2pt_batch(z_array, z_err_array)
 
-        pt_array = np.zeros((2, 2))
+    # a single singular matrix can only be converted if it is all zeros
+    if len(z_array.shape) == 2 and singular:
+        if np.linalg.norm(np.real(z_array)) != 0 or \
+                np.linalg.norm(np.imag(z_array)) != 0:
+            raise MTex.MTpyError_PT(
+                'Error - z-array contains a singular matrix, thus it cannot be converted into a PT!')
 
-        realz = np.real(z_array)
-        imagz = np.imag(z_array)
-        detreal = np.linalg.det(realz)
+    return pt_array, pterr_array
 
-        if detreal == 0:
-            if np.linalg.norm(realz) == 0 and np.linalg.norm(imagz) == 0:
-                pterr_array = np.zeros_like(pt_array)
-                if z_err_array is None:
-                    pterr_array = None
-                return pt_array, pterr_array
 
-            else:
-                raise MTex.MTpyError_PT(
-                    'Error - z-array contains a singular matrix, thus it cannot be converted into a PT!')
-
-        pt_array[0, 0] = realz[1, 1] * imagz[0, 0] - realz[0, 1] * imagz[1, 0]
-        pt_array[0, 1] = realz[1, 1] * imagz[0, 1] - realz[0, 1] * imagz[1, 1]
-        pt_array[1, 0] = realz[0, 0] * imagz[1, 0] - realz[1, 0] * imagz[0, 0]
-        pt_array[1, 1] = realz[0, 0] * imagz[1, 1] - realz[1, 0] * imagz[0, 1]
-
-        pt_array /= detreal
-
-        if z_err_array is None:
-            return pt_array, None
-
-        pterr_array = np.zeros_like(pt_array)
-
-        # Z entries are independent -> use Gaussian error propagation (squared
-        # sums/2-norm)
-        pterr_array[0, 0] = 1 / np.abs(detreal) * np.sqrt(
-            np.sum([np.abs(-pt_array[0, 0] * realz[1, 1] * z_err_array[0, 0]) ** 2,
-                    np.abs(
-                pt_array[
-                    0,
-                    0] *
-                realz[
-                    0,
-                    1] *
-                z_err_array[
-                    1,
-                    0]) ** 2,
-                    np.abs(((imagz[0, 0] * realz[1, 0] - realz[0, 0] * imagz[1, 0]) / np.abs(detreal) * realz[0, 0]) *
-                           z_err_array[0, 1]) ** 2,
-                    np.abs(((imagz[1, 0] * realz[0, 0] - realz[1, 0] * imagz[1, 1]) / np.abs(detreal) * realz[0, 1]) *
-                           z_err_array[1, 1]) ** 2,
-                    np.abs(realz[1, 1] * z_err_array[0, 0]) ** 2,
-                    np.abs(realz[0, 1] * z_err_array[1, 0]) ** 2]))
-
-        pterr_array[0, 1] = 1 / np.abs(detreal) * np.sqrt(
-            np.sum([np.abs(-pt_array[0, 1] * realz[1, 1] * z_err_array[0, 0]) ** 2,
-                    np.abs(
-                pt_array[
-                    0,
-                    1] *
-                realz[
-                    0,
-                    1] *
-                z_err_array[
-                    1,
-                    0]) ** 2,
-                    np.abs(((imagz[0, 1] * realz[1, 0] - realz[0, 0] * imagz[1, 1]) / np.abs(detreal) * realz[1, 1]) *
-                           z_err_array[0, 1]) ** 2,
-                    np.abs(((imagz[1, 1] * realz[0, 0] - realz[0, 1] * imagz[1, 0]) / np.abs(detreal) * realz[0, 1]) *
-                           z_err_array[1, 1]) ** 2,
-                    np.abs(realz[1, 1] * z_err_array[0, 1]) ** 2,
-                    np.abs(realz[0, 1] * z_err_array[1, 1]) ** 2]))
-
-        pterr_array[1, 0] = 1 / np.abs(detreal) * np.sqrt(
-            np.sum([np.abs(pt_array[1, 0] * realz[1, 0] * z_err_array[0, 1]) ** 2,
-                    np.abs(-pt_array[1, 0] * realz[0, 0]
-                           * z_err_array[1, 1]) ** 2,
-                    np.abs(((imagz[0, 0] * realz[1, 1] - realz[0, 1] * imagz[1, 1]) / np.abs(detreal) * realz[1, 0]) *
-                           z_err_array[0, 0]) ** 2,
-                    np.abs(((imagz[1, 0] * realz[0, 1] - realz[1, 1] * imagz[0, 0]) / np.abs(detreal) * realz[0, 0]) *
-                           z_err_array[0, 1]) ** 2,
-                    np.abs(realz[1, 0] * z_err_array[0, 0]) ** 2,
-                    np.abs(realz[0, 0] * z_err_array[1, 0]) ** 2]))
-
-        pterr_array[1, 1] = 1 / np.abs(detreal) * np.sqrt(
-            np.sum([np.abs(pt_array[1, 1] * realz[1, 0] * z_err_array[0, 1]) ** 2,
-                    np.abs(-pt_array[1, 1] * realz[0, 0]
-                           * z_err_array[1, 1]) ** 2,
-                    np.abs(((imagz[0, 1] * realz[1, 1] - realz[0, 1] * imagz[1, 1]) / np.abs(detreal) * realz[1, 0]) *
-                           z_err_array[0, 0]) ** 2,
-                    np.abs(((imagz[1, 1] * realz[0, 1] - realz[1, 1] * imagz[0, 1]) / np.abs(detreal) * realz[0, 0]) *
-                           z_err_array[0, 1]) ** 2,
-                    np.abs(- realz[1, 0] * z_err_array[0, 1]) ** 2,
-                    np.abs(realz[0, 0] * z_err_array[1, 1]) ** 2]))
-
-        return pt_array, pterr_array
-
-    # else:
-    pt_array = np.zeros((z_array.shape[0], 2, 2))
-
-    for idx_f in range(len(z_array)):
-
-        realz = np.real(z_array[idx_f])
-        imagz = np.imag(z_array[idx_f])
-
-        detreal = np.linalg.det(realz)
-        if detreal == 0:
-            raise MTex.MTpyError_Z('Warning - z-array no. {0} contains a singular matrix,'
-                                   ' thus it cannot be converted into a PT!'.format(idx_f))
-
-        pt_array[idx_f, 0, 0] = realz[1, 1] * \
-            imagz[0, 0] - realz[0, 1] * imagz[1, 0]
-        pt_array[idx_f, 0, 1] = realz[1, 1] * \
-            imagz[0, 1] - realz[0, 1] * imagz[1, 1]
-        pt_array[idx_f, 1, 0] = realz[0, 0] * \
-            imagz[1, 0] - realz[1, 0] * imagz[0, 0]
-        pt_array[idx_f, 1, 1] = realz[0, 0] * \
-            imagz[1, 1] - realz[1, 0] * imagz[0, 1]
-
-        pt_array /= detreal
-
-        if z_err_array is None:
-            return pt_array, pterr_array
-
-        pterr_array = np.zeros_like(pt_array)
-        pterr_array[idx_f, 0, 0] = 1 / detreal * (np.abs(-pt_array[idx_f, 0, 0] * realz[1, 1] * z_err_array[0, 0]) +
-                                                  np.abs(pt_array[idx_f, 0, 0] * realz[0, 1] * z_err_array[1, 0]) +
-                                                  np.abs(
-                                                      (imagz[0, 0] - pt_array[idx_f, 0, 0] * realz[0, 0]) * z_err_array[
-                                                          1, 1]) +
-                                                  np.abs((-imagz[1, 0] + pt_array[idx_f, 0, 0] * realz[1, 0]) *
-                                                         z_err_array[0, 1]) +
-                                                  np.abs(realz[1, 1] * z_err_array[0, 0]) + np.abs(
-            realz[0, 1] * z_err_array[1, 0]))
-
-        pterr_array[idx_f, 0, 1] = 1 / detreal * (np.abs(-pt_array[idx_f, 0, 1] * realz[1, 1] * z_err_array[0, 0]) +
-                                                  np.abs(pt_array[idx_f, 0, 1] * realz[0, 1] * z_err_array[1, 0]) +
-                                                  np.abs(
-                                                      (imagz[0, 1] - pt_array[idx_f, 0, 1] * realz[0, 0]) * z_err_array[
-                                                          1, 1]) +
-                                                  np.abs((-imagz[1, 1] + pt_array[idx_f, 0, 1] * realz[1, 0]) *
-                                                         z_err_array[0, 1]) +
-                                                  np.abs(realz[1, 1] * z_err_array[0, 1]) + np.abs(
-            realz[0, 1] * z_err_array[1, 1]))
-
-        pterr_array[idx_f, 1, 0] = 1 / detreal * (
-            np.abs((imagz[1, 0] - pt_array[idx_f, 1, 0] * realz[1, 1]) * z_err_array[0, 0]) +
-            np.abs(pt_array[idx_f, 1, 0] * realz[1, 0] * z_err_array[0, 1]) +
-            np.abs((-imagz[0, 0] + pt_array[idx_f, 1, 0] * realz[0, 1]) * z_err_array[1, 0]) +
-            np.abs(-pt_array[idx_f, 1, 0] * realz[0, 0] * z_err_array[1, 1]) +
-            np.abs(realz[0, 0] * z_err_array[1, 0]) + np.abs(-realz[1, 0] * z_err_array[0, 0]))
-
-        pterr_array[idx_f, 1, 1] = 1 / detreal * (
-            np.abs((imagz[1, 1] - pt_array[idx_f, 1, 1] * realz[1, 1]) * z_err_array[0, 0]) +
-            np.abs(pt_array[idx_f, 1, 1] * realz[1, 0] * z_err_array[0, 1]) +
-            np.abs((-imagz[0, 1] + pt_array[idx_f, 1, 1] * realz[0, 1]) * z_err_array[1, 0]) +
-            np.abs(-pt_array[idx_f, 1, 1] * realz[0, 0] * z_err_array[1, 1]) +
-            np.abs(realz[0, 0] * z_err_array[1, 1]) + np.abs(-realz[1, 0] * z_err_array[0, 1]))
+def z2pt_batch(z_array, z_err_array=None):
+    """
+        Calculate the Phase Tensors Phi = X^-1 Y of many impedance tensors
+        Z = X + iY at once (incl. uncertainties), with the closed form
+        inverse of the 2x2 real parts.
 
-    return pt_array, pterr_array
+        Input:
+        - Z : (..., 2, 2) complex valued Numpy array, e.g. (n_freq, 2, 2)
+              or (n_station, n_freq, 2, 2)
+
+        Optional:
+        - Z-error : (..., 2, 2) real valued Numpy array
+
+        Return:
+        - PT : (..., 2, 2) real valued Numpy array, zeros where X is
+               singular
+        - PT-error : (..., 2, 2) real valued Numpy array, zeros where X is
+                     singular.  None if no Z-error is given
+        - singular : (...) boolean Numpy array, True where X is singular
+
+        The errors are the same Gaussian error propagation as z2pt.
+    """
+    z_array = np.asarray(z_array)
+    if z_array.ndim < 2 or z_array.shape[-2:] != (2, 2):
+        raise MTex.MTpyError_PT('Error - incorrect z array: %s instead of '
+                                '(...,2,2)' % str(z_array.shape))
+    if z_err_array is not None:
+        z_err_array = np.asarray(z_err_array)
+        if z_err_array.shape != z_array.shape:
+            raise MTex.MTpyError_PT('Error - z-array and z-err-array have '
+                                    'different shape: %s;%s' % (
+                                        str(z_array.shape),
+                                        str(z_err_array.shape)))
+
+    r00, r01, r10, r11 = [np.real(z_array[..., ii, jj])
+                          for ii, jj in [(0, 0), (0, 1), (1, 0), (1, 1)]]
+    i00, i01, i10, i11 = [np.imag(z_array[..., ii, jj])
+                          for ii, jj in [(0, 0), (0, 1), (1, 0), (1, 1)]]
+
+    detreal = r00 * r11 - r01 * r10
+    singular = detreal == 0
+    # singular matrices are divided by 1 and set to zero afterwards
+    detreal = np.where(singular, 1., detreal)
+
+    pt_array = np.empty(z_array.shape, dtype='float')
+    pt_array[..., 0, 0] = (r11 * i00 - r01 * i10) / detreal
+    pt_array[..., 0, 1] = (r11 * i01 - r01 * i11) / detreal
+    pt_array[..., 1, 0] = (r00 * i10 - r10 * i00) / detreal
+    pt_array[..., 1, 1] = (r00 * i11 - r10 * i01) / detreal
+    pt_array[singular] = 0
+
+    if z_err_array is None:
+        return pt_array, None, singular
+
+    e00, e01, e10, e11 = [np.abs(z_err_array[..., ii, jj])
+                          for ii, jj in [(0, 0), (0, 1), (1, 0), (1, 1)]]
+    p00, p01, p10, p11 = [pt_array[..., ii, jj]
+                          for ii, jj in [(0, 0), (0, 1), (1, 0), (1, 1)]]
+    absdet = np.abs(detreal)
+
+    # Z entries are independent -> use Gaussian error propagation (squared
+    # sums/2-norm)
+    pterr_array = np.empty(z_array.shape, dtype='float')
+    pterr_array[..., 0, 0] = np.sqrt(
+        (p00 * r11 * e00) ** 2 + (p00 * r01 * e10) ** 2 +
+        ((i00 * r10 - r00 * i10) / absdet * r00 * e01) ** 2 +
+        ((i10 * r00 - r10 * i11) / absdet * r01 * e11) ** 2 +
+        (r11 * e00) ** 2 + (r01 * e10) ** 2) / absdet
+    pterr_array[..., 0, 1] = np.sqrt(
+        (p01 * r11 * e00) ** 2 + (p01 * r01 * e10) ** 2 +
+        ((i01 * r10 - r00 * i11) / absdet * r11 * e01) ** 2 +
+        ((i11 * r00 - r01 * i10) / absdet * r01 * e11) ** 2 +
+        (r11 * e01) ** 2 + (r01 * e11) ** 2) / absdet
+    pterr_array[..., 1, 0] = np.sqrt(
+        (p10 * r10 * e01) ** 2 + (p10 * r00 * e11) ** 2 +
+        ((i00 * r11 - r01 * i11) / absdet * r10 * e00) ** 2 +
+        ((i10 * r01 - r11 * i00) / absdet * r00 * e01) ** 2 +
+        (r10 * e00) ** 2 + (r00 * e10) ** 2) / absdet
+    pterr_array[..., 1, 1] = np.sqrt(
+        (p11 * r10 * e01) ** 2 + (p11 * r00 * e11) ** 2 +
+        ((i01 * r11 - r01 * i11) / absdet * r10 * e00) ** 2 +
+        ((i11 * r01 - r11 * i01) / absdet * r00 * e01) ** 2 +
+        (r10 * e01) ** 2 + (r00 * e11) ** 2) / absdet
+    pterr_array[singular] = 0
+
+    return pt_array, pterr_array, singular
+
+
+def residual_pt_batch(pt1_array, pt2_array, pt1err_array=None,
+                      pt2err_array=None):
+    """
+        Calculate the Residual Phase Tensors DeltaPhi = 1 - Phi1^-1*Phi2 of
+        many pairs of Phase Tensors at once (incl. uncertainties and
+        attributes), e.g. of the data and the model response of a whole
+        survey.
+
+        Input:
+        - PT1 : (..., 2, 2) real valued Numpy array, e.g. (n_freq, 2, 2) or
+                (n_station, n_freq, 2, 2)
+        - PT2 : (..., 2, 2) real valued Numpy array of the same shape
+
+        Optional:
+        - PT1-error, PT2-error : (..., 2, 2) real valued Numpy arrays
+
+        Return:
+        - ResPT : (..., 2, 2) real valued Numpy array, zeros where PT1 or
+                  PT2 is singular
+        - ResPT-error : (..., 2, 2) real valued Numpy array, zeros where PT1
+                        or PT2 is singular.  None if the errors are not
+                        given
+        - attributes : Numpy record array of shape PT1.shape[:-2] with the
+                       attributes of ResPT, see pt_attributes
+        - singular : (...) boolean Numpy array, True where PT1 or PT2 is
+                     singular
+
+        The errors are propagated as in ResidualPhaseTensor, from the
+        symmetrised products of PT1 and the inverse of PT2.
+    """
+    pt1_array = np.asarray(pt1_array, dtype='float')
+    pt2_array = np.asarray(pt2_array, dtype='float')
+    if pt1_array.ndim < 2 or pt1_array.shape[-2:] != (2, 2):
+        raise MTex.MTpyError_PT('Error - incorrect pt array: %s instead of '
+                                '(...,2,2)' % str(pt1_array.shape))
+    if pt1_array.shape != pt2_array.shape:
+        raise MTex.MTpyError_PT('PT arrays not the same shape: %s;%s' % (
+            str(pt1_array.shape), str(pt2_array.shape)))
+
+    def _inverse(pt_array):
+        det = pt_array[..., 0, 0] * pt_array[..., 1, 1] - \
+            pt_array[..., 0, 1] * pt_array[..., 1, 0]
+        singular = det == 0
+        # singular matrices are divided by 1 and set to zero afterwards
+        det = np.where(singular, 1., det)
+        inverse = np.empty(pt_array.shape)
+        inverse[..., 0, 0] = pt_array[..., 1, 1] / det
+        inverse[..., 0, 1] = -pt_array[..., 0, 1] / det
+        inverse[..., 1, 0] = -pt_array[..., 1, 0] / det
+        inverse[..., 1, 1] = pt_array[..., 0, 0] / det
+        inverse[singular] = 0
+        return inverse, singular
+
+    inv1, singular = _inverse(pt1_array)
+    inv2, singular2 = _inverse(pt2_array)
+    singular |= singular2
+
+    rpt_array = np.eye(2) - np.matmul(inv1, pt2_array)
+    rpt_array[singular] = 0
+
+    rpterr_array = None
+    if pt1err_array is not None and pt2err_array is not None:
+        pt1err_array = np.abs(np.asarray(pt1err_array, dtype='float'))
+        pt2err_array = np.abs(np.asarray(pt2err_array, dtype='float'))
+        if pt1err_array.shape != pt1_array.shape or \
+                pt2err_array.shape != pt1_array.shape:
+            raise MTex.MTpyError_PT('ERROR - both PhaseTensor objects must '
+                                    'contain PT-error arrays of the same '
+                                    'shape')
+        # error of the inverse of PT2, the sum of the absolute first order
+        # terms
+        abs_inv2 = np.abs(inv2)
+        inv2err = np.matmul(np.matmul(abs_inv2, pt2err_array), abs_inv2)
+
+        # Gaussian errors of PT2^-1*PT1 and PT1*PT2^-1
+        var1 = np.matmul(inv2err ** 2, pt1_array ** 2) + \
+            np.matmul(inv2 ** 2, pt1err_array ** 2)
+        var2 = np.matmul(pt1err_array ** 2, inv2 ** 2) + \
+            np.matmul(pt1_array ** 2, inv2err ** 2)
+        rpterr_array = np.sqrt(0.25 * var1 + 0.25 * var2)
+        rpterr_array[singular] = 0
+
+    attributes = pt_attributes(rpt_array, rpterr_array)
+
+    return rpt_array, rpterr_array, attributes, singular
+
+
+def residual_pt_list(pt1_list, pt2_list, pt1err_list=None,
+                     pt2err_list=None):
+    """
+        Calculate the Residual Phase Tensors of lists of Phase Tensor
+        arrays, one pair per station (e.g. the data and the model response
+        of a survey), with one call of residual_pt_batch.
+
+        Stations whose two arrays are missing or differ in shape from each
+        other or from the first station that can be compared cannot be
+        compared, as ResidualPhaseTensor raises MTpyError_PT for them.
+        Their residuals, errors and attributes are zeros.
+
+        Input:
+        - PT1 list : (n_freq, 2, 2) real valued Numpy arrays (or None)
+        - PT2 list : (n_freq, 2, 2) real valued Numpy arrays (or None)
+
+        Optional:
+        - PT1-error list, PT2-error list : (n_freq, 2, 2) real valued Numpy
+                                           arrays (or None)
+
+        Return:
+        - ResPT : (n_station, n_freq, 2, 2) real valued Numpy array, n_freq
+                  of the first station that can be compared, else of the
+                  first PT1 array
+        - ResPT-error : (n_station, n_freq, 2, 2) real valued Numpy array,
+                        zeros for stations without both errors.  None if
+                        the error lists are not given
+        - attributes : Numpy record array of shape (n_station, n_freq)
+                       with the attributes of ResPT, see pt_attributes
+        - matched : (n_station) boolean Numpy array, False for the stations
+                    that could not be compared
+    """
+    shapes = [(np.shape(pt1) if pt1 is not None else None,
+               np.shape(pt2) if pt2 is not None else None)
+              for pt1, pt2 in zip(pt1_list, pt2_list)]
+    pairs = [shape1 for shape1, shape2 in shapes
+             if shape1 == shape2 and shape1 is not None and
+             len(shape1) == 3 and shape1[1:] == (2, 2)]
+    # without any pair the data still give the number of periods
+    pairs += [shape1 for shape1, shape2 in shapes
+              if shape1 is not None and len(shape1) == 3 and
+              shape1[1:] == (2, 2)]
+    pt_shape = pairs[0] if len(pairs) > 0 else (0, 2, 2)
+    matched = np.array([shape1 == pt_shape and shape2 == pt_shape
+                        for shape1, shape2 in shapes], dtype=bool)
+
+    n_station = len(shapes)
+    rpt_array = np.zeros((n_station,) + pt_shape)
+    rpterr_array = None
+    has_err = np.zeros(n_station, dtype=bool)
+    if pt1err_list is not None and pt2err_list is not None:
+        rpterr_array = np.zeros(rpt_array.shape)
+        has_err = np.array([np.shape(pt1err) == pt_shape and
+                            np.shape(pt2err) == pt_shape
+                            for pt1err, pt2err in zip(pt1err_list,
+                                                      pt2err_list)],
+                           dtype=bool) & matched
+
+    attributes = pt_attributes(rpt_array, rpterr_array)
+    attributes[:] = 0
+    if np.any(matched):
+        err_list = None
+        if rpterr_array is not None:
+            # zeros where a station has no errors, its errors are zeroed
+            # again below
+            err_list = [[pterr if ok else np.zeros(pt_shape)
+                         for pterr, ok in zip(pterr_list, has_err)]
+                        for pterr_list in (pt1err_list, pt2err_list)]
+            err_list = [[pterr for pterr, ok in zip(pterr_list, matched)
+                         if ok] for pterr_list in err_list]
+        rpt, rpterr, attr = residual_pt_batch(
+            [pt1 for pt1, ok in zip(pt1_list, matched) if ok],
+            [pt2 for pt2, ok in zip(pt2_list, matched) if ok],
+            *(err_list or []))[:3]
+        rpt_array[matched] = rpt
+        attributes[matched] = attr
+        if rpterr_array is not None:
+            rpterr_array[matched] = rpterr
+            rpterr_array[~has_err] = 0
+            for name in attributes.dtype.names:
+                if name.endswith('_err'):
+                    attributes[name][~has_err] = 0
+
+    return rpt_array, rpterr_array, attributes, matched
 
 
 def z_object2pt(z_object):
@@ -6,6 +6,11 @@ Static Shift
 
 module for estimating static shift
 
+Classes
+---------
+    * SpatialMedianStaticShift --> spatial median static shift of every
+                                   station of a survey
+
 Created on Mon Aug 19 10:06:21 2013
 
 @author: jpeacock
@@ -13,11 +18,16 @@ Created on Mon Aug 19 10:06:21 2013
 
 # ==============================================================================
 import os
+import warnings
 
 import numpy as np
 
 import mtpy.core.mt as mt
-import mtpy.imaging.mtplot as mtplot
+import mtpy.core.mt_loader as mt_loader
+import mtpy.core.spatial_index as spatial_index
+import mtpy.core.z as MTz
+import mtpy.core.z_interp as MTz_interp
+import mtpy.utils.exceptions as MTex
 
 
 # ==============================================================================
@@ -69,11 +79,6 @@ def estimate_static_spatial_median(edi_fn, radius=1000., num_freq=20,
                                 static shift corrections for x and y modes
 
     """
-    # convert meters to decimal degrees so we don't have to deal with zone
-    # changes
-    meter_to_deg_factor = 8.994423457456377e-06
-    dm_deg = radius * meter_to_deg_factor
-
     # make a list of edi files in the directory
     edi_path = os.path.dirname(edi_fn)
     edi_list = [os.path.abspath(os.path.join(edi_path, edi))
@@ -87,39 +92,31 @@ def estimate_static_spatial_median(edi_fn, radius=1000., num_freq=20,
     mt_obj.Z._compute_res_phase()
     interp_freq = mt_obj.Z.freq[freq_skip:num_freq + freq_skip]
 
-    # Find stations near by and store them in a list
-    mt_obj_list = []
-    for kk, kk_edi in enumerate(edi_list):
-        mt_obj_2 = mt.MT(kk_edi)
-        delta_d = np.sqrt((mt_obj.lat - mt_obj_2.lat) ** 2 +
-                          (mt_obj.lon - mt_obj_2.lon) ** 2)
-        if delta_d <= dm_deg:
-            mt_obj_2.delta_d = float(delta_d) / meter_to_deg_factor
-            mt_obj_list.append(mt_obj_2)
+    # Find stations near by and store them in a list, only the headers are
+    # read for the locations, the data of the near by stations are read when
+    # they are interpolated
+    mt_obj_list = mt_loader.load_mt_list(edi_list, n_workers=1, data=False)
+    s_index = spatial_index.SpatialIndex(
+        [mt_obj_2.lat for mt_obj_2 in mt_obj_list],
+        [mt_obj_2.lon for mt_obj_2 in mt_obj_list])
+    near_index, near_distance = s_index.query_radius(mt_obj.lat, mt_obj.lon,
+                                                     radius)
+    mt_obj_list = [mt_obj_list[kk] for kk in near_index]
+    for mt_obj_2, delta_d in zip(mt_obj_list, near_distance):
+        mt_obj_2.delta_d = float(delta_d)
 
     if len(mt_obj_list) == 0:
         print 'No stations found within given radius {0:.2f} m'.format(radius)
         return 1.0, 1.0
 
-    # extract the resistivity values from the near by stations
-    res_array = np.zeros((len(mt_obj_list), num_freq, 2, 2))
+    # extract the resistivity values from the near by stations, 0 where
+    # a frequency is outside the range of a station
     print 'These stations are within the given {0} m radius:'.format(radius)
-    for kk, mt_obj_kk in enumerate(mt_obj_list):
+    for mt_obj_kk in mt_obj_list:
         print '\t{0} --> {1:.1f} m'.format(mt_obj_kk.station, mt_obj_kk.delta_d)
-        interp_idx = np.where((interp_freq >= mt_obj_kk.Z.freq.min()) &
-                              (interp_freq <= mt_obj_kk.Z.freq.max()))
-
-        interp_freq_kk = interp_freq[interp_idx]
-        Z_interp, Tip_interp = mt_obj_kk.interpolate_impedance_tensor(interp_freq_kk)
-        Z_interp._compute_res_phase()
-        res_array[
-            kk,
-            interp_idx,
-            :,
-            :] = Z_interp.resistivity[
-            0:len(interp_freq_kk),
-            :,
-            :]
+    z_stack = MTz_interp.interpolate_mt_list(mt_obj_list, 1. / interp_freq)
+    res_array = np.where(z_stack.mask[:, :, np.newaxis, np.newaxis],
+                         z_stack.resistivity, 0.)
 
     # compute the static shift of x-components
     static_shift_x = mt_obj.Z.resistivity[freq_skip:num_freq + freq_skip, 0, 1] / \
@@ -205,8 +202,8 @@ def remove_static_shift_spatial_filter(edi_fn, radius=1000, num_freq=20,
                                                 shift_tol=.15)
     mt_obj = mt.MT(edi_fn)
 
-    s, z_ss = mt_obj.Z.no_ss(reduce_res_factor_x=ss_x,
-                             reduce_res_factor_y=ss_y)
+    s, z_ss = mt_obj.Z.remove_ss(reduce_res_factor_x=ss_x,
+                                 reduce_res_factor_y=ss_y)
     edi_path = os.path.dirname(edi_fn)
 
     mt_obj.Z.z = z_ss
@@ -218,8 +215,295 @@ def remove_static_shift_spatial_filter(edi_fn, radius=1000, num_freq=20,
     mt_obj.write_edi_file(new_fn=new_edi_fn)
 
     if plot == True:
+        # imported here so that matplotlib is only loaded for plotting
+        import mtpy.imaging.mtplot as mtplot
+
         rpm = mtplot.plot_multiple_mt_responses(fn_list=[edi_fn, new_edi_fn],
                                                 plot_style='compare')
         return new_edi_fn, s[0], rpm
     else:
         return new_edi_fn, s[0], None
+
+
+class SpatialMedianStaticShift(object):
+    """
+    Static shift of every station of a survey from a spatial median
+    filter, the same estimate as estimate_static_spatial_median gives for
+    each station, with each .edi file read once.
+
+    The stations within radius of each station are found with one spatial
+    index, all stations are interpolated at once onto the frequencies used
+    for the estimate, and the x and y static shift factors of all stations
+    are the medians of arrays of shape (n_station, n_neighbour, num_freq).
+
+    Arguments
+    -----------
+        **z_stack** : mtpy.core.z_stack.ZStack
+                      impedance tensors and locations of the survey
+
+        **edi_list** : list
+                       .edi file of each station of z_stack, needed to
+                       write corrected .edi files.  *default* is None
+
+        **radius** : float
+                     radius to look for nearby stations, in meters.
+                     *default* is 1000 m
+
+        **num_freq** : int
+                       number of frequencies to calculate the median static
+                       shift from, counted from the highest frequency of
+                       each station.  *default* is 20
+
+        **freq_skip** : int
+                        number of frequencies to skip from the highest
+                        frequency.  *default* is 4
+
+        **shift_tol** : float
+                        If 1-tol < correction < 1+tol then the correction
+                        factor is set to 1.  *default* is 0.15
+
+        **n_workers** : int
+                        number of worker processes or threads to read and
+                        write .edi files with.  *default* is None, the
+                        number of CPUs
+
+        **pool** : [ 'process' | 'thread' ]
+                   kind of worker pool, *default* is 'process'
+
+    =============== ===========================================================
+    Attributes      Description
+    =============== ===========================================================
+    z_stack         impedance tensors and locations of the survey
+    edi_list        .edi file of each station
+    shift_table     record array of station, lat, lon, n_near, ss_x, ss_y
+                    of every station, None until estimate is called
+    =============== ===========================================================
+
+    =================== =======================================================
+    Methods             Description
+    =================== =======================================================
+    from_edi_files      reads a directory or list of .edi files
+    estimate            static shift factors of every station
+    remove_static_shift impedance tensors with static shift removed
+    write_edi_files     writes .edi files with static shift removed
+    write_shift_table   writes shift_table to a text file
+    =================== =======================================================
+
+    Example
+    -----------
+
+        >>> import mtpy.analysis.staticshift as staticshift
+        >>> ss_obj = staticshift.SpatialMedianStaticShift.from_edi_files(
+        >>>     r"/home/mt/edi_files", radius=2000.)
+        >>> table = ss_obj.estimate()
+        >>> table.ss_x
+        >>> ss_obj.write_edi_files(save_path=r"/home/mt/edi_files/SS")
+
+    """
+
+    def __init__(self, z_stack, edi_list=None, radius=1000., num_freq=20,
+                 freq_skip=4, shift_tol=.15, n_workers=None, pool='process'):
+        self.z_stack = z_stack
+        self.edi_list = edi_list
+        self.radius = radius
+        self.num_freq = num_freq
+        self.freq_skip = freq_skip
+        self.shift_tol = shift_tol
+        self.n_workers = n_workers
+        self.pool = pool
+
+        self.shift_table = None
+
+    @classmethod
+    def from_edi_files(cls, edi_source, n_workers=None, pool='process',
+                       **kwargs):
+        """
+        Read a directory or list of .edi files with a pool of workers, files
+        that cannot be read are logged and left out (with one worker the
+        read error is raised).  The other arguments are those of
+        SpatialMedianStaticShift.
+        """
+        loader = mt_loader.MTLoader(n_workers=n_workers, pool=pool)
+        z_stack = loader.load_z_stack(edi_source)
+
+        return cls(z_stack, edi_list=loader.loaded_edi_list,
+                   n_workers=n_workers, pool=pool, **kwargs)
+
+    def _frequency_bands(self):
+        """
+        index of the frequencies of each station used for the estimate, on
+        z_stack.freq, (n_station, num_freq) and -1 where a station has
+        fewer frequencies
+        """
+        mask = self.z_stack.mask
+        rank = np.cumsum(mask, axis=1) - 1 - self.freq_skip
+        in_band = mask & (rank >= 0) & (rank < self.num_freq)
+
+        band_index = -np.ones((self.z_stack.n_stations, self.num_freq),
+                              dtype='int')
+        station_index, freq_index = np.nonzero(in_band)
+        band_index[station_index, rank[in_band]] = freq_index
+        return band_index
+
+    def _neighbour_index(self):
+        """
+        index of the stations within radius of each station,
+        (n_station, max_neighbours) and -1 where a station has fewer
+        """
+        neighbours = self.z_stack.spatial_index.neighbours(self.radius)
+        n_near = np.array([len(indices) for indices, distances in neighbours],
+                          dtype='int')
+
+        near_index = -np.ones((len(n_near), max(n_near.max(), 1)),
+                              dtype='int')
+        for ii, (indices, distances) in enumerate(neighbours):
+            near_index[ii, :n_near[ii]] = indices
+        return near_index, n_near
+
+    def estimate(self):
+        """
+        Static shift factors of every station, stored in shift_table.
+
+        Returns
+        ---------
+            **shift_table** : np.recarray(n_station)
+                              with fields station, lat, lon, n_near (number
+                              of stations within radius), ss_x and ss_y
+                              (static shift factors of the x and y modes,
+                              1.0 for stations without neighbours)
+        """
+        z_stack = self.z_stack
+        n_station = z_stack.n_stations
+
+        band_index = self._frequency_bands()
+        near_index, n_near = self._neighbour_index()
+
+        # interpolate all stations onto every frequency used by a station
+        band_freq_index = np.unique(band_index[band_index >= 0])
+        band_position = -np.ones(z_stack.n_freq, dtype='int')
+        band_position[band_freq_index] = np.arange(len(band_freq_index))
+        interp_stack = MTz_interp.interpolate_z_list(
+            z_stack.to_z_list(), None, 1. / z_stack.freq[band_freq_index],
+            n_workers=1)
+        # 0 where a frequency is outside the range of a station
+        res_interp = np.where(
+            interp_stack.mask[:, :, np.newaxis, np.newaxis],
+            interp_stack.resistivity, 0.)
+
+        has_band = band_index >= 0
+        has_near = near_index >= 0
+        station_index = np.arange(n_station)[:, np.newaxis]
+        band_interp = band_position[band_index]
+
+        factors = []
+        for ii, jj in [(0, 1), (1, 0)]:
+            # resistivity of each station on its own frequencies
+            res_station = np.where(
+                has_band,
+                z_stack.resistivity[station_index, band_index, ii, jj],
+                np.nan)
+            # and of its neighbours, (n_station, n_neighbour, num_freq)
+            res_near = res_interp[near_index[:, :, np.newaxis],
+                                  band_interp[:, np.newaxis, :], ii, jj]
+            res_near[~(has_near[:, :, np.newaxis] &
+                       has_band[:, np.newaxis, :])] = np.nan
+
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    static_shift = np.nanmedian(
+                        res_station / np.nanmedian(res_near, axis=1),
+                        axis=1)
+
+            # check to see if the estimated static shift is within the
+            # given tolerance
+            within_tol = (1 - self.shift_tol < static_shift) & \
+                (static_shift < 1 + self.shift_tol)
+            static_shift[within_tol | (n_near == 0)] = 1.0
+            factors.append(static_shift)
+
+        for station in z_stack.station[n_near == 0]:
+            print 'No stations found within given radius {0:.2f} m of ' \
+                '{1}'.format(self.radius, station)
+
+        self.shift_table = np.rec.fromarrays(
+            [z_stack.station, z_stack.lat, z_stack.lon, n_near, factors[0],
+             factors[1]],
+            names=['station', 'lat', 'lon', 'n_near', 'ss_x', 'ss_y'])
+        return self.shift_table
+
+    def remove_static_shift(self):
+        """
+        Impedance tensors of all stations with the static shift removed,
+        see mtpy.core.z.Z.remove_ss.  The factors are estimated first if
+        that has not been done.
+
+        Returns
+        ---------
+            **z_corrected** : np.ndarray(n_station, n_freq, 2, 2)
+        """
+        if self.shift_table is None:
+            self.estimate()
+
+        z_corrected = self.z_stack.z.copy()
+        z_corrected[:, :, 0, :] /= np.sqrt(
+            self.shift_table.ss_x)[:, np.newaxis, np.newaxis]
+        z_corrected[:, :, 1, :] /= np.sqrt(
+            self.shift_table.ss_y)[:, np.newaxis, np.newaxis]
+        return z_corrected
+
+    def write_edi_files(self, save_path=None, suffix='_ss'):
+        """
+        Write .edi files with the static shift removed with a pool of
+        workers, see mtpy.core.mt_loader.write_edi_list.
+
+        Arguments
+        -----------
+            **save_path** : string
+                            directory to write the new files to
+                            *default* is None, next to the input files
+
+            **suffix** : string
+                         added to the file names, *default* is '_ss'
+
+        Returns
+        ---------
+            **new_fn_list** : list
+                              the new .edi files, None where a file could
+                              not be written
+        """
+        if self.edi_list is None:
+            raise MTex.MTpyError_inputarguments(
+                'Need the .edi files of the stations to write new files')
+
+        z_corrected = self.remove_static_shift()
+        z_stack = self.z_stack
+
+        z_list = []
+        for ii in range(z_stack.n_stations):
+            valid = z_stack.mask[ii]
+            z_list.append(MTz.Z(z_array=z_corrected[ii, valid],
+                                z_err_array=z_stack.z_err[ii, valid],
+                                freq=z_stack.freq[valid]))
+
+        return mt_loader.write_edi_list(self.edi_list, z_list,
+                                        save_path=save_path, suffix=suffix,
+                                        n_workers=self.n_workers,
+                                        pool=self.pool)
+
+    def write_shift_table(self, fn):
+        """
+        Write shift_table to a comma separated text file, estimated first if
+        that has not been done.
+        """
+        if self.shift_table is None:
+            self.estimate()
+
+        with open(fn, 'w') as fid:
+            fid.write('station,lat,lon,n_near,ss_x,ss_y\n')
+            for row in self.shift_table:
+                fid.write('{0},{1:.6f},{2:.6f},{3},{4:.6f},{5:.6f}\n'.format(
+                    row.station, row.lat, row.lon, row.n_near, row.ss_x,
+                    row.ss_y))
+
+        return fn
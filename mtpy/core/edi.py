@@ -19,6 +19,7 @@ import os
 
 import numpy as np
 
+import mtpy.core.edi_cache as MTcache
 import mtpy.core.z as MTz
 import mtpy.utils.exceptions as MTex
 import mtpy.utils.filehandling as MTfh
@@ -26,15 +27,6 @@ import mtpy.utils.format as MTft
 from mtpy.utils.mtpylog import MtPyLog
 import logging
 
-try:
-    import scipy.stats.distributions as ssd
-
-    ssd_test = True
-except ImportError:
-    print 'Need scipy.stats.distributions to compute spectra errors'
-    print 'Could not find scipy.stats.distributions, check distribution'
-    ssd_test = False
-
 #tab = " " * 4
 tab = ""
 
@@ -60,6 +52,12 @@ class Edi(object):
                      *default* is None. If an .edi file is input, it is
                      automatically read in and attributes of Edi are filled
 
+        **cache** : mtpy.core.edi_cache.EdiCache
+                    cache of parsed .edi files to read from and write to.
+                    *default* is None, which uses the cache set with
+                    mtpy.core.edi_cache.enable if any.  False to never
+                    use a cache.
+
 
     Methods
     ---------------
@@ -86,6 +84,8 @@ class Edi(object):
     ===================== ========================================== ==========
     Attributes            Description                                default
     ===================== ========================================== ==========
+    cache                 mtpy.core.edi_cache.EdiCache to read       None
+                          parsed files from, False for no cache
     Data_sect             DataSection class, contains basic
                           information on the data collected and in
                           whether the data is in impedance or
@@ -122,10 +122,12 @@ class Edi(object):
         >>> new_edi_fn = edi_obj.write_edi_file()
     """
 
-    def __init__(self, edi_fn=None):
+    def __init__(self, edi_fn=None, cache=None, data=True):
 
         self.edi_fn = edi_fn
+        self.cache = cache
         self._edi_lines = None
+        self._data_loaded = True
         self.Header = Header()
         self.Info = Information()
         self.Define_measurement = DefineMeasurement()
@@ -147,9 +149,9 @@ class Edi(object):
         self._block_len = 6
 
         if self.edi_fn is not None:
-            self.read_edi_file()
+            self.read_edi_file(data=data)
 
-    def read_edi_file(self, edi_fn=None):
+    def read_edi_file(self, edi_fn=None, data=True):
         """
         Read in an edi file and fill attributes of each section's classes.
         Including:
@@ -170,6 +172,12 @@ class Edi(object):
                          full path to .edi file to be read in
                          *default* is None
 
+            **data** : [ True | False ]
+                       if False only the sections before the data blocks
+                       are read and the file is not read further.  Z and
+                       Tipper are read when they are first accessed.
+                       *default* is True
+
 
 
         Examples
@@ -181,6 +189,12 @@ class Edi(object):
             >>> edi_obj = mtedi.Edi()
             >>> edi_obj.read_edi_file(edi_fn=r"/home/mt/mt01.edi")
 
+        :Read station location only: ::
+
+            >>> edi_obj = mtedi.Edi()
+            >>> edi_obj.read_edi_file(edi_fn=r"/home/mt/mt01.edi", data=False)
+            >>> edi_obj.lat, edi_obj.lon, edi_obj.elev
+
         """
 
         logger.info("Reading the edi file %s", self.edi_fn)
@@ -196,15 +210,26 @@ class Edi(object):
                 raise MTex.MTpyError_EDI(
                     "Could not find {0}, check path".format(self.edi_fn))
 
-            with open(self.edi_fn, 'r') as fid:
-                self._edi_lines = fid.readlines()
-
-        self.Header = Header(edi_lines=self._edi_lines)
-        self.Info = Information(edi_lines=self._edi_lines)
-        self.Define_measurement = DefineMeasurement(edi_lines=self._edi_lines)
-        self.Data_sect = DataSection(edi_lines=self._edi_lines)
-
-        self._read_data()
+        cache = self._get_cache()
+        if cache is None or self._read_cache(cache) is False:
+            self._edi_lines = _read_edi_lines(self.edi_fn, data=data)
+
+            self.Header = Header(edi_lines=self._edi_lines)
+            self.Info = Information(edi_lines=self._edi_lines)
+            self.Define_measurement = DefineMeasurement(
+                edi_lines=self._edi_lines)
+            self.Data_sect = DataSection(edi_lines=self._edi_lines)
+
+            if data:
+                self._data_loaded = True
+                self._read_data()
+                if cache is not None:
+                    self._write_cache(cache)
+            else:
+                # Z and Tipper are read on first access
+                self._Z = MTz.Z()
+                self._Tipper = MTz.Tipper()
+                self._data_loaded = False
 
         if self.Header.lat is None:
             self.Header.lat = self.Define_measurement.reflat
@@ -226,6 +251,91 @@ class Edi(object):
             "Read in edi file for station {0}".format(
                 self.Header.dataid))
 
+    def _get_cache(self):
+        """
+        the cache to use, None if .edi files are not cached
+        """
+        if self.cache is False:
+            return None
+        if self.cache is None:
+            return MTcache.get_default_cache()
+        return self.cache
+
+    def _read_cache(self, cache):
+        """
+        fill the attributes from the cache entry of the edi file, returns
+        False if there is no valid entry
+        """
+        entry = cache.load(self.edi_fn)
+        if entry is None:
+            return False
+
+        self._edi_lines = entry['edi_lines']
+        self.Header = Header(edi_lines=self._edi_lines)
+        self.Info = Information(edi_lines=self._edi_lines)
+        self.Define_measurement = DefineMeasurement(edi_lines=self._edi_lines)
+        self.Data_sect = DataSection(edi_lines=self._edi_lines)
+        self.Data_sect.line_num = entry['data_line_num']
+        self.Data_sect.data_type = entry['data_type']
+
+        self._data_loaded = True
+        self.Z._freq = entry['freq']
+        self.Z._z = entry['z']
+        self.Z._z_err = entry['z_err']
+        self.Z.rotation_angle = entry['z_rotation_angle']
+        self.Z.invalidate()
+
+        self.Tipper._freq = entry['freq']
+        self.Tipper._tipper = entry['tipper']
+        self.Tipper._tipper_err = entry['tipper_err']
+        self.Tipper.rotation_angle = entry['tipper_rotation_angle']
+        self.Tipper.invalidate()
+
+        logger.info('Read %s from cache', self.edi_fn)
+        return True
+
+    def _write_cache(self, cache):
+        """
+        write the metadata lines and the Z and Tipper arrays to the cache
+        """
+        if self.Z.z is None or self.Tipper.tipper is None:
+            return
+
+        # keep everything up to the data blocks, the data section of a
+        # file without data blocks is not cut
+        line_num = self.Data_sect.line_num
+        if line_num == 0:
+            line_num = len(self._edi_lines)
+
+        cache.store(self.edi_fn,
+                    self._edi_lines[:line_num],
+                    self.Data_sect.line_num,
+                    self.Data_sect.data_type,
+                    freq=self.Z.freq,
+                    z=self.Z.z,
+                    z_err=self.Z.z_err,
+                    z_rotation_angle=self.Z.rotation_angle,
+                    tipper=self.Tipper.tipper,
+                    tipper_err=self.Tipper.tipper_err,
+                    tipper_rotation_angle=self.Tipper.rotation_angle)
+
+    def _load_data(self):
+        """
+        read the data blocks of an edi file that was read with data=False
+        """
+        self._data_loaded = True
+        if self.edi_fn is None:
+            return
+
+        logger.info("Reading the data of the edi file %s", self.edi_fn)
+        with open(self.edi_fn, 'r') as fid:
+            self._edi_lines = fid.readlines()
+        self._read_data()
+
+        cache = self._get_cache()
+        if cache is not None:
+            self._write_cache(cache)
+
     def _read_data(self):
         """
         read either impedance or spectra data depending on what the type is
@@ -252,52 +362,23 @@ class Edi(object):
         read in impedance and tipper data if its there
         """
         flip = False
-        data_dict = {}
-        data_find = False
-        for line in data_lines:
-            line = line.strip()
-            if '>' in line and '!' not in line:
-                line_list = line[1:].strip().split()
-                key = line_list[0].lower()
-                if key[0] == 'z' or key[0] == 't' or key == 'freq':
-                    data_find = True
-                    data_dict[key] = []
-                else:
-                    data_find = False
-
-            elif data_find == True and '>' not in line and '!' not in line:
-                d_lines = line.strip().split()
-                for ii, dd in enumerate(d_lines):
-                    # check for empty values and set them to 0, check for any
-                    # other characters sometimes there are ****** for a null
-                    # component
-                    try:
-                        d_lines[ii] = float(dd)
-                        if d_lines[ii] == 1.0e32:
-                            d_lines[ii] = 0.0
-                    except ValueError:
-                        d_lines[ii] = 0.0
-                data_dict[key] += d_lines
+        data_dict = _read_data_blocks(data_lines)
 
         # fill useful arrays
-        freq_arr = np.array(data_dict['freq'], dtype=np.float)
+        freq_arr = data_dict['freq']
         z_arr = np.zeros((freq_arr.size, 2, 2), dtype=np.complex)
         z_err_arr = np.zeros((freq_arr.size, 2, 2), dtype=np.float)
 
         # fill impedance tensor
-        z_arr[:, 0, 0] = np.array(data_dict['zxxr']) + \
-            np.array(data_dict['zxxi']) * 1j
-        z_arr[:, 0, 1] = np.array(data_dict['zxyr']) + \
-            np.array(data_dict['zxyi']) * 1j
-        z_arr[:, 1, 0] = np.array(data_dict['zyxr']) + \
-            np.array(data_dict['zyxi']) * 1j
-        z_arr[:, 1, 1] = np.array(data_dict['zyyr']) + \
-            np.array(data_dict['zyyi']) * 1j
-
-        z_err_arr[:, 0, 0] = np.array(data_dict['zxx.var'])
-        z_err_arr[:, 0, 1] = np.array(data_dict['zxy.var'])
-        z_err_arr[:, 1, 0] = np.array(data_dict['zyx.var'])
-        z_err_arr[:, 1, 1] = np.array(data_dict['zyy.var'])
+        z_arr[:, 0, 0] = data_dict['zxxr'] + data_dict['zxxi'] * 1j
+        z_arr[:, 0, 1] = data_dict['zxyr'] + data_dict['zxyi'] * 1j
+        z_arr[:, 1, 0] = data_dict['zyxr'] + data_dict['zyxi'] * 1j
+        z_arr[:, 1, 1] = data_dict['zyyr'] + data_dict['zyyi'] * 1j
+
+        z_err_arr[:, 0, 0] = data_dict['zxx.var']
+        z_err_arr[:, 0, 1] = data_dict['zxy.var']
+        z_err_arr[:, 1, 0] = data_dict['zyx.var']
+        z_err_arr[:, 1, 1] = data_dict['zyy.var']
 
         # check for order of frequency, we want high to low
         if freq_arr[0] < freq_arr[1]:
@@ -308,40 +389,38 @@ class Edi(object):
             z_err_arr = z_err_arr[::-1]
             flip = True
 
-        # set the attributes as private variables to avoid redundant estimation
-        # of res and phase
+        # set the attributes as private variables to avoid redundant checks,
+        # res and phase are computed when needed
         self.Z._freq = freq_arr
         self.Z._z = z_arr
         self.Z._z_err = z_err_arr
+        self.Z.invalidate()
 
         try:
-            self.Z.rotation_angle = np.array(data_dict['zrot'])
+            self.Z.rotation_angle = data_dict['zrot']
         except KeyError:
             self.Z.rotation_angle = np.zeros_like(freq_arr)
 
-        # compute resistivity and phase
-        self.Z._compute_res_phase()
-
         # fill tipper data if there it exists
         tipper_arr = np.zeros((freq_arr.size, 1, 2), dtype=np.complex)
         tipper_err_arr = np.zeros((freq_arr.size, 1, 2), dtype=np.float)
 
         try:
-            self.Tipper.rotation_angle = np.array(data_dict['trot'])
+            self.Tipper.rotation_angle = data_dict['trot']
         except KeyError:
             try:
-                self.Tipper.rotation_angle = np.array(data_dict['zrot'])
+                self.Tipper.rotation_angle = data_dict['zrot']
             except KeyError:
                 self.Tipper.rotation_angle = np.zeros_like(freq_arr)
 
         if 'txr.exp' in data_dict.keys():
-            tipper_arr[:, 0, 0] = np.array(data_dict['txr.exp']) + \
-                np.array(data_dict['txi.exp']) * 1j
-            tipper_arr[:, 0, 1] = np.array(data_dict['tyr.exp']) + \
-                np.array(data_dict['tyi.exp']) * 1j
+            tipper_arr[:, 0, 0] = data_dict['txr.exp'] + \
+                data_dict['txi.exp'] * 1j
+            tipper_arr[:, 0, 1] = data_dict['tyr.exp'] + \
+                data_dict['tyi.exp'] * 1j
 
-            tipper_err_arr[:, 0, 0] = np.array(data_dict['txvar.exp'])
-            tipper_err_arr[:, 0, 1] = np.array(data_dict['tyvar.exp'])
+            tipper_err_arr[:, 0, 0] = data_dict['txvar.exp']
+            tipper_err_arr[:, 0, 1] = data_dict['tyvar.exp']
 
             if flip == True:
                 tipper_arr = tipper_arr[::-1]
@@ -353,8 +432,7 @@ class Edi(object):
         self.Tipper._freq = freq_arr
         self.Tipper._tipper = tipper_arr
         self.Tipper._tipper_err = tipper_err_arr
-        self.Tipper._compute_amp_phase()
-        self.Tipper._compute_mag_direction()
+        self.Tipper.invalidate()
 
     def _read_spectra(self, data_lines,
                       comp_list=['hx', 'hy', 'hz', 'ex', 'ey', 'rhx', 'rhy']):
@@ -383,137 +461,24 @@ class Edi(object):
 
             elif data_find == True and line.find('>') == -1 and \
                     line.find('!') == -1:
-                data_dict[key] += [float(ll) for ll in line.strip().split()]
+                data_dict[key].append(line)
 
             elif line.find('>spectra') == -1:
                 data_find = False
 
-        # get an object that contains the indices for each component
-        cc = index_locator(comp_list)
-
         freq_arr = np.array(sorted(data_dict.keys(), reverse=True))
+        avgt_arr = np.array([avgt_dict[key] for key in freq_arr])
+
+        # convert all spectra in one go, shape (n_freq, n_comp, n_comp)
+        n_comp = len(comp_list)
+        spectra_arr = np.array(' '.join([' '.join(data_dict[key])
+                                         for key in freq_arr]).split(),
+                               dtype=np.float)
+        spectra_arr = spectra_arr.reshape((len(freq_arr), n_comp, n_comp))
 
-        z_arr = np.zeros((len(data_dict.keys()), 2, 2), dtype=np.complex)
-        t_arr = np.zeros((len(data_dict.keys()), 1, 2), dtype=np.complex)
-
-        z_err_arr = np.zeros_like(z_arr, dtype=np.float)
-        t_err_arr = np.zeros_like(t_arr, dtype=np.float)
-
-        for kk, key in enumerate(freq_arr):
-            spectra_arr = np.reshape(np.array(data_dict[key]),
-                                     (len(comp_list), len(comp_list)))
-
-            # compute cross powers
-            s_arr = np.zeros_like(spectra_arr, dtype=np.complex)
-            for ii in range(s_arr.shape[0]):
-                for jj in range(ii, s_arr.shape[0]):
-                    if ii == jj:
-                        s_arr[ii, jj] = (spectra_arr[ii, jj])
-                    else:
-                        # minus sign for complex conjugation
-                        # original spectra data are of form <A,B*>, but we need
-                        # the order <B,A*>...
-                        # this is achieved by complex conjugation of the
-                        # original entries
-                        s_arr[ii, jj] = np.complex(spectra_arr[jj, ii],
-                                                   -spectra_arr[ii, jj])
-                        # keep complex conjugated entries in the lower
-                        # triangular matrix:
-                        s_arr[jj, ii] = np.complex(spectra_arr[jj, ii],
-                                                   spectra_arr[ii, jj])
-
-            # use formulas from Bahr/Simpson to convert the Spectra into Z
-            # the entries of S are sorted like
-            # <X,X*>  <X,Y*>  <X,Z*>  <X,En*>  <X,Ee*>  <X,Rx*>  <X,Ry*>
-            #         <Y,Y*>  <Y,Z*>  <Y,En*>  <Y,Ee*>  <Y,Rx*>  <Y,Ry*>
-            # .....
-
-            z_arr[kk, 0, 0] = s_arr[cc.ex, cc.rhx] * s_arr[cc.hy, cc.rhy] - \
-                s_arr[cc.ex, cc.rhy] * s_arr[cc.hy, cc.rhx]
-            z_arr[kk, 0, 1] = s_arr[cc.ex, cc.rhy] * s_arr[cc.hx, cc.rhx] - \
-                s_arr[cc.ex, cc.rhx] * s_arr[cc.hx, cc.rhy]
-            z_arr[kk, 1, 0] = s_arr[cc.ey, cc.rhx] * s_arr[cc.hy, cc.rhy] - \
-                s_arr[cc.ey, cc.rhy] * s_arr[cc.hy, cc.rhx]
-            z_arr[kk, 1, 1] = s_arr[cc.ey, cc.rhy] * s_arr[cc.hx, cc.rhx] - \
-                s_arr[cc.ey, cc.rhx] * s_arr[cc.hx, cc.rhy]
-
-            z_arr[kk] /= (s_arr[cc.hx, cc.rhx] * s_arr[cc.hy, cc.rhy] -
-                          s_arr[cc.hx, cc.rhy] * s_arr[cc.hy, cc.rhx])
-
-            # compute error only if scipy package exists
-            if ssd_test is True:
-                # 68% Quantil of the Fisher distribution:
-                z_det = np.real(s_arr[cc.hx, cc.hx] * s_arr[cc.hy, cc.hy] -
-                                np.abs(s_arr[cc.hx, cc.hy] ** 2))
-
-                sigma_quantil = ssd.f.ppf(0.68, 4, avgt_dict[key] - 4)
-
-                # 1) Ex
-                a = s_arr[cc.ex, cc.hx] * s_arr[cc.hy, cc.hy] - \
-                    s_arr[cc.ex, cc.hy] * s_arr[cc.hy, cc.hx]
-                b = s_arr[cc.ex, cc.hy] * s_arr[cc.hx, cc.hx] - \
-                    s_arr[cc.ex, cc.hx] * s_arr[cc.hx, cc.hy]
-                a /= z_det
-                b /= z_det
-
-                psi_squared = np.real(1. / s_arr[cc.ex, cc.ex].real *
-                                      (a * s_arr[cc.hx, cc.ex] + b * s_arr[cc.hy, cc.ex]))
-                epsilon_squared = 1. - psi_squared
-
-                scaling = sigma_quantil * 4 / (avgt_dict[key] - 4.) * \
-                    epsilon_squared / z_det * s_arr[cc.ex, cc.ex].real
-                z_err_arr[kk, 0, 0] = np.sqrt(
-                    scaling * s_arr[cc.hy, cc.hy].real)
-                z_err_arr[kk, 0, 1] = np.sqrt(
-                    scaling * s_arr[cc.hx, cc.hx].real)
-
-                # 2) EY
-                a = s_arr[cc.ey, cc.hx] * s_arr[cc.hy, cc.hy] - \
-                    s_arr[cc.ey, cc.hy] * s_arr[cc.hy, cc.hx]
-                b = s_arr[cc.ey, cc.hy] * s_arr[cc.hx, cc.hx] - \
-                    s_arr[cc.ey, cc.hx] * s_arr[cc.hx, cc.hy]
-                a /= z_det
-                b /= z_det
-
-                psi_squared = np.real(1. / np.real(s_arr[cc.ey, cc.ey]) *
-                                      (a * s_arr[cc.hx, cc.ey] + b * s_arr[cc.hy, cc.ey]))
-                epsilon_squared = 1. - psi_squared
-
-                scaling = sigma_quantil * 4 / (avgt_dict[key] - 4.) * \
-                    epsilon_squared / z_det * s_arr[cc.ey, cc.ey].real
-                z_err_arr[kk, 1, 0] = np.sqrt(
-                    scaling * s_arr[cc.hy, cc.hy].real)
-                z_err_arr[kk, 1, 1] = np.sqrt(
-                    scaling * s_arr[cc.hx, cc.hx].real)
-
-            # if HZ information is present:
-            if len(comp_list) > 5:
-                t_arr[kk, 0, 0] = s_arr[cc.hz, cc.rhx] * s_arr[cc.hy, cc.rhy] - \
-                    s_arr[cc.hz, cc.rhy] * s_arr[cc.hy, cc.rhx]
-                t_arr[kk, 0, 1] = s_arr[cc.hz, cc.rhy] * s_arr[cc.hx, cc.rhx] - \
-                    s_arr[cc.hz, cc.rhx] * s_arr[cc.hx, cc.rhy]
-
-                t_arr[kk] /= (s_arr[cc.hx, cc.rhx] * s_arr[cc.hy, cc.rhy] -
-                              s_arr[cc.hx, cc.rhy] * s_arr[cc.hy, cc.rhx])
-
-                if ssd_test is True:
-                    a = s_arr[cc.hz, cc.hx] * s_arr[cc.hy, cc.hy] - \
-                        s_arr[cc.hz, cc.hy] * s_arr[cc.hy, cc.hx]
-                    b = s_arr[cc.hz, cc.hy] * s_arr[cc.hx, cc.hx] - \
-                        s_arr[cc.hz, cc.hx] * s_arr[cc.hx, cc.hy]
-                    a /= z_det
-                    b /= z_det
-
-                    psi_squared = np.real(1. / s_arr[cc.hz, cc.hz].real *
-                                          (a * s_arr[cc.hx, cc.hz] + b * s_arr[cc.hy, cc.hz]))
-                    epsilon_squared = 1. - psi_squared
-
-                    scaling = sigma_quantil * 4 / (avgt_dict[key] - 4.) * \
-                        epsilon_squared / z_det * s_arr[cc.hz, cc.hz].real
-                    t_err_arr[kk, 0, 0] = np.sqrt(
-                        scaling * s_arr[cc.hy, cc.hy].real)
-                    t_err_arr[kk, 0, 1] = np.sqrt(
-                        scaling * s_arr[cc.hx, cc.hx].real)
+        z_arr, z_err_arr, t_arr, t_err_arr = _spectra_to_z(spectra_arr,
+                                                           avgt_arr,
+                                                           comp_list)
 
         # check for nans
         z_err_arr = np.nan_to_num(z_err_arr)
@@ -527,14 +492,11 @@ class Edi(object):
         self.Z.z_err = z_err_arr
         self.Z.freq = freq_arr
         self.Z.rotation_angle = np.zeros_like(freq_arr)
-        self.Z._compute_res_phase()
 
         self.Tipper.tipper = t_arr
         self.Tipper.tipper_err = t_err_arr
         self.Tipper.freq = freq_arr
         self.Tipper.rotation_angle = np.zeros_like(freq_arr)
-        self.Tipper._compute_amp_phase()
-        self.Tipper._compute_mag_direction()
 
     def write_edi_file(self, new_edi_fn=None):
         """
@@ -677,20 +639,14 @@ class Edi(object):
             raise MTex.MTpyError_EDI(
                 'Cannot write block for {0}'.format(data_key))
 
-        for d_index, d_comp in enumerate(data_comp_arr, 1):
-            if d_comp == 0.0 and data_key.lower() not in ['zrot', 'trot']:
-                d_comp = float(self.Header.empty)
-            # write the string in the specified format
-            num_str = '{0:{1}}'.format(d_comp, self._num_format)
-
-            # check to see if a new line is needed
-            if d_index % self._block_len == 0:
-                num_str += '\n'
-            # at the end of the block add a return
-            if d_index == data_comp_arr.size:
-                num_str += '\n'
+        data_comp_arr = np.asarray(data_comp_arr)
+        if data_key.lower() not in ['zrot', 'trot']:
+            data_comp_arr = np.where(data_comp_arr == 0.0,
+                                     float(self.Header.empty), data_comp_arr)
 
-            block_lines.append(num_str)
+        block_lines.append(_format_data_block(data_comp_arr,
+                                              self._num_format,
+                                              self._block_len))
 
         return block_lines
 
@@ -721,9 +677,9 @@ class Edi(object):
         return self.Header.long
 
     def _set_lon(self, input_lon):
-        self.Header.lon = MTft._assert_position_format('lon', input_lon)
+        self.Header.long = MTft._assert_position_format('lon', input_lon)
         logger.info('Converted input longitude to decimal degrees: {0: .6f}'.format(
-            self.Header.lon))
+            self.Header.long))
 
     lon = property(fget=_get_lon, fset=_set_lon,
                    doc='Longitude in decimal degrees')
@@ -751,6 +707,36 @@ class Edi(object):
     station = property(fget=_get_station, fset=_set_station,
                        doc="station name")
 
+    # --> Z and Tipper, read on first access if the file was read with
+    # data=False
+    def _get_Z(self):
+        if not self._data_loaded:
+            self._load_data()
+        return self._Z
+
+    def _set_Z(self, z_object):
+        # read the data first, so they cannot replace the new object later
+        if not self._data_loaded:
+            self._load_data()
+        self._Z = z_object
+
+    Z = property(fget=_get_Z, fset=_set_Z,
+                 doc="mtpy.core.z.Z impedance object")
+
+    def _get_Tipper(self):
+        if not self._data_loaded:
+            self._load_data()
+        return self._Tipper
+
+    def _set_Tipper(self, tipper_object):
+        # read the data first, so they cannot replace the new object later
+        if not self._data_loaded:
+            self._load_data()
+        self._Tipper = tipper_object
+
+    Tipper = property(fget=_get_Tipper, fset=_set_Tipper,
+                      doc="mtpy.core.z.Tipper object")
+
 
 # ==============================================================================
 # Index finder
@@ -1788,6 +1774,239 @@ class DataSection(object):
         return data_sect_lines
 
 
+def _format_data_block(data_arr, num_format, block_len):
+    """
+    format the numbers of a data block, block_len numbers per line, in one
+    call to str.format.  The block ends with an extra return, so a block
+    with a full last line ends with an empty line.
+
+    :param data_arr: np.ndarray of numbers
+    :param num_format: format spec of a number, e.g. ' 15.6e'
+    :param block_len: number of numbers per line
+    :return: string
+    """
+    n_data = data_arr.size
+    if n_data == 0:
+        return ''
+
+    num_str = '{:' + num_format + '}'
+    n_lines, n_last = divmod(n_data, block_len)
+    block_str = (num_str * block_len + '\n') * n_lines + \
+        num_str * n_last + '\n'
+
+    return block_str.format(*np.ravel(data_arr).tolist())
+
+
+def _read_edi_lines(edi_fn, data=True):
+    """
+    read the lines of an edi file.  If data is False, stop after the data
+    section header (>=MTSECT or >=SPECTRASECT) and return the lines up to
+    and including the first line of the data blocks.
+    """
+    with open(edi_fn, 'r') as fid:
+        if data:
+            return fid.readlines()
+
+        edi_lines = []
+        data_sect_find = False
+        for line in fid:
+            edi_lines.append(line)
+            if '>=' in line and 'sect' in line.lower():
+                data_sect_find = True
+            elif '>' in line and data_sect_find is True:
+                break
+
+    return edi_lines
+
+
+def _read_data_blocks(data_lines):
+    """
+    read the numbers of the impedance, tipper and frequency blocks of the
+    data section in one pass.
+
+    A block starts at a line >KEY ... and ends at the next line containing
+    '>' without a '!'.  Comment lines (containing '!') are skipped.  Null
+    values, 1.0e32 or anything that is not a number (e.g. ******), are set
+    to 0.
+
+    :param data_lines: lines of the data section
+    :return: dictionary {key: np.ndarray}, keys are lower case
+    """
+    header_index = [ii for ii, line in enumerate(data_lines)
+                    if '>' in line and '!' not in line]
+
+    data_dict = {}
+    for start, end in zip(header_index,
+                          header_index[1:] + [len(data_lines)]):
+        key = data_lines[start].strip()[1:].strip().split()[0].lower()
+        if key[0] != 'z' and key[0] != 't' and key != 'freq':
+            continue
+
+        data_str = ' '.join([line for line in data_lines[start + 1:end]
+                             if '!' not in line])
+        data_dict[key] = _str_to_array(data_str)
+
+    return data_dict
+
+
+def _str_to_array(data_str):
+    """
+    convert a string of white space separated numbers into an array, values
+    that are not a number or 1.0e32 are set to 0.
+    """
+    values = data_str.split()
+    try:
+        data_arr = np.array(values, dtype=np.float)
+    except ValueError:
+        # there are null components like ****, convert one by one
+        data_arr = np.zeros(len(values), dtype=np.float)
+        for ii, value in enumerate(values):
+            try:
+                data_arr[ii] = float(value)
+            except ValueError:
+                pass
+
+    data_arr[data_arr == 1.0e32] = 0.0
+
+    return data_arr
+
+
+def _cross_powers(spectra_arr):
+    """
+    make the Hermitian cross power matrices from the spectra blocks of an
+    edi file.
+
+    The spectra blocks hold the real parts of the cross powers in the lower
+    triangle and the imaginary parts in the upper triangle, the auto powers
+    are on the diagonal.
+
+    :param spectra_arr: np.ndarray(n_freq, n_comp, n_comp) as read in
+    :return: np.ndarray(n_freq, n_comp, n_comp, dtype=complex)
+    """
+    n_comp = spectra_arr.shape[-1]
+    lower = np.tri(n_comp, k=-1, dtype=np.bool)
+    diag = np.eye(n_comp, dtype=np.bool)
+
+    real_lower = np.where(lower, spectra_arr, 0.)
+    imag_upper = np.where(lower.T, spectra_arr, 0.)
+
+    # original spectra data are of form <A,B*>, but we need the order
+    # <B,A*>, this is achieved by complex conjugation of the original entries
+    # in the upper triangle, the lower triangle keeps the conjugated entries
+    s_real = np.where(diag, spectra_arr, 0.) + real_lower + \
+        np.swapaxes(real_lower, -1, -2)
+    s_imag = np.swapaxes(imag_upper, -1, -2) - imag_upper
+
+    return s_real + 1j * s_imag
+
+
+def _spectra_to_z(spectra_arr, avgt_arr, comp_list):
+    """
+    convert spectra blocks to impedance and tipper using the formulas from
+    Bahr/Simpson, errors are the 68% quantile of the Fisher distribution and
+    are only computed if scipy is available.
+
+    :param spectra_arr: np.ndarray(n_freq, n_comp, n_comp) as read in
+    :param avgt_arr: np.ndarray(n_freq) number of averaged time windows
+    :param comp_list: list of components in the order of the spectra
+    :return: z, z_err, tipper, tipper_err
+    """
+    # get an object that contains the indices for each component
+    cc = index_locator(comp_list)
+    n_freq = spectra_arr.shape[0]
+
+    # the entries of S are sorted like
+    # <X,X*>  <X,Y*>  <X,Z*>  <X,En*>  <X,Ee*>  <X,Rx*>  <X,Ry*>
+    #         <Y,Y*>  <Y,Z*>  <Y,En*>  <Y,Ee*>  <Y,Rx*>  <Y,Ry*>
+    # .....
+    s_arr = _cross_powers(spectra_arr)
+
+    def s(ii, jj):
+        return s_arr[:, ii, jj]
+
+    z_arr = np.zeros((n_freq, 2, 2), dtype=np.complex)
+    t_arr = np.zeros((n_freq, 1, 2), dtype=np.complex)
+
+    z_err_arr = np.zeros_like(z_arr, dtype=np.float)
+    t_err_arr = np.zeros_like(t_arr, dtype=np.float)
+
+    z_arr[:, 0, 0] = s(cc.ex, cc.rhx) * s(cc.hy, cc.rhy) - \
+        s(cc.ex, cc.rhy) * s(cc.hy, cc.rhx)
+    z_arr[:, 0, 1] = s(cc.ex, cc.rhy) * s(cc.hx, cc.rhx) - \
+        s(cc.ex, cc.rhx) * s(cc.hx, cc.rhy)
+    z_arr[:, 1, 0] = s(cc.ey, cc.rhx) * s(cc.hy, cc.rhy) - \
+        s(cc.ey, cc.rhy) * s(cc.hy, cc.rhx)
+    z_arr[:, 1, 1] = s(cc.ey, cc.rhy) * s(cc.hx, cc.rhx) - \
+        s(cc.ey, cc.rhx) * s(cc.hx, cc.rhy)
+
+    h_det = s(cc.hx, cc.rhx) * s(cc.hy, cc.rhy) - \
+        s(cc.hx, cc.rhy) * s(cc.hy, cc.rhx)
+    z_arr /= h_det[:, np.newaxis, np.newaxis]
+
+    # scipy is only imported when spectra are converted
+    try:
+        import scipy.stats.distributions as ssd
+
+        ssd_test = True
+    except ImportError:
+        print 'Need scipy.stats.distributions to compute spectra errors'
+        print 'Could not find scipy.stats.distributions, check distribution'
+        ssd_test = False
+
+    if ssd_test is True:
+        # 68% Quantil of the Fisher distribution:
+        z_det = np.real(s(cc.hx, cc.hx) * s(cc.hy, cc.hy) -
+                        np.abs(s(cc.hx, cc.hy) ** 2))
+
+        sigma_quantil = ssd.f.ppf(0.68, 4, avgt_arr - 4)
+
+        def scaling(comp):
+            """
+            error scaling of the component predicted from hx, hy
+            """
+            a = (s(comp, cc.hx) * s(cc.hy, cc.hy) -
+                 s(comp, cc.hy) * s(cc.hy, cc.hx)) / z_det
+            b = (s(comp, cc.hy) * s(cc.hx, cc.hx) -
+                 s(comp, cc.hx) * s(cc.hx, cc.hy)) / z_det
+
+            psi_squared = np.real(1. / s(comp, comp).real *
+                                  (a * s(cc.hx, comp) + b * s(cc.hy, comp)))
+            epsilon_squared = 1. - psi_squared
+
+            return sigma_quantil * 4 / (avgt_arr - 4.) * epsilon_squared / \
+                z_det * s(comp, comp).real
+
+        with np.errstate(invalid='ignore'):
+            # 1) Ex
+            ex_scaling = scaling(cc.ex)
+            z_err_arr[:, 0, 0] = np.sqrt(ex_scaling * s(cc.hy, cc.hy).real)
+            z_err_arr[:, 0, 1] = np.sqrt(ex_scaling * s(cc.hx, cc.hx).real)
+
+            # 2) EY
+            ey_scaling = scaling(cc.ey)
+            z_err_arr[:, 1, 0] = np.sqrt(ey_scaling * s(cc.hy, cc.hy).real)
+            z_err_arr[:, 1, 1] = np.sqrt(ey_scaling * s(cc.hx, cc.hx).real)
+
+    # if HZ information is present:
+    if len(comp_list) > 5:
+        t_arr[:, 0, 0] = s(cc.hz, cc.rhx) * s(cc.hy, cc.rhy) - \
+            s(cc.hz, cc.rhy) * s(cc.hy, cc.rhx)
+        t_arr[:, 0, 1] = s(cc.hz, cc.rhy) * s(cc.hx, cc.rhx) - \
+            s(cc.hz, cc.rhx) * s(cc.hx, cc.rhy)
+
+        t_arr /= h_det[:, np.newaxis, np.newaxis]
+
+        if ssd_test is True:
+            with np.errstate(invalid='ignore'):
+                hz_scaling = scaling(cc.hz)
+                t_err_arr[:, 0, 0] = np.sqrt(hz_scaling *
+                                             s(cc.hy, cc.hy).real)
+                t_err_arr[:, 0, 1] = np.sqrt(hz_scaling *
+                                             s(cc.hx, cc.hx).real)
+
+    return z_arr, z_err_arr, t_arr, t_err_arr
+
+
 def _validate_str_with_equals(input_string):
     """
     make sure an input string is of the format {0}={1} {2}={3} {4}={5} ...
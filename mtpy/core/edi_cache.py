@@ -0,0 +1,474 @@
+#!/usr/bin/env python
+
+"""
+=============
+edi_cache module
+=============
+
+Binary cache of parsed .edi files.  Parsing a text .edi file is slow
+compared to loading a few arrays, so the parsed metadata sections and the
+impedance and tipper arrays can be kept in a compact binary file, either in
+a central cache directory or as a sidecar next to the .edi file.
+
+A cache entry is only used while the size and modification time of the
+.edi file are the same as when the entry was written.  If only the
+modification time changed, the SHA-1 hash of the file decides and an entry
+that is still valid is updated to the new modification time.
+
+The cache is opt-in.  Either set the environment variable MTPY_EDI_CACHE
+to a cache directory or call enable() before reading .edi files; every
+Edi (and so MT, EdiCollection, ...) object then uses it.
+
+Classes
+---------
+    * EdiCache --> stores, loads and prunes cache entries.
+
+Functions
+-----------
+    * enable --> use a cache for all .edi files read from now on
+    * disable --> stop using the cache
+    * get_default_cache --> cache used by Edi.read_edi_file, or None
+    * main --> command line interface to inspect, prune or clear a cache
+
+    >>> import mtpy.core.edi_cache as edi_cache
+    >>> edi_cache.enable(r"/home/mt/.edi_cache", max_size=500 * 1024 ** 2)
+    >>> mt_obj = mtpy.core.mt.MT(r"/home/mt/mt01.edi")
+
+"""
+
+# =================================================================
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from mtpy.utils.mtpylog import MtPyLog
+
+logger = MtPyLog().get_mtpy_logger(__name__)
+# =================================================================
+
+CACHE_VERSION = 1
+CACHE_EXT = '.edicache'
+DEFAULT_MAX_SIZE = 1024 ** 3
+CACHE_ENV = 'MTPY_EDI_CACHE'
+
+# arrays stored for Z and Tipper, their shape for one frequency and whether
+# they are complex
+_array_layout = [('freq', (), False),
+                 ('z', (2, 2), True),
+                 ('z_err', (2, 2), False),
+                 ('z_rotation_angle', (), False),
+                 ('tipper', (1, 2), True),
+                 ('tipper_err', (1, 2), False),
+                 ('tipper_rotation_angle', (), False)]
+
+
+def _file_hash(fn, block_size=2 ** 20):
+    """
+    SHA-1 hash of the contents of a file
+    """
+    sha = hashlib.sha1()
+    with open(fn, 'rb') as fid:
+        block = fid.read(block_size)
+        while block:
+            sha.update(block)
+            block = fid.read(block_size)
+    return sha.hexdigest()
+
+
+def _pack_arrays(arrays, n_freq):
+    """
+    pack the Z and Tipper arrays into one little endian float64 array
+    """
+    data_list = []
+    for key, shape, is_complex in _array_layout:
+        arr = np.resize(np.asarray(arrays[key]), (n_freq,) + shape)
+        if is_complex:
+            arr = arr.astype(np.complex).view(np.float)
+        data_list.append(np.ravel(arr))
+    return np.concatenate(data_list).astype('<f8')
+
+
+def _unpack_arrays(data, n_freq):
+    """
+    split a float64 array written by _pack_arrays into the Z and Tipper
+    arrays, None if data has the wrong length
+    """
+    arrays = {}
+    index = 0
+    for key, shape, is_complex in _array_layout:
+        n_value = n_freq * int(np.prod(shape)) * (2 if is_complex else 1)
+        arr = data[index:index + n_value].astype(np.float)
+        if is_complex:
+            arr = arr.view(np.complex)
+        arrays[key] = arr.reshape((n_freq,) + shape)
+        index += n_value
+
+    if index != data.size:
+        return None
+    return arrays
+
+
+def _write_entry(cache_fn, header, edi_bytes, data):
+    """
+    write a cache entry through a temporary file in the same directory, so a
+    reader never sees a half written entry
+    """
+    tmp_fid, tmp_fn = tempfile.mkstemp(suffix=CACHE_EXT,
+                                       dir=os.path.dirname(cache_fn))
+    with os.fdopen(tmp_fid, 'wb') as fid:
+        fid.write((json.dumps(header) + '\n').encode('utf-8'))
+        fid.write(edi_bytes)
+        fid.write(data.astype('<f8').tobytes())
+    if os.path.isfile(cache_fn):
+        os.remove(cache_fn)
+    os.rename(tmp_fn, cache_fn)
+
+
+class EdiCache(object):
+    """
+    Cache of parsed .edi files.
+
+    Each entry is a binary file with a one line JSON header holding the
+    size, modification time and hash of the .edi file.  It is followed by
+    the lines of the .edi file before the data blocks (HEAD, INFO,
+    DEFINEMEAS and the data section header) and the frequency, impedance
+    and tipper arrays with their errors and rotation angles as little
+    endian float64.
+
+    Arguments
+    -----------
+        **cache_dir** : string
+                        directory to keep the cache entries in.  If None,
+                        entries are written as sidecar files
+                        (station.edi.edicache) next to the .edi files.
+                        *default* is None
+
+        **max_size** : int
+                       maximum total size (bytes) of a cache directory.
+                       When it is exceeded the least recently used entries
+                       are removed.  Not applied to sidecar files.
+                       *default* is 1 GB
+
+        **verify_hash** : [ True | False ]
+                          always compare the hash of the .edi file, not
+                          only when the modification time changed.
+                          *default* is False
+
+    Examples
+    ----------
+
+        >>> import mtpy.core.edi_cache as edi_cache
+        >>> cache = edi_cache.EdiCache(r"/home/mt/.edi_cache")
+        >>> edi_obj = mtpy.core.edi.Edi(r"/home/mt/mt01.edi", cache=cache)
+        >>> cache.prune(max_size=100 * 1024 ** 2)
+    """
+
+    def __init__(self, cache_dir=None, max_size=DEFAULT_MAX_SIZE,
+                 verify_hash=False):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.verify_hash = verify_hash
+
+        # running total of the size of the cache directory, None until the
+        # directory has been scanned
+        self._size = None
+
+        if self.cache_dir is not None:
+            self.cache_dir = os.path.abspath(self.cache_dir)
+            if not os.path.isdir(self.cache_dir):
+                os.makedirs(self.cache_dir)
+
+    def cache_fn(self, edi_fn):
+        """
+        full path of the cache entry of edi_fn
+        """
+        edi_fn = os.path.abspath(edi_fn)
+        if self.cache_dir is None:
+            return edi_fn + CACHE_EXT
+
+        key = hashlib.sha1(edi_fn.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key + CACHE_EXT)
+
+    def load(self, edi_fn):
+        """
+        load the cache entry of edi_fn
+
+        Returns
+        ----------
+            **entry** : dict
+                        keys are 'edi_lines', 'data_line_num', 'data_type'
+                        and the array names freq, z, z_err,
+                        z_rotation_angle, tipper, tipper_err and
+                        tipper_rotation_angle.  None if there is no valid
+                        entry.
+        """
+        cache_fn = self.cache_fn(edi_fn)
+        if not os.path.isfile(cache_fn):
+            return None
+
+        new_mtime = False
+        try:
+            edi_stat = os.stat(edi_fn)
+            with open(cache_fn, 'rb') as fid:
+                header = json.loads(fid.readline().decode('utf-8'))
+                if header['version'] != CACHE_VERSION or \
+                        header['src_size'] != edi_stat.st_size:
+                    return None
+
+                if self.verify_hash or \
+                        header['src_mtime'] != edi_stat.st_mtime:
+                    if header['src_sha1'] != _file_hash(edi_fn):
+                        return None
+                    new_mtime = header['src_mtime'] != edi_stat.st_mtime
+
+                edi_bytes = fid.read(header['n_bytes'])
+                edi_str = edi_bytes
+                if not isinstance(edi_str, str):
+                    edi_str = edi_str.decode('utf-8')
+                data = np.frombuffer(fid.read(), dtype='<f8')
+        except (IOError, OSError, KeyError, ValueError) as error:
+            logger.info('Could not read cache entry %s: %s', cache_fn, error)
+            return None
+
+        entry = _unpack_arrays(data, header['n_freq'])
+        if entry is None:
+            logger.info('Cache entry %s is truncated', cache_fn)
+            return None
+        entry['edi_lines'] = edi_str.splitlines(True)
+        entry['data_line_num'] = header['data_line_num']
+        entry['data_type'] = str(header['data_type'])
+
+        if new_mtime:
+            # same contents with a new modification time (e.g. a copy or a
+            # touch), keep the new time so the file is not hashed again
+            header['src_mtime'] = edi_stat.st_mtime
+            try:
+                _write_entry(cache_fn, header, edi_bytes, data)
+            except (IOError, OSError) as error:
+                logger.info('Could not update cache entry %s: %s', cache_fn,
+                            error)
+        else:
+            # mark as recently used for the eviction
+            try:
+                os.utime(cache_fn, None)
+            except OSError:
+                pass
+
+        return entry
+
+    def store(self, edi_fn, edi_lines, data_line_num, data_type, **arrays):
+        """
+        write the cache entry of edi_fn
+
+        Arguments
+        -----------
+            **edi_fn** : string
+                         full path to the .edi file that was parsed
+
+            **edi_lines** : list
+                            lines of the .edi file before the data blocks
+
+            **data_line_num** : int
+                                index of the first line of the data blocks
+
+            **data_type** : string
+                            'z' or 'spectra'
+
+            **arrays** : np.ndarray
+                         freq, z, z_err, z_rotation_angle, tipper,
+                         tipper_err and tipper_rotation_angle
+
+        Returns
+        ----------
+            **cache_fn** : string
+                           full path to the cache entry, None if it could
+                           not be written
+        """
+        cache_fn = self.cache_fn(edi_fn)
+
+        edi_bytes = ''.join(edi_lines)
+        if not isinstance(edi_bytes, bytes):
+            edi_bytes = edi_bytes.encode('utf-8')
+        n_freq = len(arrays['freq'])
+
+        try:
+            edi_stat = os.stat(edi_fn)
+            header = {'version': CACHE_VERSION,
+                      'src_size': edi_stat.st_size,
+                      'src_mtime': edi_stat.st_mtime,
+                      'src_sha1': _file_hash(edi_fn),
+                      'data_line_num': int(data_line_num),
+                      'data_type': data_type,
+                      'n_freq': n_freq,
+                      'n_bytes': len(edi_bytes)}
+            _write_entry(cache_fn, header, edi_bytes,
+                         _pack_arrays(arrays, n_freq))
+        except (IOError, OSError) as error:
+            logger.info('Could not write cache entry %s: %s', cache_fn, error)
+            return None
+
+        if self.cache_dir is not None:
+            if self._size is None:
+                self._size = self.size()
+            else:
+                self._size += os.path.getsize(cache_fn)
+            if self.max_size is not None and self._size > self.max_size:
+                self.prune()
+
+        return cache_fn
+
+    def entries(self):
+        """
+        list of (cache_fn, size, last access time) of the cache directory,
+        least recently used first
+        """
+        if self.cache_dir is None or not os.path.isdir(self.cache_dir):
+            return []
+
+        entry_list = []
+        for fn in os.listdir(self.cache_dir):
+            if not fn.endswith(CACHE_EXT):
+                continue
+            cache_fn = os.path.join(self.cache_dir, fn)
+            try:
+                fn_stat = os.stat(cache_fn)
+            except OSError:
+                continue
+            entry_list.append((cache_fn, fn_stat.st_size, fn_stat.st_mtime))
+
+        return sorted(entry_list, key=lambda entry: entry[2])
+
+    def size(self):
+        """
+        total size (bytes) of the cache directory
+        """
+        return sum([entry[1] for entry in self.entries()])
+
+    def prune(self, max_size=None):
+        """
+        remove the least recently used entries of the cache directory until
+        its total size is at most max_size (bytes), *default* is
+        self.max_size
+
+        Returns
+        ----------
+            **removed** : list
+                          full paths of the removed entries
+        """
+        if max_size is None:
+            max_size = self.max_size
+
+        entry_list = self.entries()
+        total_size = sum([entry[1] for entry in entry_list])
+
+        removed = []
+        for cache_fn, fn_size, fn_time in entry_list:
+            if max_size is not None and total_size <= max_size:
+                break
+            try:
+                os.remove(cache_fn)
+            except OSError:
+                continue
+            total_size -= fn_size
+            removed.append(cache_fn)
+
+        self._size = total_size
+        logger.info('Removed %d entries from %s', len(removed), self.cache_dir)
+        return removed
+
+    def clear(self):
+        """
+        remove all entries of the cache directory
+        """
+        return self.prune(max_size=0)
+
+
+_default_cache = None
+_disabled = False
+
+
+def enable(cache_dir=None, max_size=DEFAULT_MAX_SIZE, verify_hash=False):
+    """
+    use an EdiCache for all .edi files read from now on, see EdiCache for
+    the arguments
+
+    Returns
+    ----------
+        **cache** : EdiCache
+    """
+    global _default_cache, _disabled
+    _default_cache = EdiCache(cache_dir=cache_dir, max_size=max_size,
+                              verify_hash=verify_hash)
+    _disabled = False
+    return _default_cache
+
+
+def disable():
+    """
+    stop using the cache, also if MTPY_EDI_CACHE is set
+    """
+    global _default_cache, _disabled
+    _default_cache = None
+    _disabled = True
+
+
+def get_default_cache():
+    """
+    the EdiCache set with enable() or by the environment variable
+    MTPY_EDI_CACHE, None if caching is not enabled
+    """
+    global _default_cache
+    if _default_cache is None and not _disabled and \
+            os.environ.get(CACHE_ENV):
+        _default_cache = EdiCache(cache_dir=os.environ[CACHE_ENV])
+    return _default_cache
+
+
+def main(args=None):
+    """
+    command line interface to inspect, prune or clear a cache directory
+
+        mtpy_edi_cache info ~/.edi_cache
+        mtpy_edi_cache prune ~/.edi_cache --max_size 500
+        mtpy_edi_cache clear ~/.edi_cache
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Inspect, prune or clear an mtpy edi cache directory')
+    parser.add_argument('command', choices=['info', 'prune', 'clear'],
+                        help='show the size of the cache, remove the least '
+                             'recently used entries or remove all entries')
+    parser.add_argument('cache_dir', nargs='?', default=os.environ.get(CACHE_ENV),
+                        help='cache directory, *default* is $' + CACHE_ENV)
+    parser.add_argument('-s', '--max_size', type=float,
+                        default=DEFAULT_MAX_SIZE / 1024. ** 2,
+                        help='maximum size in MB to prune to')
+    args = parser.parse_args(args)
+
+    if args.cache_dir is None:
+        parser.error('no cache directory given and {0} is not set'.format(
+            CACHE_ENV))
+    if not os.path.isdir(args.cache_dir):
+        parser.error('{0} is not a directory'.format(args.cache_dir))
+
+    cache = EdiCache(cache_dir=args.cache_dir,
+                     max_size=int(args.max_size * 1024 ** 2))
+    if args.command == 'prune':
+        removed = cache.prune()
+        print('Removed {0} entries'.format(len(removed)))
+    elif args.command == 'clear':
+        removed = cache.clear()
+        print('Removed {0} entries'.format(len(removed)))
+
+    entry_list = cache.entries()
+    print('{0}: {1} entries, {2:.1f} MB'.format(
+        cache.cache_dir, len(entry_list),
+        sum([entry[1] for entry in entry_list]) / 1024. ** 2))
+
+
+if __name__ == '__main__':
+    main()
@@ -9,22 +9,22 @@ InitDate: 2017-04-20
 
 from __future__ import print_function
 
-import csv
+import collections
 import glob
 import logging
 import os
 import sys
 
-import geopandas as gpd
-import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
-from shapely.geometry import Point  # , Polygon, LineString, LinearRing
 
 # import matplotlib as mpl
 # from mpl_toolkits.axes_grid1 import make_axes_locatable
 import mtpy.core.mt as mt
-import mtpy.imaging.mtplottools as mtplottools
+import mtpy.core.mt_loader as mt_loader
+import mtpy.core.period_index as period_index
+import mtpy.core.spatial_index as spatial_index
+import mtpy.core.survey_archive as survey_archive
+import mtpy.core.survey_export as survey_export
 from mtpy.utils.decorator import deprecated
 from mtpy.utils.mtpylog import MtPyLog
 
@@ -51,20 +51,96 @@ def is_num_in_seq(anum, aseq, atol=0.0001):
     return False
 
 
+class _cached_property(object):
+    """
+    property computed on first access and then kept in the instance,
+    delete the attribute to compute it again
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.__doc__ = func.__doc__
+
+    def __get__(self, obj, cls):
+        if obj is None:
+            return self
+        value = obj.__dict__[self.func.__name__] = self.func(obj)
+        return value
+
+
+class MTStationList(object):
+    """
+    Read-only sequence of the MT objects of a list of edi files. An MT object is read from its edi file
+    (or the edi cache, see mtpy.core.edi_cache) when it is accessed. If max_loaded is given only that many
+    of the most recently used MT objects are kept in memory, otherwise all objects read are kept.
+
+    :param edi_list: list of edi files
+    :param max_loaded: maximum number of MT objects kept, default None keeps all
+    """
+
+    def __init__(self, edi_list, max_loaded=None):
+        self.edi_list = list(edi_list)
+        self.max_loaded = max_loaded
+        self._loaded = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self.edi_list)
+
+    def __iter__(self):
+        for index in range(len(self.edi_list)):
+            yield self[index]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[ii] for ii in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self.edi_list)
+        if not 0 <= index < len(self.edi_list):
+            raise IndexError("station index out of range")
+
+        # the most recently used objects are at the end
+        mt_obj = self._loaded.pop(index, None)
+        if mt_obj is None:
+            mt_obj = mt.MT(self.edi_list[index])
+        self._loaded[index] = mt_obj
+        if self.max_loaded is not None:
+            while len(self._loaded) > max(self.max_loaded, 1):
+                self._loaded.popitem(last=False)
+
+        return mt_obj
+
+
 class EdiCollection(object):
     """
-    A super class to encapsulate the properties pertinent to a set of EDI files
+    A super class to encapsulate the properties pertinent to a set of EDI files.
+    The periods, the station table (geopdf), the bounding box and the period and spatial indices
+    are computed when they are first accessed.
     """
 
-    def __init__(self, edilist=None, mt_objs=None, ptol=0.05):
+    def __init__(self, edilist=None, mt_objs=None, ptol=0.05, n_workers=1,
+                 archive=None, max_loaded=None):
         """ constructor
         :param edilist: a list of edifiles with full path, for read-only
+        :param mt_objs: a list of MT objects
+        :param archive: a survey archive directory or SurveyArchive, see mtpy.core.survey_archive
         :param ptol: period tolerance considered as equal, default 0.05 means 5 percent
         this param controls what freqs/periods are grouped together:
         10pct may result more double counting of freq/period data than 5pct.
         eg: E:/Data/MT_Datasets/WenPingJiang_EDI 18528 rows vs 14654 rows
+        :param n_workers: number of processes reading the edi files, None for one per CPU.
+        with more than one, edi files that can not be read are left out of the collection and
+        listed in self.load_errors, with a single worker their error is raised.
+        :param max_loaded: if given with edilist and a single worker, the MT objects are read from the edi files
+        when they are used and only the max_loaded most recently used are kept in memory, see MTStationList.
+        An edi file that can not be read raises an error when it is used.
         """
 
+        if archive is not None:
+            if not isinstance(archive, survey_archive.SurveyArchive):
+                archive = survey_archive.SurveyArchive(archive)
+            mt_objs = archive.to_mt_list()
+
         if edilist is not None:
             self.edifiles = edilist
             logger.info("number of edi files in this collection: %s",
@@ -73,54 +149,92 @@ class EdiCollection(object):
             self.edifiles = [mt_obj.fn for mt_obj in mt_objs]
         assert len(self.edifiles) > 0
 
-        self.num_of_edifiles = len(self.edifiles)  # number of stations
-        print("number of stations/edifiles = %s" % self.num_of_edifiles)
-
         self.ptol = ptol
-
-        if edilist is not None:
-            # if edilist is provided, always create MT objects from the list
+        self._from_edi_files = edilist is not None
+        self.load_errors = []
+
+        if edilist is not None and max_loaded is not None and n_workers == 1:
+            # MT objects are read when they are needed
+            logger.debug("streaming MT objects from edi files")
+            self.mt_obj_list = MTStationList(self.edifiles,
+                                             max_loaded=max_loaded)
+        elif edilist is not None:
+            # if edilist is provided, always create MT objects from the list.
+            # with a single worker the data blocks are read when they are
+            # first needed, otherwise the workers read them
             logger.debug("constructing MT objects from edi files")
-            self.mt_obj_list = [mt.MT(edi) for edi in self.edifiles]
+            loader = mt_loader.MTLoader(n_workers=n_workers,
+                                        data=n_workers != 1)
+            self.mt_obj_list = loader.load(self.edifiles)
+            self.edifiles = loader.loaded_edi_list
+            self.load_errors = loader.errors
         elif mt_objs is not None:
             # use the supplied mt_objs
             self.mt_obj_list = list(mt_objs)
         else:
             logger.error("None Edi file set")
 
-        # get all frequencies from all edi files
-        self.all_frequencies = None
-        self.mt_periods = None
-        self.all_unique_periods = self._get_all_periods()
-
-        self.geopdf = self.create_mt_station_gdf()
-
-        self.bound_box_dict = self.get_bounding_box()  # in orginal projection
+        self.num_of_edifiles = len(self.edifiles)  # number of stations
+        print("number of stations/edifiles = %s" % self.num_of_edifiles)
 
         return
 
-    def _get_all_periods(self):
+    @_cached_property
+    def station_info(self):
         """
-        from the list of edi files get a list of all unique periods from the frequencies.
+        station, lon, lat, elev, utm_zone and frequencies of every station, collected in a single pass
+        over the MT objects
+        :return: dict of lists
         """
-        if self.all_frequencies is not None:  # already initialized
-            return
-
-        # get all frequencies from all edi files
-        all_freqs = []
+        info = dict((key, []) for key in ['station', 'lon', 'lat', 'elev', 'utm_zone', 'freq'])
         for mt_obj in self.mt_obj_list:
-            all_freqs.extend(list(mt_obj.Z.freq))
-
-        self.mt_periods = 1.0 / np.array(all_freqs)
-
-        # sort all frequencies so that they are in ascending order,
-        # use set to remove repeats and make an array
-        self.all_frequencies = sorted(list(set(all_freqs)))
-
-        logger.debug("Number of MT Frequencies: %s", len(self.all_frequencies))
+            info['station'].append(mt_obj.station)
+            info['lon'].append(mt_obj.lon)
+            info['lat'].append(mt_obj.lat)
+            info['elev'].append(mt_obj.elev)
+            info['utm_zone'].append(mt_obj.utm_zone)
+            info['freq'].append(mt_obj.Z.freq)
+        return info
+
+    @_cached_property
+    def period_index(self):
+        """
+        index of the frequencies of all edi files, sorted once, see mtpy.core.period_index.PeriodIndex
+        """
+        return period_index.PeriodIndex(self.station_info['freq'], ptol=self.ptol)
+
+    @_cached_property
+    def mt_periods(self):
+        """ periods of all stations """
+        return 1.0 / self.period_index.all_freq
+
+    @_cached_property
+    def all_frequencies(self):
+        """ all unique frequencies in ascending order """
+        all_frequencies = list(self.period_index.unique_freq)
+        logger.debug("Number of MT Frequencies: %s", len(all_frequencies))
+        return all_frequencies
+
+    @_cached_property
+    def all_unique_periods(self):
+        """ all unique periods in ascending order """
+        return self._get_all_periods()
+
+    @_cached_property
+    def geopdf(self):
+        """ geopandas dataframe of the station locations, see create_mt_station_gdf """
+        return self.create_mt_station_gdf()
+
+    @_cached_property
+    def bound_box_dict(self):
+        """ bounding box of the stations in the original projection """
+        return self.get_bounding_box()
 
-        all_periods = 1.0 / \
-                      np.array(sorted(self.all_frequencies, reverse=True))
+    def _get_all_periods(self):
+        """
+        from the list of edi files get a list of all unique periods from the frequencies.
+        """
+        all_periods = 1.0 / self.period_index.unique_freq[::-1]
 
         # logger.debug("Type of the all_periods %s", type(all_periods))
         logger.info("Number of MT Periods: %s", len(all_periods))
@@ -128,6 +242,15 @@ class EdiCollection(object):
 
         return all_periods
 
+    @_cached_property
+    def spatial_index(self):
+        """
+        spatial index of the station locations for radius, nearest neighbour and bounding box queries,
+        see mtpy.core.spatial_index.SpatialIndex. Station indices refer to mt_obj_list.
+        """
+        return spatial_index.SpatialIndex(self.station_info['lat'], self.station_info['lon'],
+                                          station=self.station_info['station'])
+
     def get_periods_by_stats(self, percentage=10.0):
         """
         check the presence of each period in all edi files, keep a list of periods which are at least percentage present
@@ -135,19 +258,16 @@ class EdiCollection(object):
         """
         adict = {}
         for aper in self.all_unique_periods:
-            station_list = []
             afreq = 1.0 / aper
-            acount = 0
-            for mt_obj in self.mt_obj_list:
-                # if afreq in mt_obj.Z.freq:
-                if is_num_in_seq(afreq, mt_obj.Z.freq):
-                    acount = acount + 1
-                    station_list.append(mt_obj.station)
+            # stations with a frequency within the tolerance of is_num_in_seq
+            stations = self.period_index.find_freq_atol(afreq)[0]
+            acount = len(stations)
 
             if (100.0 * acount) / self.num_of_edifiles >= percentage:
                 adict.update({aper: acount})
                 # print (aper, acount)
             else:
+                station_list = [self.mt_obj_list[ii].station for ii in stations]
                 logger.info("Period=%s is excluded. it is from stations: %s ", aper, station_list)
 
         mydict_ordered = sorted(
@@ -160,17 +280,28 @@ class EdiCollection(object):
         print("Selected periods %s out of the total %s:" % (len(selected_periods), len(self.all_unique_periods)))
         return selected_periods
 
+    def get_stations_by_period(self, period, ptol=None):
+        """
+        get the MT objects of the stations that have a period within ptol of period
+        :param period: period in s
+        :param ptol: relative tolerance of the frequency, default None uses self.ptol
+        :return: list of (mt_obj, index of the period in mt_obj.Z.freq)
+        """
+        stations, positions = self.period_index.find_period(period, ptol=ptol)
+        return [(self.mt_obj_list[ii], pp) for ii, pp in zip(stations, positions)]
+
     def create_mt_station_gdf(self, outshpfile=None):
         """
         create station location geopandas dataframe, and output to shape file outshpfile
         :return: gdf
         """
+        # GIS libraries are only imported when they are needed
+        import geopandas as gpd
+        import pandas as pd
+        from shapely.geometry import Point  # , Polygon, LineString, LinearRing
 
-        mt_stations = []
-
-        for mtobj in self.mt_obj_list:
-            mt_stations.append(
-                [mtobj.station, mtobj.lon, mtobj.lat, mtobj.elev, mtobj.utm_zone])
+        info = self.station_info
+        mt_stations = zip(info['station'], info['lon'], info['lat'], info['elev'], info['utm_zone'])
 
         pdf = pd.DataFrame(mt_stations, columns=['StationId', 'Lon', 'Lat', 'Elev', 'UtmZone'])
 
@@ -193,6 +324,7 @@ class EdiCollection(object):
         visualise the geopandas df of MT stations
         :return:
         """
+        import matplotlib.pyplot as plt
 
         gdf = self.geopdf
         gdf.plot(figsize=(10, 6), marker='o', color='blue', markersize=5)
@@ -211,6 +343,8 @@ class EdiCollection(object):
 
         :return:
         """
+        import geopandas as gpd
+        import matplotlib.pyplot as plt
 
         world = gpd.read_file(gpd.datasets.get_path('naturalearth_lowres'))
 
@@ -238,6 +372,7 @@ class EdiCollection(object):
         display/overlay the MT properties on a background geo-referenced map image
         :return:
         """
+        import matplotlib.pyplot as plt
         import examples.sandpit.plot_geotiff_imshow as plotegoimg
 
         myax = plotegoimg.plot_geotiff(
@@ -256,69 +391,61 @@ class EdiCollection(object):
 
         return myax2
 
-    def create_phase_tensor_csv(self, dest_dir, file_name="phase_tensor.csv"):
+    def _export_sources(self, n_workers):
+        """
+        MT objects or edi files the exported tables are made from. The workers read the edi files themselves
+        if the collection was read from them, so no MT objects are sent to them.
+        """
+        if self._from_edi_files and (n_workers != 1 or isinstance(self.mt_obj_list, MTStationList)):
+            return self.edifiles
+        return self.mt_obj_list
+
+    def _export(self, table_func, writer, n_workers):
+        """
+        write the tables of all stations at all_frequencies, station by station, see mtpy.core.survey_export
+        """
+        with writer:
+            counts = survey_export.export_tables(table_func, self._export_sources(n_workers),
+                                                 self.period_index.unique_freq, writer, ptol=self.ptol,
+                                                 n_workers=n_workers)
+        for freq, count in zip(self.all_frequencies, counts):
+            if count < self.num_of_edifiles:
+                logger.warn("Freq %s NOT found for %s stations", freq, self.num_of_edifiles - count)
+
+    def create_phase_tensor_csv(self, dest_dir, file_name="phase_tensor.csv", n_workers=1):
         """
         create phase tensor ellipse and tipper properties.
         reimplemented based on mtpy.utils.shapefiles_creator.ShapeFilesCreator.create_csv_files
+        The attributes of a station are computed for all frequencies at once and written out straight away,
+        see mtpy.core.survey_export.
         :param dest_dir: output directory
-        :param file_name: output file name
-        :return:
+        :param file_name: output file name, a csv file per frequency is written next to it
+        :param n_workers: number of processes computing the stations, None for one per CPU
+        :return: csvfname
         """
         csvfname = os.path.join(dest_dir, file_name)
+        name = os.path.splitext(file_name)
+        freq_files = [os.path.join(dest_dir, '{name[0]}_{freq}Hz{name[1]}'.format(freq=str(freq), name=name))
+                      for freq in self.all_frequencies]
 
-        pt_dict = {}
-
-        csv_header = ['station', 'freq', 'lon', 'lat', 'phi_min', 'phi_max', 'azimuth', 'skew',
-                      'n_skew', 'elliptic', 'tip_mag_re', 'tip_mag_im', 'tip_ang_re', 'tip_ang_im']
-
-        with open(csvfname, "wb") as csvf:
-            writer = csv.writer(csvf)
-            writer.writerow(csv_header)
-
-            for freq in self.all_frequencies:
-                ptlist = []
-                for mt_obj in self.mt_obj_list:
-                    freq_min = freq * (1 - self.ptol)
-                    freq_max = freq * (1 + self.ptol)
-                    f_index_list = [ff for ff, f2 in enumerate(mt_obj.Z.freq)
-                                    if (f2 > freq_min) and (f2 < freq * freq_max)]
-                    if len(f_index_list) > 1:
-                        logger.warn("more than one freq found %s", f_index_list)
-                    if len(f_index_list) >= 1:
-                        p_index = f_index_list[0]
-                        # geographic coord lat long and elevation
-                        # long, lat, elev = (mt_obj.lon, mt_obj.lat, 0)
-                        station, lon, lat = (mt_obj.station, mt_obj.lon, mt_obj.lat)
-
-                        pt_stat = [station, freq, lon, lat,
-                                   mt_obj.pt.phimin[0][p_index],
-                                   mt_obj.pt.phimax[0][p_index],
-                                   mt_obj.pt.azimuth[0][p_index],
-                                   mt_obj.pt.beta[0][p_index],
-                                   2 * mt_obj.pt.beta[0][p_index],
-                                   mt_obj.pt.ellipticity[0][p_index],  # FZ: get ellipticity begin here
-                                   mt_obj.Tipper.mag_real[p_index],
-                                   mt_obj.Tipper.mag_imag[p_index],
-                                   mt_obj.Tipper.angle_real[p_index],
-                                   mt_obj.Tipper.angle_imag[p_index]]
-
-                        ptlist.append(pt_stat)
-                    else:
-                        logger.warn("Freq %s NOT found for this station %s", freq, mt_obj.station)
-
-                csv_freq_file = os.path.join(dest_dir,
-                                             '{name[0]}_{freq}Hz{name[1]}'.format(
-                                                 freq=str(freq), name=os.path.splitext(file_name)))
-                with open(csv_freq_file, "wb") as freq_csvf:
-                    writer_freq = csv.writer(freq_csvf)
-                    writer_freq.writerow(csv_header)
-                    writer_freq.writerows(ptlist)
-
-                writer.writerows(ptlist)
-
-                pt_dict[freq] = ptlist
-
-        return pt_dict
+        self._export(survey_export.phase_tensor_table,
+                     survey_export.CsvTableWriter(csvfname, freq_files, survey_export.PT_COLUMNS), n_workers)
+
+        return csvfname
+
+    def create_phase_tensor_npz(self, dest_dir, file_name="phase_tensor.npz", n_workers=1):
+        """
+        phase tensor ellipse and tipper properties in a compressed columnar file, one array per column of
+        create_phase_tensor_csv, rows in station order. Read it with np.load.
+        :param dest_dir: output directory
+        :param file_name: output file name
+        :param n_workers: number of processes computing the stations, None for one per CPU
+        :return: npzfname
+        """
+        npzfname = os.path.join(dest_dir, file_name)
+        self._export(survey_export.phase_tensor_table,
+                     survey_export.NpzTableWriter(npzfname, survey_export.PT_COLUMNS), n_workers)
+        return npzfname
 
     @deprecated("This function is more expensive compared with create_phase_tensor_csv()")
     def create_phase_tensor_csv_with_image(self, dest_dir):
@@ -333,12 +460,7 @@ class EdiCollection(object):
             ptm.export_params_to_file(save_path=dest_dir)
         return
 
-    def create_measurement_csv(self, dest_dir='/e/tmp'):
-        """
-        create csv file from the data of EDI files: IMPEDANCE, APPARENT RESISTIVITIES AND PHASES
-        see also utils/shapefiles_creator.py
-        :return: csvfname
-        """
+    def _check_dest_dir(self, dest_dir):
         if dest_dir is None:
             raise Exception("output dir was not provided!!")
         else:
@@ -346,85 +468,43 @@ class EdiCollection(object):
             if not os.path.exists(dest_dir):
                 os.mkdir(dest_dir)
 
-        # summary csv file
+    def create_measurement_csv(self, dest_dir='/e/tmp', n_workers=1):
+        """
+        create csv file from the data of EDI files: IMPEDANCE, APPARENT RESISTIVITIES AND PHASES
+        see also utils/shapefiles_creator.py
+        The values of a station are computed for all frequencies at once and written out straight away,
+        see mtpy.core.survey_export.
+        :param n_workers: number of processes computing the stations, None for one per CPU
+        :return: csvfname
+        """
+        self._check_dest_dir(dest_dir)
+
+        # summary csv file and an individual csv file for each freq
         csv_basename = "edi_measurement"
         csvfname = os.path.join(dest_dir, "%s.csv" % csv_basename)
+        freq_files = [os.path.join(dest_dir, "%s_%sHz.csv" % (csv_basename, str(freq)))
+                      for freq in self.all_frequencies]
 
-        pt_dict = {}
+        self._export(survey_export.measurement_table,
+                     survey_export.CsvTableWriter(csvfname, freq_files, survey_export.MEASUREMENT_COLUMNS),
+                     n_workers)
 
-        csv_header = [
-            'FREQ', 'STATION', 'LAT', 'LON', 'ZXXre', 'ZXXim',
-            'ZXYre', 'ZXYim', 'ZYXre', 'ZYXim', 'ZYYre', 'ZYYim', 'TXre', 'TXim', 'TYre', 'TYim',
-            'RHOxx', 'RHOxy', 'RHOyx', 'RHOyy', 'PHSxx', 'PHSxy', 'PHSyx', 'PHSyy'
-        ]
-
-        with open(csvfname, "wb") as csvf:
-            writer = csv.writer(csvf)
-            writer.writerow(csv_header)
+        return csvfname
 
-        for freq in self.all_frequencies:
+    def create_measurement_npz(self, dest_dir='/e/tmp', n_workers=1):
+        """
+        the columns of create_measurement_csv in a compressed columnar file edi_measurement.npz, rows in
+        station order. Read it with np.load.
+        :param n_workers: number of processes computing the stations, None for one per CPU
+        :return: npzfname
+        """
+        self._check_dest_dir(dest_dir)
 
-            mtlist = []
-            for mt_obj in self.mt_obj_list:
-
-                f_index_list = [ff for ff, f2 in enumerate(mt_obj.Z.freq)
-                                if (f2 > freq * (1 - self.ptol)) and
-                                (f2 < freq * (1 + self.ptol))]
-                if len(f_index_list) > 1:
-                    logger.warn("more than one fre found %s", f_index_list)
-
-                if len(f_index_list) >= 1:
-                    p_index = f_index_list[0]
-
-                    logger.debug("The freqs index %s", f_index_list)
-                    # geographic coord lat long and elevation
-                    # long, lat, elev = (mt_obj.lon, mt_obj.lat, 0)
-                    station, lat, lon = (
-                        mt_obj.station, mt_obj.lat, mt_obj.lon)
-
-                    resist_phase = mtplottools.ResPhase(z_object=mt_obj.Z)
-                    # resist_phase.compute_res_phase()
-
-                    mt_stat = [freq, station, lat, lon,
-                               mt_obj.Z.z[p_index, 0, 0].real,
-                               mt_obj.Z.z[p_index, 0, 0].imag,
-                               mt_obj.Z.z[p_index, 0, 1].real,
-                               mt_obj.Z.z[p_index, 0, 1].imag,
-                               mt_obj.Z.z[p_index, 1, 0].real,
-                               mt_obj.Z.z[p_index, 1, 0].imag,
-                               mt_obj.Z.z[p_index, 1, 1].real,
-                               mt_obj.Z.z[p_index, 1, 1].imag,
-                               mt_obj.Tipper.tipper[p_index, 0, 0].real,
-                               mt_obj.Tipper.tipper[p_index, 0, 0].imag,
-                               mt_obj.Tipper.tipper[p_index, 0, 1].real,
-                               mt_obj.Tipper.tipper[p_index, 0, 1].imag,
-                               resist_phase.resxx[p_index], resist_phase.resxy[p_index],
-                               resist_phase.resyx[p_index], resist_phase.resyy[p_index],
-                               resist_phase.phasexx[p_index], resist_phase.phasexy[p_index],
-                               resist_phase.phaseyx[p_index], resist_phase.phaseyy[p_index]
-                               ]
-                    mtlist.append(mt_stat)
-
-                else:
-                    logger.warn(
-                        'Freq %s NOT found for this station %s', freq, mt_obj.station)
-
-            with open(csvfname, "ab") as csvf:  # summary csv for all freqs
-                writer = csv.writer(csvf)
-                writer.writerows(mtlist)
-
-            csv_basename2 = "%s_%sHz.csv" % (csv_basename, str(freq))
-            csvfile2 = os.path.join(dest_dir, csv_basename2)
-
-            with open(csvfile2, "wb") as csvf:  # individual csvfile for each freq
-                writer = csv.writer(csvf)
-
-                writer.writerow(csv_header)
-                writer.writerows(mtlist)
-
-            pt_dict[freq] = mtlist
+        npzfname = os.path.join(dest_dir, "edi_measurement.npz")
+        self._export(survey_export.measurement_table,
+                     survey_export.NpzTableWriter(npzfname, survey_export.MEASUREMENT_COLUMNS), n_workers)
 
-        return csvfname
+        return npzfname
 
     def get_bounding_box(self, epsgcode=None):
         """ compute bounding box
@@ -432,11 +512,13 @@ class EdiCollection(object):
         """
 
         if epsgcode is None:
-            new_gdf = self.geopdf
+            # the bounds of the station locations, geopandas is not needed
+            lon = np.array(self.station_info['lon'], dtype='float')
+            lat = np.array(self.station_info['lat'], dtype='float')
+            tup = (np.nanmin(lon), np.nanmin(lat), np.nanmax(lon), np.nanmax(lat))
         else:  # reproj
             new_gdf = self.geopdf.to_crs(epsg=epsgcode)
-
-        tup = new_gdf.total_bounds
+            tup = new_gdf.total_bounds
 
         bdict = {"MinLon": tup[0],
                  "MinLat": tup[1],
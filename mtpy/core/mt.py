@@ -22,28 +22,11 @@ import mtpy.analysis.pt as MTpt
 import mtpy.analysis.zinvariants as MTinv
 import mtpy.core.edi as MTedi
 import mtpy.core.z as MTz
-import mtpy.imaging.plot_mt_response as plotresponse
+import mtpy.core.z_interp as MTz_interp
 import mtpy.utils.exceptions as MTex
 import mtpy.utils.format as MTformat
 import mtpy.utils.latlon_utm_conversion as MTutm
 
-try:
-    import scipy
-
-    scipy_version = int(scipy.__version__.replace('.', ''))
-
-    if scipy_version < 140:
-        print ('Note: need scipy version 0.14.0 or higher or interpolation ' +
-               'might not work.')
-    import scipy.interpolate as spi
-
-    interp_import = True
-
-except ImportError:
-    print('Could not find scipy.interpolate, cannot use method interpolate' +
-          'check installation you can get scipy from scipy.org.')
-    interp_import = False
-
 import logging
 from mtpy.utils.mtpylog import MtPyLog
 
@@ -99,6 +82,9 @@ class MT(object):
             - tipper          --> np.ndarray(n_freq, 1, 2, dtype='complex')
             - tipper_err       --> np.ndarray(n_freq, 1, 2)
 
+        * data=False reads only the station information of the .edi file,
+          Z, Tipper, pt and zinv are read when they are first accessed.
+
     Methods
     ------------
     ===================== =====================================================
@@ -168,6 +154,8 @@ class MT(object):
         self._east = kwargs.pop('east', None)
         self._north = kwargs.pop('north', None)
         self._rotation_angle = kwargs.pop('rotation_angle', 0)
+        self._data_on_read = kwargs.pop('data', True)
+        self._data_loaded = True
 
         # provide key words to fill values if an edi file does not exist
         if 'z_object' in kwargs:
@@ -312,8 +300,11 @@ class MT(object):
         for strike angle
         """
 
+        if not self._data_loaded:
+            self._load_data()
+
         self._Z = z_object
-        self._Z._compute_res_phase()
+        self._Z.invalidate()
 
         # --> compute phase tensor
         self.pt = MTpt.PhaseTensor(z_object=self._Z, freq=self._Z.freq)
@@ -328,9 +319,31 @@ class MT(object):
         recalculate tipper angle and magnitude
         """
 
+        if not self._data_loaded:
+            self._load_data()
+
         self._Tipper = t_object
-        self._Tipper._compute_amp_phase()
-        self._Tipper._compute_mag_direction()
+        self._Tipper.invalidate()
+
+    def _set_pt(self, pt_object):
+        """
+        set phase tensor object
+        """
+
+        if not self._data_loaded:
+            self._load_data()
+
+        self._pt = pt_object
+
+    def _set_zinv(self, zinv_object):
+        """
+        set Zinvariants object
+        """
+
+        if not self._data_loaded:
+            self._load_data()
+
+        self._zinv = zinv_object
 
     # ==========================================================================
     # get functions
@@ -360,11 +373,25 @@ class MT(object):
         return self._rotation_angle
 
     def _get_Z(self):
+        if not self._data_loaded:
+            self._load_data()
         return self._Z
 
     def _get_Tipper(self):
+        if not self._data_loaded:
+            self._load_data()
         return self._Tipper
 
+    def _get_pt(self):
+        if not self._data_loaded:
+            self._load_data()
+        return self._pt
+
+    def _get_zinv(self):
+        if not self._data_loaded:
+            self._load_data()
+        return self._zinv
+
     # ==========================================================================
     # set properties
     # ==========================================================================
@@ -395,6 +422,10 @@ class MT(object):
 
     Tipper = property(_get_Tipper, _set_Tipper, doc="Tipper object")
 
+    pt = property(_get_pt, _set_pt, doc="phase tensor object")
+
+    zinv = property(_get_zinv, _set_zinv, doc="Zinvariants object")
+
     # --> conversion between utm and ll
     def _get_utm(self):
         """
@@ -420,25 +451,37 @@ class MT(object):
         read in edi file and set attributes accordingly
 
         """
-        self.edi_object = MTedi.Edi(edi_fn=self.fn)
+        self.edi_object = MTedi.Edi(edi_fn=self.fn, data=self._data_on_read)
         self._lat = self.edi_object.lat
         self._lon = self.edi_object.lon
         self._elev = self.edi_object.elev
-        self._Z = self.edi_object.Z
-        self._Tipper = self.edi_object.Tipper
         self.station = self.edi_object.station
 
         # --> get utm coordinates from lat and lon
         self._get_utm()
 
+        if self._data_on_read:
+            self._load_data()
+        else:
+            self._data_loaded = False
+
+    def _load_data(self):
+        """
+        get Z and Tipper from the edi object and compute the phase tensor
+        and invariants
+        """
+        self._data_loaded = True
+        self._Z = self.edi_object.Z
+        self._Tipper = self.edi_object.Tipper
+
         # --> make sure things are ordered from high frequency to low
         self._check_freq_order()
 
         # --> compute phase tensor
-        self.pt = MTpt.PhaseTensor(z_object=self.Z, freq=self.Z.freq)
+        self._pt = MTpt.PhaseTensor(z_object=self.Z, freq=self.Z.freq)
 
         # --> compute invariants
-        self.zinv = MTinv.Zinvariants(z_object=self.Z)
+        self._zinv = MTinv.Zinvariants(z_object=self.Z)
 
     # --> write edi file
     def write_edi_file(self, new_fn=None, new_Z=None, new_Tipper=None):
@@ -465,12 +508,12 @@ class MT(object):
         if new_Z is not None:
             self.edi_object.Z = new_Z
         else:
-            self.edi_object.Z = self._Z
+            self.edi_object.Z = self.Z
 
         if new_Tipper is not None:
             self.edi_object.Tipper = new_Tipper
         else:
-            self.edi_object.Tipper = self._Tipper
+            self.edi_object.Tipper = self.Tipper
 
         self.edi_object.lat = self._lat
         self.edi_object.lon = self._lon
@@ -517,8 +560,7 @@ class MT(object):
             >>> mt1.write_edi_file(new_fn=r"/home/mt/edi_files/mt01_dr.edi",\
             >>>                    new_Z=new_z)
         """
-        dummy_z_obj = MTz.copy.deepcopy(self.Z)
-        D, new_z_object = MTdistortion.remove_distortion(z_object=dummy_z_obj,
+        D, new_z_object = MTdistortion.remove_distortion(z_object=self.Z,
                                                          num_freq=num_freq)
 
         return D, new_z_object
@@ -588,7 +630,12 @@ class MT(object):
                                a 1-d array of frequencies to interpolate on
                                to.  Must be with in the bounds of the existing
                                frequency range, anything outside and an error
-                               will occur.
+                               will occur.  The array is not changed.
+
+            *bounds_error* : [ True | False ]
+                             raise a ValueError if new_freq_array is outside
+                             the existing frequency range, otherwise those
+                             frequencies are set to 0.  *default* is True
 
         Returns
         -----------
@@ -601,6 +648,11 @@ class MT(object):
                              a new tipper object with the corresponding
                              frequencies and components.
 
+        .. note:: all components are interpolated at once, linearly in
+                  log10(frequency), leaving out entries that are 0.  The
+                  interpolation weights are kept and reused for stations
+                  with the same frequencies and new_freq_array.
+
 
         Examples
         ----------
@@ -618,100 +670,8 @@ class MT(object):
             >>> ...                   new_Tipper=new_tipper_object)
 
         """
-            # if the interpolation module has not been loaded return
-        if interp_import is False:
-            print('could not interpolate, need to install scipy')
-            return
-
-        # make sure the input is a numpy array
-        if not isinstance(new_freq_array, np.ndarray):
-            new_freq_array = np.array(new_freq_array)
-
-        floater= 0.00000001  #FZ: a small offset to avoid out-of-bound error in spi interpolation module.
-        logger.info("massage the new_freq_array's min and max to avoid out-of-bound interp")
-        minindex = np.argmin(new_freq_array)
-        maxindex = np.argmax(new_freq_array)
-        new_freq_array[minindex] = new_freq_array[minindex] + floater
-        new_freq_array[maxindex] = new_freq_array[maxindex] - floater
-
-        #logger.debug("new freq array %s", new_freq_array)
-
-        # check the bounds of the new frequency array
-        if bounds_error:
-            if self.Z.freq.min() > new_freq_array.min():
-                print (self.Z.freq.min(), self.Z.freq.max())
-                print (new_freq_array.min(),new_freq_array.max())
-                raise ValueError('New frequency minimum of {0:.5g}'.format(new_freq_array.min()) +
-                                 ' is smaller than old frequency minimum of {0:.5g}'.format(self.Z.freq.min()) +
-                                 '.  The new frequency range needs to be within the ' +
-                                 'bounds of the old one.')
-            if self.Z.freq.max() < new_freq_array.max():
-                raise ValueError('New frequency maximum of {0:.5g}'.format(new_freq_array.max()) +
-                                 'is smaller than old frequency maximum of {0:.5g}'.format(self.Z.freq.max()) +
-                                 '.  The new frequency range needs to be within the ' +
-                                 'bounds of the old one.')
-
-        # make a new Z object
-        new_Z = MTz.Z(z_array=np.zeros((new_freq_array.shape[0], 2, 2),
-                                       dtype='complex'),
-                      z_err_array=np.zeros((new_freq_array.shape[0], 2, 2)),
-                      freq=new_freq_array)
-
-        new_Tipper = MTz.Tipper(tipper_array=np.zeros((new_freq_array.shape[0], 1, 2),
-                                                      dtype='complex'),
-                                tipper_err_array=np.zeros(
-            (new_freq_array.shape[0], 1, 2)),
-            freq=new_freq_array)
-
-        # interpolate the impedance tensor
-        #kinds = ('nearest', 'zero', 'linear', 'slinear', 'quadratic', 'cubic')
-        interpkind='linear'
-        for ii in range(2):
-            for jj in range(2):
-                # need to sort array for old version of interp1d otherwise
-                # frequencies fall out of bounds ???
-                # first, remove zero values
-                non_zero = np.nonzero(self.Z.z[:,ii,jj])
-                ind = np.argsort(self.Z.freq[non_zero])
-                if len(ind) > 0:
-                    z_func_real = spi.interp1d(np.log10(self.Z.freq[non_zero][ind]), self.Z.z[non_zero][ind][:, ii, jj].real,
-                                               kind=interpkind, bounds_error=False, fill_value=0.)
-                    z_func_imag = spi.interp1d(np.log10(self.Z.freq[non_zero][ind]), self.Z.z[non_zero][ind][:, ii, jj].imag,
-                                               kind=interpkind, bounds_error=False, fill_value=0.)
-                    new_Z.z[:, ii, jj] = z_func_real(np.log10(new_freq_array)) + \
-                        1j * z_func_imag(np.log10(new_freq_array))
-    
-                    z_func_err = spi.interp1d(np.log10(self.Z.freq[non_zero][ind]), self.Z.z_err[ind][:, ii, jj],
-                                              kind=interpkind, bounds_error=False)
-                    new_Z.z_err[:, ii, jj] = z_func_err(np.log10(new_freq_array))
-
-        # if there is not tipper than skip
-        if self.Tipper.tipper is None:
-            return new_Z, None
-
-        # interpolate the Tipper
-        for jj in range(2):
-            non_zero = np.nonzero(self.Tipper.tipper[:,0,jj])
-            ind = np.argsort(self.Z.freq[non_zero])
-
-            if len(ind) > 0:
-                t_func_real = spi.interp1d(np.log10(self.Z.freq[non_zero][ind]),
-                                           self.Tipper.tipper[non_zero][ind][:, 0, jj].real,
-                                           kind=interpkind, bounds_error=False, fill_value=0.)
-                t_func_imag = spi.interp1d(np.log10(self.Z.freq[non_zero][ind]),
-                                           self.Tipper.tipper[non_zero][ind][:, 0, jj].imag,
-                                           kind=interpkind, bounds_error=False, fill_value=0.)
-                new_Tipper.tipper[:, 0, jj] = t_func_real(np.log10(new_freq_array)) + \
-                    1j * t_func_imag(np.log10(new_freq_array))
-    
-                t_func_err = spi.interp1d(np.log10(self.Z.freq[non_zero][ind]),
-                                          self.Tipper.tipper_err[ind][:, 0, jj],
-                                          kind=interpkind, bounds_error=False)
-                new_Tipper.tipper_err[
-                    :, 0, jj] = t_func_err(
-                    np.log10(new_freq_array))
-
-        return new_Z, new_Tipper
+        return MTz_interp.interpolate_z(self.Z, self.Tipper, new_freq_array,
+                                        bounds_error=bounds_error)
 
 
     def plot_mt_response(self, **kwargs):
@@ -728,6 +688,8 @@ class MT(object):
             >>> help(pr)
 
         """
+        # imported here so that matplotlib is only loaded for plotting
+        import mtpy.imaging.plot_mt_response as plotresponse
 
         plot_obj = plotresponse.PlotMTResponse(fn=self.fn, **kwargs)
         plot_obj.plot()
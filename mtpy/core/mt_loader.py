@@ -0,0 +1,486 @@
+#!/usr/bin/env python
+
+"""
+=============
+mt_loader module
+=============
+
+Read many .edi files at once with a pool of processes or threads.  The
+results keep the order of the input files.  With a pool, a file that cannot
+be read is reported in MTLoader.errors instead of stopping the whole load;
+read in this process (n_workers=1) its error is raised as before.  New
+impedances of many stations are written back to .edi files the same way.
+
+Classes
+---------
+    * MTLoader --> reads a directory or list of .edi files into a list of
+                   mtpy.core.mt.MT objects or into a ZStack.
+
+Functions
+-----------
+    * get_edi_list --> list of .edi files in a directory
+    * pool_map --> map a function over a list in a pool of workers
+    * pool_imap --> the same, results are yielded one at a time
+    * load_mt_list --> list of MT objects of a directory or list of files
+    * write_edi_list --> write .edi files with new impedances
+
+    >>> import mtpy.core.mt_loader as mt_loader
+    >>> loader = mt_loader.MTLoader(n_workers=8)
+    >>> mt_list = loader.load(r"/home/mt/edi_files")
+    >>> loader.errors
+    [('/home/mt/edi_files/bad.edi', 'MTpyError_EDI: ...')]
+    >>> z_stack = loader.load_z_stack(r"/home/mt/edi_files")
+
+"""
+
+# =================================================================
+import multiprocessing
+import multiprocessing.pool
+import os
+
+import numpy as np
+
+import mtpy.core.edi as MTedi
+import mtpy.core.mt as mt
+import mtpy.utils.exceptions as MTex
+from mtpy.core.z_stack import ZStack, match_frequencies
+
+from mtpy.utils.mtpylog import MtPyLog
+
+logger = MtPyLog().get_mtpy_logger(__name__)
+# =================================================================
+
+
+def get_edi_list(edi_source):
+    """
+    list of .edi files
+
+    Arguments
+    -----------
+        **edi_source** : string or list
+                         directory containing .edi files, or a list of .edi
+                         files which is returned as is
+
+    Returns
+    ---------
+        **edi_list** : list
+                       full paths to the .edi files of a directory, sorted
+                       by name
+    """
+    if not isinstance(edi_source, (str, type(u''))):
+        return list(edi_source)
+
+    if not os.path.isdir(edi_source):
+        raise MTex.MTpyError_inputarguments(
+            'Could not find directory {0}'.format(edi_source))
+
+    return [os.path.join(edi_source, fn)
+            for fn in sorted(os.listdir(edi_source))
+            if fn.lower().endswith('.edi')]
+
+
+def pool_map(func, items, n_workers=None, pool='process', chunksize=None):
+    """
+    func applied to each of items, in a pool of workers if there is more
+    than one.  The results keep the order of items.
+
+    Arguments
+    -----------
+        **func** : function
+                   module level function, so that it can be sent to worker
+                   processes
+
+        **items** : list
+                    arguments of func
+
+        **n_workers** : int
+                        number of worker processes or threads, 1 calls func
+                        in this process.  *default* is None, the number of
+                        CPUs
+
+        **pool** : [ 'process' | 'thread' ]
+                   kind of worker pool, *default* is 'process'
+
+        **chunksize** : int
+                        number of items handed to a worker at a time,
+                        *default* is None, which spreads the items over
+                        about 4 chunks per worker
+
+    Returns
+    ---------
+        **results** : list
+                      func(item) for each of items
+    """
+    if n_workers is None:
+        n_workers = multiprocessing.cpu_count()
+    n_workers = max(1, min(n_workers, len(items)))
+
+    if n_workers == 1:
+        return [func(item) for item in items]
+
+    if chunksize is None:
+        chunksize = max(1, len(items) // (4 * n_workers))
+
+    if pool == 'process':
+        worker_pool = multiprocessing.Pool(n_workers)
+    else:
+        worker_pool = multiprocessing.pool.ThreadPool(n_workers)
+    try:
+        return worker_pool.map(func, items, chunksize)
+    finally:
+        worker_pool.close()
+        worker_pool.join()
+
+
+def pool_imap(func, items, n_workers=None, pool='process', chunksize=1):
+    """
+    func applied to each of items like pool_map, but the results are
+    yielded one at a time in the order of items, so they do not all have to
+    be held in memory.  With one worker func is only called when the next
+    result is asked for.
+
+    Arguments
+    -----------
+        **func** : function
+                   module level function, so that it can be sent to worker
+                   processes
+
+        **items** : iterable
+                    arguments of func
+
+        **n_workers** : int
+                        number of worker processes or threads, 1 calls func
+                        in this process.  *default* is None, the number of
+                        CPUs
+
+        **pool** : [ 'process' | 'thread' ]
+                   kind of worker pool, *default* is 'process'
+
+        **chunksize** : int
+                        number of items handed to a worker at a time,
+                        *default* is 1
+
+    Returns
+    ---------
+        **results** : generator
+                      func(item) for each of items
+    """
+    if n_workers is None:
+        n_workers = multiprocessing.cpu_count()
+
+    if n_workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    if pool == 'process':
+        worker_pool = multiprocessing.Pool(n_workers)
+    else:
+        worker_pool = multiprocessing.pool.ThreadPool(n_workers)
+    try:
+        for result in worker_pool.imap(func, items, chunksize):
+            yield result
+    finally:
+        # also stops the workers when the generator is not run to the end
+        worker_pool.terminate()
+        worker_pool.join()
+
+
+def _error_message(error):
+    return '{0}: {1}'.format(type(error).__name__, error)
+
+
+def _new_mt(args):
+    """
+    read one MT object
+    """
+    edi_fn, data = args
+    return mt.MT(edi_fn, data=data)
+
+
+def _station_info(edi_fn):
+    """
+    read the station information, Z and Tipper of one .edi file as
+    (station, lat, lon, elev, Z, Tipper)
+    """
+    edi_obj = MTedi.Edi(edi_fn=edi_fn)
+    return (edi_obj.station, edi_obj.lat, edi_obj.lon, edi_obj.elev,
+            edi_obj.Z, edi_obj.Tipper)
+
+
+def _read_mt(args):
+    """
+    read one MT object, returns (mt_obj, None) or (None, error message)
+    """
+    try:
+        return _new_mt(args), None
+    except Exception as error:
+        return None, _error_message(error)
+
+
+def _read_station(edi_fn):
+    """
+    read the station information, Z and Tipper of one .edi file, returns
+    ((station, lat, lon, elev, Z, Tipper), None) or (None, error message)
+    """
+    try:
+        return _station_info(edi_fn), None
+    except Exception as error:
+        return None, _error_message(error)
+
+
+def _write_edi(args):
+    """
+    write one .edi file with new impedances, returns (new file, None) or
+    (None, error message)
+    """
+    edi_fn, new_fn, z_obj = args
+    try:
+        edi_obj = MTedi.Edi(edi_fn=edi_fn)
+        # keep the frequencies and rotation angles of the file
+        index = match_frequencies(z_obj.freq, edi_obj.Z.freq)
+        if np.any(index < 0):
+            raise MTex.MTpyError_Z('new impedances do not have all '
+                                   'frequencies of the file')
+        z_err = edi_obj.Z.z_err
+        if z_obj.z_err is not None:
+            z_err = np.real(z_obj.z_err[index])
+        edi_obj.Z.z = z_obj.z[index]
+        edi_obj.Z.z_err = z_err
+        return edi_obj.write_edi_file(new_edi_fn=new_fn), None
+    except Exception as error:
+        return None, _error_message(error)
+
+
+class MTLoader(object):
+    """
+    Read a directory or list of .edi files with a pool of workers.
+
+    Arguments
+    -----------
+        **n_workers** : int
+                        number of worker processes or threads, 1 reads the
+                        files one after the other in this process and
+                        raises the error of a file that cannot be read.
+                        *default* is None, the number of CPUs
+
+        **pool** : [ 'process' | 'thread' ]
+                   kind of worker pool.  Processes read in parallel but
+                   the objects have to be sent back to this process,
+                   threads share memory but mostly wait on each other.
+                   *default* is 'process'
+
+        **data** : [ True | False ]
+                   if False the MT objects are made with data=False and
+                   read Z and Tipper on first access.  *default* is True
+
+        **chunksize** : int
+                        number of files handed to a worker at a time,
+                        *default* is None, which spreads the files over
+                        about 4 chunks per worker
+
+    =============== ===========================================================
+    Attributes      Description
+    =============== ===========================================================
+    edi_list        .edi files of the last load
+    errors          list of (edi file, error message) of the files that
+                    could not be read in the last load, always empty with
+                    n_workers=1
+    loaded_edi_list .edi files of the last load that could be read, in step
+                    with the list or ZStack returned
+    =============== ===========================================================
+
+    With a pool the results leave out the files in errors, callers that keep
+    their own list of files should use loaded_edi_list instead.
+
+    .. note:: with a process pool on Windows the calling script needs an
+              ``if __name__ == '__main__':`` guard.
+    """
+
+    def __init__(self, n_workers=None, pool='process', data=True,
+                 chunksize=None):
+        if pool not in ['process', 'thread']:
+            raise MTex.MTpyError_inputarguments(
+                'pool must be "process" or "thread", not {0}'.format(pool))
+
+        self.n_workers = n_workers
+        self.pool = pool
+        self.data = data
+        self.chunksize = chunksize
+
+        self.edi_list = []
+        self.errors = []
+
+    @property
+    def loaded_edi_list(self):
+        """
+        .edi files of the last load without the ones that could not be read
+        """
+        failed = set(edi_fn for edi_fn, error in self.errors)
+        return [edi_fn for edi_fn in self.edi_list if edi_fn not in failed]
+
+    def _map(self, func, safe_func, items):
+        """
+        (result, error message) of func applied to each of items in order,
+        in a pool of safe_func if there is more than one worker.  In this
+        process func is called directly and its errors are raised.
+        """
+        if self.n_workers == 1:
+            return [(func(item), None) for item in items]
+
+        return pool_map(safe_func, items, n_workers=self.n_workers,
+                        pool=self.pool, chunksize=self.chunksize)
+
+    def _collect(self, results):
+        """
+        keep the results that could be read, fill errors with the rest
+        """
+        self.errors = []
+        values = []
+        for edi_fn, (value, error) in zip(self.edi_list, results):
+            if error is None:
+                values.append(value)
+            else:
+                logger.warning('Could not read {0}, {1}'.format(edi_fn,
+                                                                error))
+                self.errors.append((edi_fn, error))
+
+        logger.info('Read {0} of {1} edi files'.format(len(values),
+                                                       len(self.edi_list)))
+        return values
+
+    def load(self, edi_source):
+        """
+        read .edi files into MT objects
+
+        Arguments
+        -----------
+            **edi_source** : string or list
+                             directory containing .edi files or a list of
+                             .edi files
+
+        Returns
+        ---------
+            **mt_list** : list of mtpy.core.mt.MT
+                          in the order of the input files, without the
+                          files listed in errors
+        """
+        self.edi_list = get_edi_list(edi_source)
+        results = self._map(_new_mt, _read_mt,
+                            [(edi_fn, self.data) for edi_fn in self.edi_list])
+        return self._collect(results)
+
+    def load_z_stack(self, edi_source, freq=None, ftol=1e-4):
+        """
+        read .edi files into a ZStack.  Only the station information, Z and
+        Tipper are sent back from the workers, no phase tensors or MT
+        objects are made.
+
+        Arguments
+        -----------
+            **edi_source** : string or list
+                             directory containing .edi files or a list of
+                             .edi files
+
+            **freq** : np.ndarray(n_freq)
+                       common frequency axis, *default* is the union of
+                       all station frequencies
+
+            **ftol** : float
+                       relative tolerance for matching frequencies,
+                       *default* is 1e-4
+
+        Returns
+        ---------
+            **z_stack** : mtpy.core.z_stack.ZStack
+                          stations in the order of the input files, without
+                          the files listed in errors
+        """
+        self.edi_list = get_edi_list(edi_source)
+        station_list = self._collect(self._map(_station_info, _read_station,
+                                               self.edi_list))
+
+        return ZStack.from_z_list([ss[4] for ss in station_list],
+                                  [ss[5] for ss in station_list],
+                                  freq=freq, ftol=ftol,
+                                  station=[ss[0] for ss in station_list],
+                                  lat=[ss[1] for ss in station_list],
+                                  lon=[ss[2] for ss in station_list],
+                                  elev=[ss[3] for ss in station_list])
+
+
+def load_mt_list(edi_source, n_workers=None, pool='process', data=True):
+    """
+    read a directory or list of .edi files into a list of MT objects, see
+    MTLoader for the arguments.  With a pool, files that cannot be read are
+    logged and left out, with n_workers=1 their error is raised.
+    """
+    loader = MTLoader(n_workers=n_workers, pool=pool, data=data)
+    return loader.load(edi_source)
+
+
+def write_edi_list(edi_list, z_list, save_path=None, suffix='_RW',
+                   n_workers=None, pool='process'):
+    """
+    write new .edi files of a list of .edi files with new impedances, with a
+    pool of workers.  Each file is read again so that its header, tipper,
+    frequencies and rotation angles are kept, the new impedances are matched
+    to the frequencies of the file.
+
+    Arguments
+    -----------
+        **edi_list** : list
+                       .edi files to write new files of
+
+        **z_list** : list of mtpy.core.z.Z
+                     new impedances of each file, with the frequencies of
+                     the file sorted from high to low
+
+        **save_path** : string
+                        directory to write the new files to, *default* is
+                        None, next to the input files
+
+        **suffix** : string
+                     added to the file names, *default* is '_RW'
+
+        **n_workers** : int
+                        number of worker processes or threads, 1 writes the
+                        files one after the other in this process.
+                        *default* is None, the number of CPUs
+
+        **pool** : [ 'process' | 'thread' ]
+                   kind of worker pool, *default* is 'process'
+
+    Returns
+    ---------
+        **new_fn_list** : list
+                          the new files in the order of edi_list, None where
+                          a file could not be written
+    """
+    if len(edi_list) != len(z_list):
+        raise MTex.MTpyError_inputarguments(
+            'edi_list and z_list must have the same length')
+
+    if save_path is not None and not os.path.isdir(save_path):
+        os.makedirs(save_path)
+
+    items = []
+    for edi_fn, z_obj in zip(edi_list, z_list):
+        new_dir = save_path
+        if new_dir is None:
+            new_dir = os.path.dirname(edi_fn)
+        new_fn = os.path.join(new_dir, '{0}{1}.edi'.format(
+            os.path.splitext(os.path.basename(edi_fn))[0], suffix))
+        items.append((edi_fn, new_fn, z_obj))
+
+    new_fn_list = []
+    for (edi_fn, new_fn, z_obj), (written_fn, error) in zip(
+            items, pool_map(_write_edi, items, n_workers=n_workers,
+                            pool=pool)):
+        if error is not None:
+            logger.warning('Could not write {0}, {1}'.format(new_fn, error))
+        new_fn_list.append(written_fn)
+
+    logger.info('Wrote {0} of {1} edi files'.format(
+        len([fn for fn in new_fn_list if fn is not None]), len(edi_list)))
+    return new_fn_list
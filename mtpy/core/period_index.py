@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+
+"""
+=============
+period_index module
+=============
+
+Classes
+---------
+    * PeriodIndex --> sorted index of the frequencies of many stations for
+                      tolerance lookups of which stations have a period.
+
+    >>> import mtpy.core.period_index as period_index
+    >>> p_index = period_index.PeriodIndex([mt_obj.Z.freq for mt_obj in mt_list],
+    ...                                    ptol=0.05)
+    >>> stations, positions = p_index.find_period(10.)
+    >>> p_index.cluster_periods
+
+"""
+
+# =================================================================
+import numpy as np
+
+from mtpy.utils.mtpylog import MtPyLog
+
+logger = MtPyLog().get_mtpy_logger(__name__)
+# =================================================================
+
+
+class PeriodIndex(object):
+    """
+    Index of the frequencies of a set of stations.  All frequencies are
+    sorted once, after that the frequencies within a tolerance of a period
+    and the stations they belong to are found with a binary search.
+
+    The frequencies are also grouped into clusters in a single sweep over
+    the sorted frequencies: a cluster starts at the lowest frequency not
+    yet in a cluster and holds all frequencies up to (1 + ptol) times that
+    frequency.
+
+    Arguments
+    -----------
+        **freq_list** : list of np.ndarray
+                        frequencies (Hz) of each station, in the station
+                        order
+
+        **ptol** : float
+                   relative tolerance of lookups and clusters,
+                   *default* is 0.05
+
+    ================== =======================================================
+    Attributes         Description
+    ================== =======================================================
+    n_stations         number of stations
+    offsets            np.ndarray(n_stations + 1), the frequencies of station
+                       ii are all_freq[offsets[ii]:offsets[ii + 1]]
+    all_freq           np.ndarray, frequencies of all stations in station
+                       order
+    freq               np.ndarray, all_freq sorted from low to high
+    freq_station       np.ndarray, station index of each entry of freq
+    freq_position      np.ndarray, index of each entry of freq into the
+                       frequencies of its station
+    unique_freq        np.ndarray, unique frequencies from low to high
+    cluster_offsets    np.ndarray(n_clusters + 1), the frequencies of cluster
+                       jj are freq[cluster_offsets[jj]:cluster_offsets[jj + 1]]
+    cluster_freq       np.ndarray(n_clusters), logarithmic mean frequency of
+                       each cluster
+    cluster_periods    np.ndarray(n_clusters), 1 / cluster_freq
+    ================== =======================================================
+    """
+
+    def __init__(self, freq_list, ptol=0.05):
+        self.ptol = ptol
+
+        freq_list = [np.zeros(0) if ff is None else
+                     np.asarray(ff, dtype='float').ravel()
+                     for ff in freq_list]
+        self.n_stations = len(freq_list)
+
+        lengths = np.array([len(ff) for ff in freq_list], dtype='int')
+        self.offsets = np.concatenate(([0], np.cumsum(lengths)))
+        if self.offsets[-1] > 0:
+            self.all_freq = np.concatenate(freq_list)
+        else:
+            self.all_freq = np.zeros(0)
+
+        station = np.repeat(np.arange(self.n_stations), lengths)
+        position = np.arange(len(self.all_freq)) - \
+            np.repeat(self.offsets[:-1], lengths)
+
+        # a stable sort keeps the entries of equal frequencies in station
+        # order
+        order = np.argsort(self.all_freq, kind='mergesort')
+        self.freq = self.all_freq[order]
+        self.freq_station = station[order]
+        self.freq_position = position[order]
+        self.unique_freq = np.unique(self.freq)
+
+        self._make_clusters()
+
+    def _make_clusters(self):
+        """
+        group the sorted frequencies into clusters of relative width ptol
+        """
+        starts = []
+        start = 0
+        while start < len(self.freq):
+            starts.append(start)
+            start = np.searchsorted(self.freq,
+                                    self.freq[start] * (1 + self.ptol),
+                                    side='right')
+        self.cluster_offsets = np.array(starts + [len(self.freq)],
+                                        dtype='int')
+
+        if len(starts) == 0:
+            self.cluster_freq = np.zeros(0)
+        else:
+            counts = np.diff(self.cluster_offsets)
+            log_freq = np.add.reduceat(np.log(self.freq), starts)
+            self.cluster_freq = np.exp(log_freq / counts)
+
+        logger.debug("%s frequencies in %s clusters", len(self.freq),
+                     len(self.cluster_freq))
+
+    @property
+    def cluster_periods(self):
+        return 1. / self.cluster_freq
+
+    def station_freq(self, station_index):
+        """
+        frequencies of station station_index in their original order
+        """
+        return self.all_freq[self.offsets[station_index]:
+                             self.offsets[station_index + 1]]
+
+    def _window(self, freq_min, freq_max):
+        """
+        slice into freq of the frequencies with freq_min < f < freq_max
+        """
+        return slice(np.searchsorted(self.freq, freq_min, side='right'),
+                     np.searchsorted(self.freq, freq_max, side='left'))
+
+    def _first_per_station(self, window):
+        """
+        station indices and the first position of each station in window
+        """
+        stations = self.freq_station[window]
+        positions = self.freq_position[window]
+        if len(stations) == 0:
+            return stations, positions
+
+        order = np.lexsort((positions, stations))
+        stations = stations[order]
+        positions = positions[order]
+        first = np.concatenate(([True], stations[1:] != stations[:-1]))
+        if not np.all(first):
+            logger.debug("more than one frequency found for stations %s",
+                         np.unique(stations[~first]))
+        return stations[first], positions[first]
+
+    def find_freq(self, freq, ptol=None):
+        """
+        Find the stations that have a frequency within the relative
+        tolerance ptol of freq, freq * (1 - ptol) < f < freq * (1 + ptol).
+
+        Arguments
+        -----------
+            **freq** : float
+                       frequency (Hz)
+
+            **ptol** : float
+                       relative tolerance, *default* is None, use self.ptol
+
+        Returns
+        ---------
+            **stations** : np.ndarray(dtype=int)
+                           indices of the stations, sorted
+
+            **positions** : np.ndarray(dtype=int)
+                            index into the frequencies of each station of
+                            its first frequency within the tolerance
+        """
+        if ptol is None:
+            ptol = self.ptol
+        return self._first_per_station(
+            self._window(freq * (1 - ptol), freq * (1 + ptol)))
+
+    def find_period(self, period, ptol=None):
+        """
+        Find the stations that have a period within the relative tolerance
+        ptol of period, see find_freq.
+        """
+        return self.find_freq(1. / period, ptol=ptol)
+
+    def find_freq_atol(self, freq, atol=0.0001):
+        """
+        Find the stations that have a frequency with abs(f - freq) < atol,
+        the same test as mtpy.core.edi_collection.is_num_in_seq.
+
+        Returns
+        ---------
+            **stations**, **positions** : see find_freq
+        """
+        window = self._window(freq - 2 * atol, freq + 2 * atol)
+        # the window is a little wider, keep the exact test of the
+        # tolerance
+        indices = np.arange(window.start, max(window.start, window.stop))
+        indices = indices[np.abs(freq - self.freq[indices]) < atol]
+        return self._first_per_station(indices)
+
+    def cluster_index(self, freq):
+        """
+        index of the cluster freq falls into, -1 if it is in none
+        """
+        start_freq = self.freq[self.cluster_offsets[:-1]]
+        cluster = np.searchsorted(start_freq, freq, side='right') - 1
+        if cluster < 0 or freq > start_freq[cluster] * (1 + self.ptol):
+            return -1
+        return int(cluster)
+
+    def cluster_stations(self, cluster):
+        """
+        station indices and positions of the frequencies in a cluster,
+        stations with more than one frequency in the cluster are listed
+        once with their first frequency
+        """
+        return self._first_per_station(
+            slice(self.cluster_offsets[cluster],
+                  self.cluster_offsets[cluster + 1]))
@@ -0,0 +1,271 @@
+#!/usr/bin/env python
+
+"""
+=============
+spatial_index module
+=============
+
+Classes
+---------
+    * SpatialIndex --> k-d tree of station locations for radius, nearest
+                       neighbour and bounding box queries.
+
+The stations are projected onto earth centred cartesian coordinates on the
+WGS-84 ellipsoid, so distances are in meters and do not depend on UTM
+zones.  Distances are straight lines between the stations, for the
+distances between neighbouring stations this is the same as the distance
+along the surface to well below a meter.
+
+    >>> from mtpy.core.spatial_index import SpatialIndex
+    >>> s_index = SpatialIndex(lat, lon, station=station_names)
+    >>> indices, distances = s_index.query_radius(-22.1, 139.3, 5000.)
+    >>> indices, distances = s_index.query_station_nearest('mt01', k=4)
+
+"""
+
+# =================================================================
+import numpy as np
+
+import mtpy.utils.exceptions as MTex
+
+from mtpy.utils.mtpylog import MtPyLog
+
+logger = MtPyLog().get_mtpy_logger(__name__)
+# =================================================================
+
+# WGS-84
+_a = 6378137.
+_f = 1. / 298.257223563
+_e2 = _f * (2 - _f)
+
+
+def geodetic_to_cartesian(lat, lon):
+    """
+    earth centred cartesian coordinates (m) of points on the WGS-84
+    ellipsoid
+
+    Arguments
+    -----------
+        **lat**, **lon** : np.ndarray
+                           latitudes and longitudes in decimal degrees
+
+    Returns
+    ---------
+        **xyz** : np.ndarray(shape + (3,))
+    """
+    lat = np.radians(np.asarray(lat, dtype='float'))
+    lon = np.radians(np.asarray(lon, dtype='float'))
+    sin_lat = np.sin(lat)
+    radius = _a / np.sqrt(1 - _e2 * sin_lat ** 2)
+
+    return np.stack([radius * np.cos(lat) * np.cos(lon),
+                     radius * np.cos(lat) * np.sin(lon),
+                     radius * (1 - _e2) * sin_lat], axis=-1)
+
+
+class SpatialIndex(object):
+    """
+    Index of station locations for neighbourhood queries.  The tree is
+    built once, after that a query costs about log(n_stations).  Stations
+    without a location (NaN latitude or longitude) are never found.
+
+    Arguments
+    -----------
+        **lat**, **lon** : np.ndarray(n_stations)
+                           station locations in decimal degrees
+
+        **station** : list of station names, *default* is None, stations
+                      can then only be given by index
+
+        **leafsize** : int
+                       leaf size of the k-d tree, *default* is 16
+
+    =============== ===========================================================
+    Attributes      Description
+    =============== ===========================================================
+    n_stations      number of stations
+    lat             station latitudes
+    lon             station longitudes
+    station         station names or None
+    xyz             earth centred coordinates (n_stations, 3) in m, NaN for
+                    stations without a location
+    valid           True for the stations with a location
+    =============== ===========================================================
+
+    =================== =======================================================
+    Methods             Description
+    =================== =======================================================
+    station_index       index of a station name
+    query_radius        stations within a distance of a location
+    query_nearest       k nearest stations to a location
+    query_bbox          stations in a longitude, latitude box
+    query_station_*     the same around a station of the index, the
+                        station itself is left out
+    neighbours          stations within a distance of every station
+    =================== =======================================================
+    """
+
+    def __init__(self, lat, lon, station=None, leafsize=16):
+        # imported here, scipy is only loaded when an index is built
+        from scipy.spatial import cKDTree
+
+        self.lat = np.array(lat, dtype='float')
+        self.lon = np.array(lon, dtype='float')
+        if self.lat.shape != self.lon.shape or self.lat.ndim != 1:
+            raise MTex.MTpyError_inputarguments(
+                'lat and lon must be 1-d arrays of the same length')
+        self.n_stations = len(self.lat)
+
+        self.station = None
+        self._station_lookup = {}
+        if station is not None:
+            self.station = np.array(station, dtype='object')
+            if self.station.shape != self.lat.shape:
+                raise MTex.MTpyError_inputarguments(
+                    'need one station name per location')
+            self._station_lookup = dict((name, ii) for ii, name in
+                                        reversed(list(enumerate(
+                                            self.station))))
+
+        self.valid = ~(np.isnan(self.lat) | np.isnan(self.lon))
+        self.xyz = geodetic_to_cartesian(self.lat, self.lon)
+        self._tree_index = np.nonzero(self.valid)[0]
+        # a tree can not be built without points
+        self._tree = None
+        if len(self._tree_index) > 0:
+            self._tree = cKDTree(self.xyz[self._tree_index],
+                                 leafsize=leafsize)
+
+        logger.debug("spatial index of %s stations, %s without location",
+                     self.n_stations, self.n_stations - len(self._tree_index))
+
+    def station_index(self, station):
+        """
+        index of a station, given by name or index
+        """
+        if isinstance(station, (int, np.integer)):
+            if not -self.n_stations <= station < self.n_stations:
+                raise MTex.MTpyError_inputarguments(
+                    'Station index {0} out of range'.format(station))
+            return int(station) % self.n_stations
+        try:
+            return self._station_lookup[station]
+        except KeyError:
+            raise MTex.MTpyError_inputarguments(
+                'Station {0} is not in the index'.format(station))
+
+    def _point(self, lat, lon):
+        return geodetic_to_cartesian(lat, lon)
+
+    def _ball(self, point, radius):
+        """
+        tree indices of the points within radius of point
+        """
+        if self._tree is None:
+            return []
+        return self._tree.query_ball_point(point, radius)
+
+    def _sorted(self, tree_indices, point, exclude=None):
+        """
+        station indices and distances sorted by distance
+        """
+        indices = self._tree_index[np.asarray(tree_indices, dtype='int')]
+        if exclude is not None:
+            indices = indices[indices != exclude]
+        distances = np.sqrt(np.sum((self.xyz[indices] - point) ** 2,
+                                   axis=-1))
+        order = np.argsort(distances, kind='mergesort')
+        return indices[order], distances[order]
+
+    def query_radius(self, lat, lon, radius):
+        """
+        Stations within radius (m) of a location.
+
+        Returns
+        ---------
+            **indices** : np.ndarray(dtype=int)
+                          station indices, nearest first
+
+            **distances** : np.ndarray
+                            distances in m
+        """
+        point = self._point(lat, lon)
+        return self._sorted(self._ball(point, radius), point)
+
+    def query_nearest(self, lat, lon, k=1):
+        """
+        The k nearest stations to a location, fewer if the index has less
+        than k stations with a location.
+
+        Returns
+        ---------
+            **indices**, **distances** : see query_radius
+        """
+        return self._nearest(self._point(lat, lon), k)
+
+    def _nearest(self, point, k, exclude=None):
+        n_tree = len(self._tree_index)
+        if self._tree is None or k < 1:
+            return np.zeros(0, dtype='int'), np.zeros(0)
+        k_query = min(k + (exclude is not None), n_tree)
+        tree_indices = np.atleast_1d(self._tree.query(point, k=k_query)[1])
+        indices, distances = self._sorted(tree_indices, point,
+                                          exclude=exclude)
+        return indices[:k], distances[:k]
+
+    def query_bbox(self, min_lon, min_lat, max_lon, max_lat):
+        """
+        Stations inside a box of longitudes and latitudes, edges included.
+
+        Returns
+        ---------
+            **indices** : np.ndarray(dtype=int)
+                          station indices in station order
+        """
+        with np.errstate(invalid='ignore'):
+            inside = (self.lon >= min_lon) & (self.lon <= max_lon) & \
+                (self.lat >= min_lat) & (self.lat <= max_lat)
+        return np.nonzero(inside)[0]
+
+    def _station_point(self, station):
+        index = self.station_index(station)
+        if not self.valid[index]:
+            raise MTex.MTpyError_inputarguments(
+                'Station {0} has no location'.format(station))
+        return index, self.xyz[index]
+
+    def query_station_radius(self, station, radius):
+        """
+        Other stations within radius (m) of a station, see query_radius.
+        """
+        index, point = self._station_point(station)
+        return self._sorted(self._ball(point, radius), point, exclude=index)
+
+    def query_station_nearest(self, station, k=1):
+        """
+        The k nearest other stations of a station, see query_nearest.
+        """
+        index, point = self._station_point(station)
+        return self._nearest(point, k, exclude=index)
+
+    def neighbours(self, radius):
+        """
+        Other stations within radius (m) of every station.
+
+        Returns
+        ---------
+            **neighbours** : list of (indices, distances), one per station,
+                             see query_radius.  Empty arrays for stations
+                             without a location.
+        """
+        empty = (np.zeros(0, dtype='int'), np.zeros(0))
+        neighbours = [empty] * self.n_stations
+        if self._tree is None:
+            return neighbours
+
+        found = self._tree.query_ball_point(self.xyz[self._tree_index],
+                                            radius)
+        for index, tree_indices in zip(self._tree_index, found):
+            neighbours[index] = self._sorted(tree_indices, self.xyz[index],
+                                             exclude=index)
+        return neighbours
@@ -0,0 +1,591 @@
+#!/usr/bin/env python
+
+"""
+=============
+survey_archive module
+=============
+
+A survey archive keeps the impedance tensors, tippers and errors of a whole
+survey in one directory of NumPy .npy files, one file per quantity with the
+stations stacked along the first axis:
+
+    archive_dir/
+        archive.json      format version and array shapes
+        station.npy       station table (station, lat, lon, elev, east,
+                          north, utm_zone, fn)
+        freq.npy          common frequencies (n_freq), high to low
+        z.npy             (n_station, n_freq, 2, 2) complex
+        z_err.npy         (n_station, n_freq, 2, 2)
+        tipper.npy        (n_station, n_freq, 1, 2) complex
+        tipper_err.npy    (n_station, n_freq, 1, 2)
+        mask.npy          (n_station, n_freq) True where there is impedance
+        tipper_mask.npy   (n_station, n_freq) True where there is a tipper
+        rotation_angle.npy (n_station, n_freq)
+
+The data files are memory mapped when an archive is opened, so taking one
+station or one period out of the archive only reads the bytes it needs.
+
+Classes
+---------
+    * SurveyArchive --> read access to an archive directory
+
+Functions
+-----------
+    * write_archive --> write a ZStack to an archive directory
+    * is_archive --> True if a directory is a survey archive
+    * edi_to_archive --> read a directory of .edi files into an archive
+    * archive_to_edi --> write .edi files of all stations of an archive
+
+    >>> import mtpy.core.survey_archive as survey_archive
+    >>> survey_archive.edi_to_archive(r"/home/mt/edi_files",
+    ...                               r"/home/mt/survey", n_workers=4)
+    >>> archive = survey_archive.SurveyArchive(r"/home/mt/survey")
+    >>> z_10s = archive.get_period(10.)
+    >>> z_10s.resistivity[:, 0, 0, 1]
+    >>> mt_obj = archive.get_mt('mt01')
+
+"""
+
+# =================================================================
+import json
+import os
+
+import numpy as np
+
+import mtpy.core.edi as MTedi
+import mtpy.core.mt_loader as mt_loader
+import mtpy.core.spatial_index as spatial_index
+import mtpy.utils.exceptions as MTex
+import mtpy.utils.latlon_utm_conversion as MTutm
+from mtpy.core.z import Tipper
+from mtpy.core.z_stack import ZStack
+
+from mtpy.utils.mtpylog import MtPyLog
+
+logger = MtPyLog().get_mtpy_logger(__name__)
+# =================================================================
+
+ARCHIVE_FORMAT = 'mtpy-survey-archive'
+ARCHIVE_VERSION = 1
+
+# name, dtype and shape after (n_station, n_freq) of the data files
+_DATA_ARRAYS = [('z', 'complex', (2, 2)),
+                ('z_err', 'float', (2, 2)),
+                ('tipper', 'complex', (1, 2)),
+                ('tipper_err', 'float', (1, 2)),
+                ('mask', 'bool', ()),
+                ('tipper_mask', 'bool', ()),
+                ('rotation_angle', 'float', ())]
+
+# WGS-84, as in mtpy.core.mt.MT
+_UTM_ELLIPSOID = 23
+
+
+def is_archive(archive_dir):
+    """
+    True if archive_dir is a survey archive directory
+    """
+    try:
+        return os.path.isdir(archive_dir) and \
+            os.path.isfile(os.path.join(archive_dir, 'archive.json'))
+    except TypeError:
+        return False
+
+
+def _text_dtype(values):
+    """
+    fixed length unicode dtype that fits all values
+    """
+    return 'U{0}'.format(max([1] + [len(vv) for vv in values]))
+
+
+def _station_table(z_stack, edi_fn=None):
+    """
+    structured array with one row of station information per station of
+    z_stack, UTM coordinates are computed from lat and lon
+    """
+    n_station = z_stack.n_stations
+    names = [u'' if ss is None else u'{0}'.format(ss)
+             for ss in z_stack.station]
+    if edi_fn is None:
+        edi_fn = [u''] * n_station
+    if len(edi_fn) != n_station:
+        raise MTex.MTpyError_inputarguments(
+            'need one edi file per station ({0}), got {1}'.format(
+                n_station, len(edi_fn)))
+    edi_fn = [u'' if fn is None else u'{0}'.format(fn) for fn in edi_fn]
+
+    east = np.full(n_station, np.nan)
+    north = np.full(n_station, np.nan)
+    zones = [u''] * n_station
+    for ii in range(n_station):
+        if np.isnan(z_stack.lat[ii]) or np.isnan(z_stack.lon[ii]):
+            continue
+        zone, east[ii], north[ii] = MTutm.LLtoUTM(_UTM_ELLIPSOID,
+                                                  z_stack.lat[ii],
+                                                  z_stack.lon[ii])
+        zones[ii] = u'{0}'.format(zone)
+
+    table = np.zeros(n_station, dtype=[('station', _text_dtype(names)),
+                                       ('lat', 'float'),
+                                       ('lon', 'float'),
+                                       ('elev', 'float'),
+                                       ('east', 'float'),
+                                       ('north', 'float'),
+                                       ('utm_zone', _text_dtype(zones)),
+                                       ('fn', _text_dtype(edi_fn))])
+    table['station'] = names
+    table['lat'] = z_stack.lat
+    table['lon'] = z_stack.lon
+    table['elev'] = z_stack.elev
+    table['east'] = east
+    table['north'] = north
+    table['utm_zone'] = zones
+    table['fn'] = edi_fn
+
+    return table
+
+
+def write_archive(archive_dir, z_stack, edi_fn=None, overwrite=False):
+    """
+    write a ZStack to a survey archive directory
+
+    Arguments
+    -----------
+        **archive_dir** : string
+                          directory to write to, made if it does not exist
+
+        **z_stack** : mtpy.core.z_stack.ZStack
+                      data of all stations
+
+        **edi_fn** : list of strings
+                     .edi file each station was read from, one per station,
+                     *default* is None
+
+        **overwrite** : [ True | False ]
+                        replace an existing archive, *default* is False
+
+    Returns
+    ---------
+        **archive** : SurveyArchive
+                      the new archive opened for reading
+    """
+    if os.path.isdir(archive_dir):
+        if is_archive(archive_dir) and not overwrite:
+            raise MTex.MTpyError_inputarguments(
+                '{0} is already a survey archive, set overwrite=True to '
+                'replace it'.format(archive_dir))
+        if is_archive(archive_dir):
+            os.remove(os.path.join(archive_dir, 'archive.json'))
+    else:
+        os.makedirs(archive_dir)
+
+    np.save(os.path.join(archive_dir, 'station.npy'),
+            _station_table(z_stack, edi_fn))
+    np.save(os.path.join(archive_dir, 'freq.npy'), z_stack.freq)
+    for name, dtype, shape in _DATA_ARRAYS:
+        np.save(os.path.join(archive_dir, '{0}.npy'.format(name)),
+                np.ascontiguousarray(getattr(z_stack, name), dtype=dtype))
+
+    # written last, an archive without it is incomplete
+    with open(os.path.join(archive_dir, 'archive.json'), 'w') as fid:
+        json.dump({'format': ARCHIVE_FORMAT,
+                   'version': ARCHIVE_VERSION,
+                   'n_station': z_stack.n_stations,
+                   'n_freq': z_stack.n_freq}, fid)
+
+    logger.info('Wrote {0} stations and {1} frequencies to {2}'.format(
+        z_stack.n_stations, z_stack.n_freq, archive_dir))
+
+    return SurveyArchive(archive_dir)
+
+
+# ------------------------
+class SurveyArchive(object):
+    """
+    Read access to a survey archive directory, see the module documentation
+    for the layout.
+
+    Arguments
+    -----------
+        **archive_dir** : string
+                          survey archive directory
+
+        **mmap_mode** : [ 'r' | 'r+' | 'c' | None ]
+                        how the data files are memory mapped, see
+                        numpy.load.  None reads the arrays into memory.
+                        *default* is 'r'
+
+    =============== ===========================================================
+    Attributes      Description
+    =============== ===========================================================
+    archive_dir     survey archive directory
+    station_table   structured array (station, lat, lon, elev, east, north,
+                    utm_zone, fn), one row per station
+    station         array of station names
+    lat, lon, elev  station coordinates
+    east, north     station UTM coordinates (WGS-84)
+    utm_zone        UTM zones
+    fn              .edi file each station was read from, '' if unknown
+    freq            common frequencies, high to low
+    period          1 / freq
+    z, z_err        impedance tensors and errors (n_station, n_freq, 2, 2)
+    tipper,         tippers and errors (n_station, n_freq, 1, 2)
+    tipper_err
+    mask            True where there is impedance data (n_station, n_freq)
+    tipper_mask     True where there is tipper data (n_station, n_freq)
+    rotation_angle  rotation angle of the data (n_station, n_freq)
+    spatial_index   mtpy.core.spatial_index.SpatialIndex of the stations,
+                    built on first access
+    =============== ===========================================================
+
+    =================== =======================================================
+    Methods             Description
+    =================== =======================================================
+    station_index       index of a station name
+    period_index        index of the nearest period on the common axis
+    get_station         ZStack of one or more stations
+    get_period          ZStack of all stations at one or more periods
+    get_mt              mtpy.core.mt.MT object of one station
+    to_z_stack          ZStack of a selection of stations and periods
+    to_mt_list          list of mtpy.core.mt.MT objects
+    to_edi              writes .edi files to a directory
+    =================== =======================================================
+    """
+
+    def __init__(self, archive_dir, mmap_mode='r'):
+        if not is_archive(archive_dir):
+            raise MTex.MTpyError_inputarguments(
+                '{0} is not a survey archive'.format(archive_dir))
+
+        with open(os.path.join(archive_dir, 'archive.json'), 'r') as fid:
+            info = json.load(fid)
+        if info.get('format') != ARCHIVE_FORMAT or \
+                info.get('version') != ARCHIVE_VERSION:
+            raise MTex.MTpyError_inputarguments(
+                '{0} is a survey archive of an unknown format {1} '
+                'version {2}'.format(archive_dir, info.get('format'),
+                                     info.get('version')))
+
+        self.archive_dir = archive_dir
+        self.mmap_mode = mmap_mode
+
+        self.station_table = self._load('station', None)
+        self._freq = self._load('freq', None)
+        self._arrays = {}
+        self._spatial_index = None
+
+        n_station = info['n_station']
+        n_freq = info['n_freq']
+        for name, dtype, shape in _DATA_ARRAYS:
+            array = self._load(name, mmap_mode)
+            if array.shape != (n_station, n_freq) + shape:
+                raise MTex.MTpyError_inputarguments(
+                    '{0}.npy of {1} has shape {2}, expected {3}'.format(
+                        name, archive_dir, array.shape,
+                        (n_station, n_freq) + shape))
+            self._arrays[name] = array
+
+    def _load(self, name, mmap_mode):
+        return np.load(os.path.join(self.archive_dir, '{0}.npy'.format(name)),
+                       mmap_mode=mmap_mode)
+
+    # ---station table---------------------------------------------------------
+    def _get_spatial_index(self):
+        if self._spatial_index is None:
+            self._spatial_index = spatial_index.SpatialIndex(
+                self.lat, self.lon, station=self.station)
+        return self._spatial_index
+
+    spatial_index = property(_get_spatial_index,
+                             doc='spatial index of the station locations')
+
+    n_stations = property(lambda self: self.station_table.shape[0],
+                          doc='number of stations')
+    n_freq = property(lambda self: self._freq.shape[0],
+                      doc='number of frequencies')
+
+    station = property(lambda self: self.station_table['station'],
+                       doc='station names')
+    lat = property(lambda self: self.station_table['lat'],
+                   doc='station latitudes (decimal degrees)')
+    lon = property(lambda self: self.station_table['lon'],
+                   doc='station longitudes (decimal degrees)')
+    elev = property(lambda self: self.station_table['elev'],
+                    doc='station elevations (m)')
+    east = property(lambda self: self.station_table['east'],
+                    doc='station eastings (m)')
+    north = property(lambda self: self.station_table['north'],
+                     doc='station northings (m)')
+    utm_zone = property(lambda self: self.station_table['utm_zone'],
+                        doc='station UTM zones')
+    fn = property(lambda self: self.station_table['fn'],
+                  doc='.edi file each station was read from')
+
+    # ---data arrays-----------------------------------------------------------
+    freq = property(lambda self: self._freq, doc='common frequencies in Hz')
+    period = property(lambda self: 1. / self._freq,
+                      doc='common periods in s')
+
+    z = property(lambda self: self._arrays['z'], doc='impedance tensors')
+    z_err = property(lambda self: self._arrays['z_err'],
+                     doc='impedance tensor errors')
+    tipper = property(lambda self: self._arrays['tipper'], doc='tippers')
+    tipper_err = property(lambda self: self._arrays['tipper_err'],
+                          doc='tipper errors')
+    mask = property(lambda self: self._arrays['mask'],
+                    doc='True where a station has impedance data')
+    tipper_mask = property(lambda self: self._arrays['tipper_mask'],
+                           doc='True where a station has tipper data')
+    rotation_angle = property(lambda self: self._arrays['rotation_angle'],
+                              doc='rotation angle of the data')
+
+    # ---selection-------------------------------------------------------------
+    def station_index(self, station):
+        """
+        index of a station given by name, an integer index is returned as
+        is
+        """
+        if isinstance(station, (int, np.integer)):
+            if not -self.n_stations <= station < self.n_stations:
+                raise MTex.MTpyError_inputarguments(
+                    'station index {0} out of range'.format(station))
+            return int(station) % self.n_stations
+
+        index = np.nonzero(self.station == u'{0}'.format(station))[0]
+        if len(index) == 0:
+            raise MTex.MTpyError_inputarguments(
+                'Could not find station {0} in {1}'.format(station,
+                                                           self.archive_dir))
+        return int(index[0])
+
+    def period_index(self, period, ptol=0.05):
+        """
+        index of the common period nearest to period
+
+        Arguments
+        -----------
+            **period** : float
+                         period in s
+
+            **ptol** : float
+                       relative tolerance, *default* is 0.05
+
+        Returns
+        ---------
+            **index** : int
+                        index into freq and the frequency axis of the data
+        """
+        index = int(np.argmin(np.abs(self.period - period)))
+        if abs(self.period[index] - period) > ptol * period:
+            raise MTex.MTpyError_inputarguments(
+                'No period within {0:.0%} of {1} s in {2}'.format(
+                    ptol, period, self.archive_dir))
+        return index
+
+    def _selection(self, station=None, period=None, ptol=0.05):
+        """
+        station and frequency indices of a selection, slices for all
+        """
+        if station is None:
+            s_index = slice(None)
+        elif np.ndim(station) == 0:
+            s_index = [self.station_index(station)]
+        else:
+            s_index = [self.station_index(ss) for ss in station]
+
+        if period is None:
+            f_index = slice(None)
+        elif np.ndim(period) == 0:
+            f_index = [self.period_index(period, ptol)]
+        else:
+            f_index = [self.period_index(pp, ptol) for pp in period]
+
+        return s_index, f_index
+
+    def to_z_stack(self, station=None, period=None, ptol=0.05):
+        """
+        ZStack of a selection of stations and periods, only the selected
+        data are read from the archive.
+
+        Arguments
+        -----------
+            **station** : string, int or list
+                          station name(s) or index(es), *default* is all
+
+            **period** : float or list
+                         period(s) in s, *default* is all
+
+            **ptol** : float
+                       relative tolerance for matching periods,
+                       *default* is 0.05
+
+        Returns
+        ---------
+            **z_stack** : mtpy.core.z_stack.ZStack
+        """
+        s_index, f_index = self._selection(station, period, ptol)
+
+        def take(array):
+            return np.asarray(array[s_index][:, f_index])
+
+        z_stack = ZStack(z_array=take(self.z),
+                         z_err_array=take(self.z_err),
+                         freq=self._freq[f_index],
+                         tipper_array=take(self.tipper),
+                         tipper_err_array=take(self.tipper_err),
+                         mask=take(self.mask),
+                         tipper_mask=take(self.tipper_mask),
+                         station=self.station[s_index].tolist(),
+                         lat=self.lat[s_index],
+                         lon=self.lon[s_index],
+                         elev=self.elev[s_index])
+        z_stack.rotation_angle = take(self.rotation_angle)
+
+        return z_stack
+
+    def get_station(self, station):
+        """
+        ZStack of one or more stations, see to_z_stack
+        """
+        return self.to_z_stack(station=station)
+
+    def get_period(self, period, ptol=0.05):
+        """
+        ZStack of all stations at one or more periods, see to_z_stack
+        """
+        return self.to_z_stack(period=period, ptol=ptol)
+
+    def get_mt(self, station):
+        """
+        mtpy.core.mt.MT object of a station
+        """
+        return self.to_mt_list(station=[station])[0]
+
+    def to_mt_list(self, station=None):
+        """
+        list of mtpy.core.mt.MT objects
+
+        Arguments
+        -----------
+            **station** : list
+                          station names or indexes, *default* is all
+
+        Returns
+        ---------
+            **mt_list** : list of mtpy.core.mt.MT
+                          fn is the .edi file a station was archived from,
+                          the file is not read
+        """
+        s_index = self._selection(station)[0]
+        mt_list = self.to_z_stack(station=station).to_mt_list()
+        for mt_obj, edi_fn in zip(mt_list, self.fn[s_index]):
+            mt_obj.station = str(mt_obj.station)
+            # keep the file the station was archived from without reading it
+            if edi_fn:
+                mt_obj._fn = str(edi_fn)
+        return mt_list
+
+    def to_edi(self, save_dir, station=None):
+        """
+        write an .edi file for each station, named after the station
+
+        Arguments
+        -----------
+            **save_dir** : string
+                           directory to write to, made if it does not exist
+
+            **station** : list
+                          station names or indexes, *default* is all
+
+        Returns
+        ---------
+            **edi_list** : list
+                           full paths to the new .edi files
+        """
+        if not os.path.isdir(save_dir):
+            os.makedirs(save_dir)
+
+        z_stack = self.to_z_stack(station=station)
+        edi_list = []
+        for ii in range(z_stack.n_stations):
+            edi_obj = MTedi.Edi()
+            edi_obj.station = str(z_stack.station[ii])
+            # unknown coordinates are written as 0
+            lat, lon, elev = np.nan_to_num([z_stack.lat[ii],
+                                            z_stack.lon[ii],
+                                            z_stack.elev[ii]])
+            edi_obj.lat = lat
+            edi_obj.lon = lon
+            edi_obj.elev = elev
+            edi_obj.Define_measurement.reflat = lat
+            edi_obj.Define_measurement.reflong = lon
+            edi_obj.Define_measurement.refelev = elev
+            edi_obj.Info.info_list = ['written from survey archive '
+                                      '{0}'.format(self.archive_dir)]
+            # tippers are written on the impedance frequencies
+            valid = z_stack.mask[ii]
+            edi_obj.Z = z_stack.get_z(ii)
+            edi_obj.Tipper = Tipper(
+                tipper_array=z_stack.tipper[ii, valid],
+                tipper_err_array=z_stack.tipper_err[ii, valid],
+                freq=z_stack.freq[valid])
+            edi_obj.Tipper.rotation_angle = edi_obj.Z.rotation_angle
+
+            edi_list.append(edi_obj.write_edi_file(
+                new_edi_fn=os.path.join(save_dir,
+                                        '{0}.edi'.format(edi_obj.station))))
+
+        return edi_list
+
+
+def edi_to_archive(edi_source, archive_dir, n_workers=1, freq=None,
+                   ftol=1e-4, overwrite=False):
+    """
+    read .edi files into a survey archive
+
+    Arguments
+    -----------
+        **edi_source** : string or list
+                         directory containing .edi files or a list of .edi
+                         files
+
+        **archive_dir** : string
+                          archive directory to write
+
+        **n_workers** : int
+                        number of processes reading the .edi files, None
+                        for one per CPU.  *default* is 1
+
+        **freq** : np.ndarray(n_freq)
+                   common frequency axis, *default* is the union of all
+                   station frequencies
+
+        **ftol** : float
+                   relative tolerance for matching frequencies,
+                   *default* is 1e-4
+
+        **overwrite** : [ True | False ]
+                        replace an existing archive, *default* is False
+
+    Returns
+    ---------
+        **archive** : SurveyArchive
+                      .edi files that could not be read by a pool of
+                      workers are left out, with one worker the read
+                      error is raised
+    """
+    loader = mt_loader.MTLoader(n_workers=n_workers)
+    z_stack = loader.load_z_stack(edi_source, freq=freq, ftol=ftol)
+    edi_fn = [os.path.abspath(fn) for fn in loader.loaded_edi_list]
+
+    return write_archive(archive_dir, z_stack, edi_fn=edi_fn,
+                         overwrite=overwrite)
+
+
+def archive_to_edi(archive_dir, save_dir):
+    """
+    write an .edi file for each station of a survey archive, see
+    SurveyArchive.to_edi
+    """
+    return SurveyArchive(archive_dir).to_edi(save_dir)
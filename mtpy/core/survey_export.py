@@ -0,0 +1,471 @@
+#!/usr/bin/env python
+
+"""
+=============
+survey_export module
+=============
+
+Export the phase tensor, tipper, impedance, resistivity and phase of many
+stations to csv files or to a compressed columnar .npz file.  The values of
+a station are computed for all requested frequencies in one go, in a pool
+of workers if asked for, and written out as soon as they come back, so the
+memory used does not grow with the size of the survey.
+
+Functions
+-----------
+    * match_frequencies --> index of the first station frequency within a
+                            tolerance of each of a list of frequencies
+    * phase_tensor_table --> phase tensor and tipper attributes of a station
+    * measurement_table --> impedance, tipper, resistivity and phase of a
+                            station
+    * iter_tables --> tables of many stations, one at a time
+    * export_tables --> write the tables of many stations with a writer
+
+Classes
+---------
+    * CsvTableWriter --> a csv file per frequency and a summary csv file
+                         ordered by frequency
+    * NpzTableWriter --> one compressed .npz file with an array per column
+
+    >>> import mtpy.core.survey_export as survey_export
+    >>> freq = edi_collection.period_index.unique_freq
+    >>> with survey_export.NpzTableWriter(r"/home/mt/phase_tensor.npz",
+    ...                                   survey_export.PT_COLUMNS) as writer:
+    ...     survey_export.export_tables(survey_export.phase_tensor_table,
+    ...                                 edi_list, freq, writer, n_workers=8)
+    >>> np.load(r"/home/mt/phase_tensor.npz")['phi_min']
+
+"""
+
+# =================================================================
+import collections
+import csv
+import os
+import shutil
+import tempfile
+import zipfile
+
+import numpy as np
+
+import mtpy.core.mt as mt
+import mtpy.core.mt_loader as mt_loader
+import mtpy.utils.exceptions as MTex
+
+from mtpy.utils.mtpylog import MtPyLog
+
+logger = MtPyLog().get_mtpy_logger(__name__)
+# =================================================================
+
+PT_COLUMNS = ['station', 'freq', 'lon', 'lat', 'phi_min', 'phi_max',
+              'azimuth', 'skew', 'n_skew', 'elliptic', 'tip_mag_re',
+              'tip_mag_im', 'tip_ang_re', 'tip_ang_im']
+
+MEASUREMENT_COLUMNS = ['FREQ', 'STATION', 'LAT', 'LON', 'ZXXre', 'ZXXim',
+                       'ZXYre', 'ZXYim', 'ZYXre', 'ZYXim', 'ZYYre', 'ZYYim',
+                       'TXre', 'TXim', 'TYre', 'TYim', 'RHOxx', 'RHOxy',
+                       'RHOyx', 'RHOyy', 'PHSxx', 'PHSxy', 'PHSyx', 'PHSyy']
+
+
+def match_frequencies(station_freq, freq, ptol=0.05):
+    """
+    index of the first frequency of a station within the relative tolerance
+    ptol of each of freq, freq * (1 - ptol) < f < freq * (1 + ptol), the
+    same as mtpy.core.period_index.PeriodIndex.find_freq.
+
+    Arguments
+    -----------
+        **station_freq** : np.ndarray
+                           frequencies of the station (Hz)
+
+        **freq** : np.ndarray(n_freq)
+                   frequencies to look for (Hz)
+
+        **ptol** : float
+                   relative tolerance, *default* is 0.05
+
+    Returns
+    ---------
+        **positions** : np.ndarray(n_freq, dtype=int)
+                        index into station_freq, -1 where the station has
+                        no frequency within the tolerance
+    """
+    station_freq = np.asarray(station_freq, dtype='float').ravel()
+    freq = np.asarray(freq, dtype='float').ravel()
+    positions = np.zeros(len(freq), dtype='int') - 1
+
+    order = np.argsort(station_freq, kind='mergesort')
+    sorted_freq = station_freq[order]
+    start = np.searchsorted(sorted_freq, freq * (1 - ptol), side='right')
+    stop = np.searchsorted(sorted_freq, freq * (1 + ptol), side='left')
+    counts = np.maximum(stop - start, 0)
+    found = counts > 0
+    if not np.any(found):
+        return positions
+
+    # the windows are laid end to end, the lowest station index of each
+    # window is its first frequency in station order
+    counts = counts[found]
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    window = np.repeat(start[found] - offsets, counts) + \
+        np.arange(counts.sum())
+    positions[found] = np.minimum.reduceat(order[window], offsets)
+
+    return positions
+
+
+def _station_values(mt_obj, freq, ptol):
+    """
+    indices into freq the station has and the positions of those
+    frequencies in the station
+    """
+    positions = match_frequencies(mt_obj.Z.freq, freq, ptol)
+    freq_index = np.nonzero(positions >= 0)[0]
+    return freq_index, positions[freq_index]
+
+
+def phase_tensor_table(mt_obj, freq, ptol=0.05):
+    """
+    phase tensor ellipse and tipper attributes of a station at each of freq
+    it has a frequency for, see match_frequencies.
+
+    Arguments
+    -----------
+        **mt_obj** : mtpy.core.mt.MT
+
+        **freq** : np.ndarray(n_freq)
+                   frequencies (Hz)
+
+        **ptol** : float
+                   relative tolerance, *default* is 0.05
+
+    Returns
+    ---------
+        **freq_index** : np.ndarray(dtype=int)
+                         index into freq of each row
+
+        **columns** : list
+                      values of the columns PT_COLUMNS, one per row
+    """
+    freq = np.asarray(freq, dtype='float')
+    freq_index, p_index = _station_values(mt_obj, freq, ptol)
+    n_rows = len(p_index)
+
+    pt_obj = mt_obj.pt
+    tipper = mt_obj.Tipper
+    beta = pt_obj.beta[0][p_index]
+    columns = [[mt_obj.station] * n_rows, freq[freq_index],
+               [mt_obj.lon] * n_rows, [mt_obj.lat] * n_rows,
+               pt_obj.phimin[0][p_index],
+               pt_obj.phimax[0][p_index],
+               pt_obj.azimuth[0][p_index],
+               beta,
+               2 * beta,
+               pt_obj.ellipticity[0][p_index],
+               tipper.mag_real[p_index],
+               tipper.mag_imag[p_index],
+               tipper.angle_real[p_index],
+               tipper.angle_imag[p_index]]
+
+    return freq_index, columns
+
+
+def measurement_table(mt_obj, freq, ptol=0.05):
+    """
+    impedance, tipper, apparent resistivity and phase of a station at each
+    of freq it has a frequency for, see match_frequencies.  The yx phase is
+    moved into the first quadrant the same way as by
+    mtpy.imaging.mtplottools.ResPhase.
+
+    Returns
+    ---------
+        **freq_index**, **columns** : see phase_tensor_table, the columns
+                                      are MEASUREMENT_COLUMNS
+    """
+    freq = np.asarray(freq, dtype='float')
+    freq_index, p_index = _station_values(mt_obj, freq, ptol)
+    n_rows = len(p_index)
+
+    z = mt_obj.Z.z[p_index]
+    tipper = mt_obj.Tipper.tipper[p_index]
+    res = mt_obj.Z.resistivity[p_index]
+    phase_yx = mt_obj.Z.phase[:, 1, 0]
+    if phase_yx.mean() > 180:
+        phase_yx = phase_yx - 180
+    else:
+        phase_yx = phase_yx + 180
+    phase = mt_obj.Z.phase[p_index]
+
+    columns = [freq[freq_index], [mt_obj.station] * n_rows,
+               [mt_obj.lat] * n_rows, [mt_obj.lon] * n_rows]
+    for ii, jj in [(0, 0), (0, 1), (1, 0), (1, 1)]:
+        columns += [z[:, ii, jj].real, z[:, ii, jj].imag]
+    for jj in [0, 1]:
+        columns += [tipper[:, 0, jj].real, tipper[:, 0, jj].imag]
+    columns += [res[:, 0, 0], res[:, 0, 1], res[:, 1, 0], res[:, 1, 1],
+                phase[:, 0, 0], phase[:, 0, 1], phase_yx[p_index],
+                phase[:, 1, 1]]
+
+    return freq_index, columns
+
+
+def _station_table(args):
+    """
+    table of one station, given as an MT object or an .edi file
+    """
+    table_func, source, freq, ptol = args
+    if isinstance(source, (str, type(u''))):
+        source = mt.MT(source)
+    return table_func(source, freq, ptol=ptol)
+
+
+def iter_tables(table_func, sources, freq, ptol=0.05, n_workers=1,
+                pool='process'):
+    """
+    tables of many stations, one station at a time in the order of sources
+
+    Arguments
+    -----------
+        **table_func** : [ phase_tensor_table | measurement_table ]
+                         module level function making the table of a
+                         station
+
+        **sources** : iterable of mtpy.core.mt.MT or .edi files, files are
+                      read by the workers
+
+        **freq** : np.ndarray(n_freq)
+                   frequencies (Hz)
+
+        **ptol** : float
+                   relative tolerance, *default* is 0.05
+
+        **n_workers** : int
+                        number of workers, see mt_loader.pool_imap,
+                        *default* is 1
+
+        **pool** : [ 'process' | 'thread' ]
+                   kind of worker pool, *default* is 'process'
+
+    Returns
+    ---------
+        **tables** : generator of (freq_index, columns)
+    """
+    freq = np.asarray(freq, dtype='float')
+    return mt_loader.pool_imap(_station_table,
+                               ((table_func, source, freq, ptol)
+                                for source in sources),
+                               n_workers=n_workers, pool=pool)
+
+
+def export_tables(table_func, sources, freq, writer, ptol=0.05, n_workers=1,
+                  pool='process'):
+    """
+    write the tables of many stations, see iter_tables for the arguments
+
+    Arguments
+    -----------
+        **writer** : CsvTableWriter or NpzTableWriter
+                     written to station by station, it is not closed
+
+    Returns
+    ---------
+        **counts** : np.ndarray(n_freq, dtype=int)
+                     number of stations written for each of freq
+    """
+    counts = np.zeros(len(freq), dtype='int')
+    for freq_index, columns in iter_tables(table_func, sources, freq,
+                                           ptol=ptol, n_workers=n_workers,
+                                           pool=pool):
+        writer.write(freq_index, columns)
+        counts[freq_index] += 1
+
+    return counts
+
+
+class CsvTableWriter(object):
+    """
+    Write the tables of many stations to a csv file per frequency and a
+    summary csv file with the rows ordered by frequency, then by station.
+    The rows are kept in memory until buffer_rows of them are collected,
+    then appended to the files of their frequencies.  The summary file is
+    joined from the frequency files when the writer is closed.
+
+    Arguments
+    -----------
+        **csv_fn** : string
+                     full path to the summary csv file
+
+        **freq_fn_list** : list of strings
+                           full path to the csv file of each frequency
+
+        **header** : list of column names
+
+        **buffer_rows** : int
+                          number of rows collected before they are written,
+                          *default* is 10000
+    """
+
+    def __init__(self, csv_fn, freq_fn_list, header, buffer_rows=10000):
+        self.csv_fn = csv_fn
+        self.freq_fn_list = list(freq_fn_list)
+        self.header = list(header)
+        self.buffer_rows = buffer_rows
+
+        self._buffer = collections.defaultdict(list)
+        self._n_buffered = 0
+
+        for freq_fn in self.freq_fn_list:
+            with open(freq_fn, 'wb') as freq_csvf:
+                csv.writer(freq_csvf).writerow(self.header)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def write(self, freq_index, columns):
+        """
+        add the rows of a station, row ii goes to frequency freq_index[ii]
+        """
+        for f_index, row in zip(freq_index, zip(*columns)):
+            self._buffer[f_index].append(row)
+        self._n_buffered += len(freq_index)
+        if self._n_buffered >= self.buffer_rows:
+            self.flush()
+
+    def flush(self):
+        """
+        append the collected rows to the files of their frequencies
+        """
+        for f_index in sorted(self._buffer):
+            with open(self.freq_fn_list[f_index], 'ab') as freq_csvf:
+                csv.writer(freq_csvf).writerows(self._buffer[f_index])
+        self._buffer.clear()
+        self._n_buffered = 0
+
+    def close(self):
+        """
+        write the remaining rows and the summary file
+        """
+        self.flush()
+        with open(self.csv_fn, 'wb') as csvf:
+            csv.writer(csvf).writerow(self.header)
+            for freq_fn in self.freq_fn_list:
+                with open(freq_fn, 'rb') as freq_csvf:
+                    # skip the header
+                    freq_csvf.readline()
+                    shutil.copyfileobj(freq_csvf, csvf)
+
+
+class NpzTableWriter(object):
+    """
+    Write the tables of many stations to one compressed .npz file with an
+    array per column, readable with np.load.  The rows are in station
+    order.  Every station is appended to a temporary file per column
+    straight away, the .npz file is made from these when the writer is
+    closed.
+
+    Arguments
+    -----------
+        **npz_fn** : string
+                     full path to the .npz file
+
+        **header** : list of column names
+
+        **text_columns** : list of the columns holding station names, they
+                           become string arrays, all other columns are
+                           floats.  *default* is ['station', 'STATION']
+    """
+
+    def __init__(self, npz_fn, header, text_columns=('station', 'STATION')):
+        self.npz_fn = npz_fn
+        self.header = list(header)
+        self.text_columns = [name for name in self.header
+                             if name in text_columns]
+        self.n_rows = 0
+
+        # the station names are stored as an index into a list of names
+        self._names = collections.OrderedDict()
+        self._tmp_dir = tempfile.mkdtemp(
+            dir=os.path.dirname(os.path.abspath(npz_fn)))
+        self._files = [open(self._column_fn(name), 'wb')
+                       for name in self.header]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _column_fn(self, name):
+        return os.path.join(self._tmp_dir, name)
+
+    def write(self, freq_index, columns):
+        """
+        add the rows of a station
+        """
+        if len(columns) != len(self.header):
+            raise MTex.MTpyError_inputarguments(
+                'need {0} columns, not {1}'.format(len(self.header),
+                                                   len(columns)))
+        for name, values, column_file in zip(self.header, columns,
+                                             self._files):
+            if name in self.text_columns:
+                values = [self._names.setdefault(value, len(self._names))
+                          for value in values]
+                values = np.array(values, dtype='int64')
+            else:
+                values = np.array([np.nan if value is None else value
+                                   for value in values], dtype='float64')
+            values.tofile(column_file)
+        self.n_rows += len(freq_index)
+
+    def _write_npy(self, name, npy_fn, chunk_rows=1000000):
+        """
+        .npy file of a column from its temporary file
+        """
+        if name in self.text_columns:
+            # stations without a name are empty strings, as in a csv file
+            names = np.array([u'' if value is None else value
+                              for value in self._names] or [''])
+            dtype = names.dtype
+        else:
+            dtype = np.dtype('float64')
+            names = None
+
+        with open(npy_fn, 'wb') as npy_file:
+            np.lib.format.write_array_header_1_0(
+                npy_file, {'descr': np.lib.format.dtype_to_descr(dtype),
+                           'fortran_order': False,
+                           'shape': (self.n_rows,)})
+            with open(self._column_fn(name), 'rb') as column_file:
+                if names is None:
+                    shutil.copyfileobj(column_file, npy_file)
+                    return
+                while True:
+                    codes = np.fromfile(column_file, dtype='int64',
+                                        count=chunk_rows)
+                    if len(codes) == 0:
+                        break
+                    names[codes].tofile(npy_file)
+
+    def close(self):
+        """
+        write the .npz file and remove the temporary files
+        """
+        if self._files is None:
+            return
+        try:
+            for column_file in self._files:
+                column_file.close()
+            with zipfile.ZipFile(self.npz_fn, 'w', zipfile.ZIP_DEFLATED,
+                                 allowZip64=True) as npz_file:
+                for name in self.header:
+                    npy_fn = self._column_fn(name) + '.npy'
+                    self._write_npy(name, npy_fn)
+                    npz_file.write(npy_fn, name + '.npy')
+                    os.remove(npy_fn)
+        finally:
+            self._files = None
+            shutil.rmtree(self._tmp_dir, ignore_errors=True)
+        logger.info('Wrote {0} rows to {1}'.format(self.n_rows, self.npz_fn))
@@ -77,6 +77,8 @@ class Z(object):
     Methods             Description
     =================== =======================================================
     det                  calculates determinant of z with errors
+    invalidate           forgets the quantities derived from z, call after
+                         changing z, z_err or freq in place
     invariants           calculates the invariants of z
     inverse              calculates the inverse of z
     remove_distortion    removes distortion given a distortion matrix
@@ -104,6 +106,12 @@ class Z(object):
         >>> z_object.rotate(45)
         >>> z_object.resistivity
 
+    .. note:: resistivity, phase, det, trace, skew, norm and invariants are
+              computed when first accessed and kept until z, z_err or freq
+              are set again.  Setting these attributes is the way to change
+              the data; code that changes the arrays in place, e.g.
+              ``z_object.z[idx] = 0``, must call ``z_object.invalidate()``
+              afterwards.
 
     """
 
@@ -154,8 +162,8 @@ class Z(object):
         self._phase = None
         self._phase_err = None
 
-        if self._z is not None:
-            self._compute_res_phase()
+        # derived quantities are computed when first accessed
+        self._derived = {}
 
     # ---frequency-------------------------------------------------------------
     def _set_freq(self, lo_freq):
@@ -184,12 +192,7 @@ class Z(object):
 
         self._freq = np.array(lo_freq)
 
-        # for consistency recalculate resistivity and phase
-        if self._z is not None:
-            try:
-                self._compute_res_phase()
-            except IndexError:
-                logging.error('Need to input frequency array')
+        self.invalidate()
 
     def _get_freq(self):
         if self._freq is None:
@@ -233,12 +236,7 @@ class Z(object):
             self.rotation_angle = np.repeat(self.rotation_angle,
                                             len(self._z))
 
-        # for consistency recalculate resistivity and phase
-        if self._z is not None:
-            try:
-                self._compute_res_phase()
-            except IndexError:
-                logger.error('Need to input frequency array')
+        self.invalidate()
 
     def _get_z(self):
         return self._z
@@ -264,12 +262,7 @@ class Z(object):
                 z_err_array.shape, self.z.shape))
         self._z_err = z_err_array
 
-        # for consistency recalculate resistivity and phase
-        if self._z_err is not None and self._z is not None:
-            try:
-                self._compute_res_phase()
-            except IndexError:
-                logger.error('Need to input frequency array')
+        self.invalidate()
 
     def _get_z_err(self):
         return self._z_err
@@ -321,9 +314,6 @@ class Z(object):
 
         self.z = z_new
 
-        # for consistency recalculate resistivity and phase
-        self._compute_res_phase()
-
     # real = property(_get_real, _set_real, doc='Real part of Z')
     # ---imaginary part of impedance tensor------------------------------------
     def _get_imag(self):
@@ -369,11 +359,20 @@ class Z(object):
 
         self.z = z_new
 
-        # for consistency recalculate resistivity and phase
-        self._compute_res_phase()
-
     # imag = property(_get_imag, _set_imag, doc='Imaginary part of Z ')
 
+    # -----derived quantities-------------------------------------------------
+    def invalidate(self):
+        """
+        Forget all quantities derived from z, z_err and freq (resistivity,
+        phase, det, trace, skew, norm, invariants).  They are recomputed when
+        they are accessed next.
+
+        This is done automatically when z, z_err or freq are set, call it
+        after changing those arrays in place.
+        """
+        self._derived = {}
+
     # -----resistivity and phase----------------------------------------------
     def _compute_res_phase(self):
         """ Compute and sets attributes
@@ -382,7 +381,13 @@ class Z(object):
                 * resistivity_err
                 * phase_err
         values for resistivity are in in Ohm-m and phase in degrees.
+
+        This is done on first access of any of these attributes, all other
+        cached derived quantities are cleared.  The result is only marked
+        as up to date once it has been computed.
         """
+        self._derived = {}
+
         if self.freq is None:
             logger.info('self.freq is None - cannot calculate Res/Phase')
             # This is due to spectra type EDI file!!!
@@ -398,40 +403,53 @@ class Z(object):
             self._resistivity_err = np.zeros_like(self.z_err)
             self._phase_err = np.zeros_like(self.z_err)
 
+        if len(self.freq) < len(self.z):
+            raise IndexError('freq has {0} entries, z has {1}'.format(
+                len(self.freq), len(self.z)))
+        freq = self.freq[:len(self.z), np.newaxis, np.newaxis]
+
+        # calculate resistivity and phase for all elements at once
+        z_abs = np.abs(self.z)
         self._resistivity = np.zeros_like(self.z, dtype='float')
         self._phase = np.zeros_like(self.z, dtype='float')
+        self._resistivity[:] = z_abs ** 2 / freq * 0.2
+        self._phase[:] = np.degrees(np.angle(self.z))
 
-        # calculate resistivity and phase
-        for idx_f in range(len(self.z)):
-            for ii in range(2):
-                for jj in range(2):
-                    self._resistivity[idx_f, ii, jj] = np.abs(self.z[idx_f, ii, jj]) ** 2 / \
-                        self.freq[idx_f] * 0.2
-                    self._phase[idx_f, ii, jj] = math.degrees(cmath.phase(
-                        self.z[idx_f, ii, jj]))
-
-                    if self.z_err is not None:
-                        r_err, phi_err = MTcc.z_error2r_phi_error(
-                            np.real(self.z[idx_f, ii, jj]),
-                            self.z_err[idx_f, ii, jj],
-                            np.imag(self.z[idx_f, ii, jj]),
-                            self.z_err[idx_f, ii, jj])
-
-                        self._resistivity_err[idx_f, ii, jj] = \
-                            0.4 * np.abs(self.z[idx_f, ii, jj]) / \
-                            self.freq[idx_f] * r_err
-                        self._phase_err[idx_f, ii, jj] = phi_err
+        if self.z_err is not None:
+            r_err, phi_err = MTcc.z_error2r_phi_error_array(np.real(self.z),
+                                                            self.z_err,
+                                                            np.imag(self.z),
+                                                            self.z_err)
+
+            self._resistivity_err[:] = 0.4 * z_abs / freq * r_err
+            self._phase_err[:] = phi_err
+
+        self._derived['res_phase'] = True
+
+    def _check_res_phase(self):
+        """
+        make sure resistivity and phase are up to date
+        """
+        if 'res_phase' not in self._derived:
+            try:
+                self._compute_res_phase()
+            except IndexError:
+                logger.error('Need to input frequency array')
 
     def _get_resistivity(self):
+        self._check_res_phase()
         return self._resistivity
 
     def _get_resistivity_err(self):
+        self._check_res_phase()
         return self._resistivity_err
 
     def _get_phase(self):
+        self._check_res_phase()
         return self._phase
 
     def _get_phase_err(self):
+        self._check_res_phase()
         return self._phase_err
 
     def _set_resistivity(self, *kwargs):
@@ -505,13 +523,10 @@ class Z(object):
             raise MTex.MTpyError_inputarguments('Error - array "phase" is' +
                                                 'not real valued !')
 
-        for idx_f in range(len(z_new)):
-            for ii in range(2):
-                for jj in range(2):
-                    abs_z = np.sqrt(5 * self.freq[idx_f] *
-                                    res_array[idx_f, ii, jj])
-                    z_new[idx_f, ii, jj] = cmath.rect(abs_z,
-                                                      np.radians(phase_array[idx_f, ii, jj]))
+        freq = self.freq[:, np.newaxis, np.newaxis]
+        abs_z = np.sqrt(5 * freq * res_array)
+        phase_rad = np.radians(phase_array)
+        z_new[:] = abs_z * np.cos(phase_rad) + 1j * abs_z * np.sin(phase_rad)
 
         self.z = z_new
 
@@ -553,27 +568,19 @@ class Z(object):
                       ' Zerr not set')
                 return
 
-        for idx_f in range(len(z_err_new)):
-            for ii in range(2):
-                for jj in range(2):
-                    abs_z = np.sqrt(5 * self.freq[idx_f] *
-                                    res_array[idx_f, ii, jj])
-                    rel_error_res = reserr_array[idx_f, ii, jj] / \
-                        res_array[idx_f, ii, jj]
-                    # relative error varies by a factor of 0.5, which is the
-                    # exponent in the relation between them:
-                    abs_z_error = 0.5 * abs_z * rel_error_res
-
-                    z_err_new[idx_f, ii, jj] = max(MTcc.propagate_error_polar2rect(
-                        abs_z,
-                        abs_z_error,
-                        phase_array[idx_f, ii, jj],
-                        phaseerr_array[idx_f, ii, jj]))
+        abs_z = np.sqrt(5 * freq * res_array)
+        rel_error_res = reserr_array / res_array
+        # relative error varies by a factor of 0.5, which is the
+        # exponent in the relation between them:
+        abs_z_error = 0.5 * abs_z * rel_error_res
 
-        self.z_err = z_err_new
+        x_err, y_err = MTcc.propagate_error_polar2rect_array(abs_z,
+                                                             abs_z_error,
+                                                             phase_array,
+                                                             phaseerr_array)
+        z_err_new[:] = np.where(y_err > x_err, y_err, x_err)
 
-        # for consistency recalculate resistivity and phase
-        self._compute_res_phase()
+        self.z_err = z_err_new
 
     def _get_inverse(self):
         """
@@ -660,32 +667,16 @@ class Z(object):
             # self.rotation_angle = 0.
             return
 
-        z_rot = copy.copy(self.z)
-        z_err_rot = copy.copy(self.z_err)
-
-        for idx_freq in range(len(self.z)):
+        angles = np.array(lo_angles, dtype='float')
+        angles[np.isnan(angles)] = 0.
 
-            angle = lo_angles[idx_freq]
-            if np.isnan(angle):
-                angle = 0.
-
-            if self.z_err is not None:
-                z_rot[idx_freq], z_err_rot[idx_freq] = \
-                    MTcc.rotatematrix_incl_errors(self.z[idx_freq, :, :],
-                                                  angle,
-                                                  self.z_err[idx_freq, :, :])
-            else:
-                z_rot[idx_freq], z_err_rot = \
-                    MTcc.rotatematrix_incl_errors(self.z[idx_freq, :, :],
-                                                  angle)
+        z_rot, z_err_rot = MTcc.rotatematrices_incl_errors(self.z, angles,
+                                                           self.z_err)
 
         self.z = z_rot
         if self.z_err is not None:
             self.z_err = z_err_rot
 
-        # for consistency recalculate resistivity and phase
-        self._compute_res_phase()
-
     def remove_ss(self, reduce_res_factor_x=1., reduce_res_factor_y=1.):
         """
         Remove the static shift by providing the respective correction factors
@@ -859,45 +850,39 @@ class Z(object):
                     (distortion_err_tensor.shape == (2, 2)):
                 raise ValueError('Shape not the same')
 
-            distortion_tensor = np.matrix(np.real(distortion_tensor))
+            distortion_tensor = np.real(distortion_tensor)
+            distortion_err_tensor = np.real(distortion_err_tensor)
 
         except ValueError:
             raise MTex.MTpyError_Z('The array provided is not a proper' +
                                    'distortion tensor')
 
-        try:
-            DI = distortion_tensor.I
-        except np.linalg.LinAlgError:
+        det = distortion_tensor[0, 0] * distortion_tensor[1, 1] - \
+            distortion_tensor[0, 1] * distortion_tensor[1, 0]
+        if det == 0:
             raise MTex.MTpyError_Z('The provided distortion tensor is' +
                                    'singular - I cannot invert that!')
 
-        # propagation of errors (using 1-norm) - step 1 - inversion of D:
-        DI_err = np.zeros_like(distortion_err_tensor)
+        DI = np.array([[distortion_tensor[1, 1], -distortion_tensor[0, 1]],
+                       [-distortion_tensor[1, 0], distortion_tensor[0, 0]]],
+                      dtype='float') / det
 
+        # propagation of errors (using 1-norm) - step 1 - inversion of D:
+        # err(DI)_ij = sum_kl |DI_ik * DI_lj * err(D)_kl|
         # todo :include error on  determinant!!
-        # D_det = np.linalg.det(distortion_tensor)
-
-        dummy, DI_err = MTcc.invertmatrix_incl_errors(distortion_tensor,
-                                                      distortion_err_tensor)
+        DI_abs = np.abs(DI)
+        DI_err = np.dot(np.dot(DI_abs, distortion_err_tensor), DI_abs)
 
         # propagation of errors - step 2 - product of D.inverse and Z;
-        # D.I * Z, making it 4 summands for each component:
-        z_corrected = np.zeros_like(self.z)
-        z_corrected_err = np.zeros_like(self.z_err)
+        # D.I * Z, making it 4 summands for each component, for all
+        # frequencies at once:
+        z_err = self.z_err
+        if z_err is None:
+            z_err = np.zeros(self.z.shape)
 
-        for idx_f in range(len(self.z)):
-            z_corrected[idx_f] = np.array(np.dot(DI, np.matrix(self.z[idx_f])))
-            for ii in range(2):
-                for jj in range(2):
-                    z_corrected_err[idx_f, ii, jj] = np.sum(np.abs(
-                        np.array([DI_err[ii, 0] *
-                                  self.z[idx_f, 0, jj],
-                                  DI[ii, 0] *
-                                  self.z_err[idx_f, 0, jj],
-                                  DI_err[ii, 1] *
-                                  self.z[idx_f, 1, jj],
-                                  DI[ii, 1] *
-                                  self.z_err[idx_f, 1, jj]])))
+        z_corrected = np.matmul(DI, self.z)
+        z_corrected_err = np.matmul(DI_err, np.abs(self.z)) + \
+            np.matmul(DI_abs, np.abs(z_err))
 
         return distortion_tensor, z_corrected, z_corrected_err
 
@@ -962,13 +947,18 @@ class Z(object):
 
         """
 
-        tr = np.array([np.trace(ii) for ii in self.z])
+        if 'trace' in self._derived:
+            return self._derived['trace']
+
+        tr = self.z[:, 0, 0] + self.z[:, 1, 1]
 
         tr_err = None
         if self.z_err is not None:
             tr_err = np.zeros_like(tr)
             tr_err[:] = self.z_err[:, 0, 0] + self.z_err[:, 1, 1]
 
+        self._derived['trace'] = (tr, tr_err)
+
         return tr, tr_err
 
     trace = property(_get_trace, doc='Trace of Z, incl. error')
@@ -986,13 +976,18 @@ class Z(object):
 
         """
 
-        skew = np.array([ii[0, 1] - ii[1, 0] for ii in self.z])
+        if 'skew' in self._derived:
+            return self._derived['skew']
+
+        skew = self.z[:, 0, 1] - self.z[:, 1, 0]
 
         skewerr = None
         if self.z_err is not None:
             skewerr = np.zeros_like(skew)
             skewerr[:] = self.z_err[:, 0, 1] + self.z_err[:, 1, 0]
 
+        self._derived['skew'] = (skew, skewerr)
+
         return skew, skewerr
 
     skew = property(_get_skew, doc='Skew of Z, incl. error')
@@ -1010,7 +1005,11 @@ class Z(object):
 
         """
 
-        det_Z = np.array([np.linalg.det(ii) for ii in self.z])
+        if 'det' in self._derived:
+            return self._derived['det']
+
+        det_Z = self.z[:, 0, 0] * self.z[:, 1, 1] - \
+            self.z[:, 0, 1] * self.z[:, 1, 0]
 
         det_Z_err = None
         if self.z_err is not None:
@@ -1020,6 +1019,8 @@ class Z(object):
                 np.abs(self.z[:, 0, 1] * self.z_err[:, 1, 0]) + \
                 np.abs(self.z[:, 1, 0] * self.z_err[:, 0, 1])
 
+        self._derived['det'] = (det_Z, det_Z_err)
+
         return det_Z, det_Z_err
 
     det = property(_get_det, doc='Determinant of Z, incl. error')
@@ -1037,23 +1038,21 @@ class Z(object):
 
         """
 
-        znorm = np.array([np.linalg.norm(ii) for ii in self.z])
+        if 'norm' in self._derived:
+            return self._derived['norm']
+
+        znorm = np.sqrt(np.sum(np.abs(self.z) ** 2, axis=(1, 2)))
         znormerr = None
 
         if self.z_err is not None:
             znormerr = np.zeros_like(znorm)
-            for idx, z_tmp in enumerate(self.z):
-                value = znorm[idx]
-                error_matrix = self.z_err[idx]
-                radicand = 0.
-                for ii in range(2):
-                    for jj in range(2):
-                        radicand += (error_matrix[ii, jj] *
-                                     np.real(z_tmp[ii, jj])) ** 2
-                        radicand += (error_matrix[ii, jj] *
-                                     np.imag(z_tmp[ii, jj])) ** 2
-
-                znormerr[idx] = 1. / value * np.sqrt(radicand)
+            radicand = np.sum((self.z_err * np.real(self.z)) ** 2 +
+                              (self.z_err * np.imag(self.z)) ** 2,
+                              axis=(1, 2))
+
+            znormerr[:] = 1. / znorm * np.sqrt(radicand)
+
+        self._derived['norm'] = (znorm, znormerr)
 
         return znorm, znormerr
 
@@ -1076,45 +1075,45 @@ class Z(object):
                         * sigma_plus/minus
         """
 
+        if 'invariants' in self._derived:
+            return self._derived['invariants']
+
         invariants_dict = {}
 
         z1 = (self.z[:, 0, 1] - self.z[:, 1, 0]) / 2.
         invariants_dict['z1'] = z1
 
-        invariants_dict['det'] = self.det[0]
+        det = self.det[0]
+        invariants_dict['det'] = det
 
-        det_real = np.array([np.linalg.det(ii) for ii in np.real(self.z)])
+        z_real = np.real(self.z)
+        det_real = z_real[:, 0, 0] * z_real[:, 1, 1] - \
+            z_real[:, 0, 1] * z_real[:, 1, 0]
         invariants_dict['det_real'] = det_real
 
-        det_imag = np.array([np.linalg.det(ii) for ii in np.imag(self.z)])
+        z_imag = np.imag(self.z)
+        det_imag = z_imag[:, 0, 0] * z_imag[:, 1, 1] - \
+            z_imag[:, 0, 1] * z_imag[:, 1, 0]
         invariants_dict['det_imag'] = det_imag
 
         invariants_dict['trace'] = self.trace[0]
 
         invariants_dict['skew'] = self.skew[0]
 
-        invariants_dict['norm'] = self.norm[0]
+        norm = self.norm[0]
+        invariants_dict['norm'] = norm
 
-        lambda_plus = np.array([z1[ii] + np.sqrt(z1[ii] * z1[ii] -
-                                                 self.det[0][ii]) for ii in range(len(z1))])
-        invariants_dict['lambda_plus'] = lambda_plus
+        invariants_dict['lambda_plus'] = z1 + np.sqrt(z1 * z1 - det)
 
-        lambda_minus = np.array([z1[ii] - np.sqrt(z1[ii] * z1[ii] -
-                                                  self.det[0][ii]) for ii in range(len(z1))])
-        invariants_dict['lambda_minus'] = lambda_minus
+        invariants_dict['lambda_minus'] = z1 - np.sqrt(z1 * z1 - det)
 
-        sigma_plus = np.array([0.5 * self.norm[0][ii] ** 2 +
-                               np.sqrt(0.25 * self.norm[0][ii] ** 4 +
-                                       np.abs(self.det[0][ii]) ** 2)
-                               for ii in range(len(self.norm[0]))])
+        invariants_dict['sigma_plus'] = 0.5 * norm ** 2 + \
+            np.sqrt(0.25 * norm ** 4 + np.abs(det) ** 2)
 
-        invariants_dict['sigma_plus'] = sigma_plus
+        invariants_dict['sigma_minus'] = 0.5 * norm ** 2 - \
+            np.sqrt(0.25 * norm ** 4 + np.abs(det) ** 2)
 
-        sigma_minus = np.array([0.5 * self.norm[0][ii] ** 2 -
-                                np.sqrt(0.25 * self.norm[0][ii] ** 4 +
-                                        np.abs(self.det[0][ii]) ** 2)
-                                for ii in range(len(self.norm[0]))])
-        invariants_dict['sigma_minus'] = sigma_minus
+        self._derived['invariants'] = invariants_dict
 
         return invariants_dict
 
@@ -1169,10 +1168,15 @@ class Tipper(object):
     mag_direction   computes magnitude and direction of real and imaginary
                     induction arrows.
     amp_phase       computes amplitude and phase of Tx and Ty.
+    invalidate      forgets the quantities derived from the tipper, call
+                    after changing tipper, tipper_err or freq in place
     rotate          rotates the data by the given angle
     =============== ===========================================================
 
-
+    .. note:: amplitude, phase and the induction arrows are computed when
+              first accessed and kept until tipper, tipper_err or freq are
+              set again.  Code that changes the arrays in place must call
+              ``tipper_object.invalidate()`` afterwards.
 
     """
 
@@ -1210,18 +1214,21 @@ class Tipper(object):
         if self.tipper is not None:
             self.rotation_angle = np.zeros((len(self.tipper)))
 
-        self.amplitude = None
-        self.amplitude_err = None
+        self._amplitude = None
+        self._amplitude_err = None
         self._phase = None
         self._phase_err = None
 
-        self.mag_real = None
-        self.mag_imag = None
-        self.angle_real = None
-        self.angle_imag = None
+        self._mag_real = None
+        self._mag_imag = None
+        self._angle_real = None
+        self._angle_imag = None
 
-        self.mag_err = None
-        self.angle_err = None
+        self._mag_err = None
+        self._angle_err = None
+
+        # derived quantities are computed when first accessed
+        self._derived = {}
 
     # ==========================================================================
     # Define get/set and properties
@@ -1246,8 +1253,7 @@ class Tipper(object):
 
         self._freq = np.array(lo_freq)
 
-        # for consistency recalculate amplitude and phase
-        self._compute_amp_phase()
+        self.invalidate()
 
     def _get_freq(self):
         if self._freq is not None:
@@ -1296,11 +1302,7 @@ class Tipper(object):
             self.rotation_angle = np.repeat(self.rotation_angle,
                                             len(self._tipper))
 
-            # for consistency recalculate mag and angle
-        self._compute_mag_direction()
-
-        # for consistency recalculate amplitude and phase
-        self._compute_amp_phase()
+        self.invalidate()
 
     def _get_tipper(self):
         return self._tipper
@@ -1349,11 +1351,7 @@ class Tipper(object):
 
         self._tipper_err = tipper_err_array
 
-        # for consistency recalculate mag and angle
-        self._compute_mag_direction()
-
-        # for consistency recalculate amplitude and phase
-        self._compute_amp_phase()
+        self.invalidate()
 
     def _get_tipper_err(self):
         return self._tipper_err
@@ -1406,12 +1404,6 @@ class Tipper(object):
 
         self.tipper = tipper_new
 
-        # for consistency recalculate mag and angle
-        self._compute_mag_direction()
-
-        # for consistency recalculate amplitude and phase
-        self._compute_amp_phase()
-
     _real = property(_get_real, _set_real, doc='Real part of the Tipper')
 
     # ---imaginary part------------------------------------------------------
@@ -1462,13 +1454,19 @@ class Tipper(object):
 
         self.tipper = tipper_new
 
-        # for consistency recalculate mag and angle
-        self._compute_mag_direction()
+    _imag = property(_get_imag, _set_imag, doc='Imaginary part of the Tipper')
 
-        # for consistency recalculate amplitude and phase
-        self._compute_amp_phase()
+    # ----derived quantities
+    def invalidate(self):
+        """
+        Forget all quantities derived from the tipper (amplitude, phase,
+        magnitude and direction).  They are recomputed when they are
+        accessed next.
 
-    _imag = property(_get_imag, _set_imag, doc='Imaginary part of the Tipper')
+        This is done automatically when tipper, tipper_err or freq are set,
+        call it after changing those arrays in place.
+        """
+        self._derived = {}
 
     # ----amplitude and phase
     def _compute_amp_phase(self):
@@ -1480,37 +1478,66 @@ class Tipper(object):
                         * *phase_err*
 
         values for resistivity are in in Ohm m and phase in degrees.
+
+        This is done on first access of any of these attributes.
         """
 
+        self._derived['amp_phase'] = True
+
         if self.tipper is None:
             # logging.error( 'tipper array is None - cannot calculate rho/phi')
             return None
 
-        self.amplitude_err = None
+        self._amplitude_err = None
         self._phase_err = None
         if self.tipper_err is not None:
-            self.amplitude_err = np.zeros(self.tipper_err.shape)
+            self._amplitude_err = np.zeros(self.tipper_err.shape)
             self._phase_err = np.zeros(self.tipper_err.shape)
 
-        self.amplitude = np.zeros(self.tipper.shape)
+        self._amplitude = np.zeros(self.tipper.shape)
         self._phase = np.zeros(self.tipper.shape)
 
-        for idx_f in range(len(self.tipper)):
-            for jj in range(2):
-                self.amplitude[idx_f, 0, jj] = np.abs(
-                    self.tipper[idx_f, 0, jj])
-                self._phase[idx_f, 0, jj] = math.degrees(cmath.phase(
-                    self.tipper[idx_f, 0, jj]))
+        self._amplitude[:] = np.abs(self.tipper)
+        self._phase[:] = np.degrees(np.angle(self.tipper))
+
+        if self.tipper_err is not None:
+            r_err, phi_err = MTcc.propagate_error_rect2polar_array(
+                np.real(self.tipper),
+                self.tipper_err,
+                np.imag(self.tipper),
+                self.tipper_err)
+
+            self._amplitude_err[:] = r_err
+            self._phase_err[:] = phi_err
+
+    def _check_amp_phase(self):
+        """
+        make sure amplitude and phase are up to date
+        """
+        if 'amp_phase' not in self._derived:
+            self._compute_amp_phase()
+
+    def _get_amplitude(self):
+        self._check_amp_phase()
+        return self._amplitude
+
+    def _get_amplitude_err(self):
+        self._check_amp_phase()
+        return self._amplitude_err
+
+    def _get_phase(self):
+        self._check_amp_phase()
+        return self._phase
 
-                if self.tipper_err is not None:
-                    r_err, phi_err = MTcc.propagate_error_rect2polar(
-                        np.real(self.tipper[idx_f, 0, jj]),
-                        self.tipper_err[idx_f, 0, jj],
-                        np.imag(self.tipper[idx_f, 0, jj]),
-                        self.tipper_err[idx_f, 0, jj])
+    def _get_phase_err(self):
+        self._check_amp_phase()
+        return self._phase_err
 
-                    self.amplitude_err[idx_f, 0, jj] = r_err
-                    self._phase_err[idx_f, 0, jj] = phi_err
+    amplitude = property(_get_amplitude, doc='Amplitude array')
+    amplitude_err = property(_get_amplitude_err,
+                             doc='Amplitude error array')
+    phase = property(_get_phase, doc='Phase array (deg)')
+    phase_err = property(_get_phase_err, doc='Phase error array (deg)')
 
     def set_amp_phase(self, r_array, phi_array):
         """
@@ -1562,9 +1589,6 @@ class Tipper(object):
 
         self.tipper = tipper_new
 
-        # for consistency recalculate amplitude and phase
-        self._compute_amp_phase()
-
     # ----magnitude and direction----------------------------------------------
     def _compute_mag_direction(self):
         """
@@ -1592,30 +1616,76 @@ class Tipper(object):
 
         """
 
+        self._derived['mag_direction'] = True
+
         if self.tipper is None:
             return None
-        self.mag_real = np.sqrt(self.tipper[:, 0, 0].real ** 2 +
-                                self.tipper[:, 0, 1].real ** 2)
-        self.mag_imag = np.sqrt(self.tipper[:, 0, 0].imag ** 2 +
-                                self.tipper[:, 0, 1].imag ** 2)
+        self._mag_real = np.sqrt(self.tipper[:, 0, 0].real ** 2 +
+                                 self.tipper[:, 0, 1].real ** 2)
+        self._mag_imag = np.sqrt(self.tipper[:, 0, 0].imag ** 2 +
+                                 self.tipper[:, 0, 1].imag ** 2)
 
-        self.mag_err = None
-        self.angle_err = None
+        self._mag_err = None
+        self._angle_err = None
         # get the angle, need to make both parts negative to get it into the
         # parkinson convention where the arrows point towards the conductor
 
-        self.angle_real = np.rad2deg(np.arctan2(-self.tipper[:, 0, 1].real,
-                                                -self.tipper[:, 0, 0].real))
+        self._angle_real = np.rad2deg(np.arctan2(-self.tipper[:, 0, 1].real,
+                                                 -self.tipper[:, 0, 0].real))
 
-        self.angle_imag = np.rad2deg(np.arctan2(-self.tipper[:, 0, 1].imag,
-                                                -self.tipper[:, 0, 0].imag))
+        self._angle_imag = np.rad2deg(np.arctan2(-self.tipper[:, 0, 1].imag,
+                                                 -self.tipper[:, 0, 0].imag))
 
         # estimate error: THIS MAYBE A HACK
         if self.tipper_err is not None:
-            self.mag_err = np.sqrt(self.tipper_err[:, 0, 0] ** 2 +
-                                   self.tipper_err[:, 0, 1] ** 2)
-            self.angle_err = np.rad2deg(np.arctan2(self.tipper_err[:, 0, 0],
-                                                   self.tipper_err[:, 0, 1])) % 45
+            self._mag_err = np.sqrt(self.tipper_err[:, 0, 0] ** 2 +
+                                    self.tipper_err[:, 0, 1] ** 2)
+            self._angle_err = np.rad2deg(np.arctan2(self.tipper_err[:, 0, 0],
+                                                    self.tipper_err[:, 0, 1])) % 45
+
+    def _check_mag_direction(self):
+        """
+        make sure magnitude and direction are up to date
+        """
+        if 'mag_direction' not in self._derived:
+            self._compute_mag_direction()
+
+    def _get_mag_real(self):
+        self._check_mag_direction()
+        return self._mag_real
+
+    def _get_mag_imag(self):
+        self._check_mag_direction()
+        return self._mag_imag
+
+    def _get_angle_real(self):
+        self._check_mag_direction()
+        return self._angle_real
+
+    def _get_angle_imag(self):
+        self._check_mag_direction()
+        return self._angle_imag
+
+    def _get_mag_err(self):
+        self._check_mag_direction()
+        return self._mag_err
+
+    def _get_angle_err(self):
+        self._check_mag_direction()
+        return self._angle_err
+
+    mag_real = property(_get_mag_real,
+                        doc='magnitude of the real induction vector')
+    mag_imag = property(_get_mag_imag,
+                        doc='magnitude of the imaginary induction vector')
+    angle_real = property(_get_angle_real,
+                          doc='angle (deg) of the real induction vector')
+    angle_imag = property(_get_angle_imag,
+                          doc='angle (deg) of the imaginary induction vector')
+    mag_err = property(_get_mag_err, doc='error of the induction vector '
+                                         'magnitude')
+    angle_err = property(_get_angle_err, doc='error of the induction vector '
+                                             'angle')
 
     def set_mag_direction(self, mag_real, ang_real, mag_imag, ang_imag):
         """
@@ -1638,8 +1708,8 @@ class Tipper(object):
 
         self.tipper[:, 0, 1].imag = np.sqrt(mag_imag ** 2 /
                                             (1 - np.arctan(ang_imag) ** 2))
-        # for consistency recalculate mag and angle
-        self._compute_mag_direction()
+
+        self.invalidate()
 
     # ----rotate---------------------------------------------------------------
     def rotate(self, alpha):
@@ -1698,31 +1768,12 @@ class Tipper(object):
             self.rotation_angle = 0.
             return
 
-        tipper_rot = copy.copy(self.tipper)
-        tipper_err_rot = copy.copy(self.tipper_err)
-
-        for idx_freq in range(len(tipper_rot)):
-            angle = lo_angles[idx_freq]
-
-            if self.tipper_err is not None:
-                tipper_rot[idx_freq], tipper_err_rot[idx_freq] = \
-                    MTcc.rotatevector_incl_errors(self.tipper[idx_freq, :, :],
-                                                  angle,
-                                                  self.tipper_err[idx_freq, :, :])
-            else:
-                tipper_rot[idx_freq], tipper_err_rot = \
-                    MTcc.rotatevector_incl_errors(self.tipper[idx_freq, :, :],
-                                                  angle)
+        tipper_rot, tipper_err_rot = MTcc.rotatevectors_incl_errors(
+            self.tipper, lo_angles, self.tipper_err)
 
         self.tipper = tipper_rot
         self.tipper_err = tipper_err_rot
 
-        # for consistency recalculate mag and angle
-        self._compute_mag_direction()
-
-        # for consistency recalculate amplitude and phase
-        self._compute_amp_phase()
-
 
 # ------------------------
 def correct4sensor_orientation(Z_prime, Bx=0, By=90, Ex=0, Ey=90,
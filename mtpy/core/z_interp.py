@@ -0,0 +1,313 @@
+#!/usr/bin/env python
+
+"""
+=============
+z_interp module
+=============
+
+Interpolate the impedance tensors and tippers of many stations onto a
+common list of periods.  Each station only gets the periods within its
+frequency range (and optionally close to one of its own periods), the
+result is a ZStack with masks of which periods each station has.
+
+Functions
+-----------
+    * select_periods --> which periods of a list a station can be
+                         interpolated onto
+    * interpolate_z --> interpolate one Z and Tipper onto new frequencies
+    * interpolate_z_list --> interpolate lists of Z and Tipper objects onto
+                             a period list, returns a ZStack
+    * interpolate_mt_list --> interpolate a list of MT objects onto a period
+                              list, returns a ZStack
+
+    >>> import mtpy.core.z_interp as z_interp
+    >>> z_stack = z_interp.interpolate_mt_list(mt_list, period_list,
+    ...                                        period_buffer=0.5, n_workers=8)
+    >>> z_stack.z[z_stack.mask]
+
+"""
+
+# =================================================================
+import numpy as np
+
+import mtpy.core.z as MTz
+import mtpy.utils.exceptions as MTex
+import mtpy.utils.interpolation as MTinterp
+from mtpy.core.z_stack import ZStack
+
+from mtpy.utils.mtpylog import MtPyLog
+
+logger = MtPyLog().get_mtpy_logger(__name__)
+# =================================================================
+
+
+def select_periods(freq, period_list, period_buffer=None,
+                   original_periods=False):
+    """
+    which periods of period_list a station with frequencies freq gets
+
+    Arguments
+    -----------
+        **freq** : np.ndarray
+                   frequencies of the station (Hz)
+
+        **period_list** : np.ndarray(n_period)
+                          periods to interpolate onto (s)
+
+        **period_buffer** : float
+                            only keep periods whose ratio to the nearest
+                            station period is less than period_buffer + 1,
+                            so interpolation does not stretch over gaps.
+                            *default* is None, no limit
+
+        **original_periods** : [ True | False ]
+                               only keep periods that are station periods,
+                               *default* is False
+
+    Returns
+    ---------
+        **selected** : np.ndarray(n_period, dtype=bool)
+                       True for the periods the station gets, these are
+                       always within the period range of the station
+    """
+    period_list = np.asarray(period_list, dtype='float')
+    freq = np.asarray(freq, dtype='float')
+    if len(freq) == 0:
+        return np.zeros(period_list.shape, dtype='bool')
+
+    selected = (period_list >= 1. / freq.max()) & \
+        (period_list <= 1. / freq.min())
+
+    if period_buffer is None and not original_periods:
+        return selected
+
+    # nearest station period of each period, on ties the shorter one
+    data_periods = np.sort(1. / freq)
+    upper = np.clip(np.searchsorted(data_periods, period_list), 0,
+                    len(data_periods) - 1)
+    lower = np.clip(upper - 1, 0, len(data_periods) - 1)
+    use_upper = np.abs(data_periods[upper] - period_list) < \
+        np.abs(data_periods[lower] - period_list)
+    nearest = data_periods[np.where(use_upper, upper, lower)]
+
+    if period_buffer is not None:
+        ratio = np.maximum(nearest / period_list, period_list / nearest)
+        selected &= ratio < period_buffer + 1.
+
+    if original_periods:
+        # be aware of floating point errors
+        selected &= np.abs(nearest - period_list) < 1e-8
+
+    return selected
+
+
+def interpolate_z(z_object, tipper_object, new_freq_array,
+                  bounds_error=True):
+    """
+    Interpolate an impedance tensor and tipper onto different frequencies,
+    see mtpy.core.mt.MT.interpolate_impedance_tensor.
+
+    Arguments
+    ------------
+        **z_object** : mtpy.core.z.Z
+
+        **tipper_object** : mtpy.core.z.Tipper on the frequencies of
+                            z_object, or None
+
+        **new_freq_array** : np.ndarray
+                             frequencies to interpolate onto, the array is
+                             not changed
+
+        **bounds_error** : [ True | False ]
+                           raise a ValueError if new_freq_array is outside
+                           the frequency range of z_object, otherwise those
+                           frequencies are set to 0.  *default* is True
+
+    Returns
+    -----------
+        **new_z_object** : mtpy.core.z.Z
+
+        **new_tipper_object** : mtpy.core.z.Tipper, None if tipper_object
+                                or its tipper is None
+    """
+    # make sure the input is a numpy array, the caller's array is not
+    # changed
+    new_freq_array = np.array(new_freq_array, dtype='float')
+
+    floater= 0.00000001  #FZ: a small offset to avoid out-of-bound error in spi interpolation module.
+    logger.info("massage the new_freq_array's min and max to avoid out-of-bound interp")
+    interp_freq = new_freq_array.copy()
+    if len(interp_freq) > 0:
+        minindex = np.argmin(interp_freq)
+        maxindex = np.argmax(interp_freq)
+        interp_freq[minindex] = interp_freq[minindex] + floater
+        interp_freq[maxindex] = interp_freq[maxindex] - floater
+
+    # check the bounds of the new frequency array
+    if bounds_error and len(interp_freq) > 0:
+        if z_object.freq.min() > interp_freq.min():
+            raise ValueError('New frequency minimum of {0:.5g}'.format(interp_freq.min()) +
+                             ' is smaller than old frequency minimum of {0:.5g}'.format(z_object.freq.min()) +
+                             '.  The new frequency range needs to be within the ' +
+                             'bounds of the old one.')
+        if z_object.freq.max() < interp_freq.max():
+            raise ValueError('New frequency maximum of {0:.5g}'.format(interp_freq.max()) +
+                             'is smaller than old frequency maximum of {0:.5g}'.format(z_object.freq.max()) +
+                             '.  The new frequency range needs to be within the ' +
+                             'bounds of the old one.')
+
+    # all components are interpolated linearly in log frequency in one
+    # go, zero entries are left out.  The interpolator is shared by all
+    # stations with the same frequencies.
+    interpolator = MTinterp.get_log_frequency_interpolator(z_object.freq,
+                                                           interp_freq)
+
+    z_mask = z_object.z != 0
+    new_z = interpolator(z_object.z, mask=z_mask)
+    # errors outside the data range are undefined, unless there are no
+    # data at all for a component
+    new_z_err = interpolator(np.real(z_object.z_err), mask=z_mask,
+                             fill_value=np.nan)
+    new_z_err[:, ~np.any(z_mask, axis=0)] = 0.
+
+    # make a new Z object
+    new_Z = MTz.Z(z_array=new_z, z_err_array=new_z_err,
+                  freq=new_freq_array)
+
+    # if there is not tipper than skip
+    if tipper_object is None or tipper_object.tipper is None:
+        return new_Z, None
+
+    # interpolate the Tipper
+    t_mask = tipper_object.tipper != 0
+    new_tipper = interpolator(tipper_object.tipper, mask=t_mask)
+    new_tipper_err = interpolator(np.real(tipper_object.tipper_err),
+                                  mask=t_mask, fill_value=np.nan)
+    new_tipper_err[:, ~np.any(t_mask, axis=0)] = 0.
+
+    new_Tipper = MTz.Tipper(tipper_array=new_tipper,
+                            tipper_err_array=new_tipper_err,
+                            freq=new_freq_array)
+
+    return new_Z, new_Tipper
+
+
+def _interpolate_station(args):
+    """
+    selected periods and interpolated arrays of one station
+    """
+    z_object, tipper_object, period_list, period_buffer, original_periods = \
+        args
+
+    selected = select_periods(z_object.freq, period_list,
+                              period_buffer=period_buffer,
+                              original_periods=original_periods)
+    if not np.any(selected):
+        return selected, None, None
+
+    new_z, new_tipper = interpolate_z(z_object, tipper_object,
+                                      1. / period_list[selected])
+    if new_tipper is None:
+        return selected, (new_z.z, new_z.z_err), None
+
+    return selected, (new_z.z, new_z.z_err), (new_tipper.tipper,
+                                              new_tipper.tipper_err)
+
+
+def interpolate_z_list(z_list, tipper_list, period_list, period_buffer=None,
+                       original_periods=False, n_workers=1, station=None,
+                       lat=None, lon=None, elev=None):
+    """
+    Interpolate the impedance tensors and tippers of many stations onto a
+    common list of periods.
+
+    Arguments
+    -----------
+        **z_list** : list of mtpy.core.z.Z
+
+        **tipper_list** : list of mtpy.core.z.Tipper, same length as z_list,
+                          entries can be None
+
+        **period_list** : np.ndarray(n_period)
+                          periods to interpolate onto (s)
+
+        **period_buffer** : float
+                            see select_periods, *default* is None
+
+        **original_periods** : [ True | False ]
+                               see select_periods, *default* is False
+
+        **n_workers** : int
+                        number of processes interpolating the stations,
+                        None for one per CPU.  *default* is 1
+
+        **station**, **lat**, **lon**, **elev** : station information,
+                                                  one value per station
+
+    Returns
+    ---------
+        **z_stack** : mtpy.core.z_stack.ZStack
+                      data on the frequencies 1 / period_list, mask is True
+                      for the periods each station was interpolated onto.
+                      Errors outside the range of the data of a component
+                      are NaN.
+    """
+    # imported here, mtpy.core.mt_loader pulls in mtpy.core.mt
+    import mtpy.core.mt_loader as mt_loader
+
+    period_list = np.array(period_list, dtype='float')
+    n_station = len(z_list)
+    n_period = len(period_list)
+    if tipper_list is None:
+        tipper_list = [None] * n_station
+    if len(tipper_list) != n_station:
+        raise MTex.MTpyError_inputarguments(
+            'z_list and tipper_list must have the same length')
+
+    results = mt_loader.pool_map(
+        _interpolate_station,
+        [(z_obj, t_obj, period_list, period_buffer, original_periods)
+         for z_obj, t_obj in zip(z_list, tipper_list)],
+        n_workers=n_workers)
+
+    z = np.zeros((n_station, n_period, 2, 2), dtype='complex')
+    z_err = np.zeros((n_station, n_period, 2, 2))
+    tipper = np.zeros((n_station, n_period, 1, 2), dtype='complex')
+    tipper_err = np.zeros((n_station, n_period, 1, 2))
+    mask = np.zeros((n_station, n_period), dtype='bool')
+    tipper_mask = np.zeros((n_station, n_period), dtype='bool')
+
+    for ii, (selected, z_arrays, t_arrays) in enumerate(results):
+        mask[ii] = selected
+        if z_arrays is not None:
+            z[ii, selected], z_err[ii, selected] = z_arrays
+        if t_arrays is not None:
+            tipper[ii, selected], tipper_err[ii, selected] = t_arrays
+            tipper_mask[ii, selected] = np.any(t_arrays[0] != 0,
+                                               axis=(1, 2))
+
+    return ZStack(z_array=z, z_err_array=z_err, freq=1. / period_list,
+                  tipper_array=tipper, tipper_err_array=tipper_err,
+                  mask=mask, tipper_mask=tipper_mask, station=station,
+                  lat=lat, lon=lon, elev=elev)
+
+
+def interpolate_mt_list(mt_list, period_list, period_buffer=None,
+                        original_periods=False, n_workers=1):
+    """
+    Interpolate a list of mtpy.core.mt.MT objects onto a common list of
+    periods, see interpolate_z_list.
+
+    Returns
+    ---------
+        **z_stack** : mtpy.core.z_stack.ZStack
+    """
+    return interpolate_z_list([mt_obj.Z for mt_obj in mt_list],
+                              [mt_obj.Tipper for mt_obj in mt_list],
+                              period_list, period_buffer=period_buffer,
+                              original_periods=original_periods,
+                              n_workers=n_workers,
+                              station=[mt_obj.station for mt_obj in mt_list],
+                              lat=[mt_obj.lat for mt_obj in mt_list],
+                              lon=[mt_obj.lon for mt_obj in mt_list],
+                              elev=[mt_obj.elev for mt_obj in mt_list])
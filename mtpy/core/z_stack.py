@@ -0,0 +1,917 @@
+#!/usr/bin/env python
+
+"""
+=============
+z_stack module
+=============
+
+Classes
+---------
+    * ZStack --> impedance tensors, tippers and errors of a whole survey as
+                 contiguous arrays on a shared frequency axis.
+
+"""
+
+# =================================================================
+import numpy as np
+
+import mtpy.analysis.pt as MTpt
+import mtpy.core.spatial_index as spatial_index
+import mtpy.utils.calculator as MTcc
+import mtpy.utils.exceptions as MTex
+from mtpy.core.z import Z, Tipper
+
+from mtpy.utils.mtpylog import MtPyLog
+
+logger = MtPyLog().get_mtpy_logger(__name__)
+# =================================================================
+
+
+def merge_frequencies(freq_list, ftol=1e-4):
+    """
+    Merge the frequencies of several stations into one common frequency
+    axis.  Frequencies that differ by less than the relative tolerance ftol
+    from their neighbour are considered the same and are represented by
+    their (logarithmic) mean.
+
+    Arguments
+    -----------
+        **freq_list** : list of np.ndarray
+                        frequencies (Hz) of each station
+
+        **ftol** : float
+                   relative tolerance, *default* is 1e-4
+
+    Returns
+    ---------
+        **freq** : np.ndarray(n_freq)
+                   common frequencies sorted from high to low
+    """
+
+    freq_list = [np.asarray(ff, dtype='float') for ff in freq_list
+                 if ff is not None and len(ff) > 0]
+    if len(freq_list) == 0:
+        return np.zeros(0)
+
+    unique_freq = np.unique(np.concatenate(freq_list))
+    # start a new group wherever the gap to the next lower frequency is
+    # larger than the tolerance
+    gaps = np.diff(unique_freq) > ftol * np.abs(unique_freq[1:])
+    group = np.concatenate(([0], np.cumsum(gaps)))
+    counts = np.bincount(group)
+    log_freq = np.bincount(group, weights=np.log(unique_freq)) / counts
+
+    return np.exp(log_freq)[::-1]
+
+
+def match_frequencies(freq, station_freq, ftol=1e-4):
+    """
+    Find the index of each station frequency on a common frequency axis.
+
+    Arguments
+    -----------
+        **freq** : np.ndarray(n_freq)
+                   common frequency axis sorted from high to low
+
+        **station_freq** : np.ndarray
+                           frequencies of a single station
+
+        **ftol** : float
+                   relative tolerance, *default* is 1e-4
+
+    Returns
+    ---------
+        **index** : np.ndarray(dtype=int)
+                    index into freq of the nearest common frequency,
+                    -1 where there is none within the tolerance
+    """
+
+    freq = np.asarray(freq, dtype='float')
+    station_freq = np.asarray(station_freq, dtype='float')
+    if len(freq) == 0:
+        return -np.ones(len(station_freq), dtype='int')
+
+    # searchsorted needs ascending values
+    freq_asc = freq[::-1]
+    upper = np.clip(np.searchsorted(freq_asc, station_freq), 0,
+                    len(freq_asc) - 1)
+    lower = np.clip(upper - 1, 0, len(freq_asc) - 1)
+    use_lower = np.abs(freq_asc[lower] - station_freq) < \
+        np.abs(freq_asc[upper] - station_freq)
+    nearest = np.where(use_lower, lower, upper)
+
+    index = len(freq) - 1 - nearest
+    outside = np.abs(freq_asc[nearest] - station_freq) > \
+        ftol * np.abs(station_freq)
+    index[outside] = -1
+
+    return index
+
+
+# ------------------------
+class ZStack(object):
+    """
+    ZStack class - impedance tensors, tippers and their errors of many
+    stations on a shared frequency axis.
+
+    All data are held in contiguous arrays so that survey-wide quantities are
+    computed in one go instead of station by station.  Frequencies a station
+    was not measured at are flagged False in the masks, the data there are
+    set to zero and derived quantities are NaN.
+
+    Arguments
+    ------------
+
+        **z_array** : np.ndarray(n_station, n_freq, 2, 2)
+                      complex impedance tensors
+
+        **z_err_array** : np.ndarray(n_station, n_freq, 2, 2)
+                          errors of the impedance tensor elements
+
+        **freq** : np.ndarray(n_freq)
+                   common frequencies (Hz)
+
+        **tipper_array** : np.ndarray(n_station, n_freq, 1, 2)
+                           complex tippers
+
+        **tipper_err_array** : np.ndarray(n_station, n_freq, 1, 2)
+                               errors of the tipper elements
+
+        **mask** : np.ndarray(n_station, n_freq, dtype=bool)
+                   True where a station has impedance data, *default* is
+                   all True
+
+        **tipper_mask** : np.ndarray(n_station, n_freq, dtype=bool)
+                          True where a station has tipper data, *default*
+                          is True where the tipper is non-zero
+
+    =============== ===========================================================
+    Attributes      Description
+    =============== ===========================================================
+    station         array of station names
+    lat             array of station latitudes (decimal degrees)
+    lon             array of station longitudes (decimal degrees)
+    elev            array of station elevations (m)
+    freq            common frequencies, high to low
+    period          1 / freq
+    z               impedance tensors (n_station, n_freq, 2, 2)
+    z_err           impedance tensor errors
+    tipper          tippers (n_station, n_freq, 1, 2)
+    tipper_err      tipper errors
+    mask            True where there is impedance data (n_station, n_freq)
+    tipper_mask     True where there is tipper data (n_station, n_freq)
+    rotation_angle  angle the data are rotated by (n_station, n_freq)
+    resistivity     apparent resistivity in Ohm-m
+    resistivity_err apparent resistivity error
+    phase           impedance phase (deg)
+    phase_err       error in impedance phase
+    pt              phase tensors (n_station, n_freq, 2, 2)
+    pt_err          phase tensor errors
+    pt_attributes   record array of phimin, phimax, azimuth, ... of pt
+    det             determinant of z with errors
+    trace           trace of z with errors
+    skew            skew of z with errors
+    norm            norm of z with errors
+    invariants      dictionary of the invariants of z
+    spatial_index   mtpy.core.spatial_index.SpatialIndex of lat, lon, built
+                    on first access and again when lat or lon change
+    =============== ===========================================================
+
+    =================== =======================================================
+    Methods             Description
+    =================== =======================================================
+    from_mt_list        makes a ZStack from a list of mtpy.core.mt.MT objects
+    from_z_list         makes a ZStack from lists of Z and Tipper objects
+    to_mt_list          returns a list of mtpy.core.mt.MT objects
+    to_z_list           returns a list of Z objects
+    to_tipper_list      returns a list of Tipper objects
+    get_z               Z object of a single station
+    get_tipper          Tipper object of a single station
+    rotate              rotates z and tipper positive clockwise, angle
+                        assumes North is 0.
+    remove_distortion   removes distortion given distortion matrices
+    =================== =======================================================
+
+    Example
+    -----------
+
+        >>> import mtpy.core.mt as mt
+        >>> from mtpy.core.z_stack import ZStack
+        >>> mt_list = [mt.MT(fn) for fn in edi_list]
+        >>> z_stack = ZStack.from_mt_list(mt_list)
+        >>> z_stack.rotate(30)
+        >>> z_stack.resistivity[:, :, 0, 1]
+
+    """
+
+    def __init__(self, z_array=None, z_err_array=None, freq=None,
+                 tipper_array=None, tipper_err_array=None, mask=None,
+                 tipper_mask=None, station=None, lat=None, lon=None,
+                 elev=None):
+
+        if z_array is None:
+            raise MTex.MTpyError_Z('ZStack needs an impedance array')
+
+        z_array = np.asarray(z_array)
+        if z_array.ndim != 4 or z_array.shape[2:] != (2, 2):
+            raise MTex.MTpyError_Z('impedance array must be of shape '
+                                   '(n_station, n_freq, 2, 2), not '
+                                   '{0}'.format(z_array.shape))
+
+        n_station, n_freq = z_array.shape[:2]
+
+        self._z = np.array(z_array, dtype='complex')
+        self._z_err = self._check_array(z_err_array, (n_station, n_freq, 2, 2),
+                                        'z_err', 'float')
+        self._tipper = self._check_array(tipper_array,
+                                         (n_station, n_freq, 1, 2),
+                                         'tipper', 'complex')
+        self._tipper_err = self._check_array(tipper_err_array,
+                                             (n_station, n_freq, 1, 2),
+                                             'tipper_err', 'float')
+
+        if freq is None:
+            raise MTex.MTpyError_Z('ZStack needs a frequency array')
+        self._freq = np.array(freq, dtype='float')
+        if self._freq.shape != (n_freq,):
+            raise MTex.MTpyError_Z('length of freq ({0}) does not match '
+                                   'the impedance array ({1})'.format(
+                                       len(self._freq), n_freq))
+
+        if mask is None:
+            mask = np.ones((n_station, n_freq), dtype='bool')
+        self._mask = self._check_array(mask, (n_station, n_freq), 'mask',
+                                       'bool')
+        if tipper_mask is None:
+            tipper_mask = np.any(self._tipper != 0, axis=(2, 3))
+        self._tipper_mask = self._check_array(tipper_mask,
+                                              (n_station, n_freq),
+                                              'tipper_mask', 'bool')
+
+        self.station = self._station_array(station, n_station, 'object')
+        self.lat = self._station_array(lat, n_station, 'float')
+        self.lon = self._station_array(lon, n_station, 'float')
+        self.elev = self._station_array(elev, n_station, 'float')
+
+        self.rotation_angle = np.zeros((n_station, n_freq))
+
+        # derived quantities are computed when first accessed
+        self._derived = {}
+        self._spatial_index = None
+
+    @staticmethod
+    def _check_array(array, shape, name, dtype):
+        """
+        make an array of the given shape, zeros if array is None
+        """
+        if array is None:
+            return np.zeros(shape, dtype=dtype)
+
+        array = np.array(array, dtype=dtype)
+        if array.shape != shape:
+            raise MTex.MTpyError_Z('{0} must be of shape {1}, not '
+                                   '{2}'.format(name, shape, array.shape))
+        return array
+
+    @staticmethod
+    def _station_array(values, n_station, dtype):
+        """
+        make an array with one entry per station, NaN/None if not given
+        """
+        if values is None:
+            values = [None] * n_station
+        if dtype == 'float':
+            values = [np.nan if vv is None else vv for vv in values]
+        values = np.array(values, dtype=dtype)
+        if values.shape != (n_station,):
+            raise MTex.MTpyError_inputarguments(
+                'need one value per station ({0}), got {1}'.format(
+                    n_station, values.shape))
+        return values
+
+    # ---constructors----------------------------------------------------------
+    @classmethod
+    def from_z_list(cls, z_list, tipper_list=None, freq=None, ftol=1e-4,
+                    station=None, lat=None, lon=None, elev=None):
+        """
+        Make a ZStack from a list of Z objects (and Tipper objects).
+
+        Arguments
+        -----------
+            **z_list** : list of mtpy.core.z.Z
+
+            **tipper_list** : list of mtpy.core.z.Tipper, same length as
+                              z_list, entries can be None
+
+            **freq** : np.ndarray(n_freq)
+                       common frequency axis, *default* is the union of all
+                       station frequencies
+
+            **ftol** : float
+                       relative tolerance for matching frequencies,
+                       *default* is 1e-4
+
+            **station**, **lat**, **lon**, **elev** : station information,
+                                                      one value per station
+
+        Returns
+        ---------
+            **z_stack** : ZStack
+        """
+
+        n_station = len(z_list)
+        if tipper_list is None:
+            tipper_list = [None] * n_station
+        if len(tipper_list) != n_station:
+            raise MTex.MTpyError_inputarguments(
+                'z_list and tipper_list must have the same length')
+
+        if freq is None:
+            freq = merge_frequencies([z_obj.freq for z_obj in z_list], ftol)
+        freq = np.array(freq, dtype='float')
+        n_freq = len(freq)
+
+        z = np.zeros((n_station, n_freq, 2, 2), dtype='complex')
+        z_err = np.zeros((n_station, n_freq, 2, 2))
+        tipper = np.zeros((n_station, n_freq, 1, 2), dtype='complex')
+        tipper_err = np.zeros((n_station, n_freq, 1, 2))
+        mask = np.zeros((n_station, n_freq), dtype='bool')
+        tipper_mask = np.zeros((n_station, n_freq), dtype='bool')
+
+        for ii, (z_obj, t_obj) in enumerate(zip(z_list, tipper_list)):
+            if z_obj is not None and z_obj.z is not None and \
+                    z_obj.freq is not None:
+                index, valid = cls._station_index(freq, z_obj.freq, ftol, ii)
+                z[ii, index] = z_obj.z[valid]
+                if z_obj.z_err is not None:
+                    z_err[ii, index] = np.real(z_obj.z_err[valid])
+                mask[ii, index] = True
+
+            if t_obj is not None and t_obj.tipper is not None and \
+                    t_obj.freq is not None:
+                index, valid = cls._station_index(freq, t_obj.freq, ftol, ii)
+                tipper[ii, index] = t_obj.tipper[valid]
+                if t_obj.tipper_err is not None:
+                    tipper_err[ii, index] = np.real(t_obj.tipper_err[valid])
+                tipper_mask[ii, index] = np.any(t_obj.tipper[valid] != 0,
+                                                axis=(1, 2))
+
+        return cls(z_array=z, z_err_array=z_err, freq=freq,
+                   tipper_array=tipper, tipper_err_array=tipper_err,
+                   mask=mask, tipper_mask=tipper_mask, station=station,
+                   lat=lat, lon=lon, elev=elev)
+
+    @staticmethod
+    def _station_index(freq, station_freq, ftol, station_index):
+        """
+        index of the station frequencies on the common axis and which of
+        the station frequencies have a match
+        """
+        index = match_frequencies(freq, station_freq, ftol)
+        valid = index >= 0
+        index = index[valid]
+        if len(np.unique(index)) != len(index):
+            logger.warning('station {0}: several frequencies fall onto the '
+                           'same frequency, only the last one is '
+                           'kept'.format(station_index))
+        return index, valid
+
+    @classmethod
+    def from_mt_list(cls, mt_list, freq=None, ftol=1e-4):
+        """
+        Make a ZStack from a list of mtpy.core.mt.MT objects.
+
+        Arguments
+        -----------
+            **mt_list** : list of mtpy.core.mt.MT
+
+            **freq** : np.ndarray(n_freq)
+                       common frequency axis, *default* is the union of all
+                       station frequencies
+
+            **ftol** : float
+                       relative tolerance for matching frequencies,
+                       *default* is 1e-4
+
+        Returns
+        ---------
+            **z_stack** : ZStack
+        """
+
+        return cls.from_z_list([mt_obj.Z for mt_obj in mt_list],
+                               [mt_obj.Tipper for mt_obj in mt_list],
+                               freq=freq, ftol=ftol,
+                               station=[mt_obj.station for mt_obj in mt_list],
+                               lat=[mt_obj.lat for mt_obj in mt_list],
+                               lon=[mt_obj.lon for mt_obj in mt_list],
+                               elev=[mt_obj.elev for mt_obj in mt_list])
+
+    # ---conversion------------------------------------------------------------
+    def get_z(self, index):
+        """
+        Z object of station index, only frequencies with data are included.
+        """
+        valid = self._mask[index]
+        z_obj = Z(z_array=self._z[index, valid].copy(),
+                  z_err_array=self._z_err[index, valid].copy(),
+                  freq=self._freq[valid].copy())
+        z_obj.rotation_angle = self.rotation_angle[index, valid].copy()
+        return z_obj
+
+    def get_tipper(self, index):
+        """
+        Tipper object of station index, only frequencies with data are
+        included.
+        """
+        valid = self._tipper_mask[index]
+        t_obj = Tipper(tipper_array=self._tipper[index, valid].copy(),
+                       tipper_err_array=self._tipper_err[index, valid].copy(),
+                       freq=self._freq[valid].copy())
+        t_obj.rotation_angle = self.rotation_angle[index, valid].copy()
+        return t_obj
+
+    def to_z_list(self):
+        """
+        list of Z objects, one per station
+        """
+        return [self.get_z(ii) for ii in range(self.n_stations)]
+
+    def to_tipper_list(self):
+        """
+        list of Tipper objects, one per station
+        """
+        return [self.get_tipper(ii) for ii in range(self.n_stations)]
+
+    def to_mt_list(self):
+        """
+        list of mtpy.core.mt.MT objects, one per station
+        """
+        # imported here, mtpy.core.mt imports mtpy.core.z_interp, which
+        # imports this module
+        import mtpy.core.mt as mt
+
+        mt_list = []
+        for ii in range(self.n_stations):
+            mt_obj = mt.MT()
+            mt_obj.station = self.station[ii]
+            if not np.isnan(self.lat[ii]) and not np.isnan(self.lon[ii]):
+                mt_obj.lat = self.lat[ii]
+                mt_obj.lon = self.lon[ii]
+            if not np.isnan(self.elev[ii]):
+                mt_obj.elev = self.elev[ii]
+            mt_obj.Z = self.get_z(ii)
+            mt_obj.Tipper = self.get_tipper(ii)
+            mt_list.append(mt_obj)
+
+        return mt_list
+
+    # ---arrays----------------------------------------------------------------
+    def _get_n_stations(self):
+        return self._z.shape[0]
+
+    n_stations = property(_get_n_stations, doc='number of stations')
+
+    def _get_n_freq(self):
+        return self._z.shape[1]
+
+    n_freq = property(_get_n_freq, doc='number of frequencies')
+
+    def _get_freq(self):
+        return self._freq
+
+    freq = property(_get_freq, doc='common frequencies in Hz')
+
+    def _get_period(self):
+        return 1. / self._freq
+
+    period = property(_get_period, doc='common periods in s')
+
+    def _get_z(self):
+        return self._z
+
+    def _set_z(self, z_array):
+        self._z = self._check_array(z_array, self._z.shape, 'z', 'complex')
+        self._clear_cache()
+
+    z = property(_get_z, _set_z, doc='impedance tensors')
+
+    def _get_z_err(self):
+        return self._z_err
+
+    def _set_z_err(self, z_err_array):
+        self._z_err = self._check_array(z_err_array, self._z.shape, 'z_err',
+                                        'float')
+        self._clear_cache()
+
+    z_err = property(_get_z_err, _set_z_err, doc='impedance tensor errors')
+
+    def _get_tipper(self):
+        return self._tipper
+
+    def _set_tipper(self, tipper_array):
+        self._tipper = self._check_array(tipper_array, self._tipper.shape,
+                                         'tipper', 'complex')
+        self._clear_cache()
+
+    tipper = property(_get_tipper, _set_tipper, doc='tippers')
+
+    def _get_tipper_err(self):
+        return self._tipper_err
+
+    def _set_tipper_err(self, tipper_err_array):
+        self._tipper_err = self._check_array(tipper_err_array,
+                                             self._tipper.shape,
+                                             'tipper_err', 'float')
+        self._clear_cache()
+
+    tipper_err = property(_get_tipper_err, _set_tipper_err,
+                          doc='tipper errors')
+
+    def _get_mask(self):
+        return self._mask
+
+    def _set_mask(self, mask):
+        self._mask = self._check_array(mask, self._mask.shape, 'mask', 'bool')
+        self._clear_cache()
+
+    mask = property(_get_mask, _set_mask,
+                    doc='True where a station has impedance data')
+
+    def _get_tipper_mask(self):
+        return self._tipper_mask
+
+    def _set_tipper_mask(self, tipper_mask):
+        self._tipper_mask = self._check_array(tipper_mask,
+                                              self._tipper_mask.shape,
+                                              'tipper_mask', 'bool')
+        self._clear_cache()
+
+    tipper_mask = property(_get_tipper_mask, _set_tipper_mask,
+                           doc='True where a station has tipper data')
+
+    def _get_spatial_index(self):
+        s_index = self._spatial_index
+        if s_index is None or \
+                not self._same_values(s_index.lat, self.lat) or \
+                not self._same_values(s_index.lon, self.lon):
+            self._spatial_index = spatial_index.SpatialIndex(
+                self.lat, self.lon, station=self.station)
+        return self._spatial_index
+
+    @staticmethod
+    def _same_values(old, new):
+        """
+        True if two float arrays are equal, NaN equals NaN
+        """
+        new = np.asarray(new, dtype='float')
+        return old.shape == new.shape and \
+            np.all((old == new) | (np.isnan(old) & np.isnan(new)))
+
+    spatial_index = property(_get_spatial_index,
+                             doc='spatial index of the station locations')
+
+    # -----derived quantities-------------------------------------------------
+    def _clear_cache(self):
+        """
+        Forget all quantities derived from the data arrays.  They are
+        recomputed when they are accessed next.
+
+        This is done automatically when an array is set, call it after
+        changing arrays in place.
+        """
+        self._derived = {}
+
+    def _masked(self, values):
+        """
+        set values at frequencies without data to NaN
+        """
+        values[~self._mask] = np.nan
+        return values
+
+    def _compute_res_phase(self):
+        """
+        compute resistivity, phase and their errors
+        """
+        freq = self._freq[np.newaxis, :, np.newaxis, np.newaxis]
+        z_abs = np.abs(self._z)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            resistivity = z_abs ** 2 / freq * 0.2
+            phase = np.degrees(np.angle(self._z))
+
+            r_err, phi_err = MTcc.z_error2r_phi_error_array(np.real(self._z),
+                                                            self._z_err,
+                                                            np.imag(self._z),
+                                                            self._z_err)
+            resistivity_err = 0.4 * z_abs / freq * r_err
+
+        self._derived['res_phase'] = (self._masked(resistivity),
+                                      self._masked(resistivity_err),
+                                      self._masked(phase),
+                                      self._masked(phi_err))
+
+    def _get_res_phase(self, index):
+        if 'res_phase' not in self._derived:
+            self._compute_res_phase()
+        return self._derived['res_phase'][index]
+
+    resistivity = property(lambda self: self._get_res_phase(0),
+                           doc='apparent resistivity in Ohm-m')
+    resistivity_err = property(lambda self: self._get_res_phase(1),
+                               doc='apparent resistivity error')
+    phase = property(lambda self: self._get_res_phase(2),
+                     doc='impedance phase in degrees')
+    phase_err = property(lambda self: self._get_res_phase(3),
+                         doc='impedance phase error')
+
+    def _compute_pt(self):
+        """
+        compute the phase tensors Phi = X^-1 Y of all stations, where
+        Z = X + iY, and their errors.  They are NaN where there are no data
+        or X is singular.
+        """
+        pt, pt_err, singular = MTpt.z2pt_batch(self._z, self._z_err)
+        invalid = singular | ~self._mask
+        pt[invalid] = np.nan
+        pt_err[invalid] = np.nan
+
+        self._derived['pt'] = (pt, pt_err)
+
+    def _get_pt(self):
+        if 'pt' not in self._derived:
+            self._compute_pt()
+        return self._derived['pt'][0]
+
+    def _get_pt_err(self):
+        if 'pt' not in self._derived:
+            self._compute_pt()
+        return self._derived['pt'][1]
+
+    pt = property(_get_pt, doc='phase tensors (n_station, n_freq, 2, 2)')
+    pt_err = property(_get_pt_err, doc='phase tensor errors')
+
+    def _get_pt_attributes(self):
+        """
+        Return all phase tensor attributes and their errors of all stations
+        as a record array (n_station, n_freq), see
+        mtpy.analysis.pt.pt_attributes.  NaN where there are no data.
+        """
+        if 'pt_attributes' not in self._derived:
+            self._derived['pt_attributes'] = MTpt.pt_attributes(self.pt,
+                                                                self.pt_err)
+        return self._derived['pt_attributes']
+
+    pt_attributes = property(_get_pt_attributes,
+                             doc='phase tensor attributes (n_station, n_freq)')
+
+    def _get_trace(self):
+        """
+        Return the trace of Z (incl. uncertainties) of all stations.
+        """
+
+        if 'trace' not in self._derived:
+            tr = self._z[..., 0, 0] + self._z[..., 1, 1]
+            tr_err = self._z_err[..., 0, 0] + self._z_err[..., 1, 1]
+            self._derived['trace'] = (self._masked(tr), self._masked(tr_err))
+
+        return self._derived['trace']
+
+    trace = property(_get_trace, doc='Trace of Z, incl. error')
+
+    def _get_skew(self):
+        """
+        Return the skew of Z (incl. uncertainties) of all stations.
+        """
+
+        if 'skew' not in self._derived:
+            skew = self._z[..., 0, 1] - self._z[..., 1, 0]
+            skew_err = self._z_err[..., 0, 1] + self._z_err[..., 1, 0]
+            self._derived['skew'] = (self._masked(skew),
+                                     self._masked(skew_err))
+
+        return self._derived['skew']
+
+    skew = property(_get_skew, doc='Skew of Z, incl. error')
+
+    def _get_det(self):
+        """
+        Return the determinant of Z (incl. uncertainties) of all stations.
+        """
+
+        if 'det' not in self._derived:
+            z = self._z
+            z_err = self._z_err
+            det_z = z[..., 0, 0] * z[..., 1, 1] - z[..., 0, 1] * z[..., 1, 0]
+            det_z_err = np.abs(z[..., 1, 1] * z_err[..., 0, 0]) + \
+                np.abs(z[..., 0, 0] * z_err[..., 1, 1]) + \
+                np.abs(z[..., 0, 1] * z_err[..., 1, 0]) + \
+                np.abs(z[..., 1, 0] * z_err[..., 0, 1])
+            self._derived['det'] = (self._masked(det_z),
+                                    self._masked(det_z_err))
+
+        return self._derived['det']
+
+    det = property(_get_det, doc='Determinant of Z, incl. error')
+
+    def _get_norm(self):
+        """
+        Return the 2-/Frobenius-norm of Z (incl. uncertainties) of all
+        stations.
+        """
+
+        if 'norm' not in self._derived:
+            znorm = np.sqrt(np.sum(np.abs(self._z) ** 2, axis=(-2, -1)))
+            radicand = np.sum((self._z_err * np.real(self._z)) ** 2 +
+                              (self._z_err * np.imag(self._z)) ** 2,
+                              axis=(-2, -1))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                znorm_err = 1. / znorm * np.sqrt(radicand)
+            self._derived['norm'] = (self._masked(znorm),
+                                     self._masked(znorm_err))
+
+        return self._derived['norm']
+
+    norm = property(_get_norm, doc='Norm of Z, incl. error')
+
+    def _get_invariants(self):
+        """
+        Return a dictionary of Z-invariants of all stations, each of shape
+        (n_station, n_freq).
+
+        Contains
+                -----------
+                        * z1
+                        * det
+                        * det_real
+                        * det_imag
+                        * trace
+                        * skew
+                        * norm
+                        * lambda_plus/minus,
+                        * sigma_plus/minus
+        """
+
+        if 'invariants' in self._derived:
+            return self._derived['invariants']
+
+        invariants_dict = {}
+
+        z1 = self._masked((self._z[..., 0, 1] - self._z[..., 1, 0]) / 2.)
+        invariants_dict['z1'] = z1
+
+        det = self.det[0]
+        invariants_dict['det'] = det
+
+        z_real = np.real(self._z)
+        invariants_dict['det_real'] = self._masked(
+            z_real[..., 0, 0] * z_real[..., 1, 1] -
+            z_real[..., 0, 1] * z_real[..., 1, 0])
+
+        z_imag = np.imag(self._z)
+        invariants_dict['det_imag'] = self._masked(
+            z_imag[..., 0, 0] * z_imag[..., 1, 1] -
+            z_imag[..., 0, 1] * z_imag[..., 1, 0])
+
+        invariants_dict['trace'] = self.trace[0]
+
+        invariants_dict['skew'] = self.skew[0]
+
+        norm = self.norm[0]
+        invariants_dict['norm'] = norm
+
+        invariants_dict['lambda_plus'] = z1 + np.sqrt(z1 * z1 - det)
+
+        invariants_dict['lambda_minus'] = z1 - np.sqrt(z1 * z1 - det)
+
+        invariants_dict['sigma_plus'] = 0.5 * norm ** 2 + \
+            np.sqrt(0.25 * norm ** 4 + np.abs(det) ** 2)
+
+        invariants_dict['sigma_minus'] = 0.5 * norm ** 2 - \
+            np.sqrt(0.25 * norm ** 4 + np.abs(det) ** 2)
+
+        self._derived['invariants'] = invariants_dict
+
+        return invariants_dict
+
+    invariants = property(_get_invariants,
+                          doc="""Dictionary, containing the invariants of
+                                 Z: z1, det, det_real, det_imag, trace,
+                                 skew, norm, lambda_plus/minus,
+                                 sigma_plus/minus""")
+
+    # ---operations------------------------------------------------------------
+    def rotate(self, alpha):
+        """
+        Rotate Z and Tipper of all stations by angle alpha.
+
+        Rotation angle must be given in degrees. All angles are referenced
+        to geographic North, positive in clockwise direction.
+        (Mathematically negative!)
+
+        Arguments
+        -----------
+            **alpha** : float or np.ndarray
+                        rotation angle(s) in degrees, a single angle, one
+                        angle per station (n_station) or one angle per
+                        station and frequency (n_station, n_freq)
+        """
+
+        alpha = np.asarray(alpha, dtype='float')
+        if alpha.ndim == 1:
+            alpha = alpha[:, np.newaxis]
+        try:
+            alpha = np.array(np.broadcast_to(alpha, self.rotation_angle.shape))
+        except ValueError:
+            raise MTex.MTpyError_inputarguments(
+                '"Angle" must be a single angle, one angle per station or '
+                'one angle per station and frequency')
+
+        alpha[np.isnan(alpha)] = 0.
+
+        self._z, self._z_err = MTcc.rotatematrices_incl_errors(self._z, alpha,
+                                                               self._z_err)
+        self._tipper, self._tipper_err = MTcc.rotatevectors_incl_errors(
+            self._tipper, alpha, self._tipper_err)
+
+        self.rotation_angle = (self.rotation_angle + alpha) % 360
+
+        self._clear_cache()
+
+    def remove_distortion(self, distortion_tensor, distortion_err_tensor=None):
+        """
+        Remove distortion D from the observed impedance tensors Z to obtain
+        the unperturbed "correct" Z0 = D^-1 * Z of all stations.
+
+        Propagation of errors/uncertainties included, the data arrays are
+        not changed.
+
+        Arguments
+        ------------
+            **distortion_tensor** : np.ndarray(2, 2) or
+                                    np.ndarray(n_station, 2, 2)
+                                    real distortion tensor(s), one for all
+                                    stations or one per station
+
+            **distortion_err_tensor** : np.ndarray of the same shape,
+                                        *default* is None
+
+        Returns
+        -----------
+            **distortion_tensor** : np.ndarray(n_station, 2, 2)
+                                    input distortion tensors
+
+            **z_corrected** : np.ndarray(n_station, n_freq, 2, 2)
+                              impedance tensors with distortion removed
+
+            **z_corrected_err** : np.ndarray(n_station, n_freq, 2, 2)
+                                  impedance tensor errors after distortion
+                                  is removed
+        """
+
+        distortion_tensor = np.real(np.asarray(distortion_tensor,
+                                               dtype='complex'))
+        if distortion_err_tensor is None:
+            distortion_err_tensor = np.zeros_like(distortion_tensor)
+        distortion_err_tensor = np.real(np.asarray(distortion_err_tensor))
+
+        shape = (self.n_stations, 2, 2)
+        try:
+            if distortion_tensor.shape != distortion_err_tensor.shape:
+                raise ValueError('Shape not the same')
+            distortion_tensor = np.array(np.broadcast_to(distortion_tensor,
+                                                         shape))
+            distortion_err_tensor = np.array(
+                np.broadcast_to(distortion_err_tensor, shape))
+        except ValueError:
+            raise MTex.MTpyError_Z('The array provided is not a proper '
+                                   'distortion tensor')
+
+        det = distortion_tensor[:, 0, 0] * distortion_tensor[:, 1, 1] - \
+            distortion_tensor[:, 0, 1] * distortion_tensor[:, 1, 0]
+        if np.any(det == 0):
+            raise MTex.MTpyError_Z('The provided distortion tensor is '
+                                   'singular - I cannot invert that!')
+
+        dis_inv = np.empty_like(distortion_tensor)
+        dis_inv[:, 0, 0] = distortion_tensor[:, 1, 1]
+        dis_inv[:, 0, 1] = -distortion_tensor[:, 0, 1]
+        dis_inv[:, 1, 0] = -distortion_tensor[:, 1, 0]
+        dis_inv[:, 1, 1] = distortion_tensor[:, 0, 0]
+        dis_inv /= det[:, np.newaxis, np.newaxis]
+
+        # propagation of errors (using 1-norm) - step 1 - inversion of D:
+        # err(DI)_ij = sum_kl |DI_ik * DI_lj * err(D)_kl|
+        dis_inv_abs = np.abs(dis_inv)
+        dis_inv_err = np.matmul(np.matmul(dis_inv_abs, distortion_err_tensor),
+                                dis_inv_abs)
+
+        # step 2 - product of D.inverse and Z
+        dis_inv = dis_inv[:, np.newaxis]
+        dis_inv_abs = dis_inv_abs[:, np.newaxis]
+        dis_inv_err = dis_inv_err[:, np.newaxis]
+
+        z_corrected = np.matmul(dis_inv, self._z)
+        z_corrected_err = np.matmul(dis_inv_err, np.abs(self._z)) + \
+            np.matmul(dis_inv_abs, self._z_err)
+
+        return distortion_tensor, z_corrected, z_corrected_err
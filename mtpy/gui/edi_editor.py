@@ -1330,6 +1330,7 @@ class PlotWidget(QtGui.QWidget):
                     self.ax_phase_d.plot(data_period,
                                          self.mt_obj.Z.phase[d_index],
                                          **self.mask_kw)
+                self.mt_obj.Z.invalidate()
 
             # mask phase points
             elif self._ax_index == 2 or self._ax_index == 3:
@@ -1354,6 +1355,7 @@ class PlotWidget(QtGui.QWidget):
                     self.ax_res_d.plot(data_period,
                                        self.mt_obj.Z.resistivity[d_index],
                                        **self.mask_kw)
+                self.mt_obj.Z.invalidate()
 
             # mask tipper Tx
             elif self._ax_index == 4 or self._ax_index == 5:
@@ -1368,7 +1370,7 @@ class PlotWidget(QtGui.QWidget):
                 self.mt_obj.Tipper.tipper[d_index] = 0.0 + 0.0j
                 self.mt_obj.Tipper.tipper_err[d_index] = 0.0
 
-                self.mt_obj.Tipper._compute_amp_phase()
+                self.mt_obj.Tipper.invalidate()
 
 #            self._ax.figure.canvas.repaint()
             self._ax.figure.canvas.update()
@@ -1425,6 +1427,8 @@ class PlotWidget(QtGui.QWidget):
                 self.mt_obj.Z.z[ff, 1, 0] = 0.0 + 0.0 * 1j
                 self.mt_obj.Z.z_err[ff, 1, 0] = 0.0
 
+        self.mt_obj.Z.invalidate()
+
         self.ax_res_od.figure.canvas.draw()
         self.ax_phase_od.figure.canvas.draw()
 
@@ -1458,6 +1462,8 @@ class PlotWidget(QtGui.QWidget):
                 self.mt_obj.Z.z[ff, 1, 1] = 0.0 + 0.0 * 1j
                 self.mt_obj.Z.z_err[ff, 1, 1] = 0.0
 
+        self.mt_obj.Z.invalidate()
+
         self.ax_res_od.figure.canvas.draw()
         self.ax_phase_od.figure.canvas.draw()
 
@@ -1476,7 +1482,7 @@ class PlotWidget(QtGui.QWidget):
             self.mt_obj.Tipper.tipper[ff, 0, 0] = 0.0 + 0.0 * 1j
             self.mt_obj.Tipper.tipper_err[ff, 0, 0] = 0.0
 
-        self.mt_obj.Tipper._compute_amp_phase()
+        self.mt_obj.Tipper.invalidate()
 
         self.ax_tip_x.figure.canvas.draw()
 
@@ -1495,7 +1501,7 @@ class PlotWidget(QtGui.QWidget):
             self.mt_obj.Tipper.tipper[ff, 0, 1] = 0.0 + 0.0 * 1j
             self.mt_obj.Tipper.tipper_err[ff, 0, 1] = 0.0
 
-        self.mt_obj.Tipper._compute_amp_phase()
+        self.mt_obj.Tipper.invalidate()
 
         self.ax_tip_y.figure.canvas.draw()
 
@@ -30,7 +30,6 @@ import mtpy.analysis.niblettbostick as mtnb
 import mtpy.analysis.pt as mtpt
 import mtpy.imaging.mtcolors as mtcl
 import mtpy.imaging.mtplottools as mtplottools
-import mtpy.utils.exceptions as mtex
 
 try:
     _fromUtf8 = QtCore.QString.fromUtf8
@@ -429,6 +428,15 @@ class Ui_MainWindow(mtplottools.MTArrows, mtplottools.MTEllipse):
                                                    ('txi', np.float),
                                                    ('tyi', np.float)])
 
+        if self.modem_resp_fn is not None:
+            # residual phase tensors of all stations and periods at once,
+            # zeros for stations whose data and response do not match
+            rpt_arr, rpt_matched = mtpt.residual_pt_list(
+                [self.modem_data.mt_dict[key].pt.pt
+                 for key in self.modem_data.mt_dict.keys()],
+                [self.modem_resp.mt_dict[key].pt.pt
+                 for key in self.modem_data.mt_dict.keys()])[2:]
+
         for ii, key in enumerate(self.modem_data.mt_dict.keys()):
             east = self.modem_data.mt_dict[key].grid_east / self.dscale
             north = self.modem_data.mt_dict[key].grid_north / self.dscale
@@ -473,19 +481,15 @@ class Ui_MainWindow(mtplottools.MTArrows, mtplottools.MTEllipse):
                     np.sin(np.deg2rad(mtip.angle_imag))
                 model_pt_arr[:, ii]['tyi'] = mtip.mag_imag *\
                     np.cos(np.deg2rad(mtip.angle_imag))
-                try:
-                    rpt = mtpt.ResidualPhaseTensor(pt_object1=dpt,
-                                                   pt_object2=mpt)
-                    rpt = rpt.residual_pt
-
-                    res_pt_arr[:, ii]['phimin'] = rpt.phimin[0]
-                    res_pt_arr[:, ii]['phimax'] = rpt.phimax[0]
-                    res_pt_arr[:, ii]['azimuth'] = rpt.azimuth[0]
-                    res_pt_arr[:, ii]['skew'] = rpt.beta[0]
-                    res_pt_arr[:, ii]['geometric_mean'] = np.sqrt(abs(rpt.phimin[0] *
-                                                                      rpt.phimax[0]))
-
-                except mtex.MTpyError_PT:
+                if rpt_matched[ii]:
+                    rpt = rpt_arr[ii]
+                    res_pt_arr[:, ii]['phimin'] = rpt.phimin
+                    res_pt_arr[:, ii]['phimax'] = rpt.phimax
+                    res_pt_arr[:, ii]['azimuth'] = rpt.azimuth
+                    res_pt_arr[:, ii]['skew'] = rpt.beta
+                    res_pt_arr[:, ii]['geometric_mean'] = np.sqrt(abs(rpt.phimin *
+                                                                      rpt.phimax))
+                else:
                     print 'Could not calculate residual PT for {0}'.format(key)
 
                 res_pt_arr[:, ii]['east'] = east
@@ -16,7 +16,6 @@ import mtpy.analysis.pt as mtpt
 import mtpy.imaging.mtcolors as mtcl
 import mtpy.imaging.mtplottools as mtplottools
 import mtpy.modeling.ws3dinv as ws
-import mtpy.utils.exceptions as mtex
 from mtpy.modeling.modem_data import Data
 from mtpy.modeling.modem_model import Model
 
@@ -316,6 +315,15 @@ class PlotPTMaps(mtplottools.MTEllipse):
                                                    ('geometric_mean', np.float),
                                                    ('station', 'S10')])
 
+        if self.resp_fn is not None:
+            # residual phase tensors of all stations and periods at once,
+            # stations whose data and response do not match are left out
+            rpt_arr, rpt_matched = mtpt.residual_pt_list(
+                [self.data_obj.mt_dict[key].pt.pt
+                 for key in self.data_obj.mt_dict.keys()],
+                [self.resp_obj.mt_dict[key].pt.pt
+                 for key in self.data_obj.mt_dict.keys()])[2:]
+
         for ii, key in enumerate(self.data_obj.mt_dict.keys()):
             east = self.data_obj.mt_dict[key].grid_east / self.dscale
             north = self.data_obj.mt_dict[key].grid_north / self.dscale
@@ -333,23 +341,21 @@ class PlotPTMaps(mtplottools.MTEllipse):
             data_pt_arr[:, ii]['station'] = self.data_obj.mt_dict[key].station
             if self.resp_fn is not None:
                 mpt = self.resp_obj.mt_dict[key].pt
-                try:
-                    rpt = mtpt.ResidualPhaseTensor(pt_object1=dpt,
-                                                   pt_object2=mpt)
-                    rpt = rpt.residual_pt
+                if rpt_matched[ii]:
+                    rpt = rpt_arr[ii]
                     res_pt_arr[:, ii]['east'] = east
                     res_pt_arr[:, ii]['north'] = north
                     res_pt_arr[:, ii]['lon'] = lon
                     res_pt_arr[:, ii]['lat'] = lat
-                    res_pt_arr[:, ii]['phimin'] = rpt.phimin[0]
-                    res_pt_arr[:, ii]['phimax'] = rpt.phimax[0]
-                    res_pt_arr[:, ii]['azimuth'] = rpt.azimuth[0]
-                    res_pt_arr[:, ii]['skew'] = rpt.beta[0]
+                    res_pt_arr[:, ii]['phimin'] = rpt.phimin
+                    res_pt_arr[:, ii]['phimax'] = rpt.phimax
+                    res_pt_arr[:, ii]['azimuth'] = rpt.azimuth
+                    res_pt_arr[:, ii]['skew'] = rpt.beta
                     res_pt_arr[
                         :, ii]['station'] = self.data_obj.mt_dict[key].station
-                    res_pt_arr[:, ii]['geometric_mean'] = np.sqrt(abs(rpt.phimin[0] *
-                                                                      rpt.phimax[0]))
-                except mtex.MTpyError_PT:
+                    res_pt_arr[:, ii]['geometric_mean'] = np.sqrt(
+                        abs(rpt.phimin * rpt.phimax))
+                else:
                     print key, dpt.pt.shape, mpt.pt.shape
 
                 model_pt_arr[:, ii]['east'] = east
@@ -24,6 +24,7 @@ import mtpy
 import mtpy.modeling.occam2d_rewrite as occam2d
 from imaging_base import ImagingBase, ParameterError, ImagingError
 from mtpy.core import mt as mt
+from mtpy.core import mt_loader
 from mtpy.utils.decorator import deprecated
 from mtpy.utils.mtpylog import MtPyLog
 
@@ -529,10 +530,16 @@ def get_penetration_depth(mt_obj_list, per_index, whichrho='det'):
     return stations, periods, pen_depth, latlons
 
 
-def load_edi_files(edi_path):
+def load_edi_files(edi_path, n_workers=1):
+    """
+    load the edi files of a directory into MT objects
+    :param edi_path: directory containing edi files
+    :param n_workers: number of worker processes, None for one per CPU
+    :return: list of MT objects, files that could not be read are left out
+    """
     edi_list = []
     if edi_path is not None:
-        edi_list = [mt.MT(os.path.join(edi_path, edi)) for edi in os.listdir(edi_path) if edi.endswith("edi")]
+        edi_list = mt_loader.load_mt_list(edi_path, n_workers=n_workers)
     return edi_list
 
 
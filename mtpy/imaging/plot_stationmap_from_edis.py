@@ -49,7 +49,7 @@ def makemap(edilist, mapstretchfactor, symbolsize, labelsize, showlabel):
 
     for i in edilist:
         e = EDI.Edi()
-        e.read_edi_file(i)
+        e.read_edi_file(i, data=False)
         lats.append(e.lat)
         lons.append(e.lon)
         names.append(e.Header.dataid.lower())
@@ -614,7 +614,6 @@ class PlotResidualPTMaps(mtpl.MTEllipse):
 
                     # compute residual phase tensor
                     rpt = mtpt.ResidualPhaseTensor(pt1, pt2)
-                    rpt.compute_residual_pt(pt1, pt2)
 
                     # add some attributes to residual phase tensor object
                     rpt.station = mt1.station
@@ -635,6 +634,8 @@ class PlotResidualPTMaps(mtpl.MTEllipse):
                     self.rpt_array[mm]['lon'] = mt1.lon
                     self.rpt_array[mm]['elev'] = mt1.elev
 
+                    # all attributes of the residual pt, computed once
+                    rpt_attr = rpt.residual_pt.attributes
                     rpt_fdict = dict([(np.round(key, 5), value)
                                       for value, key in enumerate(rpt.freq)])
                     for f_index, freq in enumerate(rpt.freq):
@@ -644,16 +645,16 @@ class PlotResidualPTMaps(mtpl.MTEllipse):
                                 rr = rpt_fdict[np.round(freq, 5)]
 
                                 self.rpt_array[mm]['phimin'][aa] = \
-                                    abs(rpt.residual_pt.phimin[0][rr])
+                                    abs(rpt_attr.phimin[rr])
                                 self.rpt_array[mm]['phimax'][aa] = \
-                                    abs(rpt.residual_pt.phimax[0][rr])
+                                    abs(rpt_attr.phimax[rr])
                                 self.rpt_array[mm]['skew'][aa] = \
-                                    rpt.residual_pt.beta[0][rr]
+                                    rpt_attr.beta[rr]
                                 self.rpt_array[mm]['azimuth'][aa] = \
-                                    rpt.residual_pt.azimuth[0][rr]
+                                    rpt_attr.azimuth[rr]
                                 self.rpt_array[mm]['geometric_mean'][aa] = \
-                                    np.sqrt(abs(rpt.residual_pt.phimin[0][rr] *
-                                                rpt.residual_pt.phimax[0][rr]))
+                                    np.sqrt(abs(rpt_attr.phimin[rr] *
+                                                rpt_attr.phimax[rr]))
                             except IndexError:
                                 print '-' * 50
                                 print mt1.station
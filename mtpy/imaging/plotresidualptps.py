@@ -535,7 +535,6 @@ class PlotResidualPTps(mtpl.MTEllipse):
 
                     # compute residual phase tensor
                     rpt = mtpt.ResidualPhaseTensor(pt1, pt2)
-                    rpt.compute_residual_pt(pt1, pt2)
 
                     # add some attributes to residual phase tensor object
                     rpt.station = mt1.station
@@ -557,6 +556,8 @@ class PlotResidualPTps(mtpl.MTEllipse):
                     self.rpt_array[mm]['elev'] = mt1.elev
                     self.rpt_array[mm]['freq'][:] = self.freq_list
 
+                    # all attributes of the residual pt, computed once
+                    rpt_attr = rpt.residual_pt.attributes
                     rpt_fdict = dict([(np.round(key, 5), value)
                                       for value, key in enumerate(rpt.freq)])
 
@@ -566,16 +567,16 @@ class PlotResidualPTps(mtpl.MTEllipse):
                             rr = rpt_fdict[np.round(freq, 5)]
                             try:
                                 self.rpt_array[mm]['phimin'][aa] = \
-                                    rpt.residual_pt.phimin[0][rr]
+                                    rpt_attr.phimin[rr]
                                 self.rpt_array[mm]['phimax'][aa] = \
-                                    rpt.residual_pt.phimax[0][rr]
+                                    rpt_attr.phimax[rr]
                                 self.rpt_array[mm]['skew'][aa] = \
-                                    rpt.residual_pt.beta[0][rr]
+                                    rpt_attr.beta[rr]
                                 self.rpt_array[mm]['azimuth'][aa] = \
-                                    rpt.residual_pt.azimuth[0][rr]
+                                    rpt_attr.azimuth[rr]
                                 self.rpt_array[mm]['geometric_mean'][aa] = \
-                                    np.sqrt(abs(rpt.residual_pt.phimin[0][rr] *
-                                                rpt.residual_pt.phimax[0][rr]))
+                                    np.sqrt(abs(rpt_attr.phimin[rr] *
+                                                rpt_attr.phimax[rr]))
                                 logfid.write('Freq={0:.5f} '.format(freq))
                                 logfid.write('Freq_list_index={0} '.format(
                                     np.where(self.freq_list == freq)[0][0]))
@@ -584,13 +585,13 @@ class PlotResidualPTps(mtpl.MTEllipse):
                                 logfid.write('rpt.freq_index={0} '.format(
                                     np.where(rpt.freq == freq)[0][0]))
                                 logfid.write('Phi_max={0:2f} '.format(
-                                    rpt.residual_pt.phimax[0][rr]))
+                                    rpt_attr.phimax[rr]))
                                 logfid.write('Phi_min={0:2f} '.format(
-                                    rpt.residual_pt.phimin[0][rr]))
+                                    rpt_attr.phimin[rr]))
                                 logfid.write('Skew={0:2f} '.format(
-                                    rpt.residual_pt.beta[0][rr]))
+                                    rpt_attr.beta[rr]))
                                 logfid.write('Azimuth={0:2f}\n'.format(
-                                    rpt.residual_pt.azimuth[0][rr]))
+                                    rpt_attr.azimuth[rr]))
 
                             except IndexError:
                                 print '-' * 50
@@ -13,6 +13,7 @@ import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.ticker import MultipleLocator
 
+import mtpy.analysis.geometry as MTgy
 import mtpy.imaging.mtplottools as mtpl
 
 
@@ -282,12 +283,8 @@ class PlotStrike(object):
 
         bw = self.bin_width
 
-        if self.fold == True:
-            histrange = (-180, 180)
-        elif self.fold == False:
-            histrange = (0, 360)
-
-        # set empty lists that will hold dictionaries with keys as the period
+        # set empty lists that will hold the strikes of each station
+        perlist = []
         invlist = []
         ptlist = []
         tiprlist = []
@@ -295,7 +292,6 @@ class PlotStrike(object):
         # initialize some parameters
         nc = len(self.mt_list)
         nt = 0
-        kk = 0
 
         for dd, mt in enumerate(self.mt_list):
 
@@ -327,9 +323,7 @@ class PlotStrike(object):
                 zs[np.where(zs < 0)] += 360
                 #zs = 360-zs
 
-            # make a dictionary of strikes with keys as period
-            mdictinv = dict([(ff, jj) for ff, jj in zip(mt.period, zs)])
-            invlist.append(mdictinv)
+            invlist.append(zs)
 
             #------------get strike from phase tensor strike angle-------------
             pt = mt.get_PhaseTensor()
@@ -352,9 +346,7 @@ class PlotStrike(object):
             elif self.fold == False:
                 az[np.where(az < 0)] += 360
 
-            # make a dictionary of strikes with keys as period
-            mdictpt = dict([(ff, jj) for ff, jj in zip(mt.period, az)])
-            ptlist.append(mdictpt)
+            ptlist.append(az)
 
             #-----------get tipper strike------------------------------------
             tip = mt.get_Tipper()
@@ -378,13 +370,17 @@ class PlotStrike(object):
                 tipr[np.where(tipr < 0)] += 360
                 tipr[np.where(tipr == 360.0)] = 0.0
 
-            # make a dictionary of strikes with keys as period
-            tiprdict = dict([(ff, jj) for ff, jj in zip(mt.period, tipr)])
-            tiprlist.append(tiprdict)
+            tiprlist.append(tipr)
+            perlist.append(np.asarray(mt.period, dtype='float'))
+
+        # all stations in one go, with the station index of each value
+        allper = np.concatenate(perlist)
+        station_index = np.repeat(np.arange(nc),
+                                  [len(per) for per in perlist])
 
         #--> get min and max period
-        maxper = np.max([np.max(mm.keys()) for mm in invlist])
-        minper = np.min([np.min(mm.keys()) for mm in ptlist])
+        maxper = allper.max()
+        minper = allper.min()
 
         # make empty arrays to put data into for easy manipulation
         medinv = np.zeros((nt, nc))
@@ -397,23 +393,34 @@ class PlotStrike(object):
             np.log10(maxper),
             num=nt,
             base=10)
-        pdict = dict([(ii, jj) for jj, ii in enumerate(plist)])
 
         self._plist = plist
 
-        # put data into arrays
-        for ii, mm in enumerate(invlist):
-            mperiod = mm.keys()
-            for jj, mp in enumerate(mperiod):
-                for kk in pdict.keys():
-                    if mp > kk * (1 - self.period_tolerance) and \
-                            mp < kk * (1 + self.period_tolerance):
-                        ll = pdict[kk]
-                        medinv[ll, ii] = invlist[ii][mp]
-                        medpt[ll, ii] = ptlist[ii][mp]
-                        medtipr[ll, ii] = tiprlist[ii][mp]
-                    else:
-                        pass
+        # put data into arrays, each period goes to the periods of plist
+        # within the period tolerance
+        tol = self.period_tolerance
+        first = np.searchsorted(plist, allper / (1 + tol)) - 1
+        last = np.searchsorted(plist, allper / (1 - tol), side='right')
+        first = np.clip(first, 0, nt - 1)
+        target_list = []
+        source_list = []
+        for kk in range(int((last - first).max()) + 1):
+            ll = np.clip(first + kk, 0, nt - 1)
+            match = np.nonzero((allper > plist[ll] * (1 - tol)) &
+                               (allper < plist[ll] * (1 + tol)) &
+                               (first + kk < nt))[0]
+            target_list.append(ll[match] * nc + station_index[match])
+            source_list.append(match)
+        # where several periods of a station match one period of plist the
+        # first one is kept
+        source = np.concatenate(source_list)
+        order = np.argsort(source, kind='mergesort')
+        target, keep = np.unique(np.concatenate(target_list)[order],
+                                 return_index=True)
+        source = source[order][keep]
+        for medarr, allstrike in [(medinv, invlist), (medpt, ptlist),
+                                  (medtipr, tiprlist)]:
+            medarr.flat[target] = np.concatenate(allstrike)[source]
 
         # make the arrays local variables
         self._medinv = medinv
@@ -442,6 +449,17 @@ class PlotStrike(object):
             self.fig = plt.figure(self.fig_num, dpi=self.fig_dpi)
             plt.clf()
             nb = len(brange)
+
+            # histograms of all decades
+            decades = [(bb, bb + 1) for bb in brange]
+            invcounts, edges = MTgy.strike_histograms(medinv, plist, decades,
+                                                      bin_width=bw,
+                                                      fold=self.fold)
+            ptcounts = MTgy.strike_histograms(medpt, plist, decades,
+                                              bin_width=bw, fold=self.fold)[0]
+            trcounts = MTgy.strike_histograms(medtipr, plist, decades,
+                                              bin_width=bw, fold=self.fold)[0]
+
             for jj, bb in enumerate(brange, 1):
                 # make subplots for invariants and phase tensor azimuths
                 if self.plot_tipper == 'n':
@@ -459,10 +477,7 @@ class PlotStrike(object):
                     axlist = [self.axhinv, self.axhpt, self.axhtip]
 
                 # make a list of indicies for each decades
-                binlist = []
-                for ii, ff in enumerate(plist):
-                    if ff > 10**bb and ff < 10**(bb + 1):
-                        binlist.append(ii)
+                binlist = (plist > 10**bb) & (plist < 10**(bb + 1))
 
                 # extract just the subset for each decade
                 hh = medinv[binlist, :]
@@ -470,10 +485,8 @@ class PlotStrike(object):
                 if self.plot_tipper == 'y':
                     tr = medtipr[binlist, :]
 
-                    # compute the historgram for the tipper strike
-                    trhist = np.histogram(tr[np.nonzero(tr)].flatten(),
-                                          bins=360 / bw,
-                                          range=histrange)
+                    # the historgram for the tipper strike
+                    trhist = (trcounts[jj - 1], edges)
 
                     # make a bar graph with each bar being width of bw degrees
                     bartr = self.axhtip.bar((trhist[1][:-1]) * np.pi / 180,
@@ -486,13 +499,9 @@ class PlotStrike(object):
                         fc = float(trhist[0][cc]) / trhist[0].max() * .9
                         bar.set_facecolor((0, 1 - fc / 2, fc))
 
-                # estimate the histogram for the decade for invariants and pt
-                invhist = np.histogram(hh[np.nonzero(hh)].flatten(),
-                                       bins=360 / bw,
-                                       range=histrange)
-                pthist = np.histogram(gg[np.nonzero(gg)].flatten(),
-                                      bins=360 / bw,
-                                      range=histrange)
+                # the histogram for the decade for invariants and pt
+                invhist = (invcounts[jj - 1], edges)
+                pthist = (ptcounts[jj - 1], edges)
 
                 # plot the histograms
                 self.barinv = self.axhinv.bar((invhist[1][:-1]) * np.pi / 180,
@@ -705,21 +714,22 @@ class PlotStrike(object):
                 self.axhtip = self.fig.add_subplot(1, 3, 3, polar=True)
                 axlist = [self.axhinv, self.axhpt, self.axhtip]
 
-            # make a list of indicies for each decades
-            binlist = [pdict[ff] for ff in plist
-                       if ff > 10**brange.min() and ff < 10**brange.max()]
+            # make a list of indicies for the period range
+            binlist = (plist > 10**brange.min()) & (plist < 10**brange.max())
+            prange = [(brange.min(), brange.max())]
 
             # extract just the subset for each decade
             hh = medinv[binlist, :]
             gg = medpt[binlist, :]
 
             # estimate the histogram for the decade for invariants and pt
-            invhist = np.histogram(hh[np.nonzero(hh)].flatten(),
-                                   bins=360 / bw,
-                                   range=histrange)
-            pthist = np.histogram(gg[np.nonzero(gg)].flatten(),
-                                  bins=360 / bw,
-                                  range=histrange)
+            invcounts, edges = MTgy.strike_histograms(medinv, plist, prange,
+                                                      bin_width=bw,
+                                                      fold=self.fold)
+            invhist = (invcounts[0], edges)
+            pthist = (MTgy.strike_histograms(medpt, plist, prange,
+                                             bin_width=bw,
+                                             fold=self.fold)[0][0], edges)
 
             # plot the histograms
             self.barinv = self.axhinv.bar((invhist[1][:-1]) * np.pi / 180,
@@ -744,9 +754,9 @@ class PlotStrike(object):
             if self.plot_tipper == 'y':
                 tr = self._medtp[binlist, :]
 
-                trhist = np.histogram(tr[np.nonzero(tr)].flatten(),
-                                      bins=360 / bw,
-                                      range=histrange)
+                trhist = (MTgy.strike_histograms(medtipr, plist, prange,
+                                                 bin_width=bw,
+                                                 fold=self.fold)[0][0], edges)
 
                 self.bartr = self.axhtip.bar((trhist[1][:-1]) * np.pi / 180,
                                              trhist[0],
@@ -1048,6 +1058,20 @@ class PlotStrike(object):
         slistpt = [['station']]
         slisttip = [['station']]
 
+        # invariants, phase tensor and tipper of each station
+        station_objects = [(mt.get_Zinvariants(), mt.get_PhaseTensor(),
+                            mt.get_Tipper()) for mt in self.mt_list]
+
+        # histograms of all decades
+        decades = [(bb, bb + 1) for bb in self._brange]
+        invcounts, edges = MTgy.strike_histograms(self._medinv, self._plist,
+                                                  decades, bin_width=bw,
+                                                  fold=self.fold)
+        ptcounts = MTgy.strike_histograms(self._medpt, self._plist, decades,
+                                          bin_width=bw, fold=self.fold)[0]
+        trcounts = MTgy.strike_histograms(self._medtp, self._plist, decades,
+                                          bin_width=bw, fold=self.fold)[0]
+
         # calculate the strikes for the different period bands
         for jj, bb in enumerate(self._brange):
             tstr = self.title_dict[bb].replace('$', '')
@@ -1065,14 +1089,9 @@ class PlotStrike(object):
                     slistpt.append([mt.station])
                     slisttip.append([mt.station])
 
-                zinv = mt.get_Zinvariants()
-                pt = mt.get_PhaseTensor()
-                tp = mt.get_Tipper()
+                zinv, pt, tp = station_objects[kk - 1]
 
-                bnlist = []
-                for nn, per in enumerate(mt.period):
-                    if per > 10**bb and per < 10**(bb + 1):
-                        bnlist.append(nn)
+                bnlist = (mt.period > 10**bb) & (mt.period < 10**(bb + 1))
 
                 #---> strike from invariants
                 zs = 90 - zinv.strike[bnlist]
@@ -1198,27 +1217,17 @@ class PlotStrike(object):
                                      tpmode1))
 
             # make a list of indicies for each decades
-            binlist = []
-            for ii, ff in enumerate(self._plist):
-                if ff > 10**bb and ff < 10**(bb + 1):
-                    binlist.append(ii)
+            binlist = (self._plist > 10**bb) & (self._plist < 10**(bb + 1))
 
             # extract just the subset for each decade
             hh = self._medinv[binlist, :]
             gg = self._medpt[binlist, :]
             tr = self._medtp[binlist, :]
 
-            # estimate the histogram for the decade for invariants and pt
-            invhist = np.histogram(hh[np.nonzero(hh)].flatten(),
-                                   bins=360 / bw,
-                                   range=histrange)
-            pthist = np.histogram(gg[np.nonzero(gg)].flatten(),
-                                  bins=360 / bw,
-                                  range=histrange)
-
-            trhist = np.histogram(tr[np.nonzero(tr)].flatten(),
-                                  bins=360 / bw,
-                                  range=histrange)
+            # the histogram for the decade for invariants and pt
+            invhist = (invcounts[jj], edges)
+            pthist = (ptcounts[jj], edges)
+            trhist = (trcounts[jj], edges)
 
             #--> include the row for mean, median and mode for each parameter
             if jj == 0:
@@ -16,8 +16,10 @@ import sys
 import numpy as np
 
 import mtpy.core.mt as mt
+import mtpy.core.mt_loader as mt_loader
+import mtpy.core.survey_archive as survey_archive
 import mtpy.core.z as mtz
-import mtpy.modeling.ws3dinv as ws
+import mtpy.core.z_interp as MTz_interp
 import mtpy.utils.latlon_utm_conversion as utm2ll
 from mtpy import constants
 from mtpy.core.edi_collection import EdiCollection
@@ -67,6 +69,10 @@ class Data(object):
                            _dtype
     _z_shape               internal variable defining shape of Z array in
                            _dtype
+    archive                survey archive directory or
+                           mtpy.core.survey_archive.SurveyArchive to read the
+                           stations from instead of edi_list.
+                           *default* is None
     center_position_EN        (east, north, evel) for center point of station
                            array.  All stations are relative to this location
                            for plotting purposes.
@@ -156,9 +162,14 @@ class Data(object):
                                * '7' --> 'Off_Diagonal_Rho_Phase'
 
     inv_mode_dict          dictionary for inversion modes
+    load_errors            list of (.edi file, error message) of the files
+                           that could not be read with n_workers > 1, they
+                           are left out of edi_list
     max_num_periods        maximum number of periods
     mt_dict                dictionary of mtpy.core.mt.MT objects with keys
                            being station names
+    n_workers              number of processes reading the .edi files, None
+                           for one per CPU. *default* is 1
     period_dict            dictionary of period index for period_list
     period_list            list of periods to invert for
     period_max             maximum value of period to invert for
@@ -262,6 +273,10 @@ class Data(object):
         self.max_num_periods = kwargs.pop('max_num_periods', None)
         self.data_period_list = None
 
+        self.n_workers = kwargs.pop('n_workers', 1)
+        self.load_errors = []
+        self.archive = kwargs.pop('archive', None)
+
         self.fn_basename = kwargs.pop('fn_basename', 'ModEM_Data.dat')
         self.save_path = kwargs.pop('save_path', os.getcwd())
         self.formatting = kwargs.pop('format', '1')
@@ -367,9 +382,18 @@ class Data(object):
 
     def get_mt_dict(self):
         """
-        get mt_dict from edi file list
+        get mt_dict from edi file list, or from the survey archive if
+        archive is set
         """
 
+        if self.archive is not None:
+            archive = self.archive
+            if not isinstance(archive, survey_archive.SurveyArchive):
+                archive = survey_archive.SurveyArchive(archive)
+            self.mt_dict = dict([(mt_obj.station, mt_obj)
+                                 for mt_obj in archive.to_mt_list()])
+            return
+
         if self.edi_list is None:
             raise DataError('edi_list is None, please input a list of '
                             '.edi files containing the full path')
@@ -378,10 +402,13 @@ class Data(object):
             raise DataError('edi_list is empty, please input a list of '
                             '.edi files containing the full path')
 
+        loader = mt_loader.MTLoader(n_workers=self.n_workers)
         self.mt_dict = {}
-        for edi in self.edi_list:
-            mt_obj = mt.MT(edi)
+        for mt_obj in loader.load(self.edi_list):
             self.mt_dict[mt_obj.station] = mt_obj
+        # keep edi_list in step with mt_dict
+        self.edi_list = loader.loaded_edi_list
+        self.load_errors = loader.errors
 
     def project_sites(self):
         """
@@ -743,6 +770,19 @@ class Data(object):
         self._set_dtype((nf, 2, 2), (nf, 1, 2))
         self.data_array = np.zeros(ns, dtype=self._dtype)
 
+        # interpolate all stations onto the period list, each station only
+        # gets the periods within its range. if specified, apply a buffer so
+        # that interpolation doesn't stretch too far over periods.
+        # default: use_original_freq = False. if True each MT station edi
+        # file only gets the periods of period_list that it has itself.
+        period_buffer = None
+        if type(self.period_buffer) in [float, int]:
+            period_buffer = self.period_buffer
+        z_stack = MTz_interp.interpolate_mt_list(
+            [self.mt_dict[s_key] for s_key in sorted(self.mt_dict.keys())],
+            self.period_list, period_buffer=period_buffer,
+            original_periods=use_original_freq, n_workers=self.n_workers)
+
         rel_distance = True
         for ii, s_key in enumerate(sorted(self.mt_dict.keys())):
             logger.debug("mt_dict key: %s and ii= %s", s_key, ii)  # s_key is station name
@@ -778,61 +818,33 @@ class Data(object):
                     logger.debug("skipping - self.data_array[ii]['rel_east'] was not assigned here !!!")
                     pass
 
-            # interpolate each station onto the period list
-            # check bounds of period list
-
-            interp_periods = self.period_list[np.where(
-                (self.period_list >= 1. / mt_obj.Z.freq.max()) &
-                (self.period_list <= 1. / mt_obj.Z.freq.min()))]
-
-            # if specified, apply a buffer so that interpolation doesn't
-            # stretch too far over periods
-            if type(self.period_buffer) in [float, int]:
-                interp_periods_new = []
-                dperiods = 1. / mt_obj.Z.freq
-                for iperiod in interp_periods:
-                    # find nearest data period
-                    difference = np.abs(iperiod - dperiods)
-                    nearestdperiod = dperiods[difference == np.amin(difference)][0]
-                    if max(nearestdperiod / iperiod, iperiod / nearestdperiod) < self.period_buffer + 1.:
-                        interp_periods_new.append(iperiod)
-
-                interp_periods = np.array(interp_periods_new)
-
-            # FZ: sort in order
-            interp_periods = np.sort(interp_periods)
-            logger.debug("station_name and its original period: %s %s %s", mt_obj.station, len(mt_obj.Z.freq),
-                         1.0 / mt_obj.Z.freq)
-            logger.debug("station_name and interpolation period: %s %s %s", mt_obj.station, len(interp_periods),
-                         interp_periods)
-
-            # default: use_original_freq = True, each MT station edi file will use it's own frequency-filtered.
-            # no new freq in the output modem.dat file. select those freq of mt_obj according to interp_periods
-            if use_original_freq:
-                interp_periods = self.filter_periods(mt_obj, interp_periods)
-                logger.debug("station_name and selected/filtered periods: %s, %s, %s", mt_obj.station,
-                             len(interp_periods), interp_periods)
-                # in this case the below interpolate_impedance_tensor function will degenerate into a same-freq set.
-
-            if len(interp_periods) > 0:  # not empty
-                interp_z, interp_t = mt_obj.interpolate_impedance_tensor(1. / interp_periods)  # ,bounds_error=False)
-#                interp_z, interp_t = mt_obj.interpolate(1./interp_periods)
-                for kk, ff in enumerate(interp_periods):
-                    jj = np.where(self.period_list == ff)[0][0]
-                    self.data_array[ii]['z'][jj] = interp_z.z[kk, :, :]
-                    self.data_array[ii]['z_err'][jj] = interp_z.z_err[kk, :, :]
+            # data of the station interpolated onto the period list
+            selected = z_stack.mask[ii]
+            logger.debug("station_name and interpolation period: %s %s %s", mt_obj.station,
+                         np.count_nonzero(selected), self.period_list[selected])
 
-                    if mt_obj.Tipper.tipper is not None:
-                        self.data_array[ii]['tip'][jj] = interp_t.tipper[kk, :, :]
-                        self.data_array[ii]['tip_err'][jj] = \
-                            interp_t.tipper_err[kk, :, :]
+            if np.any(selected):  # not empty
+                self.data_array[ii]['z'] = z_stack.z[ii]
+                self.data_array[ii]['z_err'] = z_stack.z_err[ii]
+
+                if mt_obj.Tipper.tipper is not None:
+                    self.data_array[ii]['tip'] = z_stack.tipper[ii]
+                    self.data_array[ii]['tip_err'] = z_stack.tipper_err[ii]
 
                 # FZ: try to output a new edi files. Compare with original edi?
                 if new_edi_dir is not None:
+                    p_index = np.where(selected)[0]
+                    p_index = p_index[np.argsort(self.period_list[p_index])]
+                    interp_z = mtz.Z(z_array=z_stack.z[ii, p_index],
+                                     z_err_array=z_stack.z_err[ii, p_index],
+                                     freq=z_stack.freq[p_index])
+                    interp_t = None
+                    if mt_obj.Tipper.tipper is not None:
+                        interp_t = mtz.Tipper(tipper_array=z_stack.tipper[ii, p_index],
+                                              tipper_err_array=z_stack.tipper_err[ii, p_index],
+                                              freq=z_stack.freq[p_index])
                     new_edifile = os.path.join(new_edi_dir, mt_obj.station + '.edi')
                     mt_obj.write_edi_file(new_fn=new_edifile, new_Z=interp_z, new_Tipper=interp_t)
-            else:
-                pass
 
         if rel_distance is False:
             self.get_relative_station_locations()
@@ -1246,6 +1258,8 @@ class Data(object):
             >>> mdr.convert_ws3dinv_data_file(r"/home/ws3dinv/inv1/WSData.dat",
                     station_fn=r"/home/ws3dinv/inv1/WS_Station_Locations.txt")
         """
+        # ws3dinv imports matplotlib, only load it when it is needed
+        import mtpy.modeling.ws3dinv as ws
 
         if os.path.isfile(ws_data_fn) == False:
             raise ws.WSInputError(
@@ -1467,6 +1481,11 @@ class Data(object):
                         p_index, ii, jj] = dd[8] - 1j * dd[9]
                 data_dict[dd[1]].Tipper.tipper_err[p_index, ii, jj] = dd[10]
 
+        # the arrays were filled in place
+        for mt_obj in data_dict.values():
+            mt_obj.Z.invalidate()
+            mt_obj.Tipper.invalidate()
+
         # make mt_dict an attribute for easier manipulation later
         self.mt_dict = data_dict
 
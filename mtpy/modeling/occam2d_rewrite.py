@@ -47,6 +47,8 @@ from scipy.stats import mode
 
 import mtpy.analysis.geometry as MTgy
 import mtpy.core.mt as mt
+import mtpy.core.z as MTz
+import mtpy.core.z_interp as MTz_interp
 import mtpy.modeling.winglinktools as MTwl
 from mtpy.imaging.mtplottools import plot_errorbar
 
@@ -2413,31 +2415,35 @@ class Data(Profile):
                      for station, offset in zip(self.station_list,
                                                 self.station_locations)]
 
+        # interpolate data of all stations onto given frequency list, each
+        # station gets the frequencies within its range
+        if self.interpolate_freq:
+            z_stack = MTz_interp.interpolate_mt_list(self.edi_list,
+                                                     1. / self.freq)
+
         # loop over mt object in edi_list and use a counter starting at 1
         # because that is what occam starts at.
         for s_index, edi in enumerate(self.edi_list):
 
             if self.interpolate_freq:
-                station_freq = edi.Z.freq
-                interp_freq = self.freq[np.where((self.freq >= station_freq.min()) &
-                                                 (self.freq <= station_freq.max()))]
-                # interpolate data onto given frequency list
-                z_interp, t_interp = edi.interpolate_impedance_tensor(interp_freq)
+                # update station freq, as we've now interpolated new z values
+                # for the station
+                f_valid = z_stack.mask[s_index]
+                station_freq = self.freq[f_valid]
+                z_interp = MTz.Z(z_array=z_stack.z[s_index, f_valid],
+                                 z_err_array=z_stack.z_err[s_index, f_valid],
+                                 freq=station_freq)
                 z_interp._compute_res_phase()
 
                 rho = z_interp.resistivity
                 phi = z_interp.phase
                 rho_err = z_interp.resistivity_err
-                if t_interp is not None:
-                    tipper = t_interp.tipper
-                    tipper_err = t_interp.tipper_err
+                if edi.Tipper.tipper is not None:
+                    tipper = z_stack.tipper[s_index, f_valid]
+                    tipper_err = z_stack.tipper_err[s_index, f_valid]
                 else:
                     tipper = None
                     tipper_err = None
-                # update station freq, as we've now interpolated new z values
-                # for the station
-                station_freq = self.freq[np.where((self.freq >= station_freq.min()) &
-                                                  (self.freq <= station_freq.max()))]
             else:
                 station_freq = edi.Z.freq
                 rho = edi.Z.resistivity
@@ -1870,6 +1870,7 @@ class ZongeMTAvg():
                         new_Z.z[ll, ii, jj] = zzr + zzi * 1j
                     new_Z.z_err[ll, ii, jj] = \
                         self.comp_dict[ikey]['ares.%err'][kk] * .005
+            new_Z.invalidate()
 
             new_Z.freq = sorted(self.freq_dict.keys())
             self.Z = new_Z
@@ -1968,6 +1969,7 @@ class ZongeMTAvg():
                     new_Tipper.tipper_err[ll, ii, jj] += \
                         self.comp_dict[ikey]['ares.%err'][kk] *\
                         .05 * np.sqrt(tzr**2 + tzi**2)
+            new_Tipper.invalidate()
 
             new_Tipper.freq = sorted(self.freq_dict.keys())
             self.Tipper = new_Tipper
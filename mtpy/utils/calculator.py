@@ -297,6 +297,147 @@ def z_error2r_phi_error(x, x_error, y, y_error):
     return rho_err, phi_err
 
 
+#=================================================================
+# array versions of the error propagation helpers
+#
+# These evaluate the same corner/edge point schemes as the scalar functions
+# above, but over whole arrays at once (e.g. all (n_freq, 2, 2) elements
+# of an impedance tensor), so they can be used without python loops.
+#=================================================================
+
+def _error_box_points(x, x_error, y, y_error):
+    """
+        Return the corners and edge midpoints of the rectangular uncertainty
+        box around (x, y) as two arrays of shape (x.shape + (8,)).
+
+        The points are in the same order as in z_error2r_phi_error and
+        propagate_error_rect2polar.
+    """
+
+    x = np.asarray(x, dtype='float')
+    y = np.asarray(y, dtype='float')
+    x_error = np.real(np.asarray(x_error))
+    y_error = np.real(np.asarray(y_error))
+
+    x_signs = np.array([1, -1, 0, 0, -1, 1, 1, -1])
+    y_signs = np.array([0, 0, -1, 1, -1, -1, 1, 1])
+
+    x_points = x[..., np.newaxis] + x_signs * x_error[..., np.newaxis]
+    y_points = y[..., np.newaxis] + y_signs * y_error[..., np.newaxis]
+
+    return x_points, y_points
+
+
+def propagate_error_polar2rect_array(r, r_error, phi, phi_error):
+    """
+        Array version of propagate_error_polar2rect.
+
+        All inputs are arrays of the same shape (or broadcastable).
+        Returns arrays of x and y errors with the broadcast shape.
+        As in the scalar version, phi and phi_error are used as given
+        (in radians).
+    """
+
+    r = np.asarray(r, dtype='float')[..., np.newaxis]
+    r_error = np.asarray(r_error, dtype='float')[..., np.newaxis]
+    phi = np.asarray(phi, dtype='float')[..., np.newaxis]
+    phi_error = np.asarray(phi_error, dtype='float')[..., np.newaxis]
+
+    r_signs = np.array([-1, 1, 1, -1, 1])
+    phi_signs = np.array([-1, -1, 1, 1, 0])
+
+    r_corners = r + r_signs * r_error
+    phi_corners = phi + phi_signs * phi_error
+
+    x_corners = r_corners * np.cos(phi_corners)
+    y_corners = r_corners * np.sin(phi_corners)
+
+    x_point = r * np.cos(phi)
+    y_point = r * np.sin(phi)
+
+    xerr = np.max(np.abs(x_point - x_corners), axis=-1)
+    yerr = np.max(np.abs(y_point - y_corners), axis=-1)
+
+    return xerr, yerr
+
+
+def propagate_error_rect2polar_array(x, x_error, y, y_error):
+    """
+        Array version of propagate_error_rect2polar.
+
+        All inputs are arrays of the same shape (or broadcastable).
+        Returns arrays of rho and phi (degrees) errors.
+    """
+
+    x_points, y_points = _error_box_points(x, x_error, y, y_error)
+
+    # check, if origin is within the box:
+    origin_in_box = (np.real(x_error) >= np.abs(x)) & \
+                    (np.real(y_error) >= np.abs(y))
+
+    lo_rho = np.hypot(x_points, y_points)
+    lo_phi = np.degrees(np.arctan2(y_points, x_points)) % 360
+
+    rho_min = lo_rho.min(axis=-1)
+    phi_max = lo_phi.max(axis=-1)
+    phi_min = lo_phi.min(axis=-1)
+
+    rho_err = 0.5 * (lo_rho.max(axis=-1) - rho_min)
+    phi_err = 0.5 * (phi_max - phi_min)
+
+    # the box straddles the positive x-axis
+    wrapped = (270 < phi_max) & (phi_max < 360) & \
+              (0 < phi_min) & (phi_min < 90)
+    max_q1 = np.where((0 < lo_phi) & (lo_phi < 90),
+                      lo_phi, -np.inf).max(axis=-1)
+    min_q4 = np.where((270 < lo_phi) & (lo_phi < 360),
+                      lo_phi, np.inf).min(axis=-1)
+    with np.errstate(invalid='ignore'):
+        phi_err = np.where(wrapped, 0.5 * ((max_q1 - min_q4) % 360),
+                           phi_err)
+
+    phi_err = np.where(phi_err > 180, (-phi_err) % 360, phi_err)
+
+    rho_err = np.where(origin_in_box, 2 * rho_err + rho_min, rho_err)
+    phi_err = np.where(origin_in_box, 180., phi_err)
+
+    return rho_err, phi_err
+
+
+def z_error2r_phi_error_array(x, x_error, y, y_error):
+    """
+        Array version of z_error2r_phi_error.
+
+        All inputs are arrays of the same shape (or broadcastable), e.g. the
+        real part, error, imaginary part and error of a whole impedance
+        tensor array of shape (n_freq, 2, 2).
+
+        Returns arrays of the amplitude error and the phase error (degrees),
+        see z_error2r_phi_error for the meaning of those.
+    """
+
+    x_points, y_points = _error_box_points(x, x_error, y, y_error)
+
+    lo_rho = np.hypot(x_points, y_points)
+
+    # uncertainty in amplitude is defined by half the diameter of the box
+    # around x,y
+    rho_err = 0.5 * (lo_rho.max(axis=-1) - lo_rho.min(axis=-1))
+
+    rho = np.hypot(x, y)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rel_error_rho = np.where(rho == 0, 0., rho_err / rho)
+
+    # relative errors >= 100% are equivalent to a phase uncertainty of
+    # 90 degrees
+    with np.errstate(invalid='ignore'):
+        phi_err = np.where(rel_error_rho > 1., 90.,
+                           np.degrees(np.arcsin(np.minimum(rel_error_rho,
+                                                           1.))))
+
+    return rho_err, phi_err
+
+
 # rotation:
 # 1. rotation positive in clockwise direction
 # 2. orientation of new X-axis X' given by rotation angle
@@ -438,6 +579,151 @@ def rotatevector_incl_errors(invector, angle, invector_err=None):
     return rotated_vector, errvec
 
 
+# batched rotation:
+# Same conventions as rotatematrix_incl_errors/rotatevector_incl_errors,
+# but for stacks of matrices/vectors of shape (..., 2, 2) or (..., 1, 2)
+# and an array of angles broadcastable to the leading dimensions, e.g.
+# (nf,) angles for (nf, 2, 2) tensors or (ns, nf) angles for
+# (ns, nf, 2, 2) tensors.
+
+def _rotation_matrices(angles):
+    """
+        Return the rotation matrices R = ([cos, sin], [-sin, cos]) for an
+        array of angles (degrees) as an array of shape (angles.shape + (2, 2)).
+    """
+
+    try:
+        phi = np.radians(np.asarray(angles, dtype='float') % 360)
+    except (TypeError, ValueError):
+        raise MTex.MTpyError_inputarguments(
+            '"Angles" must be valid numbers (in degrees)')
+
+    cphi = np.cos(phi)
+    sphi = np.sin(phi)
+
+    rotmat = np.empty(phi.shape + (2, 2))
+    rotmat[..., 0, 0] = cphi
+    rotmat[..., 0, 1] = sphi
+    rotmat[..., 1, 0] = -sphi
+    rotmat[..., 1, 1] = cphi
+
+    return rotmat
+
+
+def rotatematrices_incl_errors(inmatrices, angles, inmatrices_err=None):
+    """
+        Rotate a stack of 2x2 matrices (and their errors) in one go.
+
+        Input:
+        inmatrices - array of shape (..., 2, 2)
+        angles - angle(s) in degrees, scalar or array broadcastable to
+                 inmatrices.shape[:-2]
+        inmatrices_err - array of the same shape as inmatrices (optional)
+
+        Output:
+        rotated matrices - array of shape (..., 2, 2)
+        rotated errors - array of shape (..., 2, 2), None if no errors given
+    """
+
+    if inmatrices is None:
+        raise MTex.MTpyError_inputarguments('Matrices must be defined')
+
+    inmatrices = np.asarray(inmatrices)
+    if inmatrices.shape[-2:] != (2, 2):
+        raise MTex.MTpyError_inputarguments(
+            'Matrices must be of shape (..., 2, 2), not %s' %
+            str(inmatrices.shape))
+
+    if (inmatrices_err is not None) and \
+            (inmatrices.shape != np.shape(inmatrices_err)):
+        raise MTex.MTpyError_inputarguments(
+            'Matrix and err-matrix shapes do not match: %s - %s' %
+            (str(inmatrices.shape), str(np.shape(inmatrices_err))))
+
+    rotmat = _rotation_matrices(angles)
+    # the inverse of a rotation matrix is its transpose
+    rotmat_t = np.swapaxes(rotmat, -1, -2)
+
+    rotated_matrices = np.matmul(np.matmul(rotmat, inmatrices), rotmat_t)
+
+    errmat = None
+    if inmatrices_err is not None:
+        err_orig = np.real(inmatrices_err)
+        errmat = np.zeros_like(inmatrices_err)
+
+        c2 = rotmat[..., 0, 0] ** 2
+        s2 = rotmat[..., 0, 1] ** 2
+        cs = rotmat[..., 0, 0] * rotmat[..., 0, 1]
+
+        e00 = err_orig[..., 0, 0]
+        e01 = err_orig[..., 0, 1]
+        e10 = err_orig[..., 1, 0]
+        e11 = err_orig[..., 1, 1]
+
+        # standard propagation of errors:
+        errmat[..., 0, 0] = np.sqrt((c2 * e00) ** 2 + (cs * e01) ** 2 +
+                                    (cs * e10) ** 2 + (s2 * e11) ** 2)
+        errmat[..., 0, 1] = np.sqrt((c2 * e01) ** 2 + (cs * e11) ** 2 +
+                                    (cs * e00) ** 2 + (s2 * e10) ** 2)
+        errmat[..., 1, 0] = np.sqrt((c2 * e10) ** 2 + (cs * e11) ** 2 +
+                                    (cs * e00) ** 2 + (s2 * e01) ** 2)
+        errmat[..., 1, 1] = np.sqrt((c2 * e11) ** 2 + (cs * e01) ** 2 +
+                                    (cs * e10) ** 2 + (s2 * e00) ** 2)
+
+    return rotated_matrices, errmat
+
+
+def rotatevectors_incl_errors(invectors, angles, invectors_err=None):
+    """
+        Rotate a stack of row vectors (e.g. tipper, shape (..., 1, 2)) or
+        column vectors (shape (..., 2, 1)) and their errors in one go.
+
+        Input:
+        invectors - array of shape (..., 1, 2) or (..., 2, 1)
+        angles - angle(s) in degrees, scalar or array broadcastable to
+                 invectors.shape[:-2]
+        invectors_err - array of the same shape as invectors (optional)
+
+        Output:
+        rotated vectors - array of the shape of invectors
+        rotated errors - array of the shape of invectors, None if no errors
+                         given
+    """
+
+    if invectors is None:
+        raise MTex.MTpyError_inputarguments('Vectors must be defined')
+
+    invectors = np.asarray(invectors)
+    if invectors.shape[-2:] not in [(1, 2), (2, 1)]:
+        raise MTex.MTpyError_inputarguments(
+            'Vectors must be of shape (..., 1, 2) or (..., 2, 1), not %s' %
+            str(invectors.shape))
+
+    if (invectors_err is not None) and \
+            (invectors.shape != np.shape(invectors_err)):
+        raise MTex.MTpyError_inputarguments(
+            'Vector and errror-vector shapes do not match: %s - %s' %
+            (str(invectors.shape), str(np.shape(invectors_err))))
+
+    rotmat = _rotation_matrices(angles)
+    rotmat_t = np.swapaxes(rotmat, -1, -2)
+
+    row_vectors = invectors.shape[-2:] == (1, 2)
+    if row_vectors:
+        rotated_vectors = np.matmul(invectors, rotmat_t)
+    else:
+        rotated_vectors = np.matmul(rotmat, invectors)
+
+    errvec = None
+    if invectors_err is not None:
+        if row_vectors:
+            errvec = np.matmul(invectors_err, np.abs(rotmat_t))
+        else:
+            errvec = np.matmul(np.abs(rotmat), invectors_err)
+
+    return rotated_vectors, errvec
+
+
 def multiplymatrices_incl_errors(
         inmatrix1, inmatrix2, inmatrix1_err=None, inmatrix2_err=None):
 
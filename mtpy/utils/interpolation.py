@@ -131,3 +131,172 @@ def interpolate_lemi_coils_response(freq, instrument_response):
     interpolated_value = np.complex(interpval_real, interpval_imag)
 
     return interpolated_value
+
+
+class LogFrequencyInterpolator(object):
+    """
+    Linear interpolation in log10(frequency) from one frequency axis onto
+    another, for any number of data columns at once.
+
+    The positions of the new frequencies on the old axis are computed once,
+    the interpolation weights are computed once per data mask and kept, so
+    stations with the same frequencies and gaps share all the work.
+
+    Arguments
+    -----------
+        **freq** : np.ndarray(n_freq)
+                   frequencies of the data, any order
+
+        **new_freq** : np.ndarray(n_new)
+                       frequencies to interpolate onto, any order
+
+    Example
+    ----------
+
+        >>> interp = LogFrequencyInterpolator(z_obj.freq, new_freq)
+        >>> new_z = interp(z_obj.z, mask=z_obj.z != 0)
+    """
+
+    # number of data masks whose weights are kept
+    max_masks = 32
+
+    def __init__(self, freq, new_freq):
+        self.freq = np.array(freq, dtype='float')
+        self.new_freq = np.array(new_freq, dtype='float')
+
+        self._order = np.argsort(self.freq, kind='mergesort')
+        self._log_freq = np.log10(self.freq[self._order])
+        self._new_log_freq = np.log10(self.new_freq)
+        # index of the last old frequency <= each new frequency, -1 if none
+        self._pos = np.searchsorted(self._log_freq, self._new_log_freq,
+                                    side='right') - 1
+
+        self._weights = {}
+
+    def weights(self, mask):
+        """
+        interpolation weights for data valid where mask is True
+
+        Arguments
+        -----------
+            **mask** : np.ndarray(n_freq, n_col, dtype=bool)
+                       True where there are data, in the order of freq
+
+        Returns
+        ---------
+            **lower**, **upper** : np.ndarray(n_new, n_col, dtype=int)
+                                   index of the valid data (in ascending
+                                   frequency order) below and above each
+                                   new frequency
+
+            **weight** : np.ndarray(n_new, n_col)
+                         weight of upper, 1 - weight is the weight of lower
+
+            **inside** : np.ndarray(n_new, n_col, dtype=bool)
+                         True where a new frequency is within the range of
+                         the valid data
+        """
+        # look up and return local references only, another thread may
+        # clear the cache at any time
+        key = (mask.shape, mask.tobytes())
+        weights = self._weights.get(key)
+        if weights is not None:
+            return weights
+
+        n_freq = self.freq.shape[0]
+        mask = mask[self._order]
+        index = np.arange(n_freq)[:, np.newaxis]
+        # last valid index at or below each index, first one at or above
+        below = np.maximum.accumulate(np.where(mask, index, -1), axis=0)
+        above = np.minimum.accumulate(np.where(mask, index, n_freq)[::-1],
+                                      axis=0)[::-1]
+        above = np.vstack((above, np.full((1, mask.shape[1]), n_freq,
+                                          dtype=above.dtype)))
+
+        pos = self._pos
+        lower = np.where((pos >= 0)[:, np.newaxis],
+                         below[np.clip(pos, 0, None)], -1)
+        upper = above[pos + 1]
+
+        has_lower = lower >= 0
+        has_upper = upper < n_freq
+        lower = np.clip(lower, 0, None)
+        x_lower = self._log_freq[lower]
+        new_x = self._new_log_freq[:, np.newaxis]
+        inside = has_lower & (has_upper | (new_x == x_lower))
+
+        upper = np.where(has_upper, upper, lower)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weight = (new_x - x_lower) / (self._log_freq[upper] - x_lower)
+        weight[~(has_lower & has_upper)] = 0.
+
+        weights = (lower, upper, weight, inside)
+        if len(self._weights) >= self.max_masks:
+            self._weights.clear()
+        self._weights[key] = weights
+
+        return weights
+
+    def __call__(self, values, mask=None, fill_value=0.):
+        """
+        interpolate values onto the new frequencies
+
+        Arguments
+        -----------
+            **values** : np.ndarray(n_freq, ...)
+                         data, the first axis goes with freq
+
+            **mask** : np.ndarray of the same shape as values
+                       True where there are data, *default* is where values
+                       are not 0
+
+            **fill_value** : float
+                             value of new frequencies outside the range of
+                             the valid data of a column, *default* is 0.
+
+        Returns
+        ---------
+            **new_values** : np.ndarray(n_new, ...)
+        """
+        values = np.asarray(values)
+        if values.shape[0] != self.freq.shape[0]:
+            raise ValueError('values have {0} frequencies, expected '
+                             '{1}'.format(values.shape[0],
+                                          self.freq.shape[0]))
+        if mask is None:
+            mask = values != 0
+
+        shape = values.shape
+        n_col = int(np.prod(shape[1:]))
+        lower, upper, weight, inside = self.weights(
+            np.asarray(mask, dtype='bool').reshape(shape[0], n_col))
+
+        values = values.reshape(shape[0], n_col)[self._order]
+        column = np.arange(n_col)
+        new_values = values[lower, column] * (1 - weight) + \
+            values[upper, column] * weight
+        new_values[~inside] = fill_value
+
+        return new_values.reshape((self.new_freq.shape[0],) + shape[1:])
+
+
+# interpolators of the most recent frequency axes
+_interpolators = {}
+
+
+def get_log_frequency_interpolator(freq, new_freq, max_cached=16):
+    """
+    LogFrequencyInterpolator from freq onto new_freq, the interpolators of
+    the last max_cached pairs of frequency axes are kept and reused.
+    """
+    freq = np.asarray(freq, dtype='float')
+    new_freq = np.asarray(new_freq, dtype='float')
+    key = (freq.tobytes(), new_freq.tobytes())
+    interp = _interpolators.get(key)
+    if interp is None:
+        interp = LogFrequencyInterpolator(freq, new_freq)
+        if len(_interpolators) >= max_cached:
+            _interpolators.clear()
+        _interpolators[key] = interp
+
+    return interp
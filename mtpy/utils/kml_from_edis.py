@@ -54,16 +54,15 @@ def convert_edi_coordinates_to_kml_file(edi_filelist, outfilename=None):
 
     for edi_idx, edi in enumerate(edi_filelist):
 
-        e = EDI.Edi()
-        e.readfile(edi)
+        e = EDI.Edi(edi_fn=edi, data=False)
         lat = e.lat
         lon = e.lon
         ele = e.elev
-        station = e.head['dataid']
+        station = e.station
 
         kml = []
 
-        description = 'File: {0}'.format(e.filename)
+        description = 'File: {0}'.format(e.edi_fn)
 
         kml.append('  <Placemark>')
         kml.append('    <name>%s</name>' % station)
@@ -17,6 +17,7 @@ import numpy as np
 
 import mtpy.analysis.pt as mtpt
 import mtpy.core.mt as mt
+import mtpy.core.mt_loader as mt_loader
 import mtpy.modeling.modem_data as md
 
 
@@ -33,8 +34,13 @@ class PTShapeFile(object):
     edi_list                 list of edi files, full paths
     ellipse_size             size of normalized ellipse in map scale
                              *default* is .01
+    load_errors              list of (edi file, error message) of the files
+                             that could not be read with n_workers > 1,
+                             they are left out of edi_list
     mt_obj_list              list of mt.MT objects
                              *default* is None, filled if edi_list is given
+    n_workers                number of processes reading the edi files, None
+                             for one per CPU. *default* is 1
     plot_period              list or value of period to convert to shape file
                              *default* is None, which will write a file for
                              every period in the edi files
@@ -93,9 +99,15 @@ class PTShapeFile(object):
 
         self.mt_obj_list = None
         self.pt_dict = None
+        n_workers = kwargs.pop('n_workers', 1)
 
+        self.load_errors = []
         if self.edi_list is not None:
-            self.mt_obj_list = [mt.MT(edi) for edi in self.edi_list]
+            loader = mt_loader.MTLoader(n_workers=n_workers)
+            self.mt_obj_list = loader.load(self.edi_list)
+            # keep edi_list in step with mt_obj_list
+            self.edi_list = loader.loaded_edi_list
+            self.load_errors = loader.errors
         else:
             raise Exception("EDI files List is None")
 
@@ -593,10 +605,25 @@ class PTShapeFile(object):
             modem_resp_obj.mt_dict[
                 r_key].rotation_angle = float(rotation_angle)
 
+        # residual phase tensors of all stations and periods at once,
+        # zeros for stations whose data and response do not match
+        keys = modem_data_obj.mt_dict.keys()
+        rpt, rpt_err, rpt_arr, matched = mtpt.residual_pt_list(
+            [modem_data_obj.mt_dict[key].pt.pt for key in keys],
+            [modem_resp_obj.mt_dict[key].pt.pt for key in keys],
+            [modem_data_obj.mt_dict[key].pt.pterr for key in keys],
+            [modem_resp_obj.mt_dict[key].pt.pterr for key in keys])
+        for key, ok in zip(keys, matched):
+            if not ok:
+                print key, modem_data_obj.mt_dict[key].pt.pt.shape, \
+                    modem_resp_obj.mt_dict[key].pt.pt.shape
+        # quarter of the Frobenius norm
+        rpt_mean = .25 * np.sqrt(np.sum(rpt ** 2, axis=(-2, -1)))
+
         residual_pt_dict = {}
         for p_index, plot_per in enumerate(self.plot_period):
             residual_pt_dict[plot_per] = []
-            for key in modem_data_obj.mt_dict.keys():
+            for s_index, key in enumerate(keys):
                 mt_obj = modem_data_obj.mt_dict[key]
                 if self.projection is None:
                     east, north, elev = (mt_obj.lon, mt_obj.lat, 0)
@@ -609,38 +636,14 @@ class PTShapeFile(object):
                                                                  self.projection)
                     east, north, elev = utm_point
 
-                # get pt objects from data and model response
-                dpt = modem_data_obj.mt_dict[key].pt
-                mpt = modem_resp_obj.mt_dict[key].pt
-
-                # calculate the residual pt
-                try:
-                    rpt = mtpt.ResidualPhaseTensor(pt_object1=dpt,
-                                                   pt_object2=mpt)
-                    rpt = rpt.residual_pt
-                    rpt_mean = .25 * np.linalg.norm(rpt.pt[p_index], ord='fro')
-                    #                    rpt_mean = .25*np.sqrt(abs(rpt.pt[p_index, 0, 0])**2+
-                    #                                          abs(rpt.pt[p_index, 0, 1])**2+
-                    #                                          abs(rpt.pt[p_index, 1, 0])**2+
-                    # abs(rpt.pt[p_index, 1, 1])**2)
-                    pt_tuple = (mt_obj.station, east, north,
-                                rpt.phimin[0][p_index],
-                                rpt.phimax[0][p_index],
-                                rpt.azimuth[0][p_index],
-                                rpt.beta[0][p_index],
-                                rpt_mean)
-                    #                                np.sqrt(abs(rpt.phimin[0][p_index]*
-                    #                                            rpt.phimax[0][p_index])))
-                    residual_pt_dict[plot_per].append(pt_tuple)
-                except mtpt.MTex.MTpyError_PT:
-                    print key, dpt.pt.shape, mpt.pt.shape
-                    pt_tuple = (mt_obj.station, east, north,
-                                0.0,
-                                0.0,
-                                0.0,
-                                0.0,
-                                0.0)
-                    residual_pt_dict[plot_per].append(pt_tuple)
+                rpt = rpt_arr[s_index, p_index]
+                pt_tuple = (mt_obj.station, east, north,
+                            rpt.phimin,
+                            rpt.phimax,
+                            rpt.azimuth,
+                            rpt.beta,
+                            rpt_mean[s_index, p_index])
+                residual_pt_dict[plot_per].append(pt_tuple)
             # now make each period an array for writing to file
             residual_pt_dict[plot_per] = np.array(residual_pt_dict[plot_per],
                                                   dtype=[('station', '|S15'),
@@ -793,8 +796,13 @@ class TipperShapeFile(object):
                              *default* is .01
 
     edi_list                 list of edi files, full paths
+    load_errors              list of (edi file, error message) of the files
+                             that could not be read with n_workers > 1,
+                             they are left out of edi_list
     mt_obj_list              list of mt.MT objects
                              *default* is None, filled if edi_list is given
+    n_workers                number of processes reading the edi files, None
+                             for one per CPU. *default* is 1
     plot_period              list or value of period to convert to shape file
                              *default* is None, which will write a file for
                              every period in the edi files
@@ -847,9 +855,15 @@ class TipperShapeFile(object):
 
         self.mt_obj_list = None
         self.tip_dict = None
+        n_workers = kwargs.pop('n_workers', 1)
 
+        self.load_errors = []
         if self.edi_list is not None:
-            self.mt_obj_list = [mt.MT(edi) for edi in self.edi_list]
+            loader = mt_loader.MTLoader(n_workers=n_workers)
+            self.mt_obj_list = loader.load(self.edi_list)
+            # keep edi_list in step with mt_obj_list
+            self.edi_list = loader.loaded_edi_list
+            self.load_errors = loader.errors
 
         for key in kwargs.keys():
             setattr(self, key, kwargs[key])
@@ -1285,6 +1299,7 @@ class TipperShapeFile(object):
         for mt_obj, key in zip(self.mt_obj_list, mt_keys):
             resp_tipper = modem_resp_obj.mt_dict[key].Tipper.tipper
             mt_obj.Tipper.tipper[:, :, :] -= resp_tipper[:, :, :]
+            mt_obj.Tipper.invalidate()
 
         self.write_imag_shape_files()
         self.write_real_shape_files()
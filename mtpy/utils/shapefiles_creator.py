@@ -23,6 +23,7 @@ from shapely.geometry import Point, Polygon, LineString, LinearRing
 
 import mtpy.core.edi_collection
 import mtpy.core.mt as mt
+import mtpy.core.mt_loader as mt_loader
 from mtpy.utils.decorator import deprecated
 from mtpy.utils.mtpylog import MtPyLog
 
@@ -40,11 +41,14 @@ class ShapeFilesCreator(object):
     create shape files for a list of MT edifiles
     """
 
-    def __init__(self, edifile_list, outdir):
+    def __init__(self, edifile_list, outdir, n_workers=1):
         """
         loop through a list of edi files, create required shapefiles
         :param edifile_list: [path2edi,...]
         :param outdir: path2output dir, where the shpe file weill be written.
+        :param n_workers: number of processes reading the edi files, None for one per CPU.
+        with more than one, edi files that can not be read are left out of self.edifiles
+        and listed in self.load_errors, otherwise their error is raised.
         """
 
         self.edifiles = edifile_list
@@ -54,8 +58,13 @@ class ShapeFilesCreator(object):
 
         self.outputdir = outdir
 
+        self.load_errors = []
         if self.edifiles is not None:
-            self.mt_obj_list = [mt.MT(edi) for edi in self.edifiles]
+            loader = mt_loader.MTLoader(n_workers=n_workers)
+            self.mt_obj_list = loader.load(self.edifiles)
+            # keep edifiles in step with mt_obj_list
+            self.edifiles = loader.loaded_edi_list
+            self.load_errors = loader.errors
 
         # get all frequencies from all edi files
         self.all_frequencies = None
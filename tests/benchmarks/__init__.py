@@ -0,0 +1,20 @@
+"""
+Benchmark scripts, run from the repository root, e.g.
+
+    python -m tests.benchmarks.bench_z_res_phase
+
+They are not collected by the test runner.
+"""
+import timeit
+
+
+def best_time(func, repeat=3, number=1):
+    """
+    return the best wall time (s) of calling func() number times
+    """
+    return min(timeit.repeat(func, repeat=repeat, number=number)) / number
+
+
+def report(name, t_old, t_new):
+    print("{0:<40s} old {1:10.4f} s   new {2:10.4f} s   speed up {3:8.1f}x".format(
+        name, t_old, t_new, t_old / t_new))
@@ -0,0 +1,116 @@
+"""
+Benchmark removing galvanic distortion from a survey, 500 stations and 30
+periods: station by station with a deep copy of Z and a frequency loop of
+2x2 np.matrix products as before, against
+mtpy.analysis.distortion.remove_distortion_stack on the whole survey.
+
+    python -m tests.benchmarks.bench_distortion
+"""
+import copy
+
+import numpy as np
+
+import mtpy.analysis.distortion as MTdistortion
+import mtpy.analysis.geometry as MTge
+import mtpy.core.z as MTz
+import mtpy.utils.calculator as MTcc
+from mtpy.core.z_stack import ZStack
+from tests.benchmarks import best_time, report
+
+
+def find_distortion_per_freq(z_object):
+    """
+    distortion tensor of one station as found before, without the error
+    terms of the 2-D estimate
+    """
+    z_obj = copy.deepcopy(z_object)
+    dim_arr = MTge.dimensionality(z_object=z_obj)
+    st_arr = -1 * MTge.strike_angle(z_object=z_obj)[:, 0]
+
+    dis = np.zeros_like(z_obj.z, dtype=np.float)
+    dis_err = np.ones_like(z_obj.z, dtype=np.float)
+    rot_mat = np.matrix([[0, -1], [1, 0]])
+    for idx, dim in enumerate(dim_arr):
+        if np.any(z_obj.z[idx] == 0.0 + 0.0j):
+            dis[idx] = np.identity(2)
+        elif dim == 1:
+            gr = np.sqrt(np.linalg.det(z_obj.z.real[idx]))
+            gi = np.sqrt(np.linalg.det(z_obj.z.imag[idx]))
+            dis[idx] = np.mean(np.array([
+                1. / gr * np.dot(z_obj.z.real[idx], rot_mat),
+                1. / gi * np.dot(z_obj.z.imag[idx], rot_mat)]), axis=0)
+            gr_err = 1. / gr * np.abs(z_obj.z_err[idx])
+            gr_err[gr_err == 0.0] = 1.0
+            gi_err = 1. / gi * np.abs(z_obj.z_err[idx])
+            gi_err[gi_err == 0.0] = 1.0
+            dis_err[idx] = np.mean(np.array([gi_err, gr_err]), axis=0)
+        elif dim == 2:
+            strike_ang = np.nan_to_num(st_arr[idx])
+            tetm_arr = MTcc.rotatematrix_incl_errors(
+                z_obj.z[idx], strike_ang, inmatrix_err=z_obj.z_err[idx])[0]
+            mats = []
+            for tetm in [tetm_arr.real, tetm_arr.imag]:
+                tetm = np.array(tetm)
+                t_arr = -4 * tetm[0, 1] * tetm[1, 0] / np.linalg.det(tetm)
+                mats.append((tetm, t_arr))
+            T = np.sqrt(max([mats[0][1], mats[1][1]])) + .001
+            avg = []
+            for tetm, t_arr in mats:
+                ss = np.sqrt(T ** 2 - t_arr)
+                mat2 = np.matrix([[0, (T + ss) / (2 * tetm[1, 0])],
+                                  [(T - ss) / (2 * tetm[0, 1]), 0]])
+                avg.append(np.dot(tetm, mat2))
+            dis[idx] = np.mean(np.array(avg), axis=0)
+        else:
+            dis[idx] = np.identity(2)
+
+    nonzero_idx = np.array(list(set(np.nonzero(dis)[0])))
+    dis_avg, weights_sum = np.average(dis[nonzero_idx], axis=0,
+                                      weights=(1. / dis_err[nonzero_idx]) ** 2,
+                                      returned=True)
+    return dis_avg, np.sqrt(1. / weights_sum)
+
+
+def remove_distortion_per_station(z_list):
+    """
+    distortion removed station by station as before
+    """
+    for z_obj in z_list:
+        dis = find_distortion_per_freq(z_obj)[0]
+        z_new = copy.deepcopy(z_obj)
+        DI = np.matrix(dis).I
+        for idx_f in range(len(z_new.z)):
+            z_new.z[idx_f] = np.array(np.dot(DI, np.matrix(z_obj.z[idx_f])))
+
+
+def make_z_list(n_station, n_freq, seed=0):
+    rs = np.random.RandomState(seed)
+    freq = np.logspace(3, -3, n_freq)
+    z_list = []
+    for ii in range(n_station):
+        # mostly 2-D impedances with a station strike and some noise
+        z = np.zeros((n_freq, 2, 2), dtype='complex')
+        z[:, 0, 1] = (1 + 1j) * rs.uniform(1, 3, n_freq)
+        z[:, 1, 0] = -np.exp(1j * rs.uniform(.2, 1.2, n_freq)) * \
+            rs.uniform(1, 3, n_freq)
+        z += .05 * (rs.normal(size=z.shape) + 1j * rs.normal(size=z.shape))
+        z = MTcc.rotatematrices_incl_errors(z, rs.uniform(0, 90))[0]
+        z_err = np.abs(z) * .05
+        z_list.append(MTz.Z(z_array=z, z_err_array=z_err, freq=freq))
+    return z_list
+
+
+def main():
+    z_list = make_z_list(500, 30)
+    z_stack = ZStack.from_z_list(z_list)
+
+    with np.errstate(all='ignore'):
+        t_old = best_time(lambda: remove_distortion_per_station(z_list),
+                          repeat=1)
+        t_new = best_time(lambda: MTdistortion.remove_distortion_stack(
+            z_stack))
+        report('remove distortion, 500 stations, 30 periods', t_old, t_new)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark constructing an EdiCollection when all artefacts were built in
+__init__ against building them on first access, and the peak memory of
+the periods of a survey with all MT objects in memory against streaming
+them with a bounded number loaded.
+
+    python -m tests.benchmarks.bench_edi_collection_lazy
+"""
+import glob
+import subprocess
+import sys
+
+from mtpy.core.edi_collection import EdiCollection
+from tests.benchmarks import best_time, report
+
+EDI_FILES = sorted(glob.glob('tests/data/edifiles/*.edi'))
+
+PEAK_MEMORY = '''
+import glob, resource
+from mtpy.core.edi_collection import EdiCollection
+edi_files = sorted(glob.glob('tests/data/edifiles/*.edi')) * 50
+edi_collection = EdiCollection(edi_files, max_loaded={0})
+edi_collection.all_unique_periods
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+'''
+
+
+def construct_all():
+    edi_collection = EdiCollection(EDI_FILES)
+    for name in ['all_unique_periods', 'geopdf', 'bound_box_dict']:
+        getattr(edi_collection, name)
+    return edi_collection
+
+
+def peak_memory(max_loaded):
+    """
+    peak memory in MB of a new interpreter reading the periods of 50
+    copies of the test survey
+    """
+    output = subprocess.check_output(
+        [sys.executable, '-c', PEAK_MEMORY.format(max_loaded)],
+        stderr=subprocess.STDOUT)
+    return int(output.splitlines()[-1]) / 1024.
+
+
+def main():
+    t_old = best_time(construct_all)
+    t_new = best_time(lambda: EdiCollection(EDI_FILES))
+    report('construct, no artefacts used', t_old, t_new)
+
+    m_old = peak_memory(None)
+    m_new = peak_memory(20)
+    print('{0:<40s} old {1:8.1f} MB   new {2:8.1f} MB'.format(
+        'peak memory, periods of 1200 stations', m_old, m_new))
+
+
+if __name__ == '__main__':
+    main()
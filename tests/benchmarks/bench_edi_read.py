@@ -0,0 +1,54 @@
+"""
+Benchmark reading the impedance and tipper blocks of a large edi file with
+the bulk block reader against the previous line by line parser.
+
+    python -m tests.benchmarks.bench_edi_read
+"""
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from mtpy.core.edi import Edi, _read_data_blocks
+from mtpy.core.z import Z, Tipper
+from tests.benchmarks import best_time, report
+from tests.core.test_edi_read import _read_data_blocks_by_line
+
+EDI_FN = 'tests/data/edifiles/15125A.edi'
+
+
+def make_edi(edi_fn, n_freq, seed=0):
+    """
+    write a copy of EDI_FN with n_freq random frequencies
+    """
+    rs = np.random.RandomState(seed)
+    edi_obj = Edi(edi_fn=EDI_FN)
+    freq = np.logspace(4, -4, n_freq)
+    z = rs.normal(size=(n_freq, 2, 2)) + 1j * rs.normal(size=(n_freq, 2, 2))
+    tipper = rs.normal(size=(n_freq, 1, 2)) + \
+        1j * rs.normal(size=(n_freq, 1, 2))
+    edi_obj.Z = Z(z_array=z, z_err_array=np.abs(z) * .05, freq=freq)
+    edi_obj.Tipper = Tipper(tipper_array=tipper,
+                            tipper_err_array=np.abs(tipper) * .05, freq=freq)
+    return edi_obj.write_edi_file(new_edi_fn=edi_fn)
+
+
+def main():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        for n_freq in [100, 1000, 10000]:
+            edi_fn = make_edi(os.path.join(tmp_dir, 'bench.edi'), n_freq)
+            edi_obj = Edi(edi_fn=edi_fn)
+            data_lines = edi_obj._edi_lines[edi_obj.Data_sect.line_num:]
+
+            t_old = best_time(lambda: _read_data_blocks_by_line(data_lines))
+            t_new = best_time(lambda: _read_data_blocks(data_lines))
+            report('edi data blocks, {0} frequencies'.format(n_freq),
+                   t_old, t_new)
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+"""
+Benchmark the batched spectra to impedance conversion of Edi._read_spectra
+against the previous one frequency at a time conversion.
+
+    python -m tests.benchmarks.bench_edi_spectra
+"""
+import numpy as np
+
+from mtpy.core.edi import _spectra_to_z
+from tests.benchmarks import best_time, report
+from tests.core.test_edi_read import _spectra_to_z_by_frequency
+
+COMP_LIST = ['hx', 'hy', 'hz', 'ex', 'ey', 'rhx', 'rhy']
+
+
+def main():
+    rs = np.random.RandomState(0)
+    n_comp = len(COMP_LIST)
+    for n_freq in [100, 1000, 10000]:
+        spectra_arr = rs.normal(size=(n_freq, n_comp, n_comp))
+        spectra_arr[:, range(n_comp), range(n_comp)] = np.abs(
+            spectra_arr[:, range(n_comp), range(n_comp)]) + 5
+        avgt_arr = rs.uniform(10, 1000, size=n_freq)
+
+        with np.errstate(invalid='ignore'):
+            t_old = best_time(lambda: _spectra_to_z_by_frequency(
+                spectra_arr, avgt_arr, COMP_LIST))
+        t_new = best_time(lambda: _spectra_to_z(spectra_arr, avgt_arr,
+                                                COMP_LIST))
+        report('edi spectra, {0} frequencies'.format(n_freq), t_old, t_new)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""
+Benchmark writing a large edi file with the bulk data block formatter
+against the previous value by value formatting.
+
+    python -m tests.benchmarks.bench_edi_write
+"""
+import os
+import shutil
+import tempfile
+
+from mtpy.core.edi import Edi
+from tests.benchmarks import best_time, report
+from tests.benchmarks.bench_edi_read import make_edi
+from tests.core.test_edi_write import _write_data_block_by_value
+
+
+def main():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        for n_freq in [100, 1000, 10000]:
+            edi_fn = make_edi(os.path.join(tmp_dir, 'bench.edi'), n_freq)
+            edi_new = Edi(edi_fn=edi_fn)
+            edi_old = Edi(edi_fn=edi_fn)
+            edi_old._write_data_block = \
+                lambda arr, key: _write_data_block_by_value(edi_old, arr, key)
+            new_fn = os.path.join(tmp_dir, 'new.edi')
+
+            def write(edi_obj):
+                edi_obj.write_edi_file(new_edi_fn=new_fn)
+                os.remove(new_fn)
+
+            t_old = best_time(lambda: write(edi_old))
+            t_new = best_time(lambda: write(edi_new))
+            report('write edi, {0} frequencies'.format(n_freq), t_old, t_new)
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""
+Benchmark the start up cost of python -c "import mtpy.core.mt" in a new
+interpreter, against also importing the plotting module it used to pull in.
+
+    python -m tests.benchmarks.bench_import
+"""
+import subprocess
+import sys
+
+from tests.benchmarks import best_time, report
+
+HEAVY_MODULES = ['matplotlib', 'scipy', 'pyproj', 'osgeo', 'geopandas',
+                 'pandas', 'shapely']
+
+
+def run_import(statement):
+    subprocess.check_call([sys.executable, '-c', statement])
+
+
+def loaded_modules(module):
+    """
+    heavy modules loaded by importing module
+    """
+    output = subprocess.check_output(
+        [sys.executable, '-c',
+         'import sys, {0}; print(" ".join(m for m in {1!r} '
+         'if m in sys.modules))'.format(module, HEAVY_MODULES)])
+    # modules can print notes on import, the list is the last line
+    return output.splitlines()[-1].split()
+
+
+def main():
+    t_old = best_time(lambda: run_import(
+        'import mtpy.core.mt, mtpy.imaging.plot_mt_response'), repeat=5)
+    t_new = best_time(lambda: run_import('import mtpy.core.mt'), repeat=5)
+    report('python -c "import mtpy.core.mt"', t_old, t_new)
+
+    for module in ['mtpy.core.mt', 'mtpy.core.edi_collection',
+                   'mtpy.analysis.staticshift', 'mtpy.modeling.modem_data']:
+        print('{0:<40s} loads {1}'.format(
+            module, ', '.join(loaded_modules(module)) or 'no heavy modules'))
+
+
+if __name__ == '__main__':
+    main()
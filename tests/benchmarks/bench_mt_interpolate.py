@@ -0,0 +1,40 @@
+"""
+Benchmark interpolating many stations onto the same periods with one
+interp1d per component against the batched log frequency interpolator.
+
+    python -m tests.benchmarks.bench_mt_interpolate
+"""
+import numpy as np
+
+from mtpy.core.mt import MT
+from tests.benchmarks import best_time, report
+from tests.core.test_mt_interpolate import _interpolate_by_component
+
+EDI_FN = 'tests/data/edifiles/15125A.edi'
+
+
+def interpolate_by_component(mt_obj, new_freq):
+    z_obj, t_obj = mt_obj.Z, mt_obj.Tipper
+    return (_interpolate_by_component(z_obj.freq, z_obj.z, new_freq, 0.),
+            _interpolate_by_component(z_obj.freq, z_obj.z_err, new_freq,
+                                      np.nan),
+            _interpolate_by_component(z_obj.freq, t_obj.tipper, new_freq, 0.),
+            _interpolate_by_component(z_obj.freq, t_obj.tipper_err, new_freq,
+                                      np.nan))
+
+
+def main():
+    mt_obj = MT(EDI_FN)
+    new_freq = np.logspace(np.log10(mt_obj.Z.freq.max()) - .1,
+                           np.log10(mt_obj.Z.freq.min()) + .1, 30)
+    n_station = 500
+
+    t_old = best_time(lambda: [interpolate_by_component(mt_obj, new_freq)
+                               for ii in range(n_station)])
+    t_new = best_time(lambda: [mt_obj.interpolate_impedance_tensor(new_freq)
+                               for ii in range(n_station)])
+    report('interpolate {0} stations'.format(n_station), t_old, t_new)
+
+
+if __name__ == '__main__':
+    main()
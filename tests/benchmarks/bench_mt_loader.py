@@ -0,0 +1,45 @@
+"""
+Benchmark loading a directory of edi files one after the other against
+loading them with a pool of worker processes.
+
+    python -m tests.benchmarks.bench_mt_loader
+"""
+import glob
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+from mtpy.core.mt_loader import MTLoader
+from tests.benchmarks import best_time, report
+
+EDI_FILES = sorted(glob.glob('tests/data/edifiles/*.edi'))
+
+
+def main():
+    tmp_dir = tempfile.mkdtemp()
+    n_workers = multiprocessing.cpu_count()
+    try:
+        for ii in range(50):
+            for edi_fn in EDI_FILES:
+                shutil.copy(edi_fn, os.path.join(
+                    tmp_dir, '{0:03}_{1}'.format(ii, os.path.basename(edi_fn))))
+        n_files = len(os.listdir(tmp_dir))
+
+        serial = MTLoader(n_workers=1)
+        pool = MTLoader(n_workers=n_workers)
+        t_old = best_time(lambda: serial.load(tmp_dir))
+        t_new = best_time(lambda: pool.load(tmp_dir))
+        report('MT, {0} files, {1} workers'.format(n_files, n_workers),
+               t_old, t_new)
+
+        t_old = best_time(lambda: serial.load_z_stack(tmp_dir))
+        t_new = best_time(lambda: pool.load_z_stack(tmp_dir))
+        report('ZStack, {0} files, {1} workers'.format(n_files, n_workers),
+               t_old, t_new)
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark Niblett-Bostick depth sections of a survey, 500 stations and 30
+periods: depth_nb and rho_minmax computed station by station and period by
+period as before against mtpy.analysis.niblettbostick on the whole survey.
+
+    python -m tests.benchmarks.bench_niblettbostick
+"""
+import numpy as np
+import scipy.interpolate as spi
+
+import mtpy.analysis.geometry as MTgy
+import mtpy.analysis.niblettbostick as MTnb
+import mtpy.utils.calculator as MTcc
+from tests.benchmarks import best_time, report
+
+
+def nb_rotated(z, period, angle):
+    """
+    TE and TM Niblett-Bostick depth and resistivity of z rotated by angle
+    """
+    new_z = np.asarray(MTcc.rotatematrix_incl_errors(z, angle)[0])
+    res = 0.2 * period * np.abs(new_z) ** 2
+    phase = np.degrees(np.angle(new_z))
+    te_rho, te_depth = MTnb.rhophi2rhodepth(res[0, 1], phase[0, 1], period)
+    tm_rho, tm_depth = MTnb.rhophi2rhodepth(res[1, 0], phase[1, 0], period)
+    return te_depth, te_rho, tm_depth, tm_rho
+
+
+def depth_nb_per_freq(z, periods):
+    """
+    depth_nb of one station as computed before
+    """
+    dims = MTgy.dimensionality(z_array=z)
+    angles = np.nan_to_num(MTgy.strike_angle(z_array=z)[:, 0])
+    strike = spi.interp1d(periods[dims != 3], angles[dims != 3],
+                          bounds_error=False, fill_value=0)(periods)
+    depth_array = np.zeros(len(periods), dtype=[('depth_min', float),
+                                                ('depth_max', float)])
+    for ii, per in enumerate(periods):
+        te_depth, te_rho, tm_depth, tm_rho = nb_rotated(z[ii], per,
+                                                        strike[ii])
+        depth_array[ii]['depth_min'] = min([te_depth, tm_depth])
+        depth_array[ii]['depth_max'] = max([te_depth, tm_depth])
+    return depth_array
+
+
+def rho_minmax_per_freq(z, periods):
+    """
+    rho_minmax of one station as computed before, one rotation at a time
+    """
+    dims = MTgy.dimensionality(z_array=z)
+    rotangles = np.arange(360) * .5
+    lo_nb_max = []
+    for z_curr, per in zip(z[dims != 3], periods[dims != 3]):
+        temp_vals = np.array([nb_rotated(z_curr, per, dd)
+                              for dd in rotangles])
+        column = np.argmax(temp_vals[:, [1, 3]].max(axis=0)) * 2 + 1
+        maxidx = np.argmax(temp_vals[:, column])
+        lo_nb_max.append([temp_vals[maxidx, column - 1],
+                          temp_vals[maxidx, column], rotangles[maxidx]])
+    return np.array(lo_nb_max)
+
+
+def make_z(shape, seed=0):
+    rs = np.random.RandomState(seed)
+    z = np.zeros(shape + (2, 2), dtype='complex')
+    z[..., 0, 1] = rs.uniform(1, 10, shape) * (1 + 1j * rs.uniform(.3, 3,
+                                                                   shape))
+    z[..., 1, 0] = -rs.uniform(1, 10, shape) * (1 + 1j * rs.uniform(.3, 3,
+                                                                    shape))
+    z = MTcc.rotatematrices_incl_errors(z, rs.uniform(-80, 80, shape))[0]
+    return z + rs.normal(size=shape + (2, 2)) * .1
+
+
+def main():
+    z = make_z((500, 30))
+    periods = np.logspace(-3, 3, 30)
+
+    with np.errstate(all='ignore'):
+        t_old = best_time(lambda: [depth_nb_per_freq(z_station, periods)
+                                   for z_station in z], repeat=1)
+        t_new = best_time(lambda: MTnb.calculate_depth_nb(z_array=z,
+                                                          periods=periods))
+        report('depth_nb, 500 stations, 30 periods', t_old, t_new)
+
+        t_old = best_time(lambda: [rho_minmax_per_freq(z_station, periods)
+                                   for z_station in z[:5]], repeat=1) * 100
+        t_new = best_time(lambda: MTnb.calculate_rho_minmax(
+            z_array=z, periods=periods))
+        report('rho_minmax, 500 stations, 30 periods', t_old, t_new)
+
+        angles = MTgy.strike_angle(z_array=z)[..., 0]
+        t_new = best_time(lambda: MTnb.calculate_znb(z_array=z,
+                                                     periods=periods))
+        print('{0:<40s} new {1:10.4f} s'.format(
+            'znb, 500 stations, 30 periods', t_new))
+        t_new = best_time(lambda: MTnb.interpolate_strike_angles(angles,
+                                                                 periods))
+        print('{0:<40s} new {1:10.4f} s'.format(
+            'strike interpolation, 500 stations', t_new))
+
+
+if __name__ == '__main__':
+    main()
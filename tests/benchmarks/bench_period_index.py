@@ -0,0 +1,63 @@
+"""
+Benchmark finding the stations of every period of a mixed AMT/BBMT/LMT
+survey the way EdiCollection did, scanning every station per period,
+against the sorted PeriodIndex.
+
+    python -m tests.benchmarks.bench_period_index
+"""
+import numpy as np
+
+from mtpy.core.edi_collection import is_num_in_seq
+from mtpy.core.period_index import PeriodIndex
+from tests.benchmarks import best_time, report
+from tests.core.test_period_index import _find_by_scan
+
+BANDS = [(1, 4.5, 40), (-3, 2.5, 50), (-4.5, -1, 30)]
+
+
+def make_survey(n_stations, rs):
+    freq_list = []
+    for ii in range(n_stations):
+        f_min, f_max, n_freq = BANDS[ii % len(BANDS)]
+        # a few instrument set ups per band
+        jitter = 1 + .002 * rs.randint(5)
+        freq_list.append(np.logspace(f_max, f_min, n_freq) * jitter)
+    return freq_list
+
+
+def count_by_scan(freq_list, unique_freq):
+    return [sum(is_num_in_seq(ff, station_freq) for station_freq in freq_list)
+            for ff in unique_freq]
+
+
+def count_by_index(p_index):
+    return [len(p_index.find_freq_atol(ff)[0]) for ff in p_index.unique_freq]
+
+
+def find_all_by_scan(freq_list, unique_freq):
+    return [_find_by_scan(freq_list, ff, .05) for ff in unique_freq]
+
+
+def find_all_by_index(freq_list):
+    p_index = PeriodIndex(freq_list, ptol=.05)
+    return [p_index.find_freq(ff) for ff in p_index.unique_freq]
+
+
+def main():
+    rs = np.random.RandomState(0)
+    freq_list = make_survey(300, rs)
+    unique_freq = np.unique(np.concatenate(freq_list))
+
+    t_old = best_time(lambda: count_by_scan(freq_list, unique_freq),
+                      repeat=1)
+    t_new = best_time(lambda: count_by_index(PeriodIndex(freq_list)))
+    report('stations per period (atol), 300 sta', t_old, t_new)
+
+    t_old = best_time(lambda: find_all_by_scan(freq_list, unique_freq),
+                      repeat=1)
+    t_new = best_time(lambda: find_all_by_index(freq_list))
+    report('stations per period (ptol), 300 sta', t_old, t_new)
+
+
+if __name__ == '__main__':
+    main()
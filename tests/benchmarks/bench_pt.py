@@ -0,0 +1,82 @@
+"""
+Benchmark the batched phase tensor and error computation of
+mtpy.analysis.pt against the previous loop over frequencies, for a single
+station and for a survey stack.
+
+    python -m tests.benchmarks.bench_pt
+"""
+import numpy as np
+
+import mtpy.analysis.pt as MTpt
+from tests.benchmarks import best_time, report
+
+
+def z2pt_per_freq(z_array, z_err_array):
+    """
+    phase tensors and errors as computed before, one 2x2 matrix at a time
+    """
+    pt = np.zeros(z_array.shape)
+    pterr = np.zeros(z_array.shape)
+    for index in np.ndindex(z_array.shape[:-2]):
+        realz = np.real(z_array[index])
+        imagz = np.imag(z_array[index])
+        err = z_err_array[index]
+        detreal = np.linalg.det(realz)
+        if detreal == 0:
+            continue
+        phi = np.dot(np.linalg.inv(realz), imagz)
+        pt[index] = phi
+        a = np.abs(detreal)
+        pterr[index][0, 0] = 1 / a * np.sqrt(np.sum([
+            (phi[0, 0] * realz[1, 1] * err[0, 0]) ** 2,
+            (phi[0, 0] * realz[0, 1] * err[1, 0]) ** 2,
+            ((imagz[0, 0] * realz[1, 0] - realz[0, 0] * imagz[1, 0]) / a *
+             realz[0, 0] * err[0, 1]) ** 2,
+            ((imagz[1, 0] * realz[0, 0] - realz[1, 0] * imagz[1, 1]) / a *
+             realz[0, 1] * err[1, 1]) ** 2,
+            (realz[1, 1] * err[0, 0]) ** 2, (realz[0, 1] * err[1, 0]) ** 2]))
+        pterr[index][0, 1] = 1 / a * np.sqrt(np.sum([
+            (phi[0, 1] * realz[1, 1] * err[0, 0]) ** 2,
+            (phi[0, 1] * realz[0, 1] * err[1, 0]) ** 2,
+            ((imagz[0, 1] * realz[1, 0] - realz[0, 0] * imagz[1, 1]) / a *
+             realz[1, 1] * err[0, 1]) ** 2,
+            ((imagz[1, 1] * realz[0, 0] - realz[0, 1] * imagz[1, 0]) / a *
+             realz[0, 1] * err[1, 1]) ** 2,
+            (realz[1, 1] * err[0, 1]) ** 2, (realz[0, 1] * err[1, 1]) ** 2]))
+        pterr[index][1, 0] = 1 / a * np.sqrt(np.sum([
+            (phi[1, 0] * realz[1, 0] * err[0, 1]) ** 2,
+            (phi[1, 0] * realz[0, 0] * err[1, 1]) ** 2,
+            ((imagz[0, 0] * realz[1, 1] - realz[0, 1] * imagz[1, 1]) / a *
+             realz[1, 0] * err[0, 0]) ** 2,
+            ((imagz[1, 0] * realz[0, 1] - realz[1, 1] * imagz[0, 0]) / a *
+             realz[0, 0] * err[0, 1]) ** 2,
+            (realz[1, 0] * err[0, 0]) ** 2, (realz[0, 0] * err[1, 0]) ** 2]))
+        pterr[index][1, 1] = 1 / a * np.sqrt(np.sum([
+            (phi[1, 1] * realz[1, 0] * err[0, 1]) ** 2,
+            (phi[1, 1] * realz[0, 0] * err[1, 1]) ** 2,
+            ((imagz[0, 1] * realz[1, 1] - realz[0, 1] * imagz[1, 1]) / a *
+             realz[1, 0] * err[0, 0]) ** 2,
+            ((imagz[1, 1] * realz[0, 1] - realz[1, 1] * imagz[0, 1]) / a *
+             realz[0, 0] * err[0, 1]) ** 2,
+            (realz[1, 0] * err[0, 1]) ** 2, (realz[0, 0] * err[1, 1]) ** 2]))
+    return pt, pterr
+
+
+def make_z(shape, seed=0):
+    rs = np.random.RandomState(seed)
+    z = rs.normal(size=shape + (2, 2)) + 1j * rs.normal(size=shape + (2, 2))
+    z_err = np.abs(rs.normal(size=shape + (2, 2))) * .1
+    return z, z_err
+
+
+def main():
+    for shape, name in [((60,), 'one station, 60 freq'),
+                        ((500, 60), '500 stations, 60 freq')]:
+        z, z_err = make_z(shape)
+        t_old = best_time(lambda: z2pt_per_freq(z, z_err))
+        t_new = best_time(lambda: MTpt.z2pt_batch(z, z_err))
+        report('z2pt, ' + name, t_old, t_new)
+
+
+if __name__ == '__main__':
+    main()
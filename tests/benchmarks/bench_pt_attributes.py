@@ -0,0 +1,114 @@
+"""
+Benchmark reading all phase tensor attributes of a survey, as a phase
+tensor map or pseudosection does, with each attribute computed by its own
+getter against the single pass of mtpy.analysis.pt.pt_attributes cached on
+the PhaseTensor, and for a whole survey stack at once.
+
+    python -m tests.benchmarks.bench_pt_attributes
+"""
+import numpy as np
+
+import mtpy.analysis.pt as MTpt
+from tests.benchmarks import best_time, report
+
+NAMES = ['phimin', 'phimax', 'azimuth', 'ellipticity', 'alpha', 'beta',
+         'skew', 'det', 'trace']
+
+
+def _pi(pt, pterr, sign):
+    """
+    pi1 (sign 1) or pi2 (sign -1) as computed before
+    """
+    diag = pt[:, 0, 0] - sign * pt[:, 1, 1]
+    off = pt[:, 0, 1] + sign * pt[:, 1, 0]
+    pi = 0.5 * np.sqrt(diag ** 2 + off ** 2)
+    pierr = 1. / pi * np.sqrt(diag ** 2 * (pterr[:, 0, 0] ** 2 +
+                                           pterr[:, 1, 1] ** 2) +
+                              off ** 2 * (pterr[:, 0, 1] ** 2 +
+                                          pterr[:, 1, 0] ** 2))
+    return pi, pierr
+
+
+def _angle(pt, pterr, sign):
+    """
+    alpha (sign 1) or beta (sign -1) as computed before
+    """
+    y = pt[:, 0, 1] + sign * pt[:, 1, 0]
+    x = pt[:, 0, 0] - sign * pt[:, 1, 1]
+    yerr = np.sqrt(pterr[:, 0, 1] ** 2 + pterr[:, 1, 0] ** 2)
+    xerr = np.sqrt(pterr[:, 0, 0] ** 2 + pterr[:, 1, 1] ** 2)
+    return (np.degrees(0.5 * np.arctan2(y, x)),
+            0.5 / (x ** 2 + y ** 2) * np.sqrt(y ** 2 * xerr ** 2 +
+                                              x ** 2 * yerr ** 2))
+
+
+def _phi(pt, pterr, sign):
+    """
+    phimax (sign 1) or phimin (sign -1) as computed before, pi1 and pi2
+    recomputed for the value and for the error
+    """
+    value = _pi(pt, pterr, -1)[0] + sign * _pi(pt, pterr, 1)[0]
+    err = np.sqrt(_pi(pt, pterr, -1)[1] ** 2 + _pi(pt, pterr, 1)[1] ** 2)
+    return np.degrees(np.arctan(value)), np.degrees(np.arctan(err))
+
+
+def attributes_by_getter(pt, pterr):
+    """
+    every attribute from its own getter, each getter recomputing what it
+    depends on
+    """
+    values = {}
+    values['phimin'] = _phi(pt, pterr, -1)
+    values['phimax'] = _phi(pt, pterr, 1)
+    values['alpha'] = _angle(pt, pterr, 1)
+    values['beta'] = _angle(pt, pterr, -1)
+    alpha = _angle(pt, pterr, 1)
+    beta = _angle(pt, pterr, -1)
+    values['azimuth'] = (alpha[0] - beta[0], np.sqrt(alpha[1] + beta[1]))
+    phimax = _phi(pt, pterr, 1)
+    phimin = _phi(pt, pterr, -1)
+    ellip = (phimax[0] - phimin[0]) / (phimax[0] + phimin[0])
+    values['ellipticity'] = (ellip, ellip * np.sqrt(phimax[1] + phimin[1]) *
+                             np.sqrt((1 / (phimax[0] - phimin[0])) ** 2 +
+                                     (1 / (phimax[0] + phimin[0])) ** 2))
+    values['skew'] = np.array([i[0, 1] - i[1, 0] for i in pt])
+    values['det'] = np.array([np.linalg.det(i) for i in pt])
+    values['trace'] = np.array([np.trace(i) for i in pt])
+    return values
+
+
+def attributes_fused(pt_list):
+    """
+    every attribute of every station through the cached record array
+    """
+    for pt_obj in pt_list:
+        pt_obj._clear_cache()
+        for name in NAMES:
+            getattr(pt_obj, name)
+
+
+def make_pt(shape, seed=0):
+    rs = np.random.RandomState(seed)
+    z = rs.normal(size=shape + (2, 2)) + 1j * rs.normal(size=shape + (2, 2))
+    z_err = np.abs(rs.normal(size=shape + (2, 2))) * .1
+    return MTpt.z2pt_batch(z, z_err)[:2]
+
+
+def main():
+    pt, pterr = make_pt((500, 30))
+    pt_list = [MTpt.PhaseTensor(pt_array=pt[ii], pterr_array=pterr[ii],
+                                freq=np.logspace(3, -3, 30))
+               for ii in range(len(pt))]
+
+    with np.errstate(all='ignore'):
+        t_old = best_time(lambda: [attributes_by_getter(pt[ii], pterr[ii])
+                                   for ii in range(len(pt))])
+        t_new = best_time(lambda: attributes_fused(pt_list))
+        report('all attributes, 500 PhaseTensors', t_old, t_new)
+
+        t_stack = best_time(lambda: MTpt.pt_attributes(pt, pterr))
+        report('all attributes, (500, 30) stack', t_old, t_stack)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark the residual phase tensors of a ModEM residual map, 1000 stations
+and 30 periods, computed station by station and frequency by frequency as
+before against mtpy.analysis.pt.residual_pt_batch on the whole survey.
+
+    python -m tests.benchmarks.bench_residual_pt
+"""
+import numpy as np
+
+import mtpy.analysis.pt as MTpt
+import mtpy.utils.calculator as MTcc
+from tests.benchmarks import best_time, report
+
+
+def residual_pt_per_freq(pt1, pt2, pt1err, pt2err):
+    """
+    residual phase tensor, its error and the ellipse parameters of one
+    station as computed before
+    """
+    rpt = np.zeros_like(pt1)
+    for idx in range(len(pt1)):
+        rpt[idx] = np.eye(2) - np.dot(np.matrix(pt1[idx]).I,
+                                      np.matrix(pt2[idx]))
+    rpterr = np.zeros(rpt.shape)
+    for idx in range(len(pt1err)):
+        matrix2, matrix2err = MTcc.invertmatrix_incl_errors(
+            pt2[idx], inmatrix_err=pt2err[idx])
+        err1 = MTcc.multiplymatrices_incl_errors(
+            matrix2, pt1[idx], inmatrix1_err=matrix2err,
+            inmatrix2_err=pt1err[idx])[1]
+        err2 = MTcc.multiplymatrices_incl_errors(
+            pt1[idx], matrix2, inmatrix1_err=pt1err[idx],
+            inmatrix2_err=matrix2err)[1]
+        rpterr[idx] = np.sqrt(0.25 * err1 ** 2 + 0.25 * err2 ** 2)
+
+    pi1 = 0.5 * np.sqrt((rpt[:, 0, 0] - rpt[:, 1, 1]) ** 2 +
+                        (rpt[:, 0, 1] + rpt[:, 1, 0]) ** 2)
+    pi2 = 0.5 * np.sqrt((rpt[:, 0, 0] + rpt[:, 1, 1]) ** 2 +
+                        (rpt[:, 0, 1] - rpt[:, 1, 0]) ** 2)
+    alpha = np.degrees(0.5 * np.arctan2(rpt[:, 0, 1] + rpt[:, 1, 0],
+                                        rpt[:, 0, 0] - rpt[:, 1, 1]))
+    beta = np.degrees(0.5 * np.arctan2(rpt[:, 0, 1] - rpt[:, 1, 0],
+                                       rpt[:, 0, 0] + rpt[:, 1, 1]))
+    return (rpt, rpterr, np.degrees(np.arctan(pi2 - pi1)),
+            np.degrees(np.arctan(pi2 + pi1)), alpha - beta, beta)
+
+
+def make_pt(shape, seed=0):
+    rs = np.random.RandomState(seed)
+    z = rs.normal(size=shape + (2, 2)) + 1j * rs.normal(size=shape + (2, 2))
+    z_err = np.abs(rs.normal(size=shape + (2, 2))) * .1
+    pt1, pt1err = MTpt.z2pt_batch(z, z_err)[:2]
+    pt2, pt2err = MTpt.z2pt_batch(z * 1.1 + .1j, z_err)[:2]
+    return pt1, pt2, pt1err, pt2err
+
+
+def main():
+    pt1, pt2, pt1err, pt2err = make_pt((1000, 30))
+
+    with np.errstate(all='ignore'):
+        t_old = best_time(lambda: [residual_pt_per_freq(pt1[ii], pt2[ii],
+                                                        pt1err[ii],
+                                                        pt2err[ii])
+                                   for ii in range(len(pt1))], repeat=1)
+        t_new = best_time(lambda: MTpt.residual_pt_batch(pt1, pt2, pt1err,
+                                                         pt2err))
+        report('residual pt, 1000 stations, 30 periods', t_old, t_new)
+
+        t_no_err = best_time(lambda: MTpt.residual_pt_batch(pt1, pt2))
+        report('residual pt without errors', t_old, t_no_err)
+
+
+if __name__ == '__main__':
+    main()
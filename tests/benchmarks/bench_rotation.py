@@ -0,0 +1,60 @@
+"""
+Benchmark the batched rotation of Z, Tipper and PhaseTensor against the
+previous per-frequency calls to rotatematrix_incl_errors and
+rotatevector_incl_errors.
+
+    python -m tests.benchmarks.bench_rotation
+"""
+import numpy as np
+
+import mtpy.utils.calculator as MTcc
+from tests.benchmarks import best_time, report
+
+
+def rotate_per_frequency(z, z_err, angles):
+    z_rot = z.copy()
+    z_err_rot = z_err.copy()
+    for idx_f in range(len(z)):
+        z_rot[idx_f], z_err_rot[idx_f] = MTcc.rotatematrix_incl_errors(
+            z[idx_f], angles[idx_f], z_err[idx_f])
+    return z_rot, z_err_rot
+
+
+def rotate_vectors_per_frequency(t, t_err, angles):
+    t_rot = t.copy()
+    t_err_rot = t_err.copy()
+    for idx_f in range(len(t)):
+        t_rot[idx_f], t_err_rot[idx_f] = MTcc.rotatevector_incl_errors(
+            t[idx_f], angles[idx_f], t_err[idx_f])
+    return t_rot, t_err_rot
+
+
+def main():
+    rs = np.random.RandomState(0)
+    for n_station, n_freq in [(1, 60), (100, 60), (1000, 60)]:
+        shape = (n_station * n_freq, 2, 2)
+        z = rs.normal(size=shape) + 1j * rs.normal(size=shape)
+        z_err = np.abs(rs.normal(size=shape))
+        angles = rs.uniform(0, 360, size=n_station * n_freq)
+
+        t_old = best_time(lambda: rotate_per_frequency(z, z_err, angles))
+        t_new = best_time(lambda: MTcc.rotatematrices_incl_errors(
+            z.reshape(n_station, n_freq, 2, 2),
+            angles.reshape(n_station, n_freq),
+            z_err.reshape(n_station, n_freq, 2, 2)))
+        report('rotate Z, {0} x {1}'.format(n_station, n_freq), t_old, t_new)
+
+        t = z[:, :1, :]
+        t_err = z_err[:, :1, :]
+        t_old = best_time(lambda: rotate_vectors_per_frequency(t, t_err,
+                                                               angles))
+        t_new = best_time(lambda: MTcc.rotatevectors_incl_errors(
+            t.reshape(n_station, n_freq, 1, 2),
+            angles.reshape(n_station, n_freq),
+            t_err.reshape(n_station, n_freq, 1, 2)))
+        report('rotate Tipper, {0} x {1}'.format(n_station, n_freq), t_old,
+               t_new)
+
+
+if __name__ == '__main__':
+    main()
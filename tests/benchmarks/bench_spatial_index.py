@@ -0,0 +1,49 @@
+"""
+Benchmark finding the stations within a radius of a station of a 10k
+station survey the way estimate_static_spatial_median did, a loop over
+degree distances, against SpatialIndex.
+
+    python -m tests.benchmarks.bench_spatial_index
+"""
+import numpy as np
+
+from mtpy.core.spatial_index import SpatialIndex
+from tests.benchmarks import best_time, report
+
+METER_TO_DEG = 8.994423457456377e-06
+
+
+def radius_by_scan(lat, lon, index, radius):
+    found = []
+    for kk in range(len(lat)):
+        delta_d = np.sqrt((lat[index] - lat[kk]) ** 2 +
+                          (lon[index] - lon[kk]) ** 2)
+        if kk != index and delta_d <= radius * METER_TO_DEG:
+            found.append(kk)
+    return found
+
+
+def main():
+    rs = np.random.RandomState(0)
+    lat = rs.uniform(-30, -20, 10000)
+    lon = rs.uniform(130, 145, 10000)
+    s_index = SpatialIndex(lat, lon)
+
+    t_old = best_time(lambda: radius_by_scan(lat, lon, 10, 20000.))
+    t_new = best_time(lambda: s_index.query_station_radius(10, 20000.),
+                      number=100)
+    report('radius query, 10k stations', t_old, t_new)
+
+    t_new = best_time(lambda: s_index.query_station_nearest(10, k=8),
+                      number=100)
+    report('8 nearest vs radius scan, 10k sta', t_old, t_new)
+
+    t_old = best_time(lambda: [radius_by_scan(lat, lon, ii, 20000.)
+                               for ii in range(100)], repeat=1)
+    t_new = best_time(lambda: SpatialIndex(lat, lon).neighbours(20000.))
+    # the scan is timed for 100 stations and scaled to all of them
+    report('build + all 10k neighbourhoods', t_old * 100, t_new)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+Benchmark the spatial median static shift of a survey, 120 copies of the
+test .edi files in one directory: station by station with
+mtpy.analysis.staticshift.estimate_static_spatial_median, which reads the
+whole directory again for every station, against
+mtpy.analysis.staticshift.SpatialMedianStaticShift, which reads each file
+once.
+
+    python -m tests.benchmarks.bench_static_shift
+"""
+import glob
+import os
+import shutil
+import tempfile
+
+import mtpy.analysis.staticshift as MTss
+from tests.benchmarks import best_time, report
+
+EDI_FILES = sorted(glob.glob('tests/data/edifiles/*.edi'))
+
+
+def main():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        for ii in range(10):
+            for edi_fn in EDI_FILES:
+                shutil.copy(edi_fn, os.path.join(
+                    tmp_dir, '{0:03}_{1}'.format(ii, os.path.basename(edi_fn))))
+        edi_list = sorted(glob.glob(os.path.join(tmp_dir, '*.edi')))
+        n_files = len(edi_list)
+
+        # old: every station re-reads the directory, time 12 and scale
+        t_old = best_time(lambda: [
+            MTss.estimate_static_spatial_median(edi_fn, radius=5000.)
+            for edi_fn in edi_list[:12]], repeat=1) * n_files / 12.
+        t_new = best_time(lambda: MTss.SpatialMedianStaticShift.
+                          from_edi_files(tmp_dir, radius=5000.).estimate(),
+                          repeat=1)
+        report('spatial median static shift, {0} files'.format(n_files),
+               t_old, t_new)
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == '__main__':
+    main()
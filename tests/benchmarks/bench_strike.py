@@ -0,0 +1,103 @@
+"""
+Benchmark the strike analysis of a survey, 2000 stations and 30 periods, as
+PlotStrike does it: invariant and phase tensor strike computed station by
+station and frequency by frequency as before against
+mtpy.analysis.zinvariants.weaver_invariants and
+mtpy.analysis.geometry.strike_angle on the whole survey.
+
+    python -m tests.benchmarks.bench_strike
+"""
+import numpy as np
+
+import mtpy.analysis.geometry as MTgy
+import mtpy.analysis.pt as MTpt
+import mtpy.analysis.zinvariants as MTinv
+from tests.benchmarks import best_time, report
+
+
+def invariant_strike_per_freq(z):
+    """
+    Weaver strike of one station as computed before
+    """
+    strike = np.zeros(len(z))
+    for ii in range(len(z)):
+        x1 = .5 * (z[ii, 0, 0].real + z[ii, 1, 1].real)
+        x2 = .5 * (z[ii, 0, 1].real + z[ii, 1, 0].real)
+        x3 = .5 * (z[ii, 0, 0].real - z[ii, 1, 1].real)
+        x4 = .5 * (z[ii, 0, 1].real - z[ii, 1, 0].real)
+        e1 = .5 * (z[ii, 0, 0].imag + z[ii, 1, 1].imag)
+        e2 = .5 * (z[ii, 0, 1].imag + z[ii, 1, 0].imag)
+        e3 = .5 * (z[ii, 0, 0].imag - z[ii, 1, 1].imag)
+        e4 = .5 * (z[ii, 0, 1].imag - z[ii, 1, 0].imag)
+        ex = x1 * e1 - x2 * e2 - x3 * e3 + x4 * e4
+        if ex == 0.0:
+            strike[ii] = np.nan
+            continue
+        d12 = (x1 * e2 - x2 * e1) / ex
+        d34 = (x3 * e4 - x4 * e3) / ex
+        d13 = (x1 * e3 - x3 * e1) / ex
+        d24 = (x2 * e4 - x4 * e2) / ex
+        strike[ii] = .5 * np.arctan2(d12 - d34, d13 + d24) * (180 / np.pi)
+    return strike
+
+
+def pt_strike_per_freq(z, freq):
+    """
+    phase tensor strike of one station as computed before
+    """
+    pt_obj = MTpt.PhaseTensor(z_array=z, freq=freq)
+    strikes = []
+    for idx in range(len(z)):
+        if pt_obj.beta[0][idx] > 5:
+            dim = 3
+        elif pt_obj._pi1()[0][idx] / pt_obj._pi2()[0][idx] > .1:
+            dim = 2
+        else:
+            dim = 1
+        if dim == 1:
+            strikes.append((np.nan, np.nan))
+            continue
+        strike1 = (pt_obj.alpha[0][idx] - pt_obj.beta[0][idx]) % 90
+        if 0 < strike1 < 45:
+            strike2 = strike1 + 90
+        else:
+            strike2 = strike1 - 90
+        strikes.append((min(strike1, strike2), max(strike1, strike2)))
+    return np.array(strikes)
+
+
+def make_z(shape, seed=0):
+    rs = np.random.RandomState(seed)
+    return rs.normal(size=shape + (2, 2)) + 1j * rs.normal(size=shape + (2, 2))
+
+
+def main():
+    z = make_z((2000, 30))
+    period = np.logspace(-3, 3, 30)
+    decades = [(bb, bb + 1) for bb in range(-3, 3)]
+
+    with np.errstate(all='ignore'):
+        t_old = best_time(lambda: [invariant_strike_per_freq(z_station)
+                                   for z_station in z], repeat=1)
+        t_new = best_time(lambda: MTinv.weaver_invariants(z))
+        report('invariant strike, 2000 stations, 30 periods', t_old, t_new)
+
+        t_old = best_time(lambda: [pt_strike_per_freq(z_station, 1. / period)
+                                   for z_station in z[:200]], repeat=1) * 10
+        t_new = best_time(lambda: MTgy.strike_angle(z_array=z))
+        report('phase tensor strike, 2000 stations, 30 periods', t_old,
+               t_new)
+
+        strike = MTinv.weaver_invariants(z)['strike'].T
+        t_old = best_time(lambda: [np.histogram(
+            [ss for pp, row in zip(period, strike) for ss in row
+             if 10 ** bb_min < pp < 10 ** bb_max and ss != 0],
+            bins=72, range=(-180, 180)) for bb_min, bb_max in decades],
+            repeat=1)
+        t_new = best_time(lambda: MTgy.strike_histograms(strike, period,
+                                                         decades))
+        report('strike histogram per decade', t_old, t_new)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark taking one period of all stations out of a directory of edi
+files against taking it out of a survey archive.
+
+    python -m tests.benchmarks.bench_survey_archive
+"""
+import os
+import shutil
+import tempfile
+
+from mtpy.core.mt_loader import MTLoader
+from mtpy.core.survey_archive import SurveyArchive, edi_to_archive
+from tests.benchmarks import best_time, report
+from tests.benchmarks.bench_edi_read import make_edi
+
+
+def period_from_edi(edi_dir, period):
+    z_stack = MTLoader(n_workers=1).load_z_stack(edi_dir)
+    return z_stack.z[:, abs(z_stack.period - period).argmin()]
+
+
+def period_from_archive(archive_dir, period):
+    return SurveyArchive(archive_dir).get_period(period).z[:, 0]
+
+
+def main():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        n_freq = 200
+        edi_dir = os.path.join(tmp_dir, 'edi')
+        os.makedirs(edi_dir)
+        edi_fn = make_edi(os.path.join(tmp_dir, 'bench.edi'), n_freq)
+        for ii in range(200):
+            shutil.copy(edi_fn, os.path.join(edi_dir,
+                                             'st{0:03}.edi'.format(ii)))
+        archive_dir = os.path.join(tmp_dir, 'survey')
+        archive = edi_to_archive(edi_dir, archive_dir)
+        period = archive.period[n_freq // 2]
+
+        t_old = best_time(lambda: period_from_edi(edi_dir, period))
+        t_new = best_time(lambda: period_from_archive(archive_dir, period))
+        report('one period, 200 stations', t_old, t_new)
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == '__main__':
+    main()
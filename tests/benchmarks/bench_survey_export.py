@@ -0,0 +1,108 @@
+"""
+Benchmark writing the phase tensor and measurement csv files of a survey
+with a row per period and station, each row computed on its own and all
+rows held in memory, against computing a station for all periods at once
+and writing it straight away.
+
+    python -m tests.benchmarks.bench_survey_export
+"""
+import csv
+import glob
+import os
+import shutil
+import tempfile
+
+from mtpy.core.edi_collection import EdiCollection
+from tests.benchmarks import best_time, report
+
+EDI_FILES = sorted(glob.glob('tests/data/edifiles/*.edi'))
+
+
+def phase_tensor_csv_by_row(edi_collection, dest_dir):
+    """
+    the phase tensor csv files written by a loop over periods and stations
+    """
+    csv_header = ['station', 'freq', 'lon', 'lat', 'phi_min', 'phi_max',
+                  'azimuth', 'skew', 'n_skew', 'elliptic', 'tip_mag_re',
+                  'tip_mag_im', 'tip_ang_re', 'tip_ang_im']
+    pt_dict = {}
+    with open(os.path.join(dest_dir, 'phase_tensor.csv'), 'wb') as csvf:
+        writer = csv.writer(csvf)
+        writer.writerow(csv_header)
+        for freq in edi_collection.all_frequencies:
+            ptlist = []
+            stations, positions = edi_collection.period_index.find_freq(freq)
+            for ii, p_index in zip(stations, positions):
+                mt_obj = edi_collection.mt_obj_list[ii]
+                ptlist.append([mt_obj.station, freq, mt_obj.lon, mt_obj.lat,
+                               mt_obj.pt.phimin[0][p_index],
+                               mt_obj.pt.phimax[0][p_index],
+                               mt_obj.pt.azimuth[0][p_index],
+                               mt_obj.pt.beta[0][p_index],
+                               2 * mt_obj.pt.beta[0][p_index],
+                               mt_obj.pt.ellipticity[0][p_index],
+                               mt_obj.Tipper.mag_real[p_index],
+                               mt_obj.Tipper.mag_imag[p_index],
+                               mt_obj.Tipper.angle_real[p_index],
+                               mt_obj.Tipper.angle_imag[p_index]])
+            freq_fn = os.path.join(dest_dir,
+                                   'phase_tensor_{0}Hz.csv'.format(str(freq)))
+            with open(freq_fn, 'wb') as freq_csvf:
+                writer_freq = csv.writer(freq_csvf)
+                writer_freq.writerow(csv_header)
+                writer_freq.writerows(ptlist)
+            writer.writerows(ptlist)
+            pt_dict[freq] = ptlist
+    return pt_dict
+
+
+def measurement_csv_by_row(edi_collection, dest_dir):
+    """
+    the impedance, resistivity and phase of each row from its own ResPhase
+    """
+    import mtpy.imaging.mtplottools as mtplottools
+
+    rows = []
+    for freq in edi_collection.all_frequencies:
+        stations, positions = edi_collection.period_index.find_freq(freq)
+        for ii, p_index in zip(stations, positions):
+            mt_obj = edi_collection.mt_obj_list[ii]
+            resist_phase = mtplottools.ResPhase(z_object=mt_obj.Z)
+            rows.append([freq, mt_obj.station, mt_obj.lat, mt_obj.lon] +
+                        list(mt_obj.Z.z[p_index].ravel()) +
+                        [resist_phase.resxy[p_index],
+                         resist_phase.phaseyx[p_index]])
+    with open(os.path.join(dest_dir, 'edi_measurement.csv'), 'wb') as csvf:
+        csv.writer(csvf).writerows(rows)
+    return rows
+
+
+def main():
+    edi_collection = EdiCollection(EDI_FILES * 10)
+    edi_collection.all_frequencies
+    for mt_obj in edi_collection.mt_obj_list:
+        mt_obj.pt
+
+    dest_dir = tempfile.mkdtemp()
+    try:
+        t_old = best_time(lambda: phase_tensor_csv_by_row(edi_collection,
+                                                          dest_dir))
+        t_csv = best_time(lambda: edi_collection.create_phase_tensor_csv(
+            dest_dir))
+        report('phase tensor csv, 240 stations', t_old, t_csv)
+
+        t_old = best_time(lambda: measurement_csv_by_row(edi_collection,
+                                                         dest_dir))
+        t_new = best_time(lambda: edi_collection.create_measurement_csv(
+            dest_dir))
+        report('measurement csv, 240 stations', t_old, t_new)
+
+        t_npz = best_time(lambda: edi_collection.create_phase_tensor_npz(
+            dest_dir))
+        report('phase tensor, new csv against npz', t_csv, t_npz)
+    finally:
+        shutil.rmtree(dest_dir)
+
+
+if __name__ == '__main__':
+    main()
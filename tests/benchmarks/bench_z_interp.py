@@ -0,0 +1,39 @@
+"""
+Benchmark filling a survey on a common period list the way modem Data did,
+station by station with a nearest period scan, against interpolate_mt_list.
+
+    python -m tests.benchmarks.bench_z_interp
+"""
+import numpy as np
+
+from mtpy.core.mt import MT
+from mtpy.core.z_interp import interpolate_mt_list
+from tests.benchmarks import best_time, report
+from tests.core.test_z_interp import _select_periods_by_scan
+
+EDI_FN = 'tests/data/edifiles/15125A.edi'
+
+
+def fill_by_station(mt_list, period_list, period_buffer):
+    z = np.zeros((len(mt_list), len(period_list), 2, 2), dtype='complex')
+    for ii, mt_obj in enumerate(mt_list):
+        selected = _select_periods_by_scan(mt_obj.Z.freq, period_list,
+                                           period_buffer)
+        new_z, new_t = mt_obj.interpolate_impedance_tensor(
+            1. / period_list[selected])
+        z[ii, selected] = new_z.z
+    return z
+
+
+def main():
+    mt_list = [MT(EDI_FN)] * 500
+    period_list = np.logspace(-4, 3, 60)
+
+    t_old = best_time(lambda: fill_by_station(mt_list, period_list, .5))
+    t_new = best_time(lambda: interpolate_mt_list(mt_list, period_list,
+                                                  period_buffer=.5))
+    report('500 stations, 60 periods', t_old, t_new)
+
+
+if __name__ == '__main__':
+    main()
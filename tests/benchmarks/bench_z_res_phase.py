@@ -0,0 +1,73 @@
+"""
+Benchmark the array computation of resistivity, phase and their errors in
+mtpy.core.z.Z against the previous per-element implementation.
+
+    python -m tests.benchmarks.bench_z_res_phase
+"""
+import cmath
+import math
+
+import numpy as np
+
+import mtpy.utils.calculator as MTcc
+from mtpy.core.z import Z
+from tests.benchmarks import best_time, report
+
+
+def res_phase_per_element(z_obj):
+    """
+    resistivity and phase as computed before, one element at a time
+    """
+    z = z_obj.z
+    z_err = z_obj.z_err
+    freq = z_obj.freq
+
+    resistivity = np.zeros_like(z, dtype='float')
+    phase = np.zeros_like(z, dtype='float')
+    resistivity_err = np.zeros_like(z_err)
+    phase_err = np.zeros_like(z_err)
+    for idx_f in range(len(z)):
+        for ii in range(2):
+            for jj in range(2):
+                resistivity[idx_f, ii, jj] = np.abs(z[idx_f, ii, jj]) ** 2 / \
+                    freq[idx_f] * 0.2
+                phase[idx_f, ii, jj] = math.degrees(cmath.phase(
+                    z[idx_f, ii, jj]))
+
+                r_err, phi_err = MTcc.z_error2r_phi_error(
+                    np.real(z[idx_f, ii, jj]),
+                    z_err[idx_f, ii, jj],
+                    np.imag(z[idx_f, ii, jj]),
+                    z_err[idx_f, ii, jj])
+
+                resistivity_err[idx_f, ii, jj] = \
+                    0.4 * np.abs(z[idx_f, ii, jj]) / freq[idx_f] * r_err
+                phase_err[idx_f, ii, jj] = phi_err
+
+    return resistivity, phase, resistivity_err, phase_err
+
+
+def make_z(n_freq, seed=0):
+    rs = np.random.RandomState(seed)
+    z = rs.normal(size=(n_freq, 2, 2)) + 1j * rs.normal(size=(n_freq, 2, 2))
+    z_err = np.abs(z) * rs.uniform(.01, .2, size=(n_freq, 2, 2))
+    freq = np.logspace(4, -4, n_freq)
+    return Z(z_array=z, z_err_array=z_err, freq=freq)
+
+
+def main():
+    for n_freq in [30, 300, 3000]:
+        z_obj = make_z(n_freq)
+        t_old = best_time(lambda: res_phase_per_element(z_obj))
+        t_new = best_time(z_obj._compute_res_phase)
+        report('Z res/phase, {0} frequencies'.format(n_freq), t_old, t_new)
+
+        old = res_phase_per_element(z_obj)
+        new = (z_obj.resistivity, z_obj.phase, z_obj.resistivity_err,
+               z_obj.phase_err)
+        for a_old, a_new in zip(old, new):
+            assert np.allclose(a_old, a_new)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+import glob
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+import mtpy.analysis.distortion as MTdistortion
+import mtpy.core.mt as mt
+from mtpy.core.z_stack import ZStack
+
+edi_path = "tests/data/edifiles"
+edi_files = sorted(glob.glob(os.path.join(edi_path, "*.edi")))[:6]
+
+
+class TestDistortion(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.mt_list = [mt.MT(edi_file) for edi_file in edi_files]
+        cls.z_stack = ZStack.from_mt_list(cls.mt_list)
+
+    def test_find_distortion_batch(self):
+        z_stack = self.z_stack
+        for num_freq in [None, 10]:
+            dis, dis_err = MTdistortion.find_distortion_batch(
+                z_stack.z, z_stack.z_err, mask=z_stack.mask,
+                num_freq=num_freq)
+            self.assertEqual(dis.shape, (z_stack.n_stations, 2, 2))
+            for ii in range(z_stack.n_stations):
+                s_dis, s_dis_err = MTdistortion.find_distortion(
+                    z_stack.get_z(ii), num_freq=num_freq)
+                self.assertTrue(np.allclose(dis[ii], s_dis))
+                self.assertTrue(np.allclose(dis_err[ii], s_dis_err))
+
+    def test_single_frequency(self):
+        # a 1-D impedance tensor has D = Z . [[0, -1], [1, 0]] / det(Z)^0.5
+        z_array = np.array([[[[0, 2 + 2j], [-2 - 2j, 0]]]])
+        dis, dis_err = MTdistortion.find_distortion_batch(z_array)
+        self.assertTrue(np.allclose(dis[0], np.identity(2)))
+        self.assertTrue(np.allclose(dis_err[0], 1))
+
+    def test_remove_distortion(self):
+        mt_obj = self.mt_list[0]
+        z_orig = mt_obj.Z.z.copy()
+        dis, new_z = mt_obj.remove_distortion(num_freq=12)
+        self.assertTrue(np.all(mt_obj.Z.z == z_orig))
+        self.assertIsNot(new_z, mt_obj.Z)
+        self.assertTrue(np.allclose(new_z.freq, mt_obj.Z.freq))
+        self.assertTrue(np.allclose(
+            new_z.z, np.matmul(np.linalg.inv(dis), z_orig)))
+
+    def test_remove_distortion_stack(self):
+        dis, z_cor, z_cor_err = MTdistortion.remove_distortion_stack(
+            self.z_stack, num_freq=12)
+        for ii, mt_obj in enumerate(self.mt_list):
+            valid = self.z_stack.mask[ii]
+            s_dis, s_z = MTdistortion.remove_distortion(
+                z_object=self.z_stack.get_z(ii), num_freq=12)
+            self.assertTrue(np.allclose(dis[ii], s_dis))
+            self.assertTrue(np.allclose(z_cor[ii, valid], s_z.z))
+            self.assertTrue(np.allclose(z_cor_err[ii, valid], s_z.z_err))
+
+    def test_remove_distortion_edi_files(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            dis, new_fn_list = MTdistortion.remove_distortion_edi_files(
+                edi_files, save_path=tmp_dir, num_freq=12, n_workers=2)
+            self.assertEqual(len(new_fn_list), len(edi_files))
+            for ii, (new_fn, mt_ref) in enumerate(zip(new_fn_list,
+                                                      self.mt_list)):
+                s_dis, s_z = mt_ref.remove_distortion(num_freq=12)
+                self.assertTrue(np.allclose(dis[ii], s_dis))
+                mt_obj = mt.MT(new_fn)
+                self.assertEqual(mt_obj.station, mt_ref.station)
+                self.assertTrue(np.allclose(mt_obj.Z.z, s_z.z, rtol=1e-5))
+        finally:
+            shutil.rmtree(tmp_dir)
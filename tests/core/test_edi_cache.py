@@ -0,0 +1,125 @@
+import os
+import shutil
+import tempfile
+import time
+from unittest import TestCase
+
+import numpy as np
+
+import mtpy.core.edi_cache as edi_cache
+from mtpy.core.edi import Edi
+from mtpy.core.edi_cache import EdiCache
+
+edi_files = ["tests/data/edifiles/15125A.edi",
+             "tests/data/edifiles/15126A.edi",
+             "tests/data/AMT/15125A_spe.edi"]
+
+
+class TestEdiCache(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp_dir, 'cache')
+        self.edi_fn_list = []
+        for edi_fn in edi_files:
+            new_fn = os.path.join(self.tmp_dir, 'tmp_' + os.path.basename(edi_fn))
+            shutil.copy(edi_fn, new_fn)
+            self.edi_fn_list.append(new_fn)
+
+    def tearDown(self):
+        edi_cache.disable()
+        shutil.rmtree(self.tmp_dir)
+
+    def _assert_same(self, edi_a, edi_b):
+        self.assertEqual(edi_a.Header.dataid, edi_b.Header.dataid)
+        self.assertEqual(edi_a.lat, edi_b.lat)
+        self.assertEqual(edi_a.lon, edi_b.lon)
+        self.assertEqual(edi_a.elev, edi_b.elev)
+        self.assertEqual(edi_a.Info.info_list, edi_b.Info.info_list)
+        self.assertEqual(edi_a.Define_measurement.measurement_list,
+                         edi_b.Define_measurement.measurement_list)
+        self.assertEqual(edi_a.Data_sect.data_type, edi_b.Data_sect.data_type)
+        self.assertEqual(edi_a.Data_sect.line_num, edi_b.Data_sect.line_num)
+        self.assertTrue(np.all(edi_a.Z.freq == edi_b.Z.freq))
+        self.assertTrue(np.all(edi_a.Z.z == edi_b.Z.z))
+        self.assertTrue(np.all(edi_a.Z.z_err == edi_b.Z.z_err))
+        self.assertTrue(np.all(edi_a.Z.resistivity == edi_b.Z.resistivity))
+        self.assertTrue(np.all(edi_a.Tipper.tipper == edi_b.Tipper.tipper))
+        self.assertTrue(np.all(edi_a.Tipper.tipper_err ==
+                               edi_b.Tipper.tipper_err))
+
+    def test_round_trip(self):
+        cache = EdiCache(cache_dir=self.cache_dir)
+        for edi_fn in self.edi_fn_list:
+            edi_ref = Edi(edi_fn=edi_fn, cache=False)
+            edi_first = Edi(edi_fn=edi_fn, cache=cache)
+            self.assertIsNotNone(cache.load(edi_fn))
+            edi_cached = Edi(edi_fn=edi_fn, cache=cache)
+            self._assert_same(edi_ref, edi_first)
+            self._assert_same(edi_ref, edi_cached)
+        self.assertEqual(len(cache.entries()), len(self.edi_fn_list))
+
+    def test_sidecar(self):
+        cache = EdiCache()
+        edi_fn = self.edi_fn_list[0]
+        Edi(edi_fn=edi_fn, cache=cache)
+        self.assertTrue(os.path.isfile(edi_fn + edi_cache.CACHE_EXT))
+        self._assert_same(Edi(edi_fn=edi_fn, cache=False),
+                          Edi(edi_fn=edi_fn, cache=cache))
+
+    def test_invalidation(self):
+        cache = EdiCache(cache_dir=self.cache_dir)
+        edi_fn = self.edi_fn_list[0]
+        Edi(edi_fn=edi_fn, cache=cache)
+
+        # touching the file keeps the entry, the hash is the same
+        edi_stat = os.stat(edi_fn)
+        os.utime(edi_fn, (edi_stat.st_atime, edi_stat.st_mtime + 10))
+        self.assertIsNotNone(cache.load(edi_fn))
+        # and the entry takes the new modification time, no hash next time
+        hash_calls = []
+        file_hash = edi_cache._file_hash
+        edi_cache._file_hash = lambda fn: hash_calls.append(fn) or \
+            file_hash(fn)
+        try:
+            entry = cache.load(edi_fn)
+        finally:
+            edi_cache._file_hash = file_hash
+        self.assertIsNotNone(entry)
+        self.assertEqual(hash_calls, [])
+        self._assert_same(Edi(edi_fn=edi_fn, cache=False),
+                          Edi(edi_fn=edi_fn, cache=cache))
+
+        # changing the contents invalidates the entry
+        with open(edi_fn, 'r') as fid:
+            edi_str = fid.read()
+        with open(edi_fn, 'w') as fid:
+            fid.write(edi_str.replace('>HEAD', '>HEAD\n'))
+        self.assertIsNone(cache.load(edi_fn))
+
+    def test_prune(self):
+        cache = EdiCache(cache_dir=self.cache_dir, max_size=None)
+        for ii, edi_fn in enumerate(self.edi_fn_list):
+            Edi(edi_fn=edi_fn, cache=cache)
+            # make the access times distinct, oldest first
+            os.utime(cache.cache_fn(edi_fn), (time.time() - 100 + ii,) * 2)
+        entry_list = cache.entries()
+        self.assertEqual(entry_list[0][0], cache.cache_fn(self.edi_fn_list[0]))
+
+        removed = cache.prune(max_size=cache.size() - 1)
+        self.assertEqual(removed, [cache.cache_fn(self.edi_fn_list[0])])
+
+        # storing beyond max_size evicts on its own
+        cache.max_size = 1
+        Edi(edi_fn=self.edi_fn_list[0], cache=cache)
+        self.assertEqual(cache.entries(), [])
+
+        edi_cache.main(['clear', self.cache_dir])
+        self.assertEqual(cache.entries(), [])
+
+    def test_default_cache(self):
+        self.assertIsNone(edi_cache.get_default_cache())
+        cache = edi_cache.enable(cache_dir=self.cache_dir)
+        Edi(edi_fn=self.edi_fn_list[0])
+        self.assertEqual(len(cache.entries()), 1)
+        edi_cache.disable()
+        self.assertIsNone(edi_cache.get_default_cache())
@@ -0,0 +1,87 @@
+import filecmp
+import glob
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from mtpy.core.edi_collection import EdiCollection, MTStationList
+
+edi_files = sorted(glob.glob("tests/data/edifiles/*.edi"))
+
+
+class TestMTStationList(TestCase):
+    def test_lru(self):
+        mt_list = MTStationList(edi_files, max_loaded=2)
+        self.assertEqual(len(mt_list), len(edi_files))
+        self.assertEqual(len(mt_list._loaded), 0)
+
+        mt_0 = mt_list[0]
+        self.assertEqual(mt_0.fn, edi_files[0])
+        self.assertEqual(mt_list[-1].fn, edi_files[-1])
+        # still loaded, the same object
+        self.assertIs(mt_list[0], mt_0)
+        mt_list[1]
+        self.assertEqual(list(mt_list._loaded.keys()), [0, 1])
+        # the least recently used is read again
+        self.assertIsNot(mt_list[len(edi_files) - 1], mt_list[0])
+        self.assertEqual([mt_obj.fn for mt_obj in mt_list[2:4]],
+                         edi_files[2:4])
+        self.assertEqual(len(mt_list._loaded), 2)
+        self.assertRaises(IndexError, mt_list.__getitem__, len(edi_files))
+
+    def test_unbounded(self):
+        mt_list = MTStationList(edi_files[:3])
+        self.assertEqual([mt_obj.station for mt_obj in mt_list],
+                         [mt_obj.station for mt_obj in mt_list])
+        self.assertEqual(len(mt_list._loaded), 3)
+
+
+class TestLazyEdiCollection(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.mkdtemp()
+        cls.eager = EdiCollection(edi_files)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir)
+
+    def test_lazy_artefacts(self):
+        edi_collection = EdiCollection(edi_files)
+        for name in ['all_unique_periods', 'all_frequencies', 'mt_periods',
+                     'period_index', 'geopdf', 'bound_box_dict',
+                     'spatial_index', 'station_info']:
+            self.assertNotIn(name, edi_collection.__dict__)
+        periods = edi_collection.all_unique_periods
+        self.assertIs(periods, edi_collection.all_unique_periods)
+        self.assertNotIn('geopdf', edi_collection.__dict__)
+
+    def test_streamed(self):
+        edi_collection = EdiCollection(edi_files, max_loaded=3)
+        self.assertIsInstance(edi_collection.mt_obj_list, MTStationList)
+        self.assertEqual(len(edi_collection.mt_obj_list._loaded), 0)
+
+        self.assertTrue(np.all(edi_collection.all_unique_periods ==
+                               self.eager.all_unique_periods))
+        self.assertTrue(np.all(edi_collection.mt_periods ==
+                               self.eager.mt_periods))
+        self.assertEqual(edi_collection.bound_box_dict,
+                         self.eager.bound_box_dict)
+        self.assertEqual(edi_collection.get_periods_by_stats(50),
+                         self.eager.get_periods_by_stats(50))
+        self.assertTrue(len(edi_collection.mt_obj_list._loaded) <= 3)
+
+        lazy_dir = os.path.join(self.tmp_dir, 'lazy')
+        eager_dir = os.path.join(self.tmp_dir, 'eager')
+        edi_collection.create_measurement_csv(lazy_dir)
+        self.eager.create_measurement_csv(eager_dir)
+        csv_files = sorted(os.listdir(eager_dir))
+        self.assertEqual(sorted(os.listdir(lazy_dir)), csv_files)
+        for csv_fn in csv_files:
+            self.assertTrue(filecmp.cmp(os.path.join(lazy_dir, csv_fn),
+                                        os.path.join(eager_dir, csv_fn),
+                                        shallow=False))
+        self.assertTrue(len(edi_collection.mt_obj_list._loaded) <= 3)
@@ -0,0 +1,252 @@
+import glob
+from unittest import TestCase
+
+import numpy as np
+
+import scipy.stats.distributions as ssd
+
+from mtpy.core.edi import Edi, _read_data_blocks, _spectra_to_z, \
+    index_locator
+from mtpy.core.mt import MT
+
+edi_files = glob.glob("tests/data/edifiles/*.edi")
+spectra_edi_file = "tests/data/AMT/15125A_spe.edi"
+
+
+def _read_data_blocks_by_line(data_lines):
+    """
+    reference implementation, the line by line parser used before
+    """
+    data_dict = {}
+    data_find = False
+    for line in data_lines:
+        line = line.strip()
+        if '>' in line and '!' not in line:
+            line_list = line[1:].strip().split()
+            key = line_list[0].lower()
+            if key[0] == 'z' or key[0] == 't' or key == 'freq':
+                data_find = True
+                data_dict[key] = []
+            else:
+                data_find = False
+
+        elif data_find == True and '>' not in line and '!' not in line:
+            d_lines = line.strip().split()
+            for ii, dd in enumerate(d_lines):
+                try:
+                    d_lines[ii] = float(dd)
+                    if d_lines[ii] == 1.0e32:
+                        d_lines[ii] = 0.0
+                except ValueError:
+                    d_lines[ii] = 0.0
+            data_dict[key] += d_lines
+
+    return data_dict
+
+
+class TestReadDataBlocks(TestCase):
+    def _compare(self, data_lines, msg=None):
+        data_dict = _read_data_blocks(data_lines)
+        ref_dict = _read_data_blocks_by_line(data_lines)
+        self.assertEqual(sorted(data_dict.keys()), sorted(ref_dict.keys()),
+                         msg)
+        for key in ref_dict.keys():
+            self.assertTrue(np.array_equal(data_dict[key],
+                                           np.array(ref_dict[key])),
+                            '{0} {1}'.format(msg, key))
+
+    def test_edi_files(self):
+        self.assertTrue(len(edi_files) > 0)
+        for edi_file in edi_files:
+            edi_obj = Edi(edi_fn=edi_file)
+            if edi_obj.Data_sect.data_type != 'z':
+                continue
+            data_lines = edi_obj._edi_lines[edi_obj.Data_sect.line_num:]
+            self._compare(data_lines, edi_file)
+
+            ref_dict = _read_data_blocks_by_line(data_lines)
+            freq = np.array(ref_dict['freq'])
+            order = slice(None, None, -1) if freq[0] < freq[1] else \
+                slice(None)
+            self.assertTrue(np.array_equal(edi_obj.Z.freq, freq[order]))
+            self.assertTrue(np.array_equal(
+                edi_obj.Z.z[:, 0, 1],
+                (np.array(ref_dict['zxyr']) +
+                 1j * np.array(ref_dict['zxyi']))[order]))
+            self.assertTrue(np.array_equal(edi_obj.Z.z_err[:, 1, 0],
+                                           np.array(ref_dict['zyx.var'])[order]))
+
+    def test_null_values(self):
+        data_lines = ['>FREQ //4\n',
+                      '  1.0e+01  1.0e+00  1.0e-01  1.0e-02\n',
+                      '>!****IMPEDANCES****!\n',
+                      '>ZXXR ROT=ZROT //4\n',
+                      '  1.0E+32  ******  2.5e-01\n',
+                      '! a comment 1.0\n',
+                      '  -3.0e+00\n',
+                      '>INFO\n',
+                      '  5.0\n',
+                      '>TXR.EXP //4\n',
+                      '  1.0e32 1.0 2.0 3.0\n',
+                      '>END\n']
+        self._compare(data_lines)
+        data_dict = _read_data_blocks(data_lines)
+        self.assertEqual(list(data_dict['zxxr']), [0., 0., .25, -3.])
+        self.assertEqual(list(data_dict['txr.exp']), [0., 1., 2., 3.])
+        self.assertNotIn('info', data_dict)
+
+
+def _spectra_to_z_by_frequency(spectra_arr, avgt_arr, comp_list):
+    """
+    reference implementation, the spectra conversion one frequency at a time
+    """
+    cc = index_locator(comp_list)
+    n_freq = spectra_arr.shape[0]
+    z_arr = np.zeros((n_freq, 2, 2), dtype=np.complex)
+    t_arr = np.zeros((n_freq, 1, 2), dtype=np.complex)
+    z_err_arr = np.zeros_like(z_arr, dtype=np.float)
+    t_err_arr = np.zeros_like(t_arr, dtype=np.float)
+
+    for kk in range(n_freq):
+        spectra = spectra_arr[kk]
+        s_arr = np.zeros_like(spectra, dtype=np.complex)
+        for ii in range(s_arr.shape[0]):
+            for jj in range(ii, s_arr.shape[0]):
+                if ii == jj:
+                    s_arr[ii, jj] = spectra[ii, jj]
+                else:
+                    s_arr[ii, jj] = np.complex(spectra[jj, ii],
+                                               -spectra[ii, jj])
+                    s_arr[jj, ii] = np.complex(spectra[jj, ii],
+                                               spectra[ii, jj])
+
+        z_arr[kk, 0, 0] = s_arr[cc.ex, cc.rhx] * s_arr[cc.hy, cc.rhy] - \
+            s_arr[cc.ex, cc.rhy] * s_arr[cc.hy, cc.rhx]
+        z_arr[kk, 0, 1] = s_arr[cc.ex, cc.rhy] * s_arr[cc.hx, cc.rhx] - \
+            s_arr[cc.ex, cc.rhx] * s_arr[cc.hx, cc.rhy]
+        z_arr[kk, 1, 0] = s_arr[cc.ey, cc.rhx] * s_arr[cc.hy, cc.rhy] - \
+            s_arr[cc.ey, cc.rhy] * s_arr[cc.hy, cc.rhx]
+        z_arr[kk, 1, 1] = s_arr[cc.ey, cc.rhy] * s_arr[cc.hx, cc.rhx] - \
+            s_arr[cc.ey, cc.rhx] * s_arr[cc.hx, cc.rhy]
+        z_arr[kk] /= (s_arr[cc.hx, cc.rhx] * s_arr[cc.hy, cc.rhy] -
+                      s_arr[cc.hx, cc.rhy] * s_arr[cc.hy, cc.rhx])
+
+        z_det = np.real(s_arr[cc.hx, cc.hx] * s_arr[cc.hy, cc.hy] -
+                        np.abs(s_arr[cc.hx, cc.hy] ** 2))
+        sigma_quantil = ssd.f.ppf(0.68, 4, avgt_arr[kk] - 4)
+
+        def scaling(comp):
+            a = s_arr[comp, cc.hx] * s_arr[cc.hy, cc.hy] - \
+                s_arr[comp, cc.hy] * s_arr[cc.hy, cc.hx]
+            b = s_arr[comp, cc.hy] * s_arr[cc.hx, cc.hx] - \
+                s_arr[comp, cc.hx] * s_arr[cc.hx, cc.hy]
+            a /= z_det
+            b /= z_det
+            psi_squared = np.real(1. / s_arr[comp, comp].real *
+                                  (a * s_arr[cc.hx, comp] +
+                                   b * s_arr[cc.hy, comp]))
+            return sigma_quantil * 4 / (avgt_arr[kk] - 4.) * \
+                (1. - psi_squared) / z_det * s_arr[comp, comp].real
+
+        for ii, comp in enumerate([cc.ex, cc.ey]):
+            z_err_arr[kk, ii, 0] = np.sqrt(scaling(comp) *
+                                           s_arr[cc.hy, cc.hy].real)
+            z_err_arr[kk, ii, 1] = np.sqrt(scaling(comp) *
+                                           s_arr[cc.hx, cc.hx].real)
+
+        if len(comp_list) > 5:
+            t_arr[kk, 0, 0] = s_arr[cc.hz, cc.rhx] * s_arr[cc.hy, cc.rhy] - \
+                s_arr[cc.hz, cc.rhy] * s_arr[cc.hy, cc.rhx]
+            t_arr[kk, 0, 1] = s_arr[cc.hz, cc.rhy] * s_arr[cc.hx, cc.rhx] - \
+                s_arr[cc.hz, cc.rhx] * s_arr[cc.hx, cc.rhy]
+            t_arr[kk] /= (s_arr[cc.hx, cc.rhx] * s_arr[cc.hy, cc.rhy] -
+                          s_arr[cc.hx, cc.rhy] * s_arr[cc.hy, cc.rhx])
+            t_err_arr[kk, 0, 0] = np.sqrt(scaling(cc.hz) *
+                                          s_arr[cc.hy, cc.hy].real)
+            t_err_arr[kk, 0, 1] = np.sqrt(scaling(cc.hz) *
+                                          s_arr[cc.hx, cc.hx].real)
+
+    return z_arr, z_err_arr, t_arr, t_err_arr
+
+
+class TestReadSpectra(TestCase):
+    def test_spectra_to_z(self):
+        comp_list = ['hx', 'hy', 'hz', 'ex', 'ey', 'rhx', 'rhy']
+        rs = np.random.RandomState(0)
+        spectra_arr = rs.normal(size=(20, 7, 7))
+        # auto powers are positive
+        spectra_arr[:, range(7), range(7)] = np.abs(
+            spectra_arr[:, range(7), range(7)]) + 5
+        avgt_arr = rs.uniform(10, 1000, size=20)
+
+        new = _spectra_to_z(spectra_arr, avgt_arr, comp_list)
+        with np.errstate(invalid='ignore'):
+            ref = _spectra_to_z_by_frequency(spectra_arr, avgt_arr,
+                                             comp_list)
+        for a_new, a_ref in zip(new, ref):
+            self.assertTrue(np.allclose(a_new, a_ref, equal_nan=True))
+
+    def test_spectra_edi(self):
+        edi_obj = Edi(edi_fn=spectra_edi_file)
+        self.assertEqual(edi_obj.Data_sect.data_type, 'spectra')
+        self.assertEqual(edi_obj.Z.z.shape, (len(edi_obj.Z.freq), 2, 2))
+        self.assertTrue(np.all(np.diff(edi_obj.Z.freq) < 0))
+        self.assertTrue(np.all(np.isfinite(edi_obj.Z.z)))
+        self.assertTrue(np.all(edi_obj.Z.z_err > 0))
+
+
+class TestReadHeaderOnly(TestCase):
+    def test_edi_data_false(self):
+        for edi_fn in edi_files + [spectra_edi_file]:
+            edi_ref = Edi(edi_fn=edi_fn)
+            edi_obj = Edi(edi_fn=edi_fn, data=False)
+            self.assertFalse(edi_obj._data_loaded)
+            self.assertLessEqual(len(edi_obj._edi_lines),
+                                 edi_ref.Data_sect.line_num + 1)
+            self.assertEqual(edi_obj.station, edi_ref.station)
+            self.assertEqual(edi_obj.lat, edi_ref.lat)
+            self.assertEqual(edi_obj.lon, edi_ref.lon)
+            self.assertEqual(edi_obj.elev, edi_ref.elev)
+            self.assertEqual(edi_obj.Data_sect.line_num,
+                             edi_ref.Data_sect.line_num)
+
+            # the data is read on first access
+            self.assertTrue(np.all(edi_obj.Z.z == edi_ref.Z.z))
+            self.assertTrue(edi_obj._data_loaded)
+            self.assertTrue(np.all(edi_obj.Z.freq == edi_ref.Z.freq))
+            self.assertTrue(np.all(edi_obj.Tipper.tipper ==
+                                   edi_ref.Tipper.tipper))
+
+    def test_edi_data_false_set(self):
+        import mtpy.core.z as MTz
+
+        edi_ref = Edi(edi_fn=edi_files[0])
+        new_z = MTz.Z(z_array=edi_ref.Z.z[:3] * 2,
+                      z_err_array=edi_ref.Z.z_err[:3],
+                      freq=edi_ref.Z.freq[:3])
+        new_tipper = MTz.Tipper(tipper_array=edi_ref.Tipper.tipper[:3] * 2,
+                                tipper_err_array=edi_ref.Tipper.tipper_err[:3],
+                                freq=edi_ref.Tipper.freq[:3])
+
+        # the new objects are kept, not replaced by the data of the file
+        edi_obj = Edi(edi_fn=edi_files[0], data=False)
+        edi_obj.Z = new_z
+        self.assertIs(edi_obj.Z, new_z)
+        self.assertTrue(np.all(edi_obj.Z.z == edi_ref.Z.z[:3] * 2))
+        self.assertTrue(np.all(edi_obj.Tipper.tipper ==
+                               edi_ref.Tipper.tipper))
+
+        edi_obj = Edi(edi_fn=edi_files[0], data=False)
+        edi_obj.Tipper = new_tipper
+        self.assertIs(edi_obj.Tipper, new_tipper)
+        self.assertTrue(np.all(edi_obj.Z.z == edi_ref.Z.z))
+
+    def test_mt_data_false(self):
+        mt_ref = MT(edi_files[0])
+        mt_obj = MT(edi_files[0], data=False)
+        self.assertFalse(mt_obj._data_loaded)
+        self.assertEqual(mt_obj.station, mt_ref.station)
+        self.assertEqual(mt_obj.east, mt_ref.east)
+        self.assertTrue(np.all(mt_obj.pt.phimin[0] == mt_ref.pt.phimin[0]))
+        self.assertTrue(np.all(mt_obj.Z.z == mt_ref.Z.z))
+        self.assertTrue(np.all(mt_obj.Tipper.tipper == mt_ref.Tipper.tipper))
@@ -0,0 +1,83 @@
+import glob
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from mtpy.core.edi import Edi
+
+edi_files = sorted(glob.glob("tests/data/edifiles/*.edi"))[:4] + \
+    ["tests/data/AMT/15125A_spe.edi"]
+
+
+def _write_data_block_by_value(edi_obj, data_comp_arr, data_key):
+    """
+    reference implementation, formats a data block one value at a time
+    """
+    if data_key.lower() in ['zrot', 'trot', 'freq']:
+        block_lines = ['>{0} // {1:.0f}\n'.format(data_key.upper(),
+                                                  data_comp_arr.size)]
+    elif data_key.lower().find('z') >= 0:
+        block_lines = ['>{0} ROT=ZROT // {1:.0f}\n'.format(data_key.upper(),
+                                                           data_comp_arr.size)]
+    else:
+        block_lines = ['>{0} ROT=TROT // {1:.0f}\n'.format(data_key.upper(),
+                                                           data_comp_arr.size)]
+
+    for d_index, d_comp in enumerate(data_comp_arr, 1):
+        if d_comp == 0.0 and data_key.lower() not in ['zrot', 'trot']:
+            d_comp = float(edi_obj.Header.empty)
+        num_str = '{0:{1}}'.format(d_comp, edi_obj._num_format)
+        if d_index % edi_obj._block_len == 0:
+            num_str += '\n'
+        if d_index == data_comp_arr.size:
+            num_str += '\n'
+        block_lines.append(num_str)
+
+    return block_lines
+
+
+def _strip_filedate(edi_str):
+    return [line for line in edi_str.splitlines()
+            if not line.startswith('FILEDATE')]
+
+
+class TestWriteDataBlock(TestCase):
+    def test_block_sizes(self):
+        edi_obj = Edi()
+        rs = np.random.RandomState(0)
+        for n_data in [0, 1, 5, 6, 7, 12, 13, 100]:
+            data = rs.normal(size=n_data) * 10. ** rs.randint(-8, 8, n_data)
+            data[::3] = 0
+            for key in ['freq', 'zrot', 'zxyi', 'tyvar.exp']:
+                self.assertEqual(
+                    ''.join(edi_obj._write_data_block(data, key)),
+                    ''.join(_write_data_block_by_value(edi_obj, data, key)))
+
+    def test_write_edi_file(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            for edi_fn in edi_files:
+                edi_obj = Edi(edi_fn=edi_fn)
+                new_fn = edi_obj.write_edi_file(
+                    new_edi_fn=os.path.join(tmp_dir, 'new.edi'))
+
+                edi_obj._write_data_block = \
+                    lambda arr, key: _write_data_block_by_value(edi_obj,
+                                                                arr, key)
+                ref_fn = edi_obj.write_edi_file(
+                    new_edi_fn=os.path.join(tmp_dir, 'ref.edi'))
+
+                with open(new_fn, 'r') as fid:
+                    new_str = fid.read()
+                with open(ref_fn, 'r') as fid:
+                    ref_str = fid.read()
+                self.assertEqual(_strip_filedate(new_str),
+                                 _strip_filedate(ref_str))
+                self.assertEqual(len(new_str), len(ref_str))
+                os.remove(new_fn)
+                os.remove(ref_fn)
+        finally:
+            shutil.rmtree(tmp_dir)
@@ -0,0 +1,122 @@
+import glob
+from unittest import TestCase
+
+import numpy as np
+
+import mtpy.analysis.geometry as MTgy
+import mtpy.analysis.pt as MTpt
+import mtpy.analysis.zinvariants as MTinv
+import mtpy.core.mt as mt
+from mtpy.utils.exceptions import MTpyError_PT
+
+edi_files = sorted(glob.glob("tests/data/edifiles/*.edi"))[:4]
+
+
+def make_z(shape, seed=0):
+    rs = np.random.RandomState(seed)
+    return rs.normal(size=shape + (2, 2)) + 1j * rs.normal(size=shape + (2, 2))
+
+
+class TestGeometry(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.z = make_z((5, 12))
+        cls.z[0, 0] = [[0, 1 + 1j], [-1 - 1j, 0]]
+
+    def test_dimensionality_stack(self):
+        dims = MTgy.dimensionality(z_array=self.z)
+        self.assertEqual(dims.shape, (5, 12))
+        self.assertEqual(dims[0, 0], 1)
+        for ii in range(len(self.z)):
+            pt_obj = MTpt.PhaseTensor(z_array=self.z[ii])
+            self.assertTrue(np.all(dims[ii] ==
+                                   MTgy.dimensionality(pt_object=pt_obj)))
+            beta = pt_obj.beta[0]
+            ecc = pt_obj._pi1()[0] / pt_obj._pi2()[0]
+            expected = [3 if bb > 5 else (2 if ee > .1 else 1)
+                        for bb, ee in zip(beta, ecc)]
+            self.assertEqual(list(dims[ii]), expected)
+
+    def test_strike_stack(self):
+        strike = MTgy.strike_angle(z_array=self.z)
+        self.assertEqual(strike.shape, (5, 12, 2))
+        self.assertTrue(np.all(np.isnan(strike[0, 0])))
+        for ii in range(len(self.z)):
+            pt_obj = MTpt.PhaseTensor(z_array=self.z[ii])
+            dims = MTgy.dimensionality(pt_object=pt_obj)
+            for idx in np.nonzero(dims != 1)[0]:
+                strike1 = (pt_obj.alpha[0][idx] - pt_obj.beta[0][idx]) % 90
+                if 0 < strike1 < 45:
+                    strike2 = strike1 + 90
+                else:
+                    strike2 = strike1 - 90
+                self.assertAlmostEqual(strike[ii, idx, 0],
+                                       min(strike1, strike2))
+                self.assertAlmostEqual(strike[ii, idx, 1],
+                                       max(strike1, strike2))
+
+    def test_eccentricity(self):
+        pt_array = MTpt.z2pt_batch(self.z)[0]
+        ecc, ecc_err = MTgy.eccentricity(pt_array=pt_array)
+        pt_obj = MTpt.PhaseTensor(pt_array=pt_array[2])
+        self.assertTrue(np.allclose(ecc[2],
+                                    pt_obj._pi1()[0] / pt_obj._pi2()[0]))
+        self.assertTrue(np.all(ecc_err == None))
+
+    def test_z_object(self):
+        mt_obj = mt.MT(edi_files[0])
+        dims = MTgy.dimensionality(z_object=mt_obj.Z)
+        self.assertTrue(np.all(dims == MTgy.dimensionality(
+            z_array=mt_obj.Z.z)))
+        self.assertRaises(MTpyError_PT, MTgy.strike_angle)
+
+    def test_strike_histograms(self):
+        rs = np.random.RandomState(1)
+        period = np.logspace(-2, 2, 20)
+        strike = rs.uniform(-180, 180, size=(20, 7))
+        strike[3, 2] = 0
+        strike[5, 1] = np.nan
+        decades = [(bb, bb + 1) for bb in range(-2, 2)]
+        counts, edges = MTgy.strike_histograms(strike, period, decades,
+                                               bin_width=10)
+        self.assertEqual(counts.shape, (4, 36))
+        for ii, (bb_min, bb_max) in enumerate(decades):
+            values = [ss for pp, row in zip(period, strike) for ss in row
+                      if 10 ** bb_min < pp < 10 ** bb_max and ss != 0 and
+                      np.isfinite(ss)]
+            self.assertEqual(list(counts[ii]),
+                             list(np.histogram(values, bins=36,
+                                               range=(-180, 180))[0]))
+
+
+class TestWeaverInvariants(TestCase):
+    def test_stack(self):
+        z = make_z((3, 10))
+        invariants = MTinv.weaver_invariants(z)
+        for ii in range(len(z)):
+            z_inv = MTinv.Zinvariants(z_array=z[ii],
+                                      freq=np.logspace(2, -2, 10))
+            for name in MTinv.INVARIANTS:
+                self.assertTrue(np.allclose(invariants[name][ii],
+                                            getattr(z_inv, name),
+                                            equal_nan=True), name)
+
+    def test_edi(self):
+        mt_obj = mt.MT(edi_files[1])
+        z_inv = MTinv.Zinvariants(z_object=mt_obj.Z)
+        z = mt_obj.Z.z
+        x1 = .5 * (z[:, 0, 0].real + z[:, 1, 1].real)
+        e1 = .5 * (z[:, 0, 0].imag + z[:, 1, 1].imag)
+        x4 = .5 * (z[:, 0, 1].real - z[:, 1, 0].real)
+        e4 = .5 * (z[:, 0, 1].imag - z[:, 1, 0].imag)
+        self.assertTrue(np.allclose(z_inv.inv1, np.sqrt(x4 ** 2 + x1 ** 2)))
+        self.assertTrue(np.allclose(z_inv.inv2, np.sqrt(e4 ** 2 + e1 ** 2)))
+
+    def test_undefined(self):
+        z = make_z((4,))
+        z[1] = [[1, 1], [1, 1]]
+        invariants = MTinv.weaver_invariants(z)
+        self.assertEqual(invariants['ex'][1], 0)
+        for name in MTinv.INVARIANTS:
+            self.assertTrue(np.isnan(invariants[name][1]), name)
+        self.assertTrue(np.all(np.isfinite(invariants['inv1'][[0, 2, 3]])))
@@ -0,0 +1,20 @@
+import subprocess
+import sys
+from unittest import TestCase
+
+HEADLESS_MODULES = ['mtpy.core.mt', 'mtpy.core.edi_collection',
+                    'mtpy.core.survey_archive', 'mtpy.core.z_interp',
+                    'mtpy.analysis.staticshift',
+                    'mtpy.analysis.niblettbostick',
+                    'mtpy.modeling.modem_data']
+
+
+class TestHeadlessImport(TestCase):
+    def test_no_plotting_or_gis_modules(self):
+        statement = 'import sys, {0}; print(" ".join(sorted(m for m in ' \
+                    'sys.modules if m.split(".")[0] in ["matplotlib", ' \
+                    '"scipy", "pyproj", "osgeo", "geopandas", "shapely"])))'
+        for module in HEADLESS_MODULES:
+            output = subprocess.check_output(
+                [sys.executable, '-c', statement.format(module)])
+            self.assertEqual(output.splitlines()[-1].strip(), '', module)
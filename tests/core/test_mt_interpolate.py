@@ -0,0 +1,136 @@
+import glob
+from unittest import TestCase
+
+import numpy as np
+import scipy.interpolate as spi
+
+from mtpy.core.mt import MT
+from mtpy.utils.interpolation import LogFrequencyInterpolator, \
+    get_log_frequency_interpolator
+
+edi_files = sorted(glob.glob("tests/data/edifiles/*.edi"))[:4] + \
+    ["tests/data/AMT/15125A_spe.edi"]
+
+
+def _interpolate_by_component(freq, values, new_freq, fill_value):
+    """
+    reference implementation, one scipy interp1d per component, zero
+    entries left out
+    """
+    new_values = np.zeros((len(new_freq),) + values.shape[1:],
+                          dtype=values.dtype)
+    for index in np.ndindex(values.shape[1:]):
+        column = values[(slice(None),) + index]
+        non_zero = np.nonzero(column)[0]
+        if len(non_zero) < 2:
+            continue
+        ind = np.argsort(freq[non_zero])
+        func = spi.interp1d(np.log10(freq[non_zero][ind]),
+                            column[non_zero][ind], bounds_error=False,
+                            fill_value=fill_value)
+        new_values[(slice(None),) + index] = func(np.log10(new_freq))
+    return new_values
+
+
+class TestLogFrequencyInterpolator(TestCase):
+    def test_against_interp1d(self):
+        rs = np.random.RandomState(0)
+        freq = np.logspace(3, -3, 40)
+        values = rs.normal(size=(40, 3, 2))
+        values[rs.rand(40, 3, 2) < .3] = 0
+        values[:, 2, 1] = 0
+        new_freq = np.logspace(3.5, -3.5, 57)
+
+        interp = LogFrequencyInterpolator(freq, new_freq)
+        self.assertTrue(np.allclose(
+            interp(values),
+            _interpolate_by_component(freq, values, new_freq, 0.)))
+        # the weights of a mask are reused
+        self.assertEqual(len(interp._weights), 1)
+        interp(values * 2)
+        self.assertEqual(len(interp._weights), 1)
+
+    def test_exact_and_edges(self):
+        freq = np.array([1., 10., 100.])
+        values = np.array([1., 2., 3.])
+        interp = LogFrequencyInterpolator(freq, [100., 1., 10., 31.6227766,
+                                                 1000., .1])
+        self.assertTrue(np.allclose(interp(values, fill_value=np.nan)[:4],
+                                    [3., 1., 2., 2.5]))
+        self.assertTrue(np.all(np.isnan(interp(values,
+                                               fill_value=np.nan)[4:])))
+
+        # a single value is only returned at its own frequency
+        interp = LogFrequencyInterpolator([10.], [10., 20.])
+        self.assertTrue(np.all(interp(np.array([5.])) == [5., 0.]))
+
+    def test_threads(self):
+        from multiprocessing.pool import ThreadPool
+
+        rs = np.random.RandomState(1)
+        freq = np.logspace(3, -3, 40)
+        new_freq = np.logspace(3.5, -3.5, 57)
+        values = rs.normal(size=(40, 8, 4))
+        values[rs.rand(40, 8, 4) < .3] = 0
+        expected = [_interpolate_by_component(freq, values_station, new_freq,
+                                              0.)
+                    for values_station in values.transpose(1, 0, 2)]
+
+        # every call has a new mask and clears the cache of the others
+        interp = LogFrequencyInterpolator(freq, new_freq)
+        interp.max_masks = 1
+        pool = ThreadPool(8)
+        try:
+            new_values = pool.map(lambda ii: interp(values[:, ii % 8]),
+                                  range(200))
+        finally:
+            pool.close()
+        for ii, new_station in enumerate(new_values):
+            self.assertTrue(np.allclose(new_station, expected[ii % 8]))
+
+    def test_cache(self):
+        freq = np.logspace(2, -2, 10)
+        new_freq = np.logspace(1, -1, 5)
+        self.assertIs(get_log_frequency_interpolator(freq, new_freq),
+                      get_log_frequency_interpolator(freq.copy(),
+                                                     new_freq.copy()))
+
+
+class TestInterpolateImpedanceTensor(TestCase):
+    def test_against_interp1d(self):
+        for edi_fn in edi_files:
+            mt_obj = MT(edi_fn)
+            freq = mt_obj.Z.freq
+            new_freq = np.logspace(np.log10(freq.max()),
+                                   np.log10(freq.min()), 33)
+            new_freq_in = new_freq.copy()
+
+            new_z, new_t = mt_obj.interpolate_impedance_tensor(new_freq)
+            # the input is not changed
+            self.assertTrue(np.all(new_freq == new_freq_in))
+            self.assertTrue(np.all(new_z.freq == new_freq_in))
+
+            interp_freq = new_freq.copy()
+            interp_freq[np.argmin(interp_freq)] += 1e-8
+            interp_freq[np.argmax(interp_freq)] -= 1e-8
+            self.assertTrue(np.allclose(
+                new_z.z,
+                _interpolate_by_component(freq, mt_obj.Z.z, interp_freq, 0.)))
+            self.assertTrue(np.allclose(
+                new_t.tipper,
+                _interpolate_by_component(freq, mt_obj.Tipper.tipper,
+                                          interp_freq, 0.)))
+
+            z_ref = _interpolate_by_component(
+                freq, np.where(mt_obj.Z.z != 0, mt_obj.Z.z_err, 0),
+                interp_freq, np.nan)
+            self.assertTrue(np.allclose(new_z.z_err, z_ref, equal_nan=True))
+
+    def test_bounds_error(self):
+        mt_obj = MT(edi_files[0])
+        self.assertRaises(ValueError, mt_obj.interpolate_impedance_tensor,
+                          [mt_obj.Z.freq.max() * 2])
+        new_z, new_t = mt_obj.interpolate_impedance_tensor(
+            [mt_obj.Z.freq.max() * 2, mt_obj.Z.freq[3]], bounds_error=False)
+        self.assertTrue(np.all(new_z.z[0] == 0))
+        self.assertTrue(np.allclose(new_z.z[1], mt_obj.Z.z[3]))
@@ -0,0 +1,108 @@
+import glob
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from mtpy.core.mt import MT
+from mtpy.core.mt_loader import MTLoader, get_edi_list, load_mt_list, \
+    write_edi_list
+from mtpy.core.z_stack import ZStack
+
+edi_path = "tests/data/edifiles"
+edi_files = sorted(glob.glob(os.path.join(edi_path, "*.edi")))
+
+
+class TestMTLoader(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.mt_ref = [MT(edi_fn) for edi_fn in edi_files]
+
+    def _assert_same(self, mt_list):
+        self.assertEqual(len(mt_list), len(self.mt_ref))
+        for mt_obj, mt_ref in zip(mt_list, self.mt_ref):
+            self.assertEqual(mt_obj.station, mt_ref.station)
+            self.assertTrue(np.all(mt_obj.Z.z == mt_ref.Z.z))
+            self.assertTrue(np.all(mt_obj.Tipper.tipper ==
+                                   mt_ref.Tipper.tipper))
+
+    def test_get_edi_list(self):
+        self.assertEqual(get_edi_list(edi_path), edi_files)
+        self.assertEqual(get_edi_list(edi_files[::-1]), edi_files[::-1])
+
+    def test_serial_and_pools(self):
+        self._assert_same(load_mt_list(edi_path, n_workers=1))
+        self._assert_same(load_mt_list(edi_files, n_workers=3,
+                                       pool='thread'))
+        self._assert_same(load_mt_list(edi_files, n_workers=2,
+                                       pool='process'))
+
+    def test_errors(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            bad_fn = os.path.join(tmp_dir, 'bad.edi')
+            with open(bad_fn, 'w') as fid:
+                fid.write('>HEAD\n>=MTSECT\n>FREQ // 2\n 1.0 x\n>END\n')
+            missing_fn = os.path.join(tmp_dir, 'missing.edi')
+
+            loader = MTLoader(n_workers=2)
+            mt_list = loader.load(edi_files[:2] + [bad_fn, missing_fn] +
+                                  edi_files[2:])
+            self._assert_same(mt_list)
+            self.assertEqual([error[0] for error in loader.errors],
+                             [bad_fn, missing_fn])
+            self.assertEqual(loader.loaded_edi_list, edi_files)
+
+            # read in this process the error is raised
+            loader = MTLoader(n_workers=1)
+            self.assertRaises(Exception, loader.load,
+                              edi_files[:2] + [missing_fn])
+            self.assertRaises(Exception, loader.load_z_stack,
+                              edi_files[:2] + [bad_fn])
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_load_z_stack(self):
+        loader = MTLoader(n_workers=2)
+        z_stack = loader.load_z_stack(edi_path)
+        z_ref = ZStack.from_mt_list(self.mt_ref)
+        self.assertEqual(list(z_stack.station), list(z_ref.station))
+        self.assertTrue(np.all(z_stack.freq == z_ref.freq))
+        self.assertTrue(np.all(z_stack.z == z_ref.z))
+        self.assertTrue(np.all(z_stack.tipper_err == z_ref.tipper_err))
+        self.assertTrue(np.all(z_stack.lat == z_ref.lat))
+
+    def test_write_edi_list(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            z_list = []
+            for mt_ref in self.mt_ref[:3]:
+                z_obj = ZStack.from_mt_list([mt_ref]).get_z(0)
+                z_obj.z = z_obj.z * 2
+                z_list.append(z_obj)
+            new_fn_list = write_edi_list(edi_files[:3], z_list,
+                                         save_path=tmp_dir, suffix='_x2',
+                                         n_workers=2)
+            for new_fn, edi_fn, mt_ref in zip(new_fn_list, edi_files,
+                                              self.mt_ref):
+                self.assertEqual(os.path.basename(new_fn),
+                                 os.path.basename(edi_fn)[:-4] + '_x2.edi')
+                mt_obj = MT(new_fn)
+                self.assertTrue(np.allclose(mt_obj.Z.freq, mt_ref.Z.freq))
+                self.assertTrue(np.allclose(mt_obj.Z.z, mt_ref.Z.z * 2,
+                                            rtol=1e-5))
+                self.assertTrue(np.allclose(mt_obj.Tipper.tipper,
+                                            mt_ref.Tipper.tipper))
+
+            # the frequencies of the file must all be there
+            z_short = ZStack.from_mt_list(self.mt_ref[1:2]).get_z(0)
+            z_short.z = z_short.z[1:]
+            z_short.freq = z_short.freq[1:]
+            new_fn_list = write_edi_list(edi_files[:2], [z_list[0], z_short],
+                                         save_path=tmp_dir, n_workers=1)
+            self.assertIsNotNone(new_fn_list[0])
+            self.assertIsNone(new_fn_list[1])
+        finally:
+            shutil.rmtree(tmp_dir)
@@ -0,0 +1,184 @@
+from unittest import TestCase
+
+import numpy as np
+import scipy.interpolate as spi
+
+import mtpy.analysis.geometry as MTgy
+import mtpy.analysis.niblettbostick as MTnb
+import mtpy.core.z as MTz
+import mtpy.utils.calculator as MTcc
+
+
+def make_z(shape, seed=0):
+    """
+    rotated 2D impedance tensors with some 1D and 3D periods
+    """
+    rs = np.random.RandomState(seed)
+    z = np.zeros(shape + (2, 2), dtype='complex')
+    z[..., 0, 1] = rs.uniform(1, 10, shape) * (1 + 1j * rs.uniform(.3, 3, shape))
+    z[..., 1, 0] = -rs.uniform(1, 10, shape) * (1 + 1j * rs.uniform(.3, 3, shape))
+    # 1D periods
+    is_1d = rs.uniform(size=shape) < .2
+    z[is_1d, 1, 0] = -z[is_1d, 0, 1]
+    z = MTcc.rotatematrices_incl_errors(z, rs.uniform(-80, 80, shape))[0]
+    # 3D periods
+    is_3d = rs.uniform(size=shape) < .2
+    z[is_3d] += rs.normal(size=(is_3d.sum(), 2, 2)) * 5
+    return z
+
+
+def res_phase(z, period):
+    return (0.2 * period * np.abs(z) ** 2, np.degrees(np.angle(z)))
+
+
+def interpolate_strike_per_point(angles, periods):
+    """
+    strike interpolation of one station as before, periods ascending
+    """
+    new_angles = np.array(angles, dtype='float')
+    for ii in range(len(angles)):
+        if not np.isnan(angles[ii]):
+            continue
+        if ii in [0, len(angles) - 1]:
+            new_angles[ii] = 0.
+            continue
+        jj = ii + 1
+        while jj < len(angles) - 1 and np.isnan(angles[jj]):
+            jj += 1
+        # 1D at the bottom is 0 degrees
+        ang2 = np.nan_to_num(angles[jj])
+        new_angles[ii] = new_angles[ii - 1] + \
+            (ang2 - new_angles[ii - 1]) / \
+            (periods[jj] - periods[ii - 1]) * (periods[ii] - periods[ii - 1])
+    return new_angles
+
+
+def depth_nb_per_freq(z, periods):
+    """
+    Niblett-Bostick depths of one station as before
+    """
+    dims = MTgy.dimensionality(z_array=z)
+    angles = np.nan_to_num(MTgy.strike_angle(z_array=z)[:, 0])
+    strike = spi.interp1d(periods[dims != 3], angles[dims != 3],
+                          bounds_error=False, fill_value=0)(periods)
+    rows = []
+    for ii, per in enumerate(periods):
+        new_z = MTcc.rotatematrix_incl_errors(z[ii], strike[ii])[0]
+        res, phase = res_phase(np.asarray(new_z), per)
+        te_rho, te_depth = MTnb.rhophi2rhodepth(res[0, 1], phase[0, 1], per)
+        tm_rho, tm_depth = MTnb.rhophi2rhodepth(res[1, 0], phase[1, 0], per)
+        rows.append((per, min(te_depth, tm_depth), max(te_depth, tm_depth),
+                     min(te_rho, tm_rho), max(te_rho, tm_rho)))
+    return np.array(rows)
+
+
+def rho_nb_rotated(z, period, angle):
+    """
+    Niblett-Bostick depth and resistivity of TE and TM of z rotated by angle
+    """
+    new_z = MTcc.rotatematrix_incl_errors(z, angle)[0]
+    res, phs = res_phase(np.asarray(new_z), period)
+    te_rho, te_depth = MTnb.rhophi2rhodepth(res[0, 1], phs[0, 1], period)
+    tm_rho, tm_depth = MTnb.rhophi2rhodepth(res[1, 0], phs[1, 0], period)
+    return te_depth, te_rho, tm_depth, tm_rho
+
+
+class TestNiblettBostick(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.z = make_z((4, 15))
+        cls.periods = np.logspace(-2, 3, 15)
+        cls.dims = MTgy.dimensionality(z_array=cls.z)
+
+    def test_test_data(self):
+        for dim in (1, 2, 3):
+            self.assertTrue(np.any(self.dims == dim))
+
+    def test_interpolate_strike_angles(self):
+        angles = np.array([[np.nan, 10, np.nan, np.nan, 40, 20, np.nan],
+                           [5, np.nan, 15, 30, np.nan, np.nan, 30],
+                           [np.nan] * 7])
+        periods = np.array([1, 2, 3, 5, 8, 9, 10.])
+        new_angles = MTnb.interpolate_strike_angles(angles, periods)
+        for row, new_row in zip(angles, new_angles):
+            self.assertTrue(np.allclose(
+                new_row, interpolate_strike_per_point(row, periods)))
+            self.assertTrue(np.allclose(
+                MTnb.interpolate_strike_angles(row, periods), new_row))
+
+        # input order is kept
+        order = np.array([3, 0, 6, 2, 5, 1, 4])
+        self.assertTrue(np.allclose(
+            MTnb.interpolate_strike_angles(angles[:, order], periods[order]),
+            new_angles[:, order]))
+
+        # masked out entries are left out
+        mask = np.ones(7, dtype=bool)
+        mask[[0, 4]] = False
+        masked = MTnb.interpolate_strike_angles(angles[0], periods,
+                                                mask=mask)
+        self.assertTrue(np.all(np.isnan(masked[~mask])))
+        self.assertTrue(np.allclose(masked[mask], interpolate_strike_per_point(
+            angles[0][mask], periods[mask])))
+
+    def test_calculate_znb(self):
+        nb_max, nb_min = MTnb.calculate_znb(z_array=self.z,
+                                            periods=self.periods)
+        self.assertEqual(nb_max.shape, (4, 15, 2))
+        self.assertTrue(np.all(np.isnan(nb_max[self.dims == 3])))
+        for ii, z in enumerate(self.z):
+            keep = self.dims[ii] != 3
+            angles = interpolate_strike_per_point(
+                MTgy.strike_angle(z_array=z)[keep, 0], self.periods[keep])
+            for jj, idx in enumerate(np.nonzero(keep)[0]):
+                per = self.periods[idx]
+                new_z = MTcc.rotatematrix_incl_errors(z[idx], -angles[jj])[0]
+                res, phase = res_phase(np.asarray(new_z), per)
+                te = MTnb.rhophi2rhodepth(res[0, 1], phase[0, 1], per)[::-1]
+                tm = MTnb.rhophi2rhodepth(res[1, 0], phase[1, 0], per)[::-1]
+                if te[1] < tm[1]:
+                    te, tm = tm, te
+                self.assertTrue(np.allclose(nb_max[ii, idx], te))
+                self.assertTrue(np.allclose(nb_min[ii, idx], tm))
+
+    def test_calculate_depth_nb(self):
+        depth_array = MTnb.calculate_depth_nb(z_array=self.z,
+                                              periods=self.periods)
+        self.assertEqual(depth_array.shape, (4, 15))
+        for ii, z in enumerate(self.z):
+            expected = depth_nb_per_freq(z, self.periods)
+            for jj, key in enumerate(depth_array.dtype.names):
+                self.assertTrue(np.allclose(depth_array[ii][key],
+                                            expected[:, jj]))
+
+    def test_calculate_depth_nb_z_object(self):
+        z_obj = MTz.Z(z_array=self.z[1], freq=1. / self.periods)
+        depth_array = MTnb.calculate_depth_nb(z_object=z_obj)
+        self.assertEqual(depth_array.shape, (15,))
+        self.assertTrue(np.allclose(depth_array['depth_max'],
+                                    depth_nb_per_freq(self.z[1],
+                                                      self.periods)[:, 2]))
+
+    def test_calculate_rho_minmax(self):
+        nb_max, nb_min = MTnb.calculate_rho_minmax(z_array=self.z[:2],
+                                                   periods=self.periods)
+        self.assertEqual(nb_max.shape, (2, 15, 3))
+        self.assertEqual(nb_min.shape, (2, 15, 2))
+        for ii, z in enumerate(self.z[:2]):
+            keep = self.dims[ii] != 3
+            self.assertTrue(np.all(np.isnan(nb_max[ii, ~keep])))
+            self.assertTrue(np.all(np.isnan(nb_min[ii, ~keep])))
+            for idx in np.nonzero(keep)[0]:
+                per = self.periods[idx]
+                temp_vals = np.array([rho_nb_rotated(z[idx], per, dd)
+                                      for dd in np.arange(360) * .5])
+                # maximum over all rotation angles
+                column = np.argmax(temp_vals[:, [1, 3]].max(axis=0)) * 2 + 1
+                self.assertAlmostEqual(nb_max[ii, idx, 1],
+                                       temp_vals[:, column].max())
+                # at the angle of the maximum, the other mode is the minimum
+                vals = rho_nb_rotated(z[idx], per, nb_max[ii, idx, 2])
+                if vals[1] < vals[3]:
+                    vals = vals[2:] + vals[:2]
+                self.assertTrue(np.allclose(nb_max[ii, idx, :2], vals[:2]))
+                self.assertTrue(np.allclose(nb_min[ii, idx], vals[2:]))
@@ -0,0 +1,133 @@
+import glob
+from unittest import TestCase
+
+import numpy as np
+
+from mtpy.core.edi_collection import EdiCollection, is_num_in_seq
+from mtpy.core.period_index import PeriodIndex
+
+edi_files = sorted(glob.glob("tests/data/edifiles/*.edi"))
+
+
+def _find_by_scan(freq_list, freq, ptol):
+    """
+    reference implementation, scan the frequencies of every station
+    """
+    stations, positions = [], []
+    for ii, station_freq in enumerate(freq_list):
+        f_index_list = [ff for ff, f2 in enumerate(station_freq)
+                        if (f2 > freq * (1 - ptol)) and
+                        (f2 < freq * (1 + ptol))]
+        if len(f_index_list) > 0:
+            stations.append(ii)
+            positions.append(f_index_list[0])
+    return stations, positions
+
+
+class TestPeriodIndex(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rs = np.random.RandomState(0)
+        # stations of different bands, with a little scatter of the
+        # frequencies, shuffled so that they are not sorted
+        cls.freq_list = []
+        for ii in range(30):
+            freq = np.logspace(rs.randint(-4, 0), rs.randint(1, 5),
+                               rs.randint(5, 40))
+            freq *= 1 + rs.normal(scale=.01, size=len(freq))
+            rs.shuffle(freq)
+            cls.freq_list.append(freq)
+        cls.freq_list.append(np.zeros(0))
+        cls.p_index = PeriodIndex(cls.freq_list, ptol=.05)
+
+    def test_arrays(self):
+        p_index = self.p_index
+        self.assertEqual(p_index.n_stations, len(self.freq_list))
+        self.assertTrue(np.all(np.diff(p_index.freq) >= 0))
+        for ii, freq in enumerate(self.freq_list):
+            self.assertTrue(np.all(p_index.station_freq(ii) == freq))
+        self.assertTrue(np.all(
+            self.freq_list_value(p_index.freq_station,
+                                 p_index.freq_position) == p_index.freq))
+
+    def freq_list_value(self, stations, positions):
+        return np.array([self.freq_list[ss][pp]
+                         for ss, pp in zip(stations, positions)])
+
+    def test_find_freq(self):
+        for freq in np.logspace(-4.5, 4.5, 300):
+            for ptol in [.01, .05, .2]:
+                stations, positions = self.p_index.find_freq(freq, ptol)
+                ref_stations, ref_positions = _find_by_scan(self.freq_list,
+                                                            freq, ptol)
+                self.assertEqual(list(stations), ref_stations)
+                self.assertEqual(list(positions), ref_positions)
+
+        stations, positions = self.p_index.find_period(10.)
+        self.assertEqual((list(stations), list(positions)),
+                         _find_by_scan(self.freq_list, .1, .05))
+
+    def test_find_freq_atol(self):
+        for freq in np.concatenate(self.freq_list[:3] + [[1e-5, 3e-4, 7.]]):
+            stations = self.p_index.find_freq_atol(freq)[0]
+            ref_stations = [ii for ii, station_freq in
+                            enumerate(self.freq_list)
+                            if is_num_in_seq(freq, station_freq)]
+            self.assertEqual(list(stations), ref_stations)
+
+    def test_clusters(self):
+        p_index = self.p_index
+        self.assertEqual(p_index.cluster_offsets[-1], len(p_index.freq))
+        self.assertEqual(len(p_index.cluster_freq),
+                         len(p_index.cluster_offsets) - 1)
+        for jj in range(len(p_index.cluster_freq)):
+            freq = p_index.freq[p_index.cluster_offsets[jj]:
+                                p_index.cluster_offsets[jj + 1]]
+            self.assertTrue(freq[-1] <= freq[0] * 1.05)
+            self.assertTrue(freq[0] * (1 - 1e-12) <= p_index.cluster_freq[jj]
+                            <= freq[-1] * (1 + 1e-12))
+            if jj > 0:
+                # the next frequency would not have fitted the previous
+                # cluster
+                self.assertTrue(freq[0] > p_index.freq[
+                    p_index.cluster_offsets[jj - 1]] * 1.05)
+            for ff in freq:
+                self.assertEqual(p_index.cluster_index(ff), jj)
+            stations = p_index.cluster_stations(jj)[0]
+            self.assertEqual(list(stations), sorted(set(
+                p_index.freq_station[p_index.cluster_offsets[jj]:
+                                     p_index.cluster_offsets[jj + 1]])))
+        self.assertEqual(p_index.cluster_index(p_index.freq[0] * .9), -1)
+        self.assertEqual(p_index.cluster_index(p_index.freq[-1] * 1.1), -1)
+
+    def test_empty(self):
+        p_index = PeriodIndex([np.zeros(0), None])
+        self.assertEqual(len(p_index.cluster_freq), 0)
+        self.assertEqual(len(p_index.find_freq(1.)[0]), 0)
+        self.assertEqual(p_index.cluster_index(1.), -1)
+
+
+class TestEdiCollectionPeriods(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.edi_collection = EdiCollection(edi_files)
+
+    def test_get_periods_by_stats(self):
+        # reference, count the stations of each period with is_num_in_seq
+        mt_obj_list = self.edi_collection.mt_obj_list
+        counts = dict((aper, sum(is_num_in_seq(1. / aper, mt_obj.Z.freq)
+                                 for mt_obj in mt_obj_list))
+                      for aper in self.edi_collection.all_unique_periods)
+        for percentage in [100, 80, 30, 0]:
+            selected = self.edi_collection.get_periods_by_stats(percentage)
+            self.assertEqual(
+                sorted(selected),
+                sorted(aper for aper, count in counts.items()
+                       if 100. * count / len(mt_obj_list) >= percentage))
+
+    def test_get_stations_by_period(self):
+        period = self.edi_collection.all_unique_periods[10]
+        station_freq = self.edi_collection.get_stations_by_period(period)
+        self.assertTrue(len(station_freq) > 0)
+        for mt_obj, p_index in station_freq:
+            self.assertTrue(abs(mt_obj.Z.freq[p_index] * period - 1) < .06)
@@ -0,0 +1,332 @@
+import glob
+from unittest import TestCase
+
+import numpy as np
+
+import mtpy.analysis.pt as MTpt
+import mtpy.utils.exceptions as MTex
+from mtpy.core.mt import MT
+
+edi_files = sorted(glob.glob("tests/data/edifiles/*.edi"))[:4] + \
+    ["tests/data/AMT/15125A_spe.edi"]
+
+
+def _z2pt_per_matrix(z_array, z_err_array):
+    """
+    reference implementation, the phase tensor and its error one 2x2
+    matrix at a time, zeros for singular matrices
+    """
+    pt = np.zeros(z_array.shape)
+    pterr = np.zeros(z_array.shape)
+    for index in np.ndindex(z_array.shape[:-2]):
+        realz = np.real(z_array[index])
+        imagz = np.imag(z_array[index])
+        err = z_err_array[index]
+        detreal = np.linalg.det(realz)
+        if detreal == 0:
+            continue
+        phi = np.dot(np.linalg.inv(realz), imagz)
+        pt[index] = phi
+        a = np.abs(detreal)
+        pterr[index][0, 0] = 1 / a * np.sqrt(np.sum([
+            (phi[0, 0] * realz[1, 1] * err[0, 0]) ** 2,
+            (phi[0, 0] * realz[0, 1] * err[1, 0]) ** 2,
+            ((imagz[0, 0] * realz[1, 0] - realz[0, 0] * imagz[1, 0]) / a *
+             realz[0, 0] * err[0, 1]) ** 2,
+            ((imagz[1, 0] * realz[0, 0] - realz[1, 0] * imagz[1, 1]) / a *
+             realz[0, 1] * err[1, 1]) ** 2,
+            (realz[1, 1] * err[0, 0]) ** 2, (realz[0, 1] * err[1, 0]) ** 2]))
+        pterr[index][0, 1] = 1 / a * np.sqrt(np.sum([
+            (phi[0, 1] * realz[1, 1] * err[0, 0]) ** 2,
+            (phi[0, 1] * realz[0, 1] * err[1, 0]) ** 2,
+            ((imagz[0, 1] * realz[1, 0] - realz[0, 0] * imagz[1, 1]) / a *
+             realz[1, 1] * err[0, 1]) ** 2,
+            ((imagz[1, 1] * realz[0, 0] - realz[0, 1] * imagz[1, 0]) / a *
+             realz[0, 1] * err[1, 1]) ** 2,
+            (realz[1, 1] * err[0, 1]) ** 2, (realz[0, 1] * err[1, 1]) ** 2]))
+        pterr[index][1, 0] = 1 / a * np.sqrt(np.sum([
+            (phi[1, 0] * realz[1, 0] * err[0, 1]) ** 2,
+            (phi[1, 0] * realz[0, 0] * err[1, 1]) ** 2,
+            ((imagz[0, 0] * realz[1, 1] - realz[0, 1] * imagz[1, 1]) / a *
+             realz[1, 0] * err[0, 0]) ** 2,
+            ((imagz[1, 0] * realz[0, 1] - realz[1, 1] * imagz[0, 0]) / a *
+             realz[0, 0] * err[0, 1]) ** 2,
+            (realz[1, 0] * err[0, 0]) ** 2, (realz[0, 0] * err[1, 0]) ** 2]))
+        pterr[index][1, 1] = 1 / a * np.sqrt(np.sum([
+            (phi[1, 1] * realz[1, 0] * err[0, 1]) ** 2,
+            (phi[1, 1] * realz[0, 0] * err[1, 1]) ** 2,
+            ((imagz[0, 1] * realz[1, 1] - realz[0, 1] * imagz[1, 1]) / a *
+             realz[1, 0] * err[0, 0]) ** 2,
+            ((imagz[1, 1] * realz[0, 1] - realz[1, 1] * imagz[0, 1]) / a *
+             realz[0, 0] * err[0, 1]) ** 2,
+            (realz[1, 0] * err[0, 1]) ** 2, (realz[0, 0] * err[1, 1]) ** 2]))
+    return pt, pterr
+
+
+def _random_z(shape, seed=0):
+    rs = np.random.RandomState(seed)
+    z = rs.normal(size=shape + (2, 2)) + 1j * rs.normal(size=shape + (2, 2))
+    z_err = np.abs(rs.normal(size=shape + (2, 2))) * .1
+    return z, z_err
+
+
+class TestZ2PTBatch(TestCase):
+    def test_against_per_matrix(self):
+        z, z_err = _random_z((7, 13))
+        # a singular real part and a tensor without data
+        z[2, 3].real = [[1., 2.], [2., 4.]]
+        z[4, 5] = 0
+        pt, pterr, singular = MTpt.z2pt_batch(z, z_err)
+        s_pt, s_pterr = _z2pt_per_matrix(z, z_err)
+        self.assertTrue(np.allclose(pt, s_pt))
+        self.assertTrue(np.allclose(pterr, s_pterr))
+        self.assertEqual(list(zip(*np.nonzero(singular))), [(2, 3), (4, 5)])
+        self.assertTrue(np.all(pt[singular] == 0))
+
+        pt_only, pterr_none, _ = MTpt.z2pt_batch(z)
+        self.assertTrue(np.all(pt_only == pt))
+        self.assertIsNone(pterr_none)
+
+    def test_z2pt(self):
+        z, z_err = _random_z((5,))
+        pt, pterr = MTpt.z2pt(z[1], z_err[1])
+        self.assertTrue(np.allclose(pt, np.dot(np.linalg.inv(z[1].real),
+                                               z[1].imag)))
+        self.assertTrue(np.allclose(pterr, _z2pt_per_matrix(z, z_err)[1][1]))
+
+        # a single singular matrix raises, a stack is masked
+        z[2].real = [[1., 2.], [2., 4.]]
+        self.assertRaises(MTex.MTpyError_PT, MTpt.z2pt, z[2], z_err[2])
+        pt, pterr = MTpt.z2pt(z, z_err)
+        self.assertTrue(np.all(pt[2] == 0))
+        self.assertTrue(np.allclose(pt, _z2pt_per_matrix(z, z_err)[0]))
+        # no data
+        pt, pterr = MTpt.z2pt(np.zeros((2, 2), dtype='complex'))
+        self.assertTrue(np.all(pt == 0))
+        self.assertIsNone(pterr)
+
+    def test_phase_tensor(self):
+        for edi_fn in edi_files:
+            z_obj = MT(edi_fn).Z
+            s_pt, s_pterr = _z2pt_per_matrix(z_obj.z, z_obj.z_err)
+            for pt_obj in [MTpt.PhaseTensor(z_object=z_obj),
+                           MTpt.PhaseTensor(z_array=z_obj.z,
+                                            z_err_array=z_obj.z_err,
+                                            freq=z_obj.freq)]:
+                self.assertTrue(np.allclose(pt_obj.pt, s_pt, equal_nan=True))
+                self.assertTrue(np.allclose(pt_obj.pterr, s_pterr,
+                                            equal_nan=True))
+
+            pt_obj = MTpt.PhaseTensor(z_array=z_obj.z, freq=z_obj.freq)
+            self.assertTrue(np.allclose(pt_obj.pt, s_pt, equal_nan=True))
+            self.assertTrue(np.all(pt_obj.pterr == 0))
+
+
+def _attributes_by_getter(pt, pterr):
+    """
+    reference implementation, each attribute computed on its own as by the
+    separate PhaseTensor getters
+    """
+    pi1 = 0.5 * np.sqrt((pt[:, 0, 0] - pt[:, 1, 1]) ** 2 +
+                        (pt[:, 0, 1] + pt[:, 1, 0]) ** 2)
+    pi2 = 0.5 * np.sqrt((pt[:, 0, 0] + pt[:, 1, 1]) ** 2 +
+                        (pt[:, 0, 1] - pt[:, 1, 0]) ** 2)
+    pi1err = 1. / pi1 * np.sqrt(
+        (pt[:, 0, 0] - pt[:, 1, 1]) ** 2 *
+        (pterr[:, 0, 0] ** 2 + pterr[:, 1, 1] ** 2) +
+        (pt[:, 0, 1] + pt[:, 1, 0]) ** 2 *
+        (pterr[:, 0, 1] ** 2 + pterr[:, 1, 0] ** 2))
+    pi2err = 1. / pi2 * np.sqrt(
+        (pt[:, 0, 0] + pt[:, 1, 1]) ** 2 *
+        (pterr[:, 0, 0] ** 2 + pterr[:, 1, 1] ** 2) +
+        (pt[:, 0, 1] - pt[:, 1, 0]) ** 2 *
+        (pterr[:, 0, 1] ** 2 + pterr[:, 1, 0] ** 2))
+    phimin = np.degrees(np.arctan(pi2 - pi1))
+    phimax = np.degrees(np.arctan(pi2 + pi1))
+    phierr = np.degrees(np.arctan(np.sqrt(pi2err ** 2 + pi1err ** 2)))
+
+    y = pt[:, 0, 1] + pt[:, 1, 0]
+    x = pt[:, 0, 0] - pt[:, 1, 1]
+    alpha = np.degrees(0.5 * np.arctan2(y, x))
+    alphaerr = 0.5 / (x ** 2 + y ** 2) * np.sqrt(
+        y ** 2 * (pterr[:, 0, 0] ** 2 + pterr[:, 1, 1] ** 2) +
+        x ** 2 * (pterr[:, 0, 1] ** 2 + pterr[:, 1, 0] ** 2))
+    y = pt[:, 0, 1] - pt[:, 1, 0]
+    x = pt[:, 0, 0] + pt[:, 1, 1]
+    beta = np.degrees(0.5 * np.arctan2(y, x))
+    betaerr = 0.5 / (x ** 2 + y ** 2) * np.sqrt(
+        y ** 2 * (pterr[:, 0, 0] ** 2 + pterr[:, 1, 1] ** 2) +
+        x ** 2 * (pterr[:, 0, 1] ** 2 + pterr[:, 1, 0] ** 2))
+
+    ellip = (phimax - phimin) / (phimax + phimin)
+    ellip_err = ellip * np.sqrt(2 * phierr) * np.sqrt(
+        (1 / (phimax - phimin)) ** 2 + (1 / (phimax + phimin)) ** 2)
+
+    return {'phimin': (phimin, phierr), 'phimax': (phimax, phierr),
+            'alpha': (alpha, alphaerr), 'beta': (beta, betaerr),
+            'azimuth': (alpha - beta, np.sqrt(alphaerr + betaerr)),
+            'ellipticity': (ellip, ellip_err),
+            'det': (np.array([np.linalg.det(pp) for pp in pt]), None),
+            'trace': (np.array([np.trace(pp) for pp in pt]),
+                      pterr[:, 0, 0] + pterr[:, 1, 1])}
+
+
+class TestPTAttributes(TestCase):
+    def test_against_getters(self):
+        z, z_err = _random_z((40,), seed=3)
+        pt, pterr = MTpt.z2pt(z, z_err)
+        attributes = MTpt.pt_attributes(pt, pterr)
+        self.assertEqual(attributes.shape, (40,))
+        for name, (value, err) in _attributes_by_getter(pt, pterr).items():
+            self.assertTrue(np.allclose(attributes[name], value), name)
+            if err is not None:
+                self.assertTrue(np.allclose(attributes[name + '_err'], err),
+                                name)
+
+        no_err = MTpt.pt_attributes(pt)
+        self.assertTrue(np.all(no_err.phimin == attributes.phimin))
+        self.assertTrue(np.all(np.isnan(no_err.phimin_err)))
+
+    def test_multi_station(self):
+        z, z_err = _random_z((6, 11), seed=4)
+        pt, pterr, singular = MTpt.z2pt_batch(z, z_err)
+        attributes = MTpt.pt_attributes(pt, pterr)
+        self.assertEqual(attributes.shape, (6, 11))
+        for ii in range(6):
+            station = MTpt.pt_attributes(pt[ii], pterr[ii])
+            self.assertTrue(np.all(attributes[ii] == station))
+
+    def test_phase_tensor_cache(self):
+        z_obj = MT(edi_files[0]).Z
+        pt_obj = MTpt.PhaseTensor(z_object=z_obj)
+        attributes = pt_obj.attributes
+        self.assertIs(pt_obj.attributes, attributes)
+        self.assertTrue(np.all(pt_obj.phimin[0] == attributes.phimin))
+        self.assertTrue(np.all(pt_obj.azimuth[1] == attributes.azimuth_err))
+        # the returned arrays are copies
+        pt_obj.phimax[0][:] = 0
+        self.assertTrue(np.all(pt_obj.phimax[0] == attributes.phimax))
+
+        # rotating recomputes the attributes
+        alpha = pt_obj.alpha[0]
+        pt_obj.rotate(30)
+        self.assertIsNot(pt_obj.attributes, attributes)
+        self.assertTrue(np.allclose(pt_obj.alpha[0] % 180, (alpha - 30) % 180))
+
+        pt_obj = MTpt.PhaseTensor(z_array=z_obj.z, freq=z_obj.freq)
+        pt_obj.pterr = None
+        self.assertIsNone(pt_obj.phimin[1])
+        self.assertTrue(np.allclose(pt_obj.only2d[:, 0, 0], pt_obj.phimax[0]))
+
+
+def _residual_pt_per_matrix(pt1, pt2, pt1err, pt2err):
+    """
+    reference implementation, the residual phase tensor and its error one
+    2x2 matrix at a time
+    """
+    import mtpy.utils.calculator as MTcc
+
+    rpt = np.zeros(pt1.shape)
+    rpterr = np.zeros(pt1.shape)
+    for index in np.ndindex(pt1.shape[:-2]):
+        rpt[index] = np.eye(2) - np.dot(np.linalg.inv(pt1[index]), pt2[index])
+        inv2, inv2err = MTcc.invertmatrix_incl_errors(
+            pt2[index], inmatrix_err=pt2err[index])
+        err1 = MTcc.multiplymatrices_incl_errors(inv2, pt1[index], inv2err,
+                                                 pt1err[index])[1]
+        err2 = MTcc.multiplymatrices_incl_errors(pt1[index], inv2,
+                                                 pt1err[index], inv2err)[1]
+        rpterr[index] = np.sqrt(0.25 * err1 ** 2 + 0.25 * err2 ** 2)
+    return rpt, rpterr
+
+
+class TestResidualPTBatch(TestCase):
+    def test_against_per_matrix(self):
+        z, z_err = _random_z((5, 9), seed=5)
+        pt1, pt1err = MTpt.z2pt_batch(z, z_err)[:2]
+        pt2, pt2err = MTpt.z2pt_batch(z * 1.1 + .2j, z_err)[:2]
+        rpt, rpterr, attributes, singular = MTpt.residual_pt_batch(
+            pt1, pt2, pt1err, pt2err)
+        s_rpt, s_rpterr = _residual_pt_per_matrix(pt1, pt2, pt1err, pt2err)
+        self.assertTrue(np.allclose(rpt, s_rpt))
+        self.assertTrue(np.allclose(rpterr, s_rpterr))
+        self.assertFalse(singular.any())
+        self.assertEqual(attributes.shape, (5, 9))
+        self.assertTrue(np.all(attributes == MTpt.pt_attributes(rpt, rpterr)))
+
+    def test_singular(self):
+        z, z_err = _random_z((3, 4), seed=6)
+        pt1, pt1err = MTpt.z2pt_batch(z, z_err)[:2]
+        pt2, pt2err = pt1 * 1.2, pt1err
+        pt1[1, 2] = 0
+        pt2[2, 0] = [[1., 2.], [2., 4.]]
+        rpt, rpterr, attributes, singular = MTpt.residual_pt_batch(
+            pt1, pt2, pt1err, pt2err)
+        self.assertEqual(list(zip(*np.nonzero(singular))), [(1, 2), (2, 0)])
+        # zeros where either tensor is singular
+        self.assertTrue(np.all(rpt[singular] == 0))
+        self.assertTrue(np.all(attributes[singular]['phimax'] == 0))
+        self.assertTrue(np.all(rpterr[singular] == 0))
+        self.assertTrue(np.allclose(rpt[0], -.2 * np.eye(2)))
+        self.assertIsNone(MTpt.residual_pt_batch(pt1, pt2)[1])
+        self.assertRaises(MTex.MTpyError_PT, MTpt.residual_pt_batch, pt1,
+                          pt2[:2])
+
+    def test_residual_pt_list(self):
+        z, z_err = _random_z((4, 6), seed=7)
+        pt1, pt1err = MTpt.z2pt_batch(z, z_err)[:2]
+        pt2, pt2err = MTpt.z2pt_batch(z * 1.1 + .2j, z_err)[:2]
+        pt1_list = list(pt1)
+        pt2_list = list(pt2)
+        # response with fewer periods and a station without data
+        pt2_list[1] = pt2[1, :4]
+        pt1_list[3] = None
+        rpt, rpterr, attributes, matched = MTpt.residual_pt_list(
+            pt1_list, pt2_list, list(pt1err), list(pt2err))
+        self.assertEqual(list(matched), [True, False, True, False])
+        self.assertEqual(rpt.shape, (4, 6, 2, 2))
+        self.assertEqual(rpterr.shape, (4, 6, 2, 2))
+        rpt_ref, rpterr_ref, attributes_ref = MTpt.residual_pt_batch(
+            pt1[[0, 2]], pt2[[0, 2]], pt1err[[0, 2]], pt2err[[0, 2]])[:3]
+        self.assertTrue(np.allclose(rpt[matched], rpt_ref))
+        self.assertTrue(np.allclose(rpterr[matched], rpterr_ref))
+        self.assertTrue(np.all(rpt[~matched] == 0))
+        self.assertTrue(np.all(rpterr[~matched] == 0))
+        for name in attributes.dtype.names:
+            self.assertTrue(np.allclose(attributes[matched][name],
+                                        attributes_ref[name], equal_nan=True))
+            self.assertTrue(np.all(attributes[~matched][name] == 0))
+
+        # without errors
+        rpt, rpterr, attributes, matched = MTpt.residual_pt_list(pt1_list,
+                                                                 pt2_list)
+        self.assertIsNone(rpterr)
+        self.assertTrue(np.allclose(rpt[matched], rpt_ref))
+
+        # nothing to compare, zeros for all periods of the data
+        rpt, rpterr, attributes, matched = MTpt.residual_pt_list(
+            [pt1[0], None], [pt2[0, :4], pt2[1]])
+        self.assertFalse(matched.any())
+        self.assertEqual(rpt.shape, (2, 6, 2, 2))
+        self.assertEqual(attributes.shape, (2, 6))
+        self.assertTrue(np.all(rpt == 0))
+
+    def test_residual_phase_tensor(self):
+        mt_obj = MT(edi_files[1])
+        pt_obj1 = mt_obj.pt
+        pt_obj2 = MTpt.PhaseTensor(z_array=mt_obj.Z.z * 1.05,
+                                   z_err_array=mt_obj.Z.z_err,
+                                   freq=mt_obj.Z.freq)
+        rpt_obj = MTpt.ResidualPhaseTensor(pt_obj1, pt_obj2)
+        s_rpt, s_rpterr = _residual_pt_per_matrix(pt_obj1.pt, pt_obj2.pt,
+                                                  pt_obj1.pterr,
+                                                  pt_obj2.pterr)
+        self.assertTrue(np.allclose(rpt_obj.rpt, s_rpt))
+        self.assertTrue(np.allclose(rpt_obj.rpterr, s_rpterr))
+        self.assertTrue(np.allclose(rpt_obj.residual_pt.phimin[0],
+                                    MTpt.pt_attributes(s_rpt).phimin))
+
+        # a single tensor
+        rpt_obj.read_pts(pt_obj1.pt[0], pt_obj2.pt[0])
+        self.assertEqual(rpt_obj.rpt.shape, (1, 2, 2))
+        self.assertTrue(np.allclose(rpt_obj.rpt[0], s_rpt[0]))
@@ -0,0 +1,119 @@
+import glob
+from unittest import TestCase
+
+import numpy as np
+
+import mtpy.utils.exceptions as MTex
+import mtpy.utils.latlon_utm_conversion as MTutm
+from mtpy.core.edi_collection import EdiCollection
+from mtpy.core.spatial_index import SpatialIndex, geodetic_to_cartesian
+from mtpy.core.z_stack import ZStack
+
+edi_files = sorted(glob.glob("tests/data/edifiles/*.edi"))
+
+
+def _distances(lat, lon, lat0, lon0):
+    """
+    reference, distances to all stations
+    """
+    return np.sqrt(np.sum((geodetic_to_cartesian(lat, lon) -
+                           geodetic_to_cartesian(lat0, lon0)) ** 2,
+                          axis=-1))
+
+
+class TestSpatialIndex(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rs = np.random.RandomState(0)
+        # a survey across the UTM zones 53 to 55
+        cls.lat = rs.uniform(-25, -20, 2000)
+        cls.lon = rs.uniform(134, 148, 2000)
+        cls.lat[[5, 17]] = np.nan
+        cls.station = ['mt{0:04d}'.format(ii) for ii in range(2000)]
+        cls.s_index = SpatialIndex(cls.lat, cls.lon, station=cls.station)
+
+    def test_distance(self):
+        # distances are meters, within the scale error of UTM in one zone
+        zone, east_0, north_0 = MTutm.LLtoUTM(23, -22., 141.)
+        zone, east_1, north_1 = MTutm.LLtoUTM(23, -22.05, 141.08)
+        utm_distance = np.hypot(east_1 - east_0, north_1 - north_0)
+        distance = _distances(-22.05, 141.08, -22., 141.)
+        self.assertTrue(abs(distance / utm_distance - 1) < 1e-3)
+
+    def test_query_radius(self):
+        for lat0, lon0 in [(-22., 141.), (-24.9, 134.1), (-22.5, 143.999)]:
+            for radius in [1e3, 2e4, 1e5]:
+                indices, distances = self.s_index.query_radius(lat0, lon0,
+                                                               radius)
+                ref_distances = _distances(self.lat, self.lon, lat0, lon0)
+                with np.errstate(invalid='ignore'):
+                    ref_indices = np.nonzero(ref_distances <= radius)[0]
+                self.assertEqual(sorted(indices), list(ref_indices))
+                self.assertTrue(np.all(np.diff(distances) >= 0))
+                self.assertTrue(np.allclose(distances,
+                                            ref_distances[indices]))
+
+    def test_query_nearest(self):
+        indices, distances = self.s_index.query_nearest(-22., 141., k=7)
+        ref_distances = _distances(self.lat, self.lon, -22., 141.)
+        ref_distances[np.isnan(ref_distances)] = np.inf
+        self.assertEqual(list(indices), list(np.argsort(ref_distances)[:7]))
+
+        indices, distances = self.s_index.query_station_nearest('mt0100', k=3)
+        ref_distances = _distances(self.lat, self.lon, self.lat[100],
+                                   self.lon[100])
+        ref_distances[np.isnan(ref_distances)] = np.inf
+        self.assertEqual(list(indices),
+                         list(np.argsort(ref_distances)[1:4]))
+
+    def test_query_station_radius(self):
+        indices, distances = self.s_index.query_station_radius(100, 5e4)
+        self.assertNotIn(100, indices)
+        ref_indices, ref_distances = self.s_index.query_radius(
+            self.lat[100], self.lon[100], 5e4)
+        self.assertEqual(list(indices), list(ref_indices[1:]))
+
+        neighbours = self.s_index.neighbours(5e4)
+        self.assertEqual(len(neighbours), 2000)
+        self.assertEqual(list(neighbours[100][0]), list(indices))
+        self.assertEqual(len(neighbours[5][0]), 0)
+        self.assertRaises(MTex.MTpyError_inputarguments,
+                          self.s_index.query_station_radius, 'mt0005', 1e3)
+        self.assertRaises(MTex.MTpyError_inputarguments,
+                          self.s_index.query_station_radius, 'none', 1e3)
+
+    def test_query_bbox(self):
+        indices = self.s_index.query_bbox(140., -23., 141.5, -21.)
+        with np.errstate(invalid='ignore'):
+            ref = (self.lon >= 140.) & (self.lon <= 141.5) & \
+                (self.lat >= -23.) & (self.lat <= -21.)
+        self.assertEqual(list(indices), list(np.nonzero(ref)[0]))
+
+    def test_empty(self):
+        s_index = SpatialIndex([np.nan], [np.nan])
+        self.assertEqual(len(s_index.query_radius(0., 0., 1e7)[0]), 0)
+        self.assertEqual(len(s_index.query_nearest(0., 0., 3)[0]), 0)
+
+
+class TestCollectionSpatialIndex(TestCase):
+    def test_edi_collection(self):
+        edi_collection = EdiCollection(edi_files)
+        s_index = edi_collection.spatial_index
+        self.assertIs(s_index, edi_collection.spatial_index)
+        mt_obj = edi_collection.mt_obj_list[3]
+        indices, distances = s_index.query_station_nearest(mt_obj.station,
+                                                           k=2)
+        self.assertEqual(len(indices), 2)
+        self.assertNotIn(3, indices)
+
+    def test_z_stack(self):
+        z_stack = ZStack(z_array=np.zeros((3, 2, 2, 2)), freq=[1., 2.],
+                         lat=[-20., -20.01, np.nan], lon=[140., 140., 140.])
+        s_index = z_stack.spatial_index
+        self.assertIs(s_index, z_stack.spatial_index)
+        self.assertEqual(list(s_index.query_station_radius(0, 2e3)[0]), [1])
+
+        z_stack.lat = np.array([-20., -20.1, -20.])
+        self.assertIsNot(s_index, z_stack.spatial_index)
+        self.assertEqual(list(z_stack.spatial_index.query_station_radius(
+            0, 2e3)[0]), [2])
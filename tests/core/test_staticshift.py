@@ -0,0 +1,71 @@
+import glob
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+import mtpy.analysis.staticshift as MTss
+from mtpy.core.mt import MT
+from mtpy.utils.exceptions import MTpyError_inputarguments
+
+edi_path = "tests/data/edifiles"
+edi_files = sorted(glob.glob(os.path.join(edi_path, "*.edi")))
+
+
+class TestSpatialMedianStaticShift(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.ss_obj = MTss.SpatialMedianStaticShift.from_edi_files(
+            edi_path, radius=5000., n_workers=1)
+        cls.table = cls.ss_obj.estimate()
+
+    def test_same_as_per_station(self):
+        self.assertEqual(len(self.table), len(edi_files))
+        for row, edi_fn in zip(self.table, self.ss_obj.edi_list):
+            ss_x, ss_y = MTss.estimate_static_spatial_median(edi_fn,
+                                                             radius=5000.)
+            self.assertAlmostEqual(row.ss_x, ss_x)
+            self.assertAlmostEqual(row.ss_y, ss_y)
+        self.assertTrue(np.any(self.table.ss_x != 1))
+
+    def test_no_neighbours(self):
+        ss_obj = MTss.SpatialMedianStaticShift(self.ss_obj.z_stack,
+                                               radius=1.)
+        table = ss_obj.estimate()
+        self.assertTrue(np.all(table.n_near == 0))
+        self.assertTrue(np.all(table.ss_x == 1))
+        self.assertTrue(np.all(table.ss_y == 1))
+        self.assertRaises(MTpyError_inputarguments, ss_obj.write_edi_files)
+
+    def test_remove_static_shift(self):
+        z_corrected = self.ss_obj.remove_static_shift()
+        for ii, row in enumerate(self.table):
+            z_obj = self.ss_obj.z_stack.get_z(ii)
+            valid = self.ss_obj.z_stack.mask[ii]
+            z_ss = z_obj.remove_ss(reduce_res_factor_x=row.ss_x,
+                                   reduce_res_factor_y=row.ss_y)[1]
+            self.assertTrue(np.allclose(z_corrected[ii, valid], z_ss))
+
+    def test_write(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            new_fn_list = self.ss_obj.write_edi_files(save_path=tmp_dir)
+            z_corrected = self.ss_obj.remove_static_shift()
+            for ii, new_fn in enumerate(new_fn_list):
+                self.assertTrue(new_fn.endswith('_ss.edi'))
+                valid = self.ss_obj.z_stack.mask[ii]
+                self.assertTrue(np.allclose(MT(new_fn).Z.z,
+                                            z_corrected[ii, valid],
+                                            rtol=1e-5))
+
+            table_fn = self.ss_obj.write_shift_table(
+                os.path.join(tmp_dir, 'ss.csv'))
+            table = np.genfromtxt(table_fn, delimiter=',', names=True,
+                                  dtype=None)
+            self.assertEqual(len(table), len(self.table))
+            self.assertTrue(np.allclose(table['ss_x'], self.table.ss_x,
+                                        atol=1e-6))
+        finally:
+            shutil.rmtree(tmp_dir)
@@ -0,0 +1,120 @@
+import glob
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+import mtpy.utils.exceptions as MTex
+from mtpy.core.edi_collection import EdiCollection
+from mtpy.core.mt import MT
+from mtpy.core.survey_archive import SurveyArchive, archive_to_edi, \
+    edi_to_archive, is_archive, write_archive
+from mtpy.core.z_stack import ZStack
+from mtpy.modeling.modem_data import Data
+
+edi_path = "tests/data/edifiles"
+edi_files = sorted(glob.glob(os.path.join(edi_path, "*.edi")))
+
+
+class TestSurveyArchive(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.mkdtemp()
+        cls.archive_dir = os.path.join(cls.tmp_dir, 'survey')
+        cls.archive = edi_to_archive(edi_path, cls.archive_dir)
+        cls.mt_ref = [MT(edi_fn) for edi_fn in edi_files]
+        cls.z_ref = ZStack.from_mt_list(cls.mt_ref)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir)
+
+    def test_arrays(self):
+        archive = SurveyArchive(self.archive_dir)
+        self.assertTrue(is_archive(self.archive_dir))
+        self.assertFalse(is_archive(edi_path))
+        self.assertIsInstance(archive.z, np.memmap)
+        self.assertEqual(archive.n_stations, len(edi_files))
+        self.assertEqual(list(archive.station),
+                         [mt_obj.station for mt_obj in self.mt_ref])
+        self.assertTrue(np.all(archive.freq == self.z_ref.freq))
+        for name in ['z', 'z_err', 'tipper', 'tipper_err', 'mask',
+                     'tipper_mask']:
+            self.assertTrue(np.all(getattr(archive, name) ==
+                                   getattr(self.z_ref, name)), name)
+        self.assertTrue(np.allclose(archive.east,
+                                    [mt_obj.east for mt_obj in self.mt_ref]))
+        self.assertEqual(list(archive.utm_zone),
+                         [mt_obj.utm_zone for mt_obj in self.mt_ref])
+        self.assertEqual(list(archive.fn),
+                         [os.path.abspath(fn) for fn in edi_files])
+
+    def test_get_period(self):
+        period = self.archive.period[7] * 1.01
+        z_stack = self.archive.get_period(period)
+        self.assertEqual(z_stack.z.shape, (len(edi_files), 1, 2, 2))
+        self.assertTrue(np.all(z_stack.z[:, 0] == self.z_ref.z[:, 7]))
+        self.assertTrue(np.all(z_stack.mask[:, 0] == self.z_ref.mask[:, 7]))
+        self.assertRaises(MTex.MTpyError_inputarguments,
+                          self.archive.get_period, period * 1.5)
+
+    def test_get_station(self):
+        station = self.mt_ref[3].station
+        z_stack = self.archive.get_station([station, 5])
+        self.assertEqual(list(z_stack.station),
+                         [station, self.mt_ref[5].station])
+        self.assertTrue(np.all(z_stack.z == self.z_ref.z[[3, 5]]))
+
+        mt_obj = self.archive.get_mt(station)
+        self.assertEqual(mt_obj.station, station)
+        self.assertEqual(mt_obj.fn, os.path.abspath(edi_files[3]))
+        self.assertTrue(np.all(mt_obj.Z.z == self.mt_ref[3].Z.z))
+        self.assertTrue(np.all(mt_obj.Tipper.tipper ==
+                               self.mt_ref[3].Tipper.tipper))
+        self.assertRaises(MTex.MTpyError_inputarguments,
+                          self.archive.get_mt, 'no_station')
+
+    def test_edi_round_trip(self):
+        edi_dir = os.path.join(self.tmp_dir, 'edi')
+        edi_list = archive_to_edi(self.archive_dir, edi_dir)
+        self.assertEqual(len(edi_list), len(edi_files))
+
+        archive = edi_to_archive(edi_dir, os.path.join(self.tmp_dir, 'copy'))
+        self.assertEqual(list(archive.station), list(self.archive.station))
+        self.assertTrue(np.allclose(archive.lat, self.archive.lat))
+        self.assertTrue(np.allclose(archive.elev, self.archive.elev))
+        self.assertTrue(np.all(archive.mask == self.archive.mask))
+        self.assertTrue(np.all(archive.tipper_mask ==
+                               self.archive.tipper_mask))
+        self.assertTrue(np.allclose(archive.z, self.archive.z, rtol=1e-5))
+        self.assertTrue(np.allclose(archive.tipper, self.archive.tipper,
+                                    rtol=1e-5))
+
+    def test_overwrite(self):
+        archive_dir = os.path.join(self.tmp_dir, 'overwrite')
+        z_stack = self.archive.get_station([0, 1])
+        write_archive(archive_dir, z_stack)
+        self.assertRaises(MTex.MTpyError_inputarguments, write_archive,
+                          archive_dir, z_stack)
+        archive = write_archive(archive_dir, self.archive.get_station(2),
+                                overwrite=True)
+        self.assertEqual(list(archive.station), [self.mt_ref[2].station])
+
+    def test_edi_collection(self):
+        edi_collection = EdiCollection(archive=self.archive_dir)
+        self.assertEqual(edi_collection.edifiles,
+                         [os.path.abspath(fn) for fn in edi_files])
+        self.assertTrue(np.allclose(edi_collection.all_unique_periods,
+                                    EdiCollection(edi_files).
+                                    all_unique_periods))
+
+    def test_modem_data(self):
+        data = Data(archive=self.archive)
+        data.get_mt_dict()
+        self.assertEqual(sorted(data.mt_dict.keys()),
+                         sorted([mt_obj.station for mt_obj in self.mt_ref]))
+        for mt_ref in self.mt_ref:
+            self.assertTrue(np.all(data.mt_dict[mt_ref.station].Z.z ==
+                                   mt_ref.Z.z))
@@ -0,0 +1,182 @@
+import csv
+import filecmp
+import glob
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+import mtpy.core.mt_loader as mt_loader
+import mtpy.core.survey_export as survey_export
+from mtpy.core.edi_collection import EdiCollection
+from mtpy.core.mt import MT
+from mtpy.core.period_index import PeriodIndex
+
+edi_files = sorted(glob.glob("tests/data/edifiles/*.edi"))
+
+
+def _square(value):
+    return value ** 2
+
+
+def _phase_tensor_rows(mt_list, freq_list, ptol):
+    """
+    reference implementation, a row per frequency and station found by a
+    scan over the stations
+    """
+    rows = []
+    for freq in freq_list:
+        for mt_obj in mt_list:
+            station_freq = mt_obj.Z.freq
+            found = np.nonzero((station_freq > freq * (1 - ptol)) &
+                               (station_freq < freq * (1 + ptol)))[0]
+            if len(found) == 0:
+                continue
+            p_index = found[0]
+            rows.append([mt_obj.station, freq, mt_obj.lon, mt_obj.lat,
+                         mt_obj.pt.phimin[0][p_index],
+                         mt_obj.pt.phimax[0][p_index],
+                         mt_obj.pt.azimuth[0][p_index],
+                         mt_obj.pt.beta[0][p_index],
+                         2 * mt_obj.pt.beta[0][p_index],
+                         mt_obj.pt.ellipticity[0][p_index],
+                         mt_obj.Tipper.mag_real[p_index],
+                         mt_obj.Tipper.mag_imag[p_index],
+                         mt_obj.Tipper.angle_real[p_index],
+                         mt_obj.Tipper.angle_imag[p_index]])
+    return rows
+
+
+class TestMatchFrequencies(TestCase):
+    def test_against_period_index(self):
+        rs = np.random.RandomState(0)
+        station_freq = np.concatenate([np.logspace(3, -3, 30),
+                                       np.logspace(2.01, -1.99, 9)])
+        rs.shuffle(station_freq)
+        freq = np.logspace(3.5, -3.5, 101)
+        for ptol in [0.01, 0.05, 0.2]:
+            positions = survey_export.match_frequencies(station_freq, freq,
+                                                        ptol)
+            p_index = PeriodIndex([station_freq], ptol=ptol)
+            for f_index, ff in enumerate(freq):
+                expected = p_index.find_freq(ff)[1]
+                self.assertEqual(positions[f_index],
+                                 expected[0] if len(expected) else -1)
+
+    def test_empty(self):
+        self.assertEqual(list(survey_export.match_frequencies([], [1., 2.])),
+                         [-1, -1])
+
+
+class TestPoolImap(TestCase):
+    def test_order(self):
+        items = range(20)
+        for n_workers in [1, 2]:
+            for pool in ['process', 'thread']:
+                self.assertEqual(list(mt_loader.pool_imap(
+                    _square, iter(items), n_workers=n_workers, pool=pool)),
+                    [item ** 2 for item in items])
+
+    def test_lazy(self):
+        results = mt_loader.pool_imap(_square, iter([1, 2, None]),
+                                      n_workers=1)
+        self.assertEqual(next(results), 1)
+        self.assertEqual(next(results), 4)
+
+
+class TestSurveyExport(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.mkdtemp()
+        cls.mt_list = [MT(edi_fn) for edi_fn in edi_files]
+        cls.freq = PeriodIndex([mt_obj.Z.freq for mt_obj in
+                                cls.mt_list]).unique_freq
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir)
+
+    def _csv(self, name, sources, buffer_rows=10000, n_workers=1):
+        csv_dir = os.path.join(self.tmp_dir, name)
+        os.mkdir(csv_dir)
+        csv_fn = os.path.join(csv_dir, 'pt.csv')
+        freq_fns = [os.path.join(csv_dir, 'pt_{0}.csv'.format(ii))
+                    for ii in range(len(self.freq))]
+        with survey_export.CsvTableWriter(csv_fn, freq_fns,
+                                          survey_export.PT_COLUMNS,
+                                          buffer_rows=buffer_rows) as writer:
+            counts = survey_export.export_tables(
+                survey_export.phase_tensor_table, sources, self.freq, writer,
+                n_workers=n_workers)
+        return csv_fn, freq_fns, counts
+
+    def test_csv_against_scan(self):
+        csv_fn, freq_fns, counts = self._csv('scan', self.mt_list,
+                                             buffer_rows=7)
+        expected = _phase_tensor_rows(self.mt_list, self.freq, 0.05)
+        with open(csv_fn, 'rb') as csvf:
+            rows = list(csv.reader(csvf))
+        self.assertEqual(rows[0], survey_export.PT_COLUMNS)
+        self.assertEqual(len(rows) - 1, len(expected))
+        self.assertEqual(counts.sum(), len(expected))
+        for row, expected_row in zip(rows[1:], expected):
+            self.assertEqual(row[0], expected_row[0])
+            self.assertTrue(np.allclose(np.array(row[1:], dtype='float'),
+                                        np.array(expected_row[1:],
+                                                 dtype='float'),
+                                        equal_nan=True))
+        # the frequency files hold the rows of their frequency
+        with open(freq_fns[-1], 'rb') as csvf:
+            self.assertEqual(len(list(csv.reader(csvf))) - 1, counts[-1])
+
+    def test_workers_and_files(self):
+        csv_fn = self._csv('serial', self.mt_list)[0]
+        csv_pool = self._csv('pool', edi_files, n_workers=2)[0]
+        self.assertTrue(filecmp.cmp(csv_fn, csv_pool, shallow=False))
+
+    def test_npz(self):
+        npz_dir = os.path.join(self.tmp_dir, 'npz')
+        os.mkdir(npz_dir)
+        npz_fn = os.path.join(npz_dir, 'pt.npz')
+        with survey_export.NpzTableWriter(npz_fn,
+                                          survey_export.PT_COLUMNS) as writer:
+            survey_export.export_tables(survey_export.phase_tensor_table,
+                                        self.mt_list, self.freq, writer)
+        # the temporary column files are removed
+        self.assertEqual(os.listdir(npz_dir), ['pt.npz'])
+
+        columns = np.load(npz_fn)
+        self.assertEqual(sorted(columns.files),
+                         sorted(survey_export.PT_COLUMNS))
+        # station order
+        station_rows = [survey_export.phase_tensor_table(mt_obj, self.freq)
+                        for mt_obj in self.mt_list]
+        self.assertEqual(list(columns['station']),
+                         [name for table in station_rows
+                          for name in table[1][0]])
+        self.assertTrue(np.allclose(
+            columns['phi_min'],
+            np.concatenate([table[1][4] for table in station_rows]),
+            equal_nan=True))
+        self.assertTrue(np.all(columns['freq'] == self.freq[
+            np.concatenate([table[0] for table in station_rows])]))
+
+    def test_edi_collection(self):
+        edi_collection = EdiCollection(edi_files)
+        out_dir = os.path.join(self.tmp_dir, 'collection')
+        edi_collection.create_measurement_csv(out_dir)
+        npz_fn = edi_collection.create_measurement_npz(out_dir)
+        with open(os.path.join(out_dir, 'edi_measurement.csv'), 'rb') as csvf:
+            rows = list(csv.reader(csvf))
+        columns = np.load(npz_fn)
+        self.assertEqual(len(rows) - 1, len(columns['FREQ']))
+        self.assertEqual(sorted(row[1] for row in rows[1:]),
+                         sorted(columns['STATION']))
+        self.assertTrue(np.allclose(
+            np.sort(np.array([row[17] for row in rows[1:]], dtype='float')),
+            np.sort(columns['RHOxy'])))
+        self.assertEqual(len(glob.glob(os.path.join(
+            out_dir, 'edi_measurement_*Hz.csv'))),
+            len(edi_collection.all_frequencies))
@@ -0,0 +1,213 @@
+import glob
+from unittest import TestCase
+
+import numpy as np
+
+import mtpy.utils.calculator as MTcc
+from mtpy.core.edi import Edi
+from mtpy.core.z import Z, Tipper
+
+edi_files = glob.glob("tests/data/edifiles/*.edi") + \
+    glob.glob("tests/data/AMT/*.edi") + \
+    glob.glob("tests/data/BBMT/*.edi") + \
+    ["tests/data/LMT/VIC100_ANSIR.edi"]
+
+
+def _res_phase_per_element(z, z_err, freq):
+    """
+    reference implementation, one tensor element at a time
+    """
+    res = np.zeros(z.shape)
+    phase = np.zeros(z.shape)
+    res_err = np.zeros(z.shape)
+    phase_err = np.zeros(z.shape)
+    for idx_f in range(len(z)):
+        for ii in range(2):
+            for jj in range(2):
+                res[idx_f, ii, jj] = np.abs(z[idx_f, ii, jj]) ** 2 / \
+                    freq[idx_f] * 0.2
+                phase[idx_f, ii, jj] = np.degrees(np.angle(z[idx_f, ii, jj]))
+                r_err, phi_err = MTcc.z_error2r_phi_error(
+                    np.real(z[idx_f, ii, jj]), z_err[idx_f, ii, jj],
+                    np.imag(z[idx_f, ii, jj]), z_err[idx_f, ii, jj])
+                res_err[idx_f, ii, jj] = 0.4 * np.abs(z[idx_f, ii, jj]) / \
+                    freq[idx_f] * r_err
+                phase_err[idx_f, ii, jj] = phi_err
+    return res, phase, res_err, phase_err
+
+
+class TestZResPhase(TestCase):
+    def test_res_phase_edi_files(self):
+        for edi_file in edi_files:
+            edi_obj = Edi(edi_fn=edi_file)
+            z_obj = edi_obj.Z
+            if z_obj.z_err is None:
+                continue
+            res, phase, res_err, phase_err = _res_phase_per_element(
+                z_obj.z, z_obj.z_err, z_obj.freq)
+            self.assertTrue(np.allclose(z_obj.resistivity, res), edi_file)
+            self.assertTrue(np.allclose(z_obj.phase, phase), edi_file)
+            self.assertTrue(np.allclose(z_obj.resistivity_err, res_err,
+                                        equal_nan=True),
+                            edi_file)
+            self.assertTrue(np.allclose(z_obj.phase_err, phase_err,
+                                        equal_nan=True),
+                            edi_file)
+
+    def test_res_phase_zero_elements(self):
+        z = np.zeros((3, 2, 2), dtype='complex')
+        z[:, 0, 1] = 1 + 1j
+        z[:, 1, 0] = -1 - 1j
+        z_err = np.zeros((3, 2, 2))
+        z_err[1] = .05
+        freq = np.array([10., 1., .1])
+        z_obj = Z(z_array=z, z_err_array=z_err, freq=freq)
+
+        res, phase, res_err, phase_err = _res_phase_per_element(z, z_err, freq)
+        self.assertTrue(np.allclose(z_obj.resistivity, res))
+        self.assertTrue(np.allclose(z_obj.phase, phase))
+        self.assertTrue(np.allclose(z_obj.resistivity_err, res_err,
+                                        equal_nan=True))
+        self.assertTrue(np.allclose(z_obj.phase_err, phase_err,
+                                        equal_nan=True))
+
+    def test_set_res_phase_round_trip(self):
+        z = np.array([[[.1 + .2j, 1 + 1j], [-1 - 1.1j, .05 - .1j]],
+                      [[.2 + .1j, 3 + 2j], [-2 - 3j, .1 + .01j]]])
+        z_err = np.abs(z) * .05
+        freq = np.array([10., 1.])
+        z_obj = Z(z_array=z.copy(), z_err_array=z_err.copy(), freq=freq)
+        res = z_obj.resistivity.copy()
+        phase = z_obj.phase.copy()
+
+        z_obj.set_res_phase(res, phase, z_obj.resistivity_err.copy(),
+                            z_obj.phase_err.copy())
+        self.assertTrue(np.allclose(z_obj.z, z))
+        self.assertTrue(np.allclose(z_obj.resistivity, res))
+        self.assertTrue(np.allclose(z_obj.phase, phase))
+
+
+class TestTipperAmpPhase(TestCase):
+    def test_amp_phase(self):
+        tipper = np.array([[[.1 + .2j, -.3 + .01j]],
+                           [[0, .2 - .2j]],
+                           [[.5 - .001j, .4 + 0j]]])
+        tipper_err = np.array([[[.01, .02]], [[.01, .5]], [[.02, .02]]])
+        t_obj = Tipper(tipper_array=tipper, tipper_err_array=tipper_err,
+                       freq=np.array([10., 1., .1]))
+        t_obj._compute_amp_phase()
+
+        for idx_f in range(len(tipper)):
+            for jj in range(2):
+                r_err, phi_err = MTcc.propagate_error_rect2polar(
+                    np.real(tipper[idx_f, 0, jj]), tipper_err[idx_f, 0, jj],
+                    np.imag(tipper[idx_f, 0, jj]), tipper_err[idx_f, 0, jj])
+                self.assertAlmostEqual(t_obj.amplitude[idx_f, 0, jj],
+                                       np.abs(tipper[idx_f, 0, jj]))
+                self.assertAlmostEqual(t_obj.amplitude_err[idx_f, 0, jj],
+                                       r_err)
+                self.assertAlmostEqual(t_obj.phase_err[idx_f, 0, jj],
+                                       phi_err)
+
+
+class TestRotate(TestCase):
+    def test_rotate_z_and_back(self):
+        edi_obj = Edi(edi_fn=edi_files[0])
+        z_obj = edi_obj.Z
+        z_orig = z_obj.z.copy()
+        angles = np.linspace(0, 90, len(z_orig))
+        z_obj.rotate(angles)
+        for idx_f in [0, len(z_orig) // 2, len(z_orig) - 1]:
+            s_rot = MTcc.rotatematrix_incl_errors(z_orig[idx_f],
+                                                  angles[idx_f])[0]
+            self.assertTrue(np.allclose(z_obj.z[idx_f], s_rot))
+        z_obj.rotate(-angles)
+        self.assertTrue(np.allclose(z_obj.z, z_orig))
+        self.assertTrue(np.allclose(np.cos(np.radians(z_obj.rotation_angle)),
+                                    1))
+
+    def test_rotate_tipper(self):
+        edi_obj = Edi(edi_fn=edi_files[0])
+        t_obj = edi_obj.Tipper
+        t_orig = t_obj.tipper.copy()
+        t_obj.rotate(30)
+        s_rot = MTcc.rotatevector_incl_errors(t_orig[0], 30)[0]
+        self.assertTrue(np.allclose(t_obj.tipper[0], s_rot))
+        t_obj.rotate(-30)
+        self.assertTrue(np.allclose(t_obj.tipper, t_orig))
+
+
+class TestLazyDerived(TestCase):
+    def setUp(self):
+        self.z = np.array([[[.1 + .2j, 1 + 1j], [-1 - 1.1j, .05 - .1j]],
+                           [[.2 + .1j, 3 + 2j], [-2 - 3j, .1 + .01j]]])
+        self.z_err = np.abs(self.z) * .05
+        self.freq = np.array([10., 1.])
+
+    def test_not_computed_on_set(self):
+        z_obj = Z(z_array=self.z, z_err_array=self.z_err, freq=self.freq)
+        self.assertIsNone(z_obj._resistivity)
+        self.assertTrue(np.allclose(z_obj.resistivity,
+                                    np.abs(self.z) ** 2 / 5. /
+                                    self.freq[:, None, None]))
+        # cached
+        self.assertIs(z_obj.resistivity, z_obj.resistivity)
+        self.assertIs(z_obj.det[0], z_obj.det[0])
+
+    def test_invalidated_on_set(self):
+        z_obj = Z(z_array=self.z, z_err_array=self.z_err, freq=self.freq)
+        res = z_obj.resistivity
+        det = z_obj.det[0]
+        z_obj.z = 2 * self.z
+        self.assertTrue(np.allclose(z_obj.resistivity, 4 * res))
+        self.assertTrue(np.allclose(z_obj.det[0], 4 * det))
+        z_obj.freq = 2 * self.freq
+        self.assertTrue(np.allclose(z_obj.resistivity, 2 * res))
+
+    def test_invalidate_after_in_place_change(self):
+        z_obj = Z(z_array=self.z.copy(), z_err_array=self.z_err,
+                  freq=self.freq)
+        det = z_obj.det[0]
+        trace = z_obj.trace[0]
+        z_obj.z[0] = 0
+        # kept until invalidated
+        self.assertTrue(np.allclose(z_obj.det[0], det))
+        z_obj.invalidate()
+        self.assertEqual(z_obj.det[0][0], 0)
+        self.assertEqual(z_obj.trace[0][0], 0)
+        self.assertTrue(np.allclose(z_obj.trace[0][1:], trace[1:]))
+        self.assertEqual(z_obj.resistivity[0, 0, 1], 0)
+
+    def test_res_phase_not_cached_on_error(self):
+        z_obj = Z(z_array=self.z.copy(), freq=self.freq[:-1])
+        # too few frequencies, logged and not marked as computed
+        self.assertIsNone(z_obj.resistivity)
+        self.assertNotIn('res_phase', z_obj._derived)
+        z_obj.freq = self.freq
+        self.assertTrue(np.allclose(
+            z_obj.resistivity,
+            .2 / self.freq[:, np.newaxis, np.newaxis] * np.abs(self.z) ** 2))
+
+    def test_invariants(self):
+        z_obj = Z(z_array=self.z, z_err_array=self.z_err, freq=self.freq)
+        inv = z_obj.invariants
+        for idx_f in range(len(self.z)):
+            det = np.linalg.det(self.z[idx_f])
+            self.assertAlmostEqual(inv['det'][idx_f], det)
+            self.assertAlmostEqual(inv['det_real'][idx_f],
+                                   np.linalg.det(self.z[idx_f].real))
+            self.assertAlmostEqual(inv['norm'][idx_f],
+                                   np.linalg.norm(self.z[idx_f]))
+            self.assertAlmostEqual(inv['trace'][idx_f],
+                                   np.trace(self.z[idx_f]))
+
+    def test_tipper_invalidated_on_set(self):
+        tipper = np.array([[[.1 + .2j, -.3 + .01j]], [[.2 - .1j, .2 - .2j]]])
+        t_obj = Tipper(tipper_array=tipper,
+                       tipper_err_array=np.abs(tipper) * .1,
+                       freq=self.freq)
+        self.assertTrue(np.allclose(t_obj.amplitude, np.abs(tipper)))
+        mag_real = t_obj.mag_real
+        t_obj.tipper = 2 * tipper
+        self.assertTrue(np.allclose(t_obj.amplitude, 2 * np.abs(tipper)))
+        self.assertTrue(np.allclose(t_obj.mag_real, 2 * mag_real))
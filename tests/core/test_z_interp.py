@@ -0,0 +1,79 @@
+import glob
+from unittest import TestCase
+
+import numpy as np
+
+from mtpy.core.mt import MT
+from mtpy.core.z_interp import interpolate_mt_list, select_periods
+
+edi_files = sorted(glob.glob("tests/data/edifiles/*.edi"))
+
+
+def _select_periods_by_scan(freq, period_list, period_buffer):
+    """
+    reference implementation, nearest data period found by a scan per
+    period
+    """
+    selected = []
+    dperiods = 1. / freq
+    for iperiod in period_list:
+        if iperiod < 1. / freq.max() or iperiod > 1. / freq.min():
+            selected.append(False)
+            continue
+        difference = np.abs(iperiod - dperiods)
+        nearest = dperiods[difference == np.amin(difference)][0]
+        selected.append(max(nearest / iperiod, iperiod / nearest) <
+                        period_buffer + 1.)
+    return np.array(selected)
+
+
+class TestSelectPeriods(TestCase):
+    def test_period_buffer(self):
+        freq = np.logspace(3, -2, 26)
+        period_list = np.logspace(-4, 3, 200)
+        for period_buffer in [.01, .1, .5, 2.]:
+            self.assertTrue(np.all(
+                select_periods(freq, period_list, period_buffer) ==
+                _select_periods_by_scan(freq, period_list, period_buffer)))
+
+    def test_range_and_original(self):
+        freq = np.array([100., 10., 1.])
+        period_list = np.array([.001, .01, .05, .1, 1., 2.])
+        self.assertEqual(list(select_periods(freq, period_list)),
+                         [False, True, True, True, True, False])
+        self.assertEqual(list(select_periods(freq, period_list,
+                                             original_periods=True)),
+                         [False, True, False, True, True, False])
+
+
+class TestInterpolateMTList(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.mt_list = [MT(edi_fn) for edi_fn in edi_files]
+        cls.period_list = np.logspace(-4, 3.5, 37)
+
+    def test_against_single_station(self):
+        z_stack = interpolate_mt_list(self.mt_list, self.period_list,
+                                      period_buffer=.5)
+        self.assertEqual(z_stack.z.shape, (len(edi_files), 37, 2, 2))
+        self.assertTrue(np.allclose(z_stack.period, self.period_list))
+        for ii, mt_obj in enumerate(self.mt_list):
+            selected = select_periods(mt_obj.Z.freq, self.period_list, .5)
+            self.assertTrue(np.all(z_stack.mask[ii] == selected))
+            new_z, new_t = mt_obj.interpolate_impedance_tensor(
+                1. / self.period_list[selected])
+            self.assertTrue(np.all(z_stack.z[ii, selected] == new_z.z))
+            self.assertTrue(np.all(z_stack.z[ii, ~selected] == 0))
+            self.assertTrue(np.allclose(z_stack.z_err[ii, selected],
+                                        new_z.z_err, equal_nan=True))
+            self.assertTrue(np.all(z_stack.tipper[ii, selected] ==
+                                   new_t.tipper))
+
+    def test_process_pool(self):
+        z_serial = interpolate_mt_list(self.mt_list, self.period_list)
+        z_pool = interpolate_mt_list(self.mt_list, self.period_list,
+                                     n_workers=2)
+        self.assertTrue(np.all(z_serial.mask == z_pool.mask))
+        self.assertTrue(np.all(z_serial.z == z_pool.z))
+        self.assertTrue(np.all(z_serial.tipper_mask == z_pool.tipper_mask))
+        self.assertEqual(list(z_serial.station), list(z_pool.station))
@@ -0,0 +1,127 @@
+import glob
+from unittest import TestCase
+
+import numpy as np
+
+import mtpy.analysis.pt as MTpt
+import mtpy.core.mt as mt
+import mtpy.utils.calculator as MTcc
+from mtpy.core.z_stack import ZStack, merge_frequencies, match_frequencies
+
+edi_files = sorted(glob.glob("tests/data/edifiles/*.edi"))[:6] + \
+    sorted(glob.glob("tests/data/AMT/*.edi"))[:2]
+
+
+class TestFrequencies(TestCase):
+    def test_merge_and_match(self):
+        freq = merge_frequencies([np.array([100., 10., 1.]),
+                                  np.array([100.000001, 3., 1.])])
+        self.assertEqual(len(freq), 4)
+        self.assertTrue(np.all(np.diff(freq) < 0))
+        index = match_frequencies(freq, np.array([3., 10.00000001, 2.]))
+        self.assertEqual(list(index), [2, 1, -1])
+
+
+class TestZStack(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.mt_list = [mt.MT(edi_file) for edi_file in edi_files]
+        cls.z_stack = ZStack.from_mt_list(cls.mt_list)
+
+    def test_shapes_and_masks(self):
+        z_stack = self.z_stack
+        n_station = len(self.mt_list)
+        self.assertEqual(z_stack.z.shape, (n_station, z_stack.n_freq, 2, 2))
+        self.assertEqual(z_stack.tipper.shape,
+                         (n_station, z_stack.n_freq, 1, 2))
+        for ii, mt_obj in enumerate(self.mt_list):
+            self.assertEqual(z_stack.mask[ii].sum(), len(mt_obj.Z.freq))
+            self.assertEqual(z_stack.station[ii], mt_obj.station)
+
+    def test_round_trip(self):
+        for mt_obj, z_obj, t_obj in zip(self.mt_list,
+                                        self.z_stack.to_z_list(),
+                                        self.z_stack.to_tipper_list()):
+            order = np.argsort(mt_obj.Z.freq)[::-1]
+            self.assertTrue(np.allclose(z_obj.freq, mt_obj.Z.freq[order]))
+            self.assertTrue(np.allclose(z_obj.z, mt_obj.Z.z[order]))
+            if mt_obj.Tipper.tipper is not None:
+                has_tipper = np.any(mt_obj.Tipper.tipper[order] != 0,
+                                    axis=(1, 2))
+                self.assertTrue(np.allclose(
+                    t_obj.tipper, mt_obj.Tipper.tipper[order][has_tipper]))
+
+        mt_list = self.z_stack.to_mt_list()
+        self.assertEqual([mt_obj.station for mt_obj in mt_list],
+                         [mt_obj.station for mt_obj in self.mt_list])
+        self.assertAlmostEqual(mt_list[0].lat, self.mt_list[0].lat)
+
+    def test_res_phase(self):
+        z_stack = self.z_stack
+        for ii, mt_obj in enumerate(self.mt_list):
+            valid = z_stack.mask[ii]
+            index = match_frequencies(z_stack.freq[valid], mt_obj.Z.freq)
+            self.assertTrue(np.allclose(z_stack.resistivity[ii, valid][index],
+                                        mt_obj.Z.resistivity))
+            self.assertTrue(np.allclose(z_stack.phase[ii, valid][index],
+                                        mt_obj.Z.phase))
+            self.assertTrue(np.allclose(
+                z_stack.phase_err[ii, valid][index], mt_obj.Z.phase_err,
+                equal_nan=True))
+        self.assertTrue(np.all(np.isnan(z_stack.resistivity[~z_stack.mask])))
+
+    def test_invariants(self):
+        z_obj = self.z_stack.get_z(0)
+        invariants = self.z_stack.invariants
+        valid = self.z_stack.mask[0]
+        for key in ['det', 'det_real', 'norm', 'sigma_plus', 'lambda_minus']:
+            self.assertTrue(np.allclose(invariants[key][0, valid],
+                                        z_obj.invariants[key]), key)
+
+    def test_phase_tensor(self):
+        pt = self.z_stack.pt
+        z_obj = self.z_stack.get_z(1)
+        valid = self.z_stack.mask[1]
+        for idx_f in range(0, len(z_obj.z), 5):
+            s_pt = MTpt.z2pt(z_obj.z[idx_f])[0]
+            self.assertTrue(np.allclose(pt[1, valid][idx_f], s_pt))
+        self.assertTrue(np.all(np.isnan(pt[~self.z_stack.mask])))
+
+        pt_obj = MTpt.PhaseTensor(z_object=z_obj)
+        self.assertTrue(np.allclose(self.z_stack.pt_err[1, valid],
+                                    pt_obj.pterr))
+        self.assertTrue(np.all(np.isnan(
+            self.z_stack.pt_err[~self.z_stack.mask])))
+
+        attributes = self.z_stack.pt_attributes
+        self.assertIs(self.z_stack.pt_attributes, attributes)
+        for name in ['phimin', 'phimax', 'azimuth', 'ellipticity', 'beta']:
+            value, err = getattr(pt_obj, name)
+            self.assertTrue(np.allclose(attributes[name][1, valid], value,
+                                        equal_nan=True), name)
+            self.assertTrue(np.allclose(attributes[name + '_err'][1, valid],
+                                        err, equal_nan=True), name)
+        self.assertTrue(np.all(np.isnan(
+            attributes.phimin[~self.z_stack.mask])))
+
+    def test_rotate(self):
+        z_stack = ZStack.from_mt_list(self.mt_list[:2])
+        z_orig = z_stack.z.copy()
+        angles = np.array([30., -45.])
+        z_stack.rotate(angles)
+        s_rot = MTcc.rotatematrix_incl_errors(z_orig[1, 0], -45.)[0]
+        self.assertTrue(np.allclose(z_stack.z[1, 0], s_rot))
+        z_stack.rotate(-angles)
+        self.assertTrue(np.allclose(z_stack.z, z_orig))
+
+    def test_remove_distortion(self):
+        distortion = np.array([[1.2, .5], [.35, 2.1]])
+        distortion_err = np.array([[.1, .05], [.05, .1]])
+        d, z_cor, z_cor_err = self.z_stack.remove_distortion(distortion,
+                                                             distortion_err)
+        z_obj = self.z_stack.get_z(2)
+        s_d, s_z_cor, s_z_cor_err = z_obj.remove_distortion(distortion,
+                                                            distortion_err)
+        valid = self.z_stack.mask[2]
+        self.assertTrue(np.allclose(z_cor[2, valid], s_z_cor))
+        self.assertTrue(np.allclose(z_cor_err[2, valid], s_z_cor_err))
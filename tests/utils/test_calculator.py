@@ -0,0 +1,105 @@
+from unittest import TestCase
+
+import numpy as np
+
+import mtpy.utils.calculator as MTcc
+
+
+def _random_values(n=500, seed=0):
+    rs = np.random.RandomState(seed)
+    x = rs.normal(size=n)
+    y = rs.normal(size=n)
+    x_err = np.abs(rs.normal(scale=.5, size=n))
+    # make sure the special cases are covered: zero values, zero errors,
+    # the origin inside the error box and boxes straddling the x-axis
+    x[:10] = 0.
+    y[:10] = 0.
+    x_err[5:15] = 0.
+    x[20:30] = np.abs(x[20:30]) + 1.
+    y[20:30] = 0.
+    x_err[20:30] = .1
+    return x, x_err, y, x_err
+
+
+class TestErrorPropagationArrays(TestCase):
+    def test_z_error2r_phi_error_array(self):
+        x, x_err, y, y_err = _random_values()
+        rho_err, phi_err = MTcc.z_error2r_phi_error_array(x, x_err, y, y_err)
+        for ii in range(len(x)):
+            s_rho_err, s_phi_err = MTcc.z_error2r_phi_error(x[ii], x_err[ii],
+                                                            y[ii], y_err[ii])
+            self.assertAlmostEqual(rho_err[ii], s_rho_err, places=12)
+            self.assertAlmostEqual(phi_err[ii], s_phi_err, places=10)
+
+    def test_z_error2r_phi_error_array_shape(self):
+        x, x_err, y, y_err = [v[:40].reshape(10, 2, 2)
+                              for v in _random_values()]
+        rho_err, phi_err = MTcc.z_error2r_phi_error_array(x, x_err, y, y_err)
+        self.assertEqual(rho_err.shape, (10, 2, 2))
+        self.assertEqual(phi_err.shape, (10, 2, 2))
+
+    def test_propagate_error_rect2polar_array(self):
+        x, x_err, y, y_err = _random_values(seed=1)
+        rho_err, phi_err = MTcc.propagate_error_rect2polar_array(x, x_err,
+                                                                 y, y_err)
+        for ii in range(len(x)):
+            s_rho_err, s_phi_err = MTcc.propagate_error_rect2polar(
+                x[ii], x_err[ii], y[ii], y_err[ii])
+            self.assertAlmostEqual(rho_err[ii], s_rho_err, places=12)
+            self.assertAlmostEqual(phi_err[ii], s_phi_err, places=10)
+
+    def test_propagate_error_polar2rect_array(self):
+        rs = np.random.RandomState(2)
+        r = np.abs(rs.normal(size=200))
+        r_err = np.abs(rs.normal(scale=.1, size=200))
+        phi = rs.uniform(-180, 180, size=200)
+        phi_err = rs.uniform(0, 10, size=200)
+        x_err, y_err = MTcc.propagate_error_polar2rect_array(r, r_err,
+                                                             phi, phi_err)
+        for ii in range(len(r)):
+            s_x_err, s_y_err = MTcc.propagate_error_polar2rect(
+                r[ii], r_err[ii], phi[ii], phi_err[ii])
+            self.assertAlmostEqual(x_err[ii], s_x_err, places=12)
+            self.assertAlmostEqual(y_err[ii], s_y_err, places=12)
+
+
+class TestBatchedRotation(TestCase):
+    def setUp(self):
+        rs = np.random.RandomState(3)
+        self.matrices = rs.normal(size=(4, 20, 2, 2)) + \
+            1j * rs.normal(size=(4, 20, 2, 2))
+        self.matrices_err = np.abs(rs.normal(size=(4, 20, 2, 2)))
+        self.vectors = self.matrices[:, :, :1, :]
+        self.vectors_err = self.matrices_err[:, :, :1, :]
+        self.angles = rs.uniform(-360, 360, size=(4, 20))
+
+    def test_rotatematrices_incl_errors(self):
+        rot, rot_err = MTcc.rotatematrices_incl_errors(self.matrices,
+                                                       self.angles,
+                                                       self.matrices_err)
+        for ii in range(4):
+            for jj in range(20):
+                s_rot, s_rot_err = MTcc.rotatematrix_incl_errors(
+                    self.matrices[ii, jj], self.angles[ii, jj],
+                    self.matrices_err[ii, jj])
+                self.assertTrue(np.allclose(rot[ii, jj], s_rot))
+                self.assertTrue(np.allclose(rot_err[ii, jj], s_rot_err))
+
+    def test_rotatematrices_scalar_angle(self):
+        rot, rot_err = MTcc.rotatematrices_incl_errors(self.matrices[0], 30.)
+        self.assertIsNone(rot_err)
+        for jj in range(20):
+            s_rot = MTcc.rotatematrix_incl_errors(self.matrices[0, jj], 30.)[0]
+            self.assertTrue(np.allclose(rot[jj], s_rot))
+
+    def test_rotatevectors_incl_errors(self):
+        rot, rot_err = MTcc.rotatevectors_incl_errors(self.vectors,
+                                                      self.angles,
+                                                      self.vectors_err)
+        for ii in range(4):
+            for jj in range(20):
+                s_rot, s_rot_err = MTcc.rotatevector_incl_errors(
+                    self.vectors[ii, jj], self.angles[ii, jj],
+                    self.vectors_err[ii, jj])
+                self.assertTrue(np.allclose(rot[ii, jj], s_rot))
+                self.assertTrue(np.allclose(rot_err[ii, jj], s_rot_err))